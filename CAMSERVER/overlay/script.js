@@ -149,11 +149,55 @@ function updateGraph(color, bpm = 0, maxHR = 180, status = "UNKNOWN") {
   }
 }
 
+// The aggregated live feed (/api/live/feed) replaces per-endpoint polling
+// when EventSource is available.  The overlay still renders once per second,
+// but from the local copy of the state.  Deltas list removed keys under
+// "$del"; see FightControl/static/js/live_feed.js.
+let liveState = null;
+
+function applyDelta(state, delta) {
+  const out = { ...state };
+  for (const key of delta.$del || []) delete out[key];
+  for (const [key, value] of Object.entries(delta)) {
+    if (key === "$del") continue;
+    if (
+      value !== null && typeof value === "object" && !Array.isArray(value) &&
+      out[key] && typeof out[key] === "object" && !Array.isArray(out[key])
+    ) {
+      out[key] = applyDelta(out[key], value);
+    } else {
+      out[key] = value;
+    }
+  }
+  return out;
+}
+
+function subscribeLiveFeed() {
+  if (typeof EventSource === "undefined") return false;
+  const source = new EventSource("/api/live/feed");
+  source.addEventListener("snapshot", (e) => {
+    liveState = JSON.parse(e.data);
+  });
+  source.addEventListener("delta", (e) => {
+    liveState = applyDelta(liveState || {}, JSON.parse(e.data));
+  });
+  return true;
+}
+
+const useFeed = subscribeLiveFeed();
+
+function liveCorner(color) {
+  const data = { ...(liveState && liveState[color]) };
+  if (!data.max_hr) data.max_hr = 180;
+  return data;
+}
+
 setInterval(async () => {
-  const red = await getLiveHRData("red");
-  const blue = await getLiveHRData("blue");
-  updateGraph("red", red.bpm, red.max_hr, red.status);
-  updateGraph("blue", blue.bpm, blue.max_hr, blue.status);
+  if (useFeed && !liveState) return;
+  const red = useFeed ? liveCorner("red") : await getLiveHRData("red");
+  const blue = useFeed ? liveCorner("blue") : await getLiveHRData("blue");
+  updateGraph("red", red.bpm || 0, red.max_hr, red.status || "UNKNOWN");
+  updateGraph("blue", blue.bpm || 0, blue.max_hr, blue.status || "UNKNOWN");
 }, 1000);
 
 document.body.addEventListener("keydown", (e) => {
@@ -225,6 +269,17 @@ function updateRoundUI() {
 }
 
 setInterval(async () => {
+  if (useFeed) {
+    const round = liveState && liveState.round;
+    if (!round) return;
+    currentStatus = {
+      ...round,
+      rounds: round.total_rounds,
+      status: mapToOverlay(round.status),
+    };
+    updateRoundUI();
+    return;
+  }
   try {
     const res = await fetch("/overlay/data/round_status.json");
     const json = await res.json();
@@ -1,24 +1,14 @@
 from __future__ import annotations
 
-import csv
 import importlib
-import json
 from datetime import datetime
 from pathlib import Path
 
-try:  # optional locking support
-    import fcntl  # type: ignore[attr-defined]
-except Exception:  # pragma: no cover - platform dependent
-    fcntl = None  # type: ignore
-try:  # fallback for non-posix systems
-    import portalocker  # type: ignore
-except Exception:  # pragma: no cover - optional dependency
-    portalocker = None  # type: ignore
-
 import fight_state
 import paths
 from FightControl import fighter_paths
 from FightControl.fight_utils import safe_filename
+from services import tag_ingest
 from utils_checks import next_bout_number
 
 _STATE_CACHE: tuple[dict, str, str] | None = None
@@ -45,11 +35,34 @@ def _load_state() -> tuple[dict, str, str]:
     return _STATE_CACHE
 
 
-def _ensure_logs(date: str, red: str, blue: str, round_id: str) -> Path:
+def _log_dir(date: str, red: str, blue: str) -> Path:
     bout = f"{date}_{safe_filename(red).upper()}_vs_{safe_filename(blue).upper()}_BOUT0"
-    path = Path(paths.BASE_DIR) / "FightControl" / "logs" / date / bout / round_id
-    path.mkdir(parents=True, exist_ok=True)
-    return path
+    return Path(paths.BASE_DIR) / "FightControl" / "logs" / date / bout
+
+
+def _views(bout_dir: Path) -> list:
+    """Legacy controller files derived from the bout's tag log."""
+
+    return [
+        tag_ingest.CsvView(
+            "controller:tags.csv",
+            lambda e: bout_dir / e["round"] / "tags.csv",
+            ["timestamp", "fighter", "tag"],
+            lambda e: [e["timestamp"], e["fighter"], e["tag"]],
+        ),
+        tag_ingest.CsvView(
+            "controller:events.csv",
+            lambda e: bout_dir / "events.csv",
+            ["time", "round", "fighter", "type", "value"],
+            lambda e: [e["timestamp"], e["round"], e["fighter"], e["type"], e["tag"]],
+        ),
+        tag_ingest.JsonListView(
+            "controller:tag_log.json",
+            bout_dir.parent / "tag_log.json",
+            lambda e: {"time": e["timestamp"], "fighter": e["fighter"], "tag": e["tag"]},
+            indent=None,
+        ),
+    ]
 
 
 def log_tag(
@@ -58,55 +71,28 @@ def log_tag(
     note: str | None = None,
     type: str | None = None,
 ) -> None:
+    """Append a controller tag to the bout's tag log.
+
+    ``tags.csv``, ``events.csv`` and ``tag_log.json`` are derived from the log
+    by :mod:`services.tag_ingest`; call :func:`services.tag_ingest.flush`
+    before reading them.
+    """
+
     fight, date, round_id = _load_state()
     red = fight.get("red_fighter", "Red Fighter")
     blue = fight.get("blue_fighter", "Blue Fighter")
-    log_dir = _ensure_logs(date, red, blue, round_id)
-
-    # tags.csv
-    tag_csv = log_dir / "tags.csv"
-    tag_csv.parent.mkdir(parents=True, exist_ok=True)
-    new_file = not tag_csv.exists()
-    with tag_csv.open("a", newline="", encoding="utf-8") as f:
-        try:  # avoid concurrent writes where possible
-            if fcntl is not None:
-                fcntl.flock(f, fcntl.LOCK_EX)
-            elif portalocker is not None:
-                portalocker.lock(f, portalocker.LOCK_EX)
-        except Exception:
-            pass
-        w = csv.writer(f)
-        if new_file:
-            w.writerow(["timestamp", "fighter", "tag"])
-        w.writerow([_now_str(), fighter, tag or note or ""])
-        f.flush()
-        try:
-            if fcntl is not None:
-                fcntl.flock(f, fcntl.LOCK_UN)
-            elif portalocker is not None:
-                portalocker.unlock(f)
-        except Exception:
-            pass
-
-    # events.csv
-    events_csv = log_dir.parent / "events.csv"
-    events_new = not events_csv.exists()
-    with events_csv.open("a", newline="", encoding="utf-8") as f:
-        w = csv.writer(f)
-        if events_new:
-            w.writerow(["time", "round", "fighter", "type", "value"])
-        w.writerow([_now_str(), round_id, fighter, type or "coach_note", tag or note or ""])
-
-    # JSON tag log
-    tag_json = log_dir.parent.parent / "tag_log.json"
-    try:
-        items = json.loads(tag_json.read_text(encoding="utf-8"))
-        if not isinstance(items, list):
-            items = []
-    except Exception:
-        items = []
-    items.append({"time": _now_str(), "fighter": fighter, "tag": tag or note or ""})
-    tag_json.write_text(json.dumps(items), encoding="utf-8")
+    bout_dir = _log_dir(date, red, blue)
+    tag_ingest.open_log(bout_dir, lambda: _views(bout_dir), producer="controller").append(
+        {
+            "timestamp": _now_str(),
+            "round": round_id,
+            "fighter": fighter,
+            "tag": tag or note or "",
+            "type": type or "coach_note",
+            "meta": "",
+        },
+        producer="controller",
+    )
 
 
 __all__ = ["log_tag"]
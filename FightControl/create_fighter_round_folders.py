@@ -110,12 +110,14 @@ def _ensure_zone_model_fields(name: str) -> None:
         except Exception:
             data = {}
 
-        # Look up hr_max from fighters.json
+        # Look up hr_max from the fighter registry
         hr_val = None
         try:
             fjson = DATA_DIR / "fighters.json"
             if fjson.exists():
-                arr = json.loads(fjson.read_text() or "[]")
+                from fighter_utils import registry
+
+                arr = registry.all(fjson)
                 for it in arr:
                     nm = (it.get("name") or it.get("fighter") or "").strip()
                     if nm == name:
@@ -141,7 +143,9 @@ def _ensure_zone_model_fields(name: str) -> None:
         if hr_val is not None and "max_hr" not in data:
             data["max_hr"] = hr_val
 
-        p.write_text(json.dumps(data))
+        from utils import fighter_store
+
+        fighter_store.write_view(p, data, indent=None)
     except Exception:
         # never block request flow
         pass
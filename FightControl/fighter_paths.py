@@ -3,9 +3,11 @@ from __future__ import annotations
 import importlib.util
 import sys
 from pathlib import Path
+from typing import Dict, Tuple
 
 import paths
 from FightControl.fight_utils import safe_filename
+from utils import dir_cache
 
 # ``importlib.reload`` requires modules to have a ``__spec__`` attribute and for
 # the parent package's ``__path__`` to include this file's directory.  Some
@@ -36,6 +38,20 @@ def refresh_base_dir() -> None:
     BASE_DIR = _base_dir()
 
 
+# (base, tree, *names) -> sanitised path; directories are created through
+# :mod:`utils.dir_cache` so repeated lookups issue no filesystem calls.
+_resolved: Dict[Tuple[str, ...], Path] = {}
+
+
+def _path(base_dir: Path, tree: Tuple[str, ...], *names: str) -> Path:
+    key = (str(base_dir), *tree, *names)
+    path = _resolved.get(key)
+    if path is None:
+        path = base_dir.joinpath(*tree, *(safe_filename(n) for n in names))
+        _resolved[key] = path
+    return path
+
+
 def bout_dir(fighter_name: str, date: str, bout_name: str) -> Path:
     """Return the session directory for ``bout_name`` on ``date``.
 
@@ -44,12 +60,7 @@ def bout_dir(fighter_name: str, date: str, bout_name: str) -> Path:
     ``FightControl/logs`` and is created if required.
     """
 
-    safe_date = safe_filename(date)
-    safe_bout = safe_filename(bout_name)
-    base_dir = _base_dir()
-    path = base_dir / "FightControl" / "logs" / safe_date / safe_bout
-    path.mkdir(parents=True, exist_ok=True)
-    return path
+    return dir_cache.ensure(_path(_base_dir(), ("FightControl", "logs"), date, bout_name))
 
 
 def round_dir(fighter_name: str, date: str, bout_name: str, round_id: str) -> Path:
@@ -59,10 +70,7 @@ def round_dir(fighter_name: str, date: str, bout_name: str, round_id: str) -> Pa
     is created on demand beneath :func:`bout_dir`.
     """
 
-    base = bout_dir(fighter_name, date, bout_name)
-    path = base / safe_filename(round_id)
-    path.mkdir(parents=True, exist_ok=True)
-    return path
+    return dir_cache.ensure(_path(_base_dir(), ("FightControl", "logs"), date, bout_name, round_id))
 
 
 def summary_dir(fighter_name: str, date: str, bout_name: str) -> Path:
@@ -78,21 +86,13 @@ def summary_dir(fighter_name: str, date: str, bout_name: str) -> Path:
 def fight_bout_dir(fighter_name: str, bout_name: str) -> Path:
     """Return ``{BASE}/Fights/<Fighter>/<Bout>`` creating it on demand."""
 
-    safe_name = safe_filename(fighter_name)
-    safe_bout = safe_filename(bout_name)
-    base_dir = _base_dir()
-    path = base_dir / "Fights" / safe_name / safe_bout
-    path.mkdir(parents=True, exist_ok=True)
-    return path
+    return dir_cache.ensure(_path(_base_dir(), ("Fights",), fighter_name, bout_name))
 
 
 def fight_round_dir(fighter_name: str, bout_name: str, round_id: str) -> Path:
     """Return ``{BASE}/Fights/<Fighter>/<Bout>/<RoundN>`` directory."""
 
-    base = fight_bout_dir(fighter_name, bout_name)
-    path = base / safe_filename(round_id)
-    path.mkdir(parents=True, exist_ok=True)
-    return path
+    return dir_cache.ensure(_path(_base_dir(), ("Fights",), fighter_name, bout_name, round_id))
 
 
 __all__ = [
@@ -20,6 +20,9 @@ from pathlib import Path
 from typing import Dict, List, Optional
 
 import paths
+import round_events
+from round_events import add_listener, remove_listener
+from utils import dir_cache
 
 try:
     from fight_state import load_fight_state
@@ -134,7 +137,7 @@ def round_status() -> Dict[str, object]:
 
 
 def _write_status(state_internal: Dict[str, object], path: Path | None = None) -> None:
-    """Write combined round status and overlay files."""
+    """Write combined round status and overlay files and notify listeners."""
 
     overlay_state = to_overlay(state_internal)
     data = {"state_internal": state_internal, "overlay_state": overlay_state}
@@ -147,6 +150,7 @@ def _write_status(state_internal: Dict[str, object], path: Path | None = None) -
     overlay_path = _overlay_state_file()
     overlay_path.parent.mkdir(parents=True, exist_ok=True)
     overlay_path.write_text(json.dumps(overlay_state, indent=2))
+    round_events.notify(str(state_internal.get("status", RoundState.IDLE.value)), state_internal, target, _state_file())
 
 
 class RoundManager:
@@ -250,7 +254,7 @@ def log_bpm(fighter: str, date: str, round_slug: str, bpm: int, status: str) ->
     overlay_state = to_overlay(status)
 
     log_dir = _fighter_dir(fighter, date, round_slug)
-    log_dir.mkdir(parents=True, exist_ok=True)
+    dir_cache.ensure(log_dir)
     log_path = log_dir / "hr_log.csv"
     line = f"0,{bpm},{overlay_state},{round_slug}"
     if log_path.exists():
@@ -259,7 +263,7 @@ def log_bpm(fighter: str, date: str, round_slug: str, bpm: int, status: str) ->
         log_path.write_text(line)
 
     overlay_dir = _overlay_dir()
-    overlay_dir.mkdir(parents=True, exist_ok=True)
+    dir_cache.ensure(overlay_dir)
     rm = RoundManager()
     overlay = {"bpm": bpm, "status": overlay_state, "round": rm.round}
     (overlay_dir / f"{fighter.lower()}_bpm.json").write_text(json.dumps(overlay))
@@ -274,7 +278,7 @@ def update_hr_continuous(
     """Persist a stream of heart-rate measurements for later analysis."""
 
     session_dir = _hr_log_dir(date, bout)
-    session_dir.mkdir(parents=True, exist_ok=True)
+    dir_cache.ensure(session_dir)
     path = session_dir / "hr_continuous.json"
 
     try:
@@ -385,6 +389,8 @@ def _finalise_round_dirs(
 __all__ = [
     "RoundManager",
     "RoundState",
+    "add_listener",
+    "remove_listener",
     "round_status",
     "_load_fight_state",
     "bout_dir",
@@ -1,17 +1,20 @@
 import json
+import os
 import threading
+import time
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 from typing import Callable
 
 from flask import Blueprint, jsonify, request
 
+import bout_context
+import round_events
 from FightControl.common.states import RoundState
-from FightControl.fight_utils import safe_filename
 from FightControl.fighter_paths import round_dir
 from FightControl.round_manager import get_state, round_status
 from utils.csv_writer import DebouncedCsvWriter
-from utils_checks import next_bout_number
 
 FIELDS = [
     "ts_iso",
@@ -23,80 +26,110 @@ FIELDS = [
     "user",
 ]
 
+PREBUFFER_SECONDS = float(os.getenv("TAG_PREBUFFER_SECONDS", "2"))
+PREBUFFER_ROWS = 256
+
 
 def _default_log_path() -> Path:
     state = get_state()
-    bout = state.bout or {}
-    date = bout.get("fight_date") or datetime.now().strftime("%Y-%m-%d")
-    red = bout.get("red_fighter") or bout.get("red") or "Red"
-    blue = bout.get("blue_fighter") or bout.get("blue") or "Blue"
     round_id = f"round_{state.round}" if state.round else "round_1"
-    bout_num = next_bout_number(date, red, blue) - 1
-    safe_red = safe_filename(red).upper()
-    safe_blue = safe_filename(blue).upper()
-    bout_name = f"{date}_{safe_red}_vs_{safe_blue}_BOUT{bout_num}"
-    rdir = round_dir(red, date, bout_name, round_id)
+    bout = bout_context.current(state.bout or {})
+    rdir = round_dir(bout.red, bout.date, bout.name, round_id)
     return rdir / "coach_notes.csv"
 
 
 class TagLogManager:
-    """Manage CSV logging based on round status."""
+    """Open a CSV writer while a round is live.
+
+    The manager subscribes to :func:`round_events.add_listener` so the writer
+    opens the moment a :class:`~FightControl.round_manager.RoundManager` write
+    makes a round live and closes when it leaves ``LIVE``.  The status file
+    (``status_path`` or the shared ``round_status.json``) is also written by
+    the round timer and other processes, so a watcher thread stats it every
+    ``poll_interval`` seconds and only reads it after it changes.
+
+    :meth:`log` returns ``False`` while no round is live, but the row is kept
+    in a pre-buffer for ``prebuffer`` seconds (``TAG_PREBUFFER_SECONDS``,
+    default ``2``) and committed first if a round goes live within that
+    window, so presses racing the transition are not lost.
+    """
 
     def __init__(
         self,
         path_fn: Callable[[], Path] | None = None,
         status_path: Path | None = None,
         poll_interval: float = 0.5,
+        prebuffer: float | None = None,
     ) -> None:
         self.path_fn = path_fn or _default_log_path
         self.poll_interval = poll_interval
-        if status_path is None:
-            self._status_func = round_status
-        else:
-
-            def _read_path() -> dict:
-                try:
-                    return json.loads(status_path.read_text())
-                except Exception:
-                    return {}
-
-            self._status_func = _read_path
+        self.prebuffer = PREBUFFER_SECONDS if prebuffer is None else prebuffer
+        self._status_path = Path(status_path) if status_path is not None else None
+        self._lock = threading.RLock()
         self._writer: DebouncedCsvWriter | None = None
+        self._pending: deque[tuple[float, dict]] = deque(maxlen=PREBUFFER_ROWS)
         self._stop = threading.Event()
-        self._thread = threading.Thread(target=self._watch, daemon=True)
+        round_events.add_listener(self.on_transition, self._status_path)
+        self._thread = threading.Thread(target=self._watch, name="tag-log-status", daemon=True)
         self._thread.start()
 
     def _read_status(self) -> str | None:
         try:
-            return self._status_func().get("status")
+            if self._status_path is None:
+                return round_status().get("status")
+            return json.loads(self._status_path.read_text()).get("status")
         except Exception:
             return None
 
     def _watch(self) -> None:
-        prev = None
+        seen: object = ()
         while not self._stop.is_set():
-            status = self._read_status()
-            if status == RoundState.LIVE.value and prev != RoundState.LIVE.value:
-                path = self.path_fn()
-                self._writer = DebouncedCsvWriter(path, FIELDS)
-            elif status != RoundState.LIVE.value and self._writer is not None:
+            try:
+                st = (self._status_path or round_events.status_file()).stat()
+                stamp = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                stamp = None
+            if stamp != seen:
+                seen = stamp
+                status = self._read_status()
+                if status is not None:
+                    self.on_transition(status)
+            self._stop.wait(self.poll_interval)
+
+    def on_transition(self, status: str | None, _state: dict | None = None) -> None:
+        """Open or close the writer for a round state change."""
+
+        with self._lock:
+            if status == RoundState.LIVE.value:
+                if self._writer is None:
+                    self._writer = DebouncedCsvWriter(self.path_fn(), FIELDS)
+                    cutoff = time.monotonic() - self.prebuffer
+                    for ts, row in self._pending:
+                        if ts >= cutoff:
+                            self._writer.write_row(row)
+                self._pending.clear()
+            elif self._writer is not None:
                 self._writer.close()
                 self._writer = None
-            prev = status
-            self._stop.wait(self.poll_interval)
 
     def log(self, row: dict) -> bool:
-        if self._writer is None:
-            return False
-        self._writer.write_row(row)
-        return True
+        with self._lock:
+            if self._writer is None:
+                if self.prebuffer > 0:
+                    self._pending.append((time.monotonic(), row))
+                return False
+            self._writer.write_row(row)
+            return True
 
     def shutdown(self) -> None:
         self._stop.set()
-        self._thread.join(timeout=1)
-        if self._writer is not None:
-            self._writer.close()
-            self._writer = None
+        round_events.remove_listener(self.on_transition)
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
 
     @property
     def writer(self) -> DebouncedCsvWriter | None:  # pragma: no cover - simple prop
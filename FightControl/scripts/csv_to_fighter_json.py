@@ -6,18 +6,30 @@ headers contain a ``YYYY-MM-DD`` date are grouped into test sessions.  Each
 session is stored as ``{"date": <date>, "performance": {…}}`` so downstream tools
 can track testing history.
 
+Files are streamed with the :mod:`csv` module: the column layout is compiled
+once per file by :func:`compile_columns`, rows are converted lazily by
+:func:`iter_fighters` and :func:`import_csv` validates and upserts them into
+the fighters store in batches, so only one batch of CSV rows is held at a time
+(the roster itself is the registry's in-memory snapshot).  ``fighters.json`` is
+regenerated once, after the last batch.
+
 The module exposes :func:`convert_row_to_fighter` for unit tests while the
 ``main`` function provides a CLI entry point.
 """
 
 from __future__ import annotations
 
-import json
+import argparse
+import csv
+import datetime
+import math
+import numbers
+import os
 import re
 import sys
+from itertools import islice
 from pathlib import Path
-
-import pandas as pd
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 FIGHTCONTROL_DIR = Path(__file__).resolve().parents[1]
 if str(FIGHTCONTROL_DIR) not in sys.path:
@@ -37,6 +49,8 @@ FIELD_MAP = {
     "MugShot": "photo",
 }
 
+BATCH_SIZE = 500
+
 
 def _clean_value(value: object) -> str:
     if isinstance(value, str):
@@ -44,58 +58,235 @@ def _clean_value(value: object) -> str:
     return "" if value is None else str(value)
 
 
-DATE_RE = re.compile(r"(\d{4}-\d{2}-\d{2})")
+# Placeholder text entered on the form for a test that was not taken
+_PLACEHOLDERS = {"n/a", "na", "-", "--"}
 
 
-def convert_row_to_fighter(row: pd.Series) -> dict:
-    """Convert a row from the registration CSV into a fighter profile.
+def _is_missing(value: object) -> bool:
+    if isinstance(value, str) and value.strip().lower() in _PLACEHOLDERS:
+        return True
+    return value is None or value == "" or (isinstance(value, float) and math.isnan(value))
 
-    Unknown columns containing a ``YYYY-MM-DD`` substring are grouped into
-    sessions where the portion preceding the date becomes the metric name.
-    """
 
-    fighter = {key: _clean_value(row.get(csv_field)) for csv_field, key in FIELD_MAP.items()}
+DATE_RE = re.compile(r"(\d{4}-\d{2}-\d{2})")
+
+# ``(column, field)`` pairs and ``(column, date, metric)`` session columns
+Columns = Tuple[List[Tuple[str, str]], List[Tuple[str, str, str]]]
 
-    sessions: dict[str, dict[str, object]] = {}
-    for col, value in row.items():
-        if col in FIELD_MAP or pd.isna(value) or value in (None, ""):
+
+def compile_columns(headers: Iterable[str]) -> Columns:
+    """Resolve ``headers`` into profile fields and dated session metrics once."""
+
+    fields = [(csv_field, key) for csv_field, key in FIELD_MAP.items()]
+    sessions: List[Tuple[str, str, str]] = []
+    for col in headers:
+        if col is None or col in FIELD_MAP:
             continue
         match = DATE_RE.search(col)
         if not match:
             continue
-        date = match.group(1)
         metric_name = DATE_RE.sub("", col).strip(" -_/\n")
-        if not metric_name:
+        if metric_name:
+            sessions.append((col, match.group(1), metric_name))
+    return fields, sessions
+
+
+def _build(columns: Columns, row, coerce: Callable[[object], object]) -> dict:
+    fields, session_cols = columns
+    fighter = {key: _clean_value(row.get(csv_field)) for csv_field, key in fields}
+
+    sessions: dict[str, dict[str, object]] = {}
+    for col, date, metric_name in session_cols:
+        value = row.get(col)
+        if _is_missing(value):
             continue
-        sessions.setdefault(date, {})[metric_name] = value
+        sessions.setdefault(date, {})[metric_name] = coerce(value)
 
     fighter["sessions"] = [{"date": d, "performance": m} for d, m in sorted(sessions.items())]
     return fighter
 
 
-def parse_dataframe(df: pd.DataFrame) -> list[dict]:
-    return [convert_row_to_fighter(row) for _, row in df.iterrows()]
+def _number(value: object) -> object:
+    """Return numeric CSV text as ``int``/``float`` like pandas would.
+
+    ``nan`` and ``inf`` are left as text so they are reported, not stored.
+    """
+
+    text = str(value).strip()
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        number = float(text)
+    except ValueError:
+        return text
+    return number if math.isfinite(number) else text
+
+
+def convert_row_to_fighter(row) -> dict:
+    """Convert a row from the registration CSV into a fighter profile.
+
+    Unknown columns containing a ``YYYY-MM-DD`` substring are grouped into
+    sessions where the portion preceding the date becomes the metric name.
+    ``row`` may be a :class:`pandas.Series` or any mapping.
+    """
+
+    return _build(compile_columns(row.keys()), row, lambda v: v)
+
+
+def parse_dataframe(df) -> list[dict]:
+    columns = compile_columns(df.columns)
+    return [_build(columns, row, lambda v: v) for _, row in df.iterrows()]
+
+
+def iter_fighters(csv_path: os.PathLike[str] | str) -> Iterator[dict]:
+    """Yield fighter profiles from ``csv_path`` one row at a time."""
+
+    with open(csv_path, newline="", encoding="utf-8-sig") as fh:
+        reader = csv.DictReader(fh)
+        columns = compile_columns(reader.fieldnames or [])
+        for row in reader:
+            yield _build(columns, row, _number)
 
 
 def parse_csv(csv_path: os.PathLike[str] | str) -> list[dict]:
-    df = pd.read_csv(csv_path)
-    return parse_dataframe(df)
+    return list(iter_fighters(csv_path))
+
+
+def validate_fighter(fighter: dict) -> Optional[str]:
+    """Return an error message for ``fighter`` or ``None`` when it is valid.
 
+    Besides the name, the session dates taken from the headers must be real
+    calendar dates.  Session metrics are checked one by one with
+    :func:`drop_invalid_metrics` instead, so a single bad cell does not
+    reject the whole row.
+    """
+
+    if not fighter.get("name"):
+        return "missing name"
+    for session in fighter.get("sessions") or []:
+        try:
+            datetime.date.fromisoformat(session["date"])
+        except (KeyError, TypeError, ValueError):
+            return f"invalid session date {session.get('date')!r}"
+    return None
+
+
+def _is_number(value: object) -> bool:
+    if isinstance(value, bool) or not isinstance(value, numbers.Number):
+        return False
+    return math.isfinite(value)  # type: ignore[arg-type]
 
-def main(csv_path: os.PathLike[str] | str | None = None) -> None:
+
+def drop_invalid_metrics(fighter: dict) -> List[str]:
+    """Remove session metrics that are not finite numbers from ``fighter``.
+
+    Sessions left without metrics are dropped too.  Returns one message per
+    removed metric.
+    """
+
+    problems = []
+    sessions = []
+    for session in fighter.get("sessions") or []:
+        performance = {}
+        for metric, value in (session.get("performance") or {}).items():
+            if _is_number(value):
+                performance[metric] = value
+            else:
+                problems.append(f"{metric} on {session.get('date')} is not a number: {value!r}")
+        if performance:
+            sessions.append({**session, "performance": performance})
+    if "sessions" in fighter:
+        fighter["sessions"] = sessions
+    return problems
+
+
+def _batches(items: Iterable[dict], size: int) -> Iterator[List[dict]]:
+    it = iter(items)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def import_csv(
+    csv_path: os.PathLike[str] | str,
+    output_path: os.PathLike[str] | str | None = None,
+    batch_size: int = BATCH_SIZE,
+    progress: Callable[[Dict[str, object]], None] | None = None,
+) -> Dict[str, object]:
+    """Stream ``csv_path`` into the fighters store and return import statistics.
+
+    Rows are validated and upserted by name ``batch_size`` at a time, so only
+    one batch of CSV rows is held in memory, and the ``fighters.json`` view is
+    exported once at the end.  ``progress`` is called with the
+    running statistics after every batch.  At most 20 row errors are kept in
+    ``stats["errors"]``; ``stats["invalid"]`` counts all of them.  Session
+    metrics that are not numbers are skipped without rejecting their row;
+    ``stats["skipped_metrics"]`` counts them and the first 20 are kept in
+    ``stats["warnings"]``.
+    """
+
+    import fighter_utils
+    from utils import fighter_store
+
+    output = Path(output_path or BASE_DIR / "FightControl" / "data" / "fighters.json")
+    stats: Dict[str, object] = {
+        "rows": 0,
+        "created": 0,
+        "updated": 0,
+        "invalid": 0,
+        "skipped_metrics": 0,
+        "errors": [],
+        "warnings": [],
+    }
+    for batch in _batches(iter_fighters(csv_path), max(1, batch_size)):
+        valid = []
+        for fighter in batch:
+            stats["rows"] += 1  # type: ignore[operator]
+            for problem in drop_invalid_metrics(fighter):
+                stats["skipped_metrics"] += 1  # type: ignore[operator]
+                if len(stats["warnings"]) < 20:  # type: ignore[arg-type]
+                    stats["warnings"].append({"row": stats["rows"] + 1, "error": problem})  # type: ignore[union-attr,operator]
+            error = validate_fighter(fighter)
+            if error is None:
+                valid.append(fighter)
+                continue
+            stats["invalid"] += 1  # type: ignore[operator]
+            if len(stats["errors"]) < 20:  # type: ignore[arg-type]
+                # +1 for the header line
+                stats["errors"].append({"row": stats["rows"] + 1, "error": error})  # type: ignore[union-attr,operator]
+        created, updated = fighter_utils.registry.upsert_many(valid, output, export=False)
+        stats["created"] += created  # type: ignore[operator]
+        stats["updated"] += updated  # type: ignore[operator]
+        if progress is not None:
+            progress(stats)
+    if stats["created"] or stats["updated"]:
+        fighter_store.export_json(output)
+    return stats
+
+
+def main(csv_path: os.PathLike[str] | str | None = None, argv: list[str] | None = None) -> None:
     source_folder = BASE_DIR / "FightControl" / "downloads"
     dest_folder = BASE_DIR / "FightControl" / "data"
-    csv_filename = "Form responses 1.csv" if csv_path is None else csv_path
-    csv_path = csv_path or (source_folder / csv_filename)
 
-    fighters = parse_csv(csv_path)
+    parser = argparse.ArgumentParser(description="Import a fighter registration CSV into fighters.json.")
+    parser.add_argument("csv", nargs="?", type=Path, help="CSV file (default: downloads/Form responses 1.csv)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Rows validated and saved per batch")
+    args = parser.parse_args([] if csv_path is not None and argv is None else argv)
+    csv_path = csv_path or args.csv or (source_folder / "Form responses 1.csv")
 
-    dest_folder.mkdir(parents=True, exist_ok=True)
-    output_path = dest_folder / "fighters.json"
-    with open(output_path, "w") as f:
-        json.dump(fighters, f, indent=2)
+    def _progress(stats: Dict[str, object]) -> None:
+        print(f"\r… {stats['rows']} row(s) processed", end="", flush=True)
 
-    print(f"✅ {len(fighters)} fighter(s) written to {output_path}")
+    output_path = dest_folder / "fighters.json"
+    stats = import_csv(csv_path, output_path, batch_size=args.batch_size, progress=_progress)
+    print()
+    for err in [*stats["errors"], *stats["warnings"]]:  # type: ignore[misc]
+        print(f"⚠️ Row {err['row']}: {err['error']}")
+    print(
+        f"✅ {stats['created']} fighter(s) added, {stats['updated']} updated, "
+        f"{stats['invalid']} skipped, {stats['skipped_metrics']} metric(s) ignored in {output_path}"
+    )
 
 
 if __name__ == "__main__":  # pragma: no cover - CLI entry point
@@ -1,3 +1,22 @@
+"""Download fighter photos referenced in ``fighters.json``.
+
+Photos are fetched concurrently over a bounded ``requests`` connection pool
+and revalidated with ``If-None-Match``/``If-Modified-Since`` so unchanged
+photos cost a single ``304`` round trip.  Downloads are stored content
+addressed under ``data/photos/store/<sha[:2]>/<sha>.<ext>`` which means a
+photo shared by several fighters (or re-uploaded unchanged) is stored once,
+and a JPEG thumbnail is written to ``data/photos/thumbs/<sha>.jpg`` in the
+same pass.  Validators and hashes are kept in ``data/photos/manifest.json``.
+
+Each fighter's ``photo`` may be a Google Drive share link or a plain
+``http(s)`` URL; ``photo_local`` and ``photo_thumb`` are updated with paths
+relative to ``FightControl``.  When a fetch fails, a photo already on disk
+(including a legacy ``photos/<slug>.jpg``) is kept.  The results are saved
+through the fighter registry.
+"""
+
+from __future__ import annotations
+
 import sys
 from pathlib import Path
 
@@ -8,26 +27,35 @@ REPO_ROOT = FIGHTCONTROL_DIR.parent
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
+import argparse
+import hashlib
 import json
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Optional
 from urllib.parse import parse_qs, urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
 
+from fighter_utils import registry
 from paths import BASE_DIR
 
-# Date: 2025-07-19
-
-
 BASE_FC_DIR = BASE_DIR / "FightControl"
 DATA_FOLDER = BASE_FC_DIR / "data"
 PHOTO_FOLDER = DATA_FOLDER / "photos"
 JSON_PATH = DATA_FOLDER / "fighters.json"
 
-PHOTO_FOLDER.mkdir(parents=True, exist_ok=True)
+DRIVE_DOWNLOAD_URL = "https://drive.google.com/uc?export=download&id={file_id}"
+MANIFEST_NAME = "manifest.json"
+THUMB_SIZE = (256, 256)
+WORKERS = int(os.getenv("PHOTO_SYNC_WORKERS", "8"))
+TIMEOUT = 30
 
-# Load JSON
-with open(JSON_PATH, "r") as f:
-    fighters = json.load(f)
+_store_lock = threading.Lock()
+_EXTENSIONS = {"image/png": ".png", "image/webp": ".webp", "image/gif": ".gif"}
 
 
 def extract_file_id(google_url):
@@ -41,39 +69,210 @@ def extract_file_id(google_url):
     return None
 
 
-def download_image(file_id, dest_path):
-    dl_url = f"https://drive.google.com/uc?export=download&id={file_id}"
-    try:
-        r = requests.get(dl_url, stream=True)
-        if r.status_code == 200:
-            with open(dest_path, "wb") as f:
-                for chunk in r.iter_content(1024):
-                    f.write(chunk)
-            return True
-    except Exception as e:
-        print(f"❌ Failed to download {file_id}: {e}")
-    return False
-
-
-# Process each fighter
-for f in fighters:
-    name_slug = f["name"].lower().replace(" ", "_")
-    file_id = extract_file_id(f.get("photo", ""))
+def photo_url(value: str | None) -> Optional[str]:
+    """Return the download URL for a fighter's ``photo`` field, if any."""
+
+    if not value:
+        return None
+    file_id = extract_file_id(value)
     if file_id:
-        photo_path = PHOTO_FOLDER / f"{name_slug}.jpg"
-        if not photo_path.exists():
-            print(f"⬇️  Downloading photo for: {f['name']}")
-            if download_image(file_id, photo_path):
-                f["photo_local"] = str(photo_path.relative_to(BASE_FC_DIR))
-            else:
-                f["photo_local"] = ""
+        return DRIVE_DOWNLOAD_URL.format(file_id=file_id)
+    if urlparse(value).scheme in ("http", "https"):
+        return value
+    return None
+
+
+def make_session(workers: int = WORKERS) -> requests.Session:
+    """Return a session whose connection pool is capped at ``workers``."""
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers, pool_block=True)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _make_thumbnail(src: Path, dest: Path) -> bool:
+    if dest.exists():
+        return True
+    try:
+        from PIL import Image
+
+        with Image.open(src) as img:
+            img = img.convert("RGB")
+            img.thumbnail(THUMB_SIZE)
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            tmp = dest.with_name(f"{dest.stem}.{threading.get_ident()}.tmp")
+            img.save(tmp, "JPEG", quality=85)
+            os.replace(tmp, dest)
+        return True
+    except Exception as exc:
+        print(f"⚠️  Could not create thumbnail for {src.name}: {exc}")
+        return False
+
+
+def fetch_photo(session: requests.Session, url: str, entry: dict, photo_dir: Path) -> dict:
+    """Fetch ``url`` into the content-addressed store and return its manifest entry.
+
+    ``entry`` is the previous manifest record whose validators are sent with
+    the request.  The returned record carries a ``status`` of ``fetched``,
+    ``deduplicated``, ``not_modified`` or ``failed``.
+    """
+
+    store = photo_dir / "store"
+    headers = {}
+    known = entry.get("path") and (photo_dir / entry["path"]).exists()
+    if known and entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if known and entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+
+    try:
+        with session.get(url, headers=headers, stream=True, timeout=TIMEOUT) as r:
+            if r.status_code == 304 and known:
+                return {**entry, "status": "not_modified"}
+            if r.status_code != 200:
+                return {**entry, "status": "failed", "error": f"HTTP {r.status_code}"}
+            ext = _EXTENSIONS.get(r.headers.get("Content-Type", "").split(";")[0].strip(), ".jpg")
+            digest = hashlib.sha256()
+            store.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=store, suffix=".part")
+            try:
+                with os.fdopen(fd, "wb") as fh:
+                    for chunk in r.iter_content(64 * 1024):
+                        digest.update(chunk)
+                        fh.write(chunk)
+                sha = digest.hexdigest()
+                rel = Path("store") / sha[:2] / f"{sha}{ext}"
+                dest = photo_dir / rel
+                with _store_lock:
+                    if dest.exists():
+                        status = "deduplicated"
+                    else:
+                        dest.parent.mkdir(parents=True, exist_ok=True)
+                        os.replace(tmp_name, dest)
+                        status = "fetched"
+            finally:
+                if os.path.exists(tmp_name):
+                    os.unlink(tmp_name)
+            return {
+                "status": status,
+                "sha256": sha,
+                "path": rel.as_posix(),
+                "etag": r.headers.get("ETag"),
+                "last_modified": r.headers.get("Last-Modified"),
+            }
+    except requests.RequestException as exc:
+        return {**entry, "status": "failed", "error": str(exc)}
+
+
+def _load_manifest(photo_dir: Path) -> Dict[str, dict]:
+    try:
+        data = json.loads((photo_dir / MANIFEST_NAME).read_text())
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _atomic_json(data, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(data, indent=2))
+    os.replace(tmp, path)
+
+
+def sync_photos(
+    fighters: Iterable[dict],
+    photo_dir: Path = PHOTO_FOLDER,
+    base_dir: Path = BASE_FC_DIR,
+    workers: int = WORKERS,
+    session: requests.Session | None = None,
+    progress: Callable[[str, dict], None] | None = None,
+) -> Dict[str, int]:
+    """Refresh photos for ``fighters`` in place and return status counts.
+
+    Each distinct URL is fetched once even when several fighters share it.
+    ``progress`` is called with ``(url, record)`` as downloads complete.
+    """
+
+    fighters = list(fighters)
+    photo_dir = Path(photo_dir)
+    manifest = _load_manifest(photo_dir)
+    urls = [photo_url(f.get("photo", "")) for f in fighters]
+    unique = sorted({u for u in urls if u})
+
+    session = session or make_session(workers)
+    lock = threading.Lock()
+    results: Dict[str, dict] = {}
+
+    def _job(url: str) -> None:
+        record = fetch_photo(session, url, manifest.get(url, {}), photo_dir)
+        if record.get("sha256"):
+            src = photo_dir / record["path"]
+            thumb = photo_dir / "thumbs" / f"{record['sha256']}.jpg"
+            if _make_thumbnail(src, thumb):
+                record["thumb"] = thumb.relative_to(photo_dir).as_posix()
+        with lock:
+            results[url] = record
+        if progress is not None:
+            progress(url, record)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        list(pool.map(_job, unique))
+
+    stats = {"fetched": 0, "deduplicated": 0, "not_modified": 0, "failed": 0, "no_photo": 0}
+    for url, record in results.items():
+        stats[record["status"]] += 1
+        manifest[url] = {k: v for k, v in record.items() if k not in ("status", "error")}
+    _atomic_json(manifest, photo_dir / MANIFEST_NAME)
+
+    for fighter, url in zip(fighters, urls):
+        record = results.get(url) if url else None
+        if not url:
+            stats["no_photo"] += 1
+        if record and record.get("path") and (photo_dir / record["path"]).exists():
+            fighter["photo_local"] = (photo_dir / record["path"]).relative_to(base_dir).as_posix()
+            if record.get("thumb"):
+                fighter["photo_thumb"] = (photo_dir / record["thumb"]).relative_to(base_dir).as_posix()
         else:
-            f["photo_local"] = str(photo_path.relative_to(BASE_FC_DIR))
-    else:
-        f["photo_local"] = ""
+            fighter["photo_local"] = _existing_photo(fighter, photo_dir, base_dir)
+    return stats
+
+
+def _existing_photo(fighter: dict, photo_dir: Path, base_dir: Path) -> str:
+    """Return the photo already on disk for ``fighter``, or ``""``."""
+
+    current = fighter.get("photo_local")
+    if current and (base_dir / current).is_file():
+        return current
+    slug = str(fighter.get("name") or "").lower().replace(" ", "_")
+    legacy = photo_dir / f"{slug}.jpg"
+    if slug and legacy.is_file():
+        return legacy.relative_to(base_dir).as_posix()
+    return ""
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Download fighter photos referenced in fighters.json.")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="Concurrent downloads (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    fighters = registry.all(JSON_PATH)
+
+    def _progress(url: str, record: dict) -> None:
+        if record["status"] == "failed":
+            print(f"❌ Failed to download {url}: {record.get('error')}")
+        elif record["status"] != "not_modified":
+            print(f"⬇️  {record['status']}: {url}")
+
+    stats = sync_photos(fighters, workers=args.workers, progress=_progress)
+    fields = ("name", "photo_local", "photo_thumb")
+    registry.upsert_many([{k: f[k] for k in fields if k in f} for f in fighters if f.get("name")], JSON_PATH)
+    print(
+        f"✅ Photos processed: {stats['fetched']} downloaded, {stats['deduplicated']} duplicate, "
+        f"{stats['not_modified']} unchanged, {stats['failed']} failed. JSON updated."
+    )
 
-# Save updated JSON
-with open(JSON_PATH, "w") as f:
-    json.dump(fighters, f, indent=2)
 
-print("✅ All photos processed and JSON updated.")
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    main()
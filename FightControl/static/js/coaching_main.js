@@ -2,6 +2,7 @@
 
 import { startRound, pauseRound, resumeRound, pollTimer } from './timer.js';
 import { startBpmPolling, stopBpmPolling } from './bpm.js';
+import { subscribeLiveFeed } from './live_feed.js';
 import {
   openConfig, closeConfig, loadStoredTags,
   saveTags, applyPreset, logTag, triggerTag,
@@ -83,11 +84,10 @@ function pushChartSample(color, bpm) {
   chart.update('none');
 }
 
-export function initCoaching(roundDuration = 180, baseUrl = '/live-json') {
+export function initCoaching(roundDuration = 180, baseUrl = '/live-json', onTimer = null) {
   initCharts();
 
-  // Keep a reference so polling can be stopped if needed
-  startBpmPolling(baseUrl, 1000, (data = {}) => {
+  const renderCorners = (data = {}) => {
     const red = data.red || {};
     const blue = data.blue || {};
 
@@ -138,8 +138,33 @@ export function initCoaching(roundDuration = 180, baseUrl = '/live-json') {
       blueStatus.classList.toggle('resting', status === 'RESTING');
     }
     pushChartSample('blue', blueChartVal);
+  };
+
+  // One aggregated feed replaces the per-endpoint polling when SSE is
+  // available.  Corners are still sampled once per second for the charts,
+  // but from the local copy of the state.
+  let live = {};
+  let lastTimer = null;
+  const feed = subscribeLiveFeed(state => {
+    live = state;
+    if (onTimer && state.timer && state.timer !== lastTimer) {
+      lastTimer = state.timer;
+      onTimer(state.timer);
+    }
   });
+  if (feed) {
+    setInterval(() => {
+      if (live.red || live.blue) renderCorners({ red: live.red, blue: live.blue });
+    }, 1000);
+  } else {
+    startBpmPolling(baseUrl, 1000, renderCorners);
+  }
 
+  initTagButtons();
+  return feed;
+}
+
+function initTagButtons() {
   // Apply any stored tag labels and mode
   loadStoredTags();
   loadTagMode();
@@ -156,8 +181,6 @@ export function initCoaching(roundDuration = 180, baseUrl = '/live-json') {
 
 if (typeof document !== 'undefined') {
   document.addEventListener('DOMContentLoaded', () => {
-    initCoaching();
-
     const updateTimerUI = data => {
       const timer = document.getElementById('timer');
       const status = document.getElementById('timer-status');
@@ -204,9 +227,12 @@ if (typeof document !== 'undefined') {
       applyTimer(data);
     };
 
-    // Poll once per second to keep the coaching panel updated without
-    // overloading the server or causing overlay flicker.
-    pollTimer(data => { updateTimerUI(data); applyTimer(data); }, 1000);
+    const onTimer = data => { updateTimerUI(data); applyTimer(data); };
+    const feed = initCoaching(180, '/live-json', onTimer);
+
+    // Without the live feed, poll once per second to keep the coaching panel
+    // updated without overloading the server or causing overlay flicker.
+    if (!feed) pollTimer(onTimer, 1000);
 
     document.getElementById('startBtn')?.addEventListener('click', async () => {
       await fetch('/api/timer/start', {
@@ -0,0 +1,57 @@
+// live_feed.js
+
+/** Key under which a delta lists the keys removed from its object. */
+export const DELETED = '$del';
+
+/**
+ * Apply a delta from /api/live/feed to a state object.
+ *
+ * Keys listed under "$del" are removed, nested objects are merged and any
+ * other value (including arrays and null) replaces the previous one.
+ *
+ * @param {Object} state - Current state
+ * @param {Object} delta - Changed keys only
+ * @returns {Object} new state
+ */
+export function applyDelta(state = {}, delta = {}) {
+  const out = { ...state };
+  for (const key of delta[DELETED] || []) delete out[key];
+  for (const [key, value] of Object.entries(delta)) {
+    if (key === DELETED) continue;
+    if (
+      value !== null && typeof value === 'object' && !Array.isArray(value) &&
+      out[key] && typeof out[key] === 'object' && !Array.isArray(out[key])
+    ) {
+      out[key] = applyDelta(out[key], value);
+    } else {
+      out[key] = value;
+    }
+  }
+  return out;
+}
+
+/**
+ * Subscribe to the aggregated live feed (timer, round, both corners and
+ * recent tags) over Server-Sent Events.
+ *
+ * The browser reconnects on its own and sends the last event id, so only
+ * missed deltas (or a fresh snapshot) are delivered after a dropout.
+ *
+ * @param {Function} onState - Called with the full state after every event
+ * @param {string} url - Feed endpoint
+ * @returns {EventSource|null} the source, or null when SSE is unavailable
+ */
+export function subscribeLiveFeed(onState, url = '/api/live/feed') {
+  if (typeof EventSource === 'undefined') return null;
+  let state = {};
+  const source = new EventSource(url);
+  source.addEventListener('snapshot', e => {
+    state = JSON.parse(e.data);
+    onState(state);
+  });
+  source.addEventListener('delta', e => {
+    state = applyDelta(state, JSON.parse(e.data));
+    onState(state);
+  });
+  return source;
+}
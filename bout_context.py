@@ -0,0 +1,176 @@
+"""Identity of the bout currently being fought.
+
+The tag endpoints, the timer's completion hook and the HR logger used to
+rebuild the live bout's directory name on every call with
+:func:`utils_checks.next_bout_number`, which refreshes :mod:`paths` and scans
+both fighters' date folders.  The identity is now computed once when a bout is
+armed and shared through this module.  Moving on to another bout is explicit:
+:func:`arm` numbers a freshly entered fight and :func:`rollover` advances to the
+next bout between the same fighters.
+
+Arming also creates the bout's folder tree (the log folder with one folder per
+round and both fighters' bout folders) through :mod:`utils.dir_cache`, so the
+per-sample and per-tag writers that follow never need to create directories.
+
+When nothing has been armed in this process (for example after a restart in
+the middle of a bout) :func:`current` resumes the most recent bout found on
+disk once and caches it.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, replace
+from datetime import datetime
+from functools import cached_property
+from pathlib import Path
+
+import paths
+from FightControl.fight_utils import safe_filename
+from utils import dir_cache
+
+
+@dataclass(frozen=True)
+class BoutIdentity:
+    """Date, fighters and number of a bout plus the directories derived from them."""
+
+    base_dir: Path
+    date: str
+    red: str
+    blue: str
+    number: int
+
+    @cached_property
+    def name(self) -> str:
+        """Directory name such as ``2025-01-01_RED_vs_BLUE_BOUT1``."""
+
+        return f"{self.date}_{safe_filename(self.red).upper()}_vs_{safe_filename(self.blue).upper()}_BOUT{self.number}"
+
+    @cached_property
+    def log_dir(self) -> Path:
+        """Bout directory beneath ``FightControl/logs``."""
+
+        return self.base_dir / "FightControl" / "logs" / self.date / self.name
+
+    def fighter_dir(self, fighter: str) -> Path:
+        """Bout directory beneath ``FightControl/fighter_data`` for ``fighter``."""
+
+        return self.base_dir / "FightControl" / "fighter_data" / safe_filename(fighter) / self.date / self.name
+
+    @cached_property
+    def fighter_dirs(self) -> tuple[Path, Path]:
+        return self.fighter_dir(self.red), self.fighter_dir(self.blue)
+
+    def prepare(self, rounds: int = 1) -> BoutIdentity:
+        """Create the bout's log, round and fighter folders once."""
+
+        dir_cache.ensure_tree(
+            [*(self.log_dir / f"round_{n}" for n in range(1, max(int(rounds), 1) + 1)), *self.fighter_dirs]
+        )
+        return self
+
+    def matches(self, base_dir: Path, date: str, red: str, blue: str) -> bool:
+        return (self.base_dir, self.date, self.red, self.blue) == (base_dir, date, red, blue)
+
+
+_lock = threading.Lock()
+_active: BoutIdentity | None = None
+
+
+def _resolve(fight: dict | None, date: str | None, base_dir: str | Path | None) -> tuple[Path, str, str, str]:
+    if fight is None:
+        from fight_state import load_fight_state
+
+        fight, loaded_date, _ = load_fight_state()
+        date = date or loaded_date
+    red = fight.get("red_fighter") or fight.get("red") or "Red"
+    blue = fight.get("blue_fighter") or fight.get("blue") or "Blue"
+    date = date or fight.get("fight_date") or datetime.now().strftime("%Y-%m-%d")
+    return Path(base_dir if base_dir is not None else paths.BASE_DIR), date, red, blue
+
+
+def _scan(date: str, red: str, blue: str) -> int:
+    from utils_checks import next_bout_number
+
+    return next_bout_number(date, red, blue)
+
+
+def arm(fight: dict | None = None, date: str | None = None, base_dir: str | Path | None = None) -> BoutIdentity:
+    """Start a new bout for ``fight`` and make it the active one.
+
+    This is the only place the fighter folders are scanned for a bout number.
+    Re-arming the same fighters never reuses the previous bout's number, even
+    if that bout left nothing on disk.
+    """
+
+    global _active
+    base, date, red, blue = _resolve(fight, date, base_dir)
+    number = _scan(date, red, blue)
+    with _lock:
+        if _active is not None and _active.matches(base, date, red, blue):
+            number = max(number, _active.number + 1)
+        identity = _active = BoutIdentity(base, date, red, blue, number)
+    try:
+        rounds = int((fight or {}).get("total_rounds") or 1)
+    except (TypeError, ValueError):
+        rounds = 1
+    return identity.prepare(rounds)
+
+
+def ensure(fight: dict | None = None, date: str | None = None, base_dir: str | Path | None = None) -> BoutIdentity:
+    """Return the active bout for ``fight``, arming a new one if none matches."""
+
+    base, date, red, blue = _resolve(fight, date, base_dir)
+    with _lock:
+        active = _active
+    if active is not None and active.matches(base, date, red, blue):
+        return active
+    return arm({"red_fighter": red, "blue_fighter": blue}, date, base)
+
+
+def current(fight: dict | None = None, date: str | None = None, base_dir: str | Path | None = None) -> BoutIdentity:
+    """Return the live bout for ``fight``.
+
+    The armed identity is returned without touching the filesystem.  A fight
+    that was never armed in this process resumes the latest bout on disk.
+    """
+
+    global _active
+    base, date, red, blue = _resolve(fight, date, base_dir)
+    with _lock:
+        active = _active
+    if active is not None and active.matches(base, date, red, blue):
+        return active
+    # With nothing on disk yet this is the first bout, as :func:`arm` would number it.
+    identity = BoutIdentity(base, date, red, blue, max(_scan(date, red, blue) - 1, 1))
+    with _lock:
+        _active = identity
+    return identity
+
+
+def rollover() -> BoutIdentity | None:
+    """Advance the active bout to the next number for the same fighters."""
+
+    global _active
+    with _lock:
+        if _active is not None:
+            _active = replace(_active, number=_active.number + 1)
+        identity = _active
+    return identity.prepare() if identity is not None else None
+
+
+def active() -> BoutIdentity | None:
+    """Return the active bout without resolving one."""
+
+    return _active
+
+
+def clear() -> None:
+    """Forget the active bout."""
+
+    global _active
+    with _lock:
+        _active = None
+
+
+__all__ = ["BoutIdentity", "active", "arm", "clear", "current", "ensure", "rollover"]
@@ -20,27 +20,16 @@ def setup_logging(level: int = logging.INFO) -> None:
 
 logger = logging.getLogger(__name__)
 
-try:
-    import matplotlib
-
-    matplotlib.use("Agg")  # Use non-GUI backend for PNG generation
-    import matplotlib.pyplot as plt
-except Exception as e:
-    import traceback
-
-    traceback.print_exc()
-    print(f"[HRLogger] Matplotlib import failed: {e}")
-    plt = None
-
 # Ensure the project root is on sys.path
 ROOT = Path(__file__).resolve().parents[2]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from FightControl.fight_utils import safe_filename
+import bout_context
 from FightControl.round_manager import round_status
 from paths import BASE_DIR
-from utils_checks import get_session_dir, next_bout_number
+from services.hr_chart import HrPanel, chart_backend, render_hr_chart
+from utils_checks import get_session_dir
 
 FIGHTER_DIR = BASE_DIR / "FightControl" / "fighter_data"
 FIGHT_JSON = BASE_DIR / "FightControl" / "data" / "current_fight.json"
@@ -149,31 +138,26 @@ def save_series(name: str, date: str, bout: str, series: list[dict]) -> None:
     Path(base).mkdir(parents=True, exist_ok=True)
     (base / "hr_data.json").write_text(json.dumps(series, indent=2))
 
-    if plt is not None and series:
-        times = [p["time"] for p in series]
-        bpm = [p.get("bpm", 0) for p in series]
-        max_hr = series[0].get("max_hr", 180)
-
-        plt.figure(figsize=(8, 3))
-        zones = [
-            (0.0, 0.6, "blue"),
-            (0.6, 0.7, "limegreen"),
-            (0.7, 0.8, "yellow"),
-            (0.8, 0.9, "orange"),
-            (0.9, 1.1, "red"),
-        ]
-        for low, high, color in zones:
-            plt.axhspan(low * max_hr, high * max_hr, facecolor=color, alpha=0.2)
-
-        plt.plot(times, bpm, color="lime", linewidth=2)
-        plt.xlabel("Time (s)")
-        plt.ylabel("BPM")
-        plt.title(f"{name} Heart Rate")
-        plt.ylim(0, max_hr)
-        plt.grid(True)
-        plt.tight_layout()
-        plt.savefig(base / "graph.png")
-        plt.close()
+    if not series:
+        return
+
+    times = [p["time"] for p in series]
+    bpm = [p.get("bpm", 0) for p in series]
+    max_hr = series[0].get("max_hr", 180)
+    out_path = base / "graph.png"
+
+    panel = HrPanel(
+        times=times,
+        bpm=bpm,
+        max_hr=max_hr,
+        title=f"{name} Heart Rate",
+        line_colour="lime",
+    )
+    backend = chart_backend()
+    try:
+        render_hr_chart(panel, out_path, backend=backend)
+    except ImportError as exc:
+        logger.error("HR chart (%s backend) unavailable: cannot import %s", backend, exc.name or exc)
 
 
 def main() -> None:
@@ -193,10 +177,8 @@ def main() -> None:
     red_ema = None
     blue_ema = None
 
-    bout_num = next_bout_number(date, red, blue)
-    safe_red = safe_filename(red).upper()
-    safe_blue = safe_filename(blue).upper()
-    bout_name = f"{date}_{safe_red}_vs_{safe_blue}_BOUT{bout_num}"
+    # The server arms the bout; this process only follows the latest one.
+    bout_name = bout_context.current(fight, date).name
 
     start = time.time()
     red_series = []
@@ -254,7 +236,7 @@ def main() -> None:
 
     save_series(red, date, bout_name, red_series)
     save_series(blue, date, bout_name, blue_series)
-    logger.info("HR data saved for bout %s (%s rounds)", bout_num, rounds)
+    logger.info("HR data saved for bout %s (%s rounds)", bout_name, rounds)
 
 
 if __name__ == "__main__":
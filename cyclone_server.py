@@ -1,4 +1,3 @@
-import asyncio
 import csv
 import json
 import logging
@@ -23,13 +22,18 @@ from flask import (
     send_from_directory,
 )
 
+import fight_state
 from fight_state import load_fight_state
 from FightControl.create_fighter_round_folders import create_round_folder_for_fighter
 from FightControl.fight_utils import parse_round_format, safe_filename
 from FightControl.round_manager import round_status
 from paths import STATIC_DIR, TEMPLATE_DIR
 from services.card_builder import compose_card
+from services import image_variants
+from services.card_queue import card_queue
 from utils.files import open_utf8
+from utils import dir_cache, fighter_bundles, performance_store
+from utils.fighters_index import update_index_entry
 from utils.perf import build_charts_from_perf, parse_performance_csv
 from utils.template_loader import load_template
 
@@ -58,8 +62,8 @@ except ImportError:
         """Fallback no-op when OBS integration is unavailable."""
 
 
-from fighter_utils import ensure_fighter_card, load_fighter, load_fighters
-from utils import ensure_dir_permissions, obs_health, play_audio
+from fighter_utils import load_fighter, load_fighters
+from utils import ensure_dir_permissions, play_audio
 
 # ``pycountry`` is optional; provide a stub returning ``None`` for lookups if missing.
 try:
@@ -318,7 +322,7 @@ app.config.update(
 from routes.api_routes import api_routes
 from routes.boot_status import boot_status_bp
 from routes.fighters import fighters_bp
-from routes.health import health_bp
+from routes.health import health_bp, sampler as health_sampler, start_sampler, status_checks
 from routes.hr import hr_bp, register_hr_socketio
 from routes.obs_routes import obs_bp
 
@@ -432,24 +436,18 @@ def create_fight_structure(red_name, blue_name, round_format):
 # -------------------------------------------------
 # Health check for UI
 # -------------------------------------------------
-def check_backend_ready():
-    async def _run():
-        obs_task = asyncio.to_thread(obs_health.healthy)
-        mtx_task = asyncio.to_thread(check_media_mtx)
-        obs_res, mtx_res = await asyncio.gather(obs_task, mtx_task, return_exceptions=True)
-        obs_ok = not isinstance(obs_res, Exception) and bool(obs_res)
-        if isinstance(obs_res, Exception):
-            logger.warning("OBS connection check failed: %s", obs_res)
-        mtx_ok = not isinstance(mtx_res, Exception) and bool(mtx_res)
-        if isinstance(mtx_res, Exception):
-            logger.warning("mediaMTX check failed: %s", mtx_res)
-        return obs_ok and mtx_ok
+def start_health_sampling() -> None:
+    """Sample subsystem health in the background for the status endpoints."""
 
-    try:
-        return asyncio.run(_run())
-    except Exception as e:
-        logger.warning("Backend readiness check failed: %s", e)
-        return False
+    start_sampler()
+
+
+def check_backend_ready():
+    checks = status_checks()
+    for name, result in health_sampler().results().items():
+        if result["error"] and name in ("obs_connected", "mediamtx_running"):
+            logger.warning("%s check failed: %s", name, result["error"])
+    return checks["obs"] and checks["mtx"]
 
 
 def is_process_running(name: str) -> bool:
@@ -482,22 +480,7 @@ def status_report():
 
     start = time.perf_counter()
 
-    async def _run_checks():
-        obs_task = asyncio.to_thread(obs_health.healthy)
-        mtx_task = asyncio.to_thread(check_media_mtx)
-        hr_task = asyncio.to_thread(is_process_running, "heartrate_mon.daemon")
-        return await asyncio.gather(obs_task, mtx_task, hr_task, return_exceptions=True)
-
-    obs_ok = False
-    mtx_ok = False
-    hr_ok = False
-    try:
-        obs_res, mtx_res, hr_res = asyncio.run(_run_checks())
-        obs_ok = not isinstance(obs_res, Exception) and bool(obs_res)
-        mtx_ok = not isinstance(mtx_res, Exception) and bool(mtx_res)
-        hr_ok = not isinstance(hr_res, Exception) and bool(hr_res)
-    except Exception as e:
-        logger.warning("Status report checks failed: %s", e)
+    checks = status_checks()
 
     rs = round_status().get("status", "OFFLINE")
 
@@ -507,10 +490,10 @@ def status_report():
     logger.debug("status_report latency: %.2f ms", elapsed)
 
     return jsonify(
-        obs=obs_ok,
+        obs=checks["obs"],
         audio=True,
-        mtx=mtx_ok,
-        hr_daemon=hr_ok,
+        mtx=checks["mtx"],
+        hr_daemon=checks["hr_daemon"],
         disk=disk,
         status=rs,
     )
@@ -704,7 +687,13 @@ def api_create_cyclone():
     fighter_dir.mkdir(parents=True, exist_ok=True)
 
     # Save profile.json
-    (fighter_dir / "profile.json").write_text(json.dumps(data, indent=2), encoding="utf-8")
+    from utils import fighter_store
+
+    fighter_store.write_view(fighter_dir / "profile.json", data)
+    try:
+        update_index_entry(fighter_dir.name, fighter_dir.parent, base_dir / "data" / "fighters.json")
+    except OSError:
+        logger.warning("Could not update fighters index for %s", fighter_dir.name)
 
     # Copy card assets
     assets = {}
@@ -742,7 +731,7 @@ def api_create_cyclone():
 
     # Build charts and compose card image
     charts = build_charts_from_perf(perf_data, data)
-    (fighter_dir / "charts.json").write_text(json.dumps(charts, indent=2), encoding="utf-8")
+    fighter_store.write_view(fighter_dir / "charts.json", charts)
     assets["charts"] = "charts.json"
 
     back_img = fighter_dir / "card_back.png"
@@ -753,6 +742,7 @@ def api_create_cyclone():
     # Minimal meta
     meta = {"name": name, "assets": assets}
     (fighter_dir / "card_meta.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    fighter_bundles.refresh_bundle(fighter_dir)
 
     fighter_id = fighter_dir.name
     return jsonify(fighter_id=fighter_id, charts=charts, assets=assets)
@@ -776,15 +766,18 @@ def select_fighter():
         if profile:
             fighter_data.update(profile)
 
-            # Attempt to load performance metrics from JSON or CSV.
+            # Attempt to load performance metrics from the results store,
+            # falling back to legacy JSON or CSV files.
             records = []
             perf_json = DATA_DIR / "performance_results.json"
             perf_csv = DATA_DIR / "tests.csv"
 
             try:
-                if perf_json.exists():
+                if profile.get("name") and performance_store.db_path(DATA_DIR).exists():
+                    records = performance_store.latest_results(profile["name"], data_dir=DATA_DIR)
+                if not records and perf_json.exists():
                     records = json.loads(perf_json.read_text())
-                elif perf_csv.exists():
+                elif not records and perf_csv.exists():
                     import csv
 
                     with perf_csv.open(newline="") as f:
@@ -890,7 +883,7 @@ def live_bpm_blue():
 @app.route("/api/fighters")
 def get_fighters():
     """Return a JSON array of fighter dictionaries with metadata."""
-    fighters = [ensure_fighter_card(f) for f in load_fighters()]
+    fighters = [image_variants.annotate(card_queue.annotate(f)) for f in load_fighters()]
     return jsonify(fighters), 200
 
 
@@ -1003,11 +996,9 @@ def reset_system():
         (DATA_DIR / "round_status.json").write_text(json.dumps(default_status, indent=2))
         logger.info("System status reset to WAITING")
 
-        for fname in ["current_fight.json", "current_round.txt"]:
-            fpath = DATA_DIR / fname
-            if fpath.exists():
-                fpath.unlink()
-                logger.info("Removed %s", fname)
+        fight_state.clear_fight(DATA_DIR)
+        logger.info("Removed current fight and round")
+        dir_cache.forget()
 
         refresh_obs_overlay()
         return jsonify(status="reset")
@@ -1040,6 +1031,7 @@ if __name__ == "__main__":
     host = os.environ.get("CYCLONE_HOST", "127.0.0.1")
     port = int(os.environ.get("CYCLONE_PORT", "5050"))
     debug = os.environ.get("CYCLONE_DEBUG", "0") == "1"
+    start_health_sampling()
     app.logger.info(f"Cyclone ready at http://{host}:{port}")
     app.run(host=host, port=port, debug=debug)
 
@@ -1083,10 +1075,12 @@ else:
                 if isinstance(v, str) and v.strip():
                     names.append(v)
 
-            # If still none, fall back to all fighters in fighters.json
+            # If still none, fall back to all fighters in the registry
+            from fighter_utils import registry
+
             if not names:
                 try:
-                    arr = json.loads((DATA_DIR / "fighters.json").read_text() or "[]")
+                    arr = registry.all(DATA_DIR / "fighters.json")
                     for it in arr:
                         nm = (it.get("name") or it.get("fighter") or "").strip()
                         if nm:
@@ -1097,7 +1091,7 @@ else:
             # Build hr map once
             hr_map = {}
             try:
-                arr = json.loads((DATA_DIR / "fighters.json").read_text() or "[]")
+                arr = registry.all(DATA_DIR / "fighters.json")
                 for it in arr:
                     nm = (it.get("name") or it.get("fighter") or "").strip()
                     if not nm:
@@ -5,23 +5,36 @@ utilities.  It reads the active fight definition from
 ``FightControl/data`` and builds paths under ``FightControl/fighter_data``.
 Missing metadata falls back to sensible defaults so callers can continue to
 record data even if the fight has not been fully configured.
+
+The fight definition is read on hot paths (every HR sample, tag and live
+overlay poll), so :func:`snapshot` keeps the parsed files in memory and only
+re-reads them when their ``stat`` changes.  In-process updates go through
+:func:`save_fight`, :func:`save_round` and :func:`clear_fight`, which replace
+the cached snapshot directly instead of waiting for the next stat check.
 """
 
 from __future__ import annotations
 
+import copy
+import functools
 import json
 import os
+import threading
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
 
 from paths import BASE_DIR
-from utils import ensure_dir
+from utils import dir_cache, ensure_dir
 
 ROOT_DIR = BASE_DIR
 DATA_DIR = ROOT_DIR / "FightControl" / "data"
 LIVE_DIR = ROOT_DIR / "FightControl" / "live_data"
 
 
+@functools.lru_cache(maxsize=1024)
 def _safe(value: str) -> str:
     """Return a filesystem safe version of ``value``.
 
@@ -62,6 +75,85 @@ def fighter_dir() -> Path:
     return _root()
 
 
+FIGHT_FILE = "current_fight.json"
+ROUND_FILE = "current_round.txt"
+
+
+@dataclass(frozen=True)
+class FightSnapshot:
+    """Read-only view of ``current_fight.json`` and ``current_round.txt``."""
+
+    fight: Mapping[str, Any]
+    round_id: str
+
+    @property
+    def date(self) -> str:
+        return self.fight.get("fight_date") or datetime.now().strftime("%Y-%m-%d")
+
+    def as_tuple(self) -> tuple[dict, str, str]:
+        """Return ``(fight, date, round_id)`` with a private, mutable ``fight``."""
+        return copy.deepcopy(dict(self.fight)), self.date, self.round_id
+
+
+_lock = threading.Lock()
+# data dir -> (stat stamp, snapshot)
+_cache: Dict[str, Tuple[tuple, FightSnapshot]] = {}
+
+
+def _data_dir(data_dir: str | Path | None) -> Path:
+    # ``DATA_DIR`` is read per call so reloads and monkeypatching are honoured.
+    return Path(data_dir) if data_dir is not None else DATA_DIR
+
+
+def _stamp(data_dir: Path) -> tuple:
+    stamp = []
+    for name in (FIGHT_FILE, ROUND_FILE):
+        try:
+            st = (data_dir / name).stat()
+            stamp.append((st.st_ino, st.st_mtime_ns, st.st_size))
+        except OSError:
+            stamp.append(None)
+    return tuple(stamp)
+
+
+def _read_fight(data_dir: Path) -> dict:
+    try:
+        fight = json.loads((data_dir / FIGHT_FILE).read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    return fight if isinstance(fight, dict) else {}
+
+
+def _read_round(data_dir: Path) -> str:
+    try:
+        return (data_dir / ROUND_FILE).read_text().strip()
+    except FileNotFoundError:
+        return "round_1"
+
+
+def _store(data_dir: Path, fight: Optional[dict] = None, round_id: Optional[str] = None) -> FightSnapshot:
+    """Cache a snapshot of ``data_dir``, reading whichever part is not given."""
+    stamp = _stamp(data_dir)
+    snap = FightSnapshot(
+        MappingProxyType(copy.deepcopy(fight) if fight is not None else _read_fight(data_dir)),
+        round_id if round_id is not None else _read_round(data_dir),
+    )
+    with _lock:
+        _cache[str(data_dir)] = (stamp, snap)
+    return snap
+
+
+def snapshot(data_dir: str | Path | None = None) -> FightSnapshot:
+    """Return the cached fight state, re-reading the files only when they change."""
+    data_dir = _data_dir(data_dir)
+    stamp = _stamp(data_dir)
+    with _lock:
+        hit = _cache.get(str(data_dir))
+    if hit is not None and hit[0] == stamp:
+        return hit[1]
+    return _store(data_dir)
+
+
 def load_fight_state() -> tuple[dict, str, str]:
     """Return fight metadata, date and current round identifier.
 
@@ -69,21 +161,52 @@ def load_fight_state() -> tuple[dict, str, str]:
     :data:`DATA_DIR`.  If either file is missing or malformed, defaults are
     returned (an empty ``dict``, today's date and ``"round_1"``).  This means
     callers always receive usable values even in a cold-start scenario.
+
+    Values come from :func:`snapshot`; the returned ``dict`` is a copy the
+    caller may modify.
     """
-    try:
-        fight_text = (DATA_DIR / "current_fight.json").read_text()
-        fight = json.loads(fight_text)
-    except FileNotFoundError:
-        fight = {}
-    except json.JSONDecodeError:
-        fight = {}
+    return snapshot().as_tuple()
 
-    try:
-        round_id = (DATA_DIR / "current_round.txt").read_text().strip()
-    except FileNotFoundError:
-        round_id = "round_1"
-    date = fight.get("fight_date", datetime.now().strftime("%Y-%m-%d"))
-    return fight, date, round_id
+
+def _cached(data_dir: Path, part: int) -> Optional[FightSnapshot]:
+    """Return the cached snapshot if file ``part`` (0 fight, 1 round) is unchanged on disk."""
+    with _lock:
+        hit = _cache.get(str(data_dir))
+    if hit is None or hit[0][part] != _stamp(data_dir)[part]:
+        return None
+    return hit[1]
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def save_fight(fight: dict, data_dir: str | Path | None = None) -> FightSnapshot:
+    """Write ``current_fight.json`` and make it the cached fight state."""
+    data_dir = _data_dir(data_dir)
+    _write_atomic(data_dir / FIGHT_FILE, json.dumps(fight, indent=2))
+    hit = _cached(data_dir, 1)
+    return _store(data_dir, fight=fight, round_id=hit.round_id if hit else None)
+
+
+def save_round(round_id: str, data_dir: str | Path | None = None) -> FightSnapshot:
+    """Write ``current_round.txt`` and make it the cached round."""
+    data_dir = _data_dir(data_dir)
+    _write_atomic(data_dir / ROUND_FILE, round_id)
+    hit = _cached(data_dir, 0)
+    return _store(data_dir, fight=dict(hit.fight) if hit else None, round_id=round_id)
+
+
+def clear_fight(data_dir: str | Path | None = None) -> None:
+    """Remove the fight and round files and drop the cached state."""
+    data_dir = _data_dir(data_dir)
+    for name in (FIGHT_FILE, ROUND_FILE):
+        (data_dir / name).unlink(missing_ok=True)
+    with _lock:
+        _cache.pop(str(data_dir), None)
 
 
 def get_session_dir(name: str, date: str, round_id: str) -> Path:
@@ -92,7 +215,8 @@ def get_session_dir(name: str, date: str, round_id: str) -> Path:
     ``name``, ``date`` and ``round_id`` are sanitised using a small local
     helper and joined with :func:`fighter_dir`.  The resulting directory is
     created (along with any parents) which implicitly checks writability – an
-    :class:`OSError` will be raised if the path cannot be created.
+    :class:`OSError` will be raised if the path cannot be created.  Both checks
+    run once per directory; later calls are answered by :mod:`utils.dir_cache`.
 
     Examples
     --------
@@ -100,17 +224,16 @@ def get_session_dir(name: str, date: str, round_id: str) -> Path:
     PosixPath('.../FightControl/fighter_data/Alice/2025-01-01/round_1')
     """
 
-    safe_name = _safe(name)
-    safe_date = _safe(date)
-    safe_round = _safe(round_id)
-    path = fighter_dir() / safe_name / safe_date / safe_round
+    path = fighter_dir() / _safe(name) / _safe(date) / _safe(round_id)
+    if dir_cache.known(path):
+        return path
     try:
         ensure_dir(path)
     except PermissionError as exc:  # pragma: no cover - defensive
         raise PermissionError(f"Unable to create session directory '{path}'") from exc
     if not os.access(path, os.W_OK):
         raise PermissionError(f"Session directory '{path}' is not writable")
-    return path
+    return dir_cache.remember(path)
 
 
 def fighter_session_dir(
@@ -174,7 +297,12 @@ def fighter_session_dir(
 
 
 __all__ = [
+    "FightSnapshot",
+    "clear_fight",
     "load_fight_state",
+    "save_fight",
+    "save_round",
+    "snapshot",
     "fighter_session_dir",
     "get_session_dir",
     "ROOT_DIR",
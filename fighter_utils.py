@@ -1,7 +1,9 @@
-import json
 import os
 import re
 import shutil
+import threading
+from collections.abc import Iterable
+from contextlib import closing
 from pathlib import Path
 
 # Attempt to import the project's filename sanitiser.  When unavailable fall
@@ -93,17 +95,377 @@ DEFAULT_FIGHTER = {
 FIGHTERS_JSON = BASE_DIR / "FightControl" / "data" / "fighters.json"
 
 
+def _normalise(entry: dict) -> dict:
+    """Return ``entry`` merged over :data:`DEFAULT_FIGHTER` (``country`` -> ``nation``)."""
+
+    f = dict(entry)
+    if "country" in f and "nation" not in f:
+        f["nation"] = f.pop("country")
+    merged = {**DEFAULT_FIGHTER, **f}
+    # Fresh containers so fighters never share the template's mutable defaults.
+    for key in ("wingate", "sessions"):
+        if key not in f:
+            merged[key] = []
+    return merged
+
+
+class _Snapshot:
+    """Immutable view of the roster with lookup indexes."""
+
+    __slots__ = ("stamp", "version", "raw", "fighters", "by_id", "by_name", "by_safe_name")
+
+    def __init__(self, stamp, raw: tuple, version: int | None = None):
+        self.stamp = stamp
+        self.version = version
+        self.raw = raw
+        fighters = []
+        by_name: dict = {}
+        by_safe_name: dict = {}
+        for idx, entry in enumerate(raw):
+            fighter = _normalise(entry)
+            fighter["id"] = idx
+            fighters.append(fighter)
+            name = fighter.get("name")
+            if isinstance(name, str) and name:
+                by_name.setdefault(name, idx)
+                by_safe_name.setdefault(safe_filename(name).lower(), idx)
+        self.fighters = tuple(fighters)
+        self.by_id = {str(idx): idx for idx in range(len(fighters))}
+        self.by_name = by_name
+        self.by_safe_name = by_safe_name
+
+
+def _merge_fighter(current: dict, incoming: dict) -> dict:
+    """Return ``current`` updated with the non-empty fields of ``incoming``.
+
+    Empty strings and ``None`` (blank CSV cells) keep the stored value, and
+    ``sessions`` are merged by date so a re-import adds metrics to a session
+    rather than replacing the whole history.
+    """
+
+    merged = dict(current)
+    for key, value in incoming.items():
+        if value is None or value == "":
+            continue
+        if key == "sessions" and isinstance(value, list) and isinstance(current.get(key), list):
+            merged[key] = _merge_sessions(current[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def _merge_sessions(current: list, incoming: list) -> list:
+    by_date: dict = {}
+    for session in [*current, *incoming]:
+        if not isinstance(session, dict):
+            continue
+        date = session.get("date")
+        if date not in by_date:
+            by_date[date] = dict(session)
+            continue
+        stored = by_date[date]
+        performance = {**(stored.get("performance") or {}), **(session.get("performance") or {})}
+        stored.update(session, performance=performance)
+    return sorted(by_date.values(), key=lambda s: str(s.get("date") or ""))
+
+
+class FighterRegistry:
+    """Process-wide cache of the fighter roster indexed by id and name.
+
+    Fighters are stored in :mod:`utils.fighter_store` (``fighters.db`` next to
+    ``fighters.json``); the JSON file is a generated view kept for older
+    readers.  The parsed roster is reused until the ``mtime``/size of the view
+    or the database change, so repeated lookups from the API, the select-fighter page and
+    :func:`utils_bpm.read_bpm` no longer re-read and re-normalise it.  Lookups
+    by id, display name and :func:`safe_filename` are dictionary hits.
+
+    Snapshots are never mutated.  Writers change only the affected rows inside
+    a database transaction and swap in a fresh snapshot, so readers holding
+    the previous one are unaffected.  Returned fighters are shallow copies;
+    nested values such as ``sessions`` must not be modified in place.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._path: Path | None = None
+        self._snapshot = _Snapshot(None, ())
+
+    @staticmethod
+    def _stamp(path: Path):
+        """Return the ``mtime``/size of the view and of the database files.
+
+        The view is exported lazily, so commits from other processes are
+        noticed through the database and its write-ahead log instead.
+        """
+
+        from utils import fighter_store
+
+        db = fighter_store.db_path(path)
+        stamps = []
+        for p in (path, db, db.with_name(db.name + "-wal")):
+            try:
+                st = p.stat()
+            except OSError:
+                stamps.append(None)
+            else:
+                stamps.append((st.st_mtime_ns, st.st_size))
+        return None if stamps[0] is None and stamps[1] is None else tuple(stamps)
+
+    def _load(self, path: Path) -> _Snapshot:
+        from utils import fighter_store
+
+        if self._stamp(path) is None:
+            return _Snapshot(None, ())
+        with closing(fighter_store.connect(path)) as conn:
+            # A hand-edited view is imported, so take the write lock up front
+            # rather than upgrading a read transaction.
+            conn.execute("BEGIN IMMEDIATE" if fighter_store.legacy_changed(conn, path) else "BEGIN")
+            try:
+                fighter_store.sync_legacy(conn, path)
+                version, raw = fighter_store.load(conn)
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+        if not path.exists():
+            fighter_store.export_json(path)
+        return _Snapshot(self._stamp(path), tuple(raw), version)
+
+    def snapshot(self, path: Path | None = None) -> _Snapshot:
+        """Return the current snapshot for ``path``, reloading when stale."""
+
+        path = Path(path or FIGHTERS_JSON)
+        stamp = self._stamp(path)
+        snap = self._snapshot
+        if self._path == path and snap.stamp == stamp:
+            return snap
+        with self._lock:
+            if self._path != path or self._snapshot.stamp != self._stamp(path):
+                self._snapshot = self._load(path)
+                self._path = path
+            return self._snapshot
+
+    def invalidate(self) -> None:
+        """Drop the cached snapshot so the next lookup re-reads the store."""
+
+        with self._lock:
+            self._path = None
+            self._snapshot = _Snapshot(None, ())
+
+    def all(self, path: Path | None = None) -> list:
+        return [dict(f) for f in self.snapshot(path).fighters]
+
+    def _get(self, index: str, key, path: Path | None) -> dict | None:
+        snap = self.snapshot(path)
+        idx = getattr(snap, index).get(key)
+        return dict(snap.fighters[idx]) if idx is not None else None
+
+    def get(self, fighter_id, path: Path | None = None) -> dict | None:
+        return self._get("by_id", str(fighter_id).strip(), path)
+
+    def get_by_name(self, name: str, path: Path | None = None) -> dict | None:
+        return self._get("by_name", name, path)
+
+    def get_by_safe_name(self, safe_name: str, path: Path | None = None) -> dict | None:
+        return self._get("by_safe_name", str(safe_name).lower(), path)
+
+    def _write(self, path: Path | None, change, export: bool = True):
+        """Apply ``change(conn, raw)`` in one transaction and swap in the result.
+
+        ``change`` edits the list ``raw`` in place, writes the affected rows
+        with :func:`utils.fighter_store.put` and returns ``(result, changed)``.
+        With ``export=False`` the ``fighters.json`` view is left for the caller
+        to regenerate with :func:`utils.fighter_store.export_json`.
+        """
+
+        from utils import fighter_store
+
+        path = Path(path or FIGHTERS_JSON)
+        with self._lock:
+            with closing(fighter_store.connect(path)) as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    fighter_store.sync_legacy(conn, path)
+                    version = fighter_store.version(conn)
+                    snap = self._snapshot
+                    if self._path == path and snap.version == version:
+                        raw = list(snap.raw)
+                    else:
+                        version, raw = fighter_store.load(conn)
+                    result, changed = change(conn, raw)
+                    if changed:
+                        version = fighter_store.bump(conn)
+                    conn.commit()
+                except BaseException:
+                    conn.rollback()
+                    raise
+            if changed and export:
+                fighter_store.schedule_export(path)
+            self._snapshot = _Snapshot(self._stamp(path), tuple(raw), version)
+            self._path = path
+            return result
+
+    def add(self, fighter: dict, path: Path | None = None) -> tuple:
+        """Append ``fighter`` unless its name exists; return ``(fighter, created)``."""
+
+        from utils import fighter_store
+
+        def change(conn, raw):
+            pos = fighter_store.find(conn, fighter.get("name")) if fighter.get("name") else None
+            if pos is not None and raw[pos].get("name") == fighter.get("name"):
+                return (pos, False), False
+            raw.append(fighter)
+            fighter_store.put(conn, len(raw) - 1, fighter)
+            return (len(raw) - 1, True), True
+
+        idx, created = self._write(path, change)
+        return dict(self._snapshot.fighters[idx]), created
+
+    def append(self, fighter: dict, path: Path | None = None) -> dict:
+        """Append ``fighter`` even when its name already exists."""
+
+        from utils import fighter_store
+
+        def change(conn, raw):
+            raw.append(fighter)
+            fighter_store.put(conn, len(raw) - 1, fighter)
+            return len(raw) - 1, True
+
+        idx = self._write(path, change)
+        return dict(self._snapshot.fighters[idx])
+
+    def update(self, fighter_id, fighter: dict, path: Path | None = None) -> dict | None:
+        """Replace the fighter with ``fighter_id``; ``None`` if it does not exist."""
+
+        from utils import fighter_store
+
+        entry = {k: v for k, v in fighter.items() if k != "id"}
+
+        def change(conn, raw):
+            try:
+                idx = int(str(fighter_id).strip())
+            except ValueError:
+                return None, False
+            if not 0 <= idx < len(raw):
+                return None, False
+            raw[idx] = entry
+            fighter_store.put(conn, idx, entry)
+            return idx, True
+
+        idx = self._write(path, change)
+        return None if idx is None else dict(self._snapshot.fighters[idx])
+
+    def upsert_many(self, fighters: Iterable[dict], path: Path | None = None, export: bool = True) -> tuple:
+        """Merge ``fighters`` into the store by name in a single transaction.
+
+        Existing entries are updated field by field with :func:`_merge_fighter`
+        and new names appended.  Returns ``(created, updated)`` counts, where
+        entries the merge leaves unchanged are not counted.  ``export`` is
+        passed to :meth:`_write`.
+        """
+
+        from utils import fighter_store
+
+        def change(conn, raw):
+            by_name: dict = {}
+            for idx, entry in enumerate(raw):
+                by_name.setdefault(entry.get("name"), idx)
+            created = updated = 0
+            for fighter in fighters:
+                idx = by_name.get(fighter.get("name"))
+                if idx is None:
+                    idx = by_name[fighter.get("name")] = len(raw)
+                    raw.append(fighter)
+                    created += 1
+                else:
+                    merged = _merge_fighter(raw[idx], fighter)
+                    if merged == raw[idx]:
+                        continue
+                    raw[idx] = merged
+                    updated += 1
+                fighter_store.put(conn, idx, raw[idx])
+            return (created, updated), bool(created or updated)
+
+        return self._write(path, change, export)
+
+    def replace(self, fighters: Iterable[dict], path: Path | None = None) -> bool:
+        """Replace the whole roster with ``fighters``; ``True`` if it changed."""
+
+        from utils import fighter_store
+
+        fighters = list(fighters)
+
+        def change(conn, raw):
+            if raw == fighters:
+                return False, False
+            raw[:] = fighters
+            fighter_store.replace_all(conn, raw)
+            return True, True
+
+        return self._write(path, change)
+
+    def patch(self, old: dict | None, new: dict | None, path: Path | None = None) -> bool:
+        """Swap the entry equal to ``old`` for ``new``.
+
+        When no entry equals ``old`` the first one sharing a name with ``old``
+        or ``new`` is used instead.  ``new`` is appended when nothing matches,
+        and ``new=None`` removes the match.  Returns ``True`` if the roster changed.
+        """
+
+        return bool(self.patch_many([(old, new)], path))
+
+    def patch_many(self, changes: Iterable[tuple], path: Path | None = None) -> int:
+        """Apply several :meth:`patch` ``(old, new)`` pairs in one transaction.
+
+        Only the touched rows are written unless an entry is removed.  Returns
+        the number of pairs that changed the roster.
+        """
+
+        from utils import fighter_store
+
+        changes = list(changes)
+
+        def change(conn, raw):
+            count = 0
+            removed = False
+            touched = set()
+            for old, new in changes:
+                names = {n for n in ((old or {}).get("name"), (new or {}).get("name")) if n}
+                idx = next((i for i, f in enumerate(raw) if old and f == old), None)
+                if idx is None:
+                    idx = next((i for i, f in enumerate(raw) if f.get("name") in names), None)
+                if new is None:
+                    if idx is None:
+                        continue
+                    del raw[idx]
+                    removed = True
+                elif idx is None:
+                    raw.append(new)
+                    touched.add(len(raw) - 1)
+                elif raw[idx] == new:
+                    continue
+                else:
+                    raw[idx] = new
+                    touched.add(idx)
+                count += 1
+            if removed:
+                # Later positions shifted; rewrite them in order.
+                fighter_store.replace_all(conn, raw)
+            else:
+                for idx in sorted(touched):
+                    fighter_store.put(conn, idx, raw[idx])
+            return count, bool(count)
+
+        return self._write(path, change)
+
+
+registry = FighterRegistry()
+
+
 def load_fighters():
-    if not FIGHTERS_JSON.exists():
-        return []
-    data = json.loads(FIGHTERS_JSON.read_text())
-    for f in data:
-        if "country" in f and "nation" not in f:
-            f["nation"] = f.pop("country")
-    fighters = [{**DEFAULT_FIGHTER, **f} for f in data]
-    for idx, fighter in enumerate(fighters):
-        fighter["id"] = idx
-    return fighters
+    """Return all fighters with default fields and an ``id`` per entry."""
+
+    return registry.all()
 
 
 def save_fighter(f):
@@ -120,35 +482,29 @@ def save_fighter(f):
     if "country" in f and "nation" not in f:
         f["nation"] = f.pop("country")
 
-    fighters = json.loads(FIGHTERS_JSON.read_text()) if FIGHTERS_JSON.exists() else []
+    stored, _created = registry.add(f)
+    return stored
 
-    for idx, existing in enumerate(fighters):
-        if existing.get("name") == f.get("name"):
-            return {**DEFAULT_FIGHTER, **existing, "id": idx}
 
-    fighters.append(f)
-    FIGHTERS_JSON.parent.mkdir(parents=True, exist_ok=True)
-    FIGHTERS_JSON.write_text(json.dumps(fighters, indent=2))
+def load_fighter(fighter_id):
+    """Return the fighter whose ``id`` (its index) matches ``fighter_id``."""
 
-    idx = len(fighters) - 1
-    return {**DEFAULT_FIGHTER, **f, "id": idx}
+    fighter = registry.get(fighter_id)
+    if fighter is None:
+        # Fallback: interpret values such as ``"01"`` as an index
+        try:
+            fighter = registry.get(int(fighter_id))
+        except (TypeError, ValueError):
+            return None
+    return fighter
 
 
-def load_fighter(fighter_id):
-    fighters = load_fighters()
-    # Try to match by explicit ID field
-    for f in fighters:
-        if str(f.get("id")) == str(fighter_id):
-            return {**DEFAULT_FIGHTER, **f}
-    # Fallback: interpret fighter_id as an index
-    try:
-        idx = int(fighter_id)
-    except (TypeError, ValueError):
+def find_fighter(name: str):
+    """Return the fighter with display name or safe name ``name``."""
+
+    if not name:
         return None
-    if 0 <= idx < len(fighters):
-        f = fighters[idx]
-        return {**DEFAULT_FIGHTER, **f}
-    return None
+    return registry.get_by_name(name) or registry.get_by_safe_name(safe_filename(name))
 
 
 def map_asset_paths(meta: dict) -> dict:
@@ -221,9 +577,19 @@ def create_fighter_card(photo, card_template=None, output_dir=None):
             card_img.paste(uploaded_img, (0, 0), uploaded_img)
             card_img.save(out_path)
 
+    from services.image_variants import generate_variants
+
+    generate_variants(out_path, static_dir=BASE_DIR / "FightControl" / "static")
     return out_path
 
 
+def fighter_card_path(fighter: dict) -> Path:
+    """Return the expected ``FightControl/data/<name>_card.png`` for ``fighter``."""
+
+    name = safe_filename(fighter.get("name", ""))
+    return BASE_DIR / "FightControl" / "data" / f"{name}_card.png"
+
+
 def ensure_fighter_card(fighter: dict) -> dict:
     """Ensure ``fighter`` has a generated card image and return updated dict.
 
@@ -237,8 +603,7 @@ def ensure_fighter_card(fighter: dict) -> dict:
     """
 
     result = dict(fighter)
-    name = safe_filename(result.get("name", ""))
-    card_path = BASE_DIR / "FightControl" / "data" / f"{name}_card.png"
+    card_path = fighter_card_path(result)
 
     if not card_path.exists():
         photo_local = result.get("photo_local")
@@ -287,7 +652,9 @@ def mirror_fighter_to_filesystem(fighter: dict) -> None:
         fighter_dir.mkdir(parents=True, exist_ok=True)
 
         # Persist fighter.json
-        (fighter_dir / "fighter.json").write_text(json.dumps(fighter, indent=2), encoding="utf-8")
+        from utils import fighter_store
+
+        fighter_store.write_view(fighter_dir / "fighter.json", fighter)
 
         # Mirror or create the fighter card image
         src_card = base / "FightControl" / "static" / "images" / "cyclone_card_front_logo.png"
@@ -308,9 +675,13 @@ __all__ = [
     "load_fighters",
     "save_fighter",
     "load_fighter",
+    "find_fighter",
+    "registry",
+    "FighterRegistry",
     "map_asset_paths",
     "create_fighter_card",
     "ensure_fighter_card",
+    "fighter_card_path",
     "mirror_fighter_to_filesystem",
 ]
 
@@ -338,12 +709,12 @@ def _ensure_zone_model_fields(name: str) -> None:
         except Exception:
             data = {}
 
-        # Get hr_max from fighters.json if present
+        # Get hr_max from the fighter registry if present
         hr_val = None
         try:
             fjson = DATA_DIR / "fighters.json"
             if fjson.exists():
-                arr = json.loads(fjson.read_text() or "[]")
+                arr = registry.all(fjson)
                 for it in arr:
                     nm = (it.get("name") or it.get("fighter") or "").strip()
                     if nm == name:
@@ -368,7 +739,9 @@ def _ensure_zone_model_fields(name: str) -> None:
         if hr_val is not None and "max_hr" not in data:
             data["max_hr"] = hr_val
 
-        p.write_text(json.dumps(data))
+        from utils import fighter_store
+
+        fighter_store.write_view(p, data, indent=None)
     except Exception:
         pass
 
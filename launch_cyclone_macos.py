@@ -14,6 +14,7 @@ import cyclone_server
 def _start_server():
     """Run the Cyclone Flask server."""
     cyclone_server.setup_logging()
+    cyclone_server.start_health_sampling()
     cyclone_server.app.run(debug=False, host="0.0.0.0", port=5050)
 
 
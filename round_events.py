@@ -0,0 +1,72 @@
+"""Round state change notifications.
+
+:mod:`FightControl.round_manager` publishes every round state it writes here
+and :class:`FightControl.routes.tags.TagLogManager` subscribes.  The registry
+lives outside ``round_manager`` because that module is reloaded by
+:func:`round_timer.start_round_timer` and dropped from ``sys.modules`` by some
+blueprints; a list held there would be emptied or split between copies.
+
+Only writes made in this process are published.  Other writers, such as the
+round timer or another process, are picked up by watching the status file.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Callable
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+Listener = Callable[[str, dict[str, object]], None]
+
+_lock = threading.Lock()
+_listeners: list[tuple[Listener, Path | None]] = []
+
+
+def status_file() -> Path:
+    """Return the shared ``round_status.json`` path."""
+
+    from paths import BASE_DIR
+
+    return Path(BASE_DIR) / "FightControl" / "data" / "round_status.json"
+
+
+def add_listener(callback: Listener, path: Path | None = None) -> None:
+    """Call ``callback(status, state_internal)`` whenever a round state is written.
+
+    Only writes to ``path`` are reported; it defaults to :func:`status_file`.
+    """
+
+    with _lock:
+        _listeners[:] = [entry for entry in _listeners if entry[0] != callback]
+        _listeners.append((callback, Path(path) if path is not None else None))
+
+
+def remove_listener(callback: Listener) -> None:
+    """Stop notifying ``callback`` of round state changes."""
+
+    with _lock:
+        _listeners[:] = [entry for entry in _listeners if entry[0] != callback]
+
+
+def notify(status: str, state_internal: dict[str, object], target: Path, default: Path | None = None) -> None:
+    """Report a write of ``state_internal`` to ``target``.
+
+    ``default`` is the file listeners registered without a path follow.
+    """
+
+    default = default or status_file()
+    with _lock:
+        listeners = list(_listeners)
+    for callback, path in listeners:
+        if Path(target) != (path or default):
+            continue
+        try:
+            callback(status, state_internal)
+        except Exception:
+            logger.exception("round state listener %r failed", callback)
+
+
+__all__ = ["add_listener", "notify", "remove_listener", "status_file"]
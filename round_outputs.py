@@ -343,19 +343,38 @@ async def move_outputs_for_round(round_meta: dict[str, Any]) -> None:
     hr_stats_all = round_meta.get("hr_stats") or {}
 
     # Write per‑fighter round_meta.json
+    round_dirs: dict[str, Path] = {}
     if red:
         red_stats = hr_stats_all.get("red", hr_stats_all) if isinstance(hr_stats_all, dict) else {}
         try:
-            save_round_meta(red, date, round_no, duration, moved_paths, red_stats)
+            round_dirs["red"] = save_round_meta(red, date, round_no, duration, moved_paths, red_stats).parent
         except Exception:
             logger.exception("save_round_meta failed for fighter %s", red)
     if blue:
         blue_stats = hr_stats_all.get("blue", hr_stats_all) if isinstance(hr_stats_all, dict) else {}
         try:
-            save_round_meta(blue, date, round_no, duration, moved_paths, blue_stats)
+            round_dirs["blue"] = save_round_meta(blue, date, round_no, duration, moved_paths, blue_stats).parent
         except Exception:
             logger.exception("save_round_meta failed for fighter %s", blue)
 
+    # Cut tagged highlight clips from the recordings just filed
+    if moved_paths and round_dirs:
+        try:
+            import bout_context
+            from services import clip_export
+
+            session_dir = bout_context.current({"red_fighter": red, "blue_fighter": blue}, date).log_dir
+            await asyncio.to_thread(
+                clip_export.export_round,
+                session_dir,
+                round_no,
+                moved_paths,
+                {"red": red, "blue": blue},
+                round_dirs,
+            )
+        except Exception:
+            logger.exception("Highlight clip export failed for round %s", round_no)
+
 
 async def round_start() -> None:
     """Handle OBS actions when a round starts."""
@@ -3,22 +3,20 @@
 from __future__ import annotations
 
 import json
+import logging
 import shutil
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Tuple
 
-import matplotlib
-
-matplotlib.use("Agg")
 import importlib.util
 import sys
 import types
 
-import matplotlib.pyplot as plt
 import pandas as pd
 
 import paths
+from services.hr_chart import HrPanel, render_hr_panels
 
 _fu_spec = importlib.util.spec_from_file_location(
     "FightControl.fight_utils", Path(__file__).parent / "FightControl" / "fight_utils.py"
@@ -46,6 +44,8 @@ bout_dir = fighter_paths.bout_dir
 round_dir = fighter_paths.round_dir
 summary_dir = fighter_paths.summary_dir
 
+logger = logging.getLogger(__name__)
+
 DEFAULT_MAX_HR = 200
 DEFAULT_HR_ZONES = [
     (0.0, 0.60, "blue"),
@@ -150,89 +150,67 @@ def _load_zone_model(fighter: str) -> Tuple[int, List[Tuple[float, float, str]]]
 def _load_tag_events(session_dir: Path, fighter: str) -> List[Tuple[float, str]]:
     """Return list of ``(seconds, label)`` tag events for ``fighter``.
 
-    Tag events are normalised relative to the start of the fighter's heart-rate
-    data. Session-level ``events.csv`` files are preferred with per-round
-    ``tags.csv`` files used as a fallback. Rows whose ``type`` is ``bookmark``
-    are ignored.
+    Tag events are read from the bout timeline (:mod:`services.timeline`) and
+    expressed relative to the start of the bout's continuous heart-rate data.
+    Rows whose ``type`` is ``bookmark`` are ignored.
     """
 
-    fighter = fighter.lower()
-    events: List[Tuple[float, str]] = []
-
-    hr_df = _load_continuous_hr(session_dir, fighter)
-    start_ts = hr_df["timestamp"].iloc[0] if not hr_df.empty else None
-
-    date = session_dir.parent.name
-    bout_name = session_dir.name
-
-    def _append(ts: pd.Timestamp | None, label: str) -> None:
-        if start_ts is None or ts is None:
-            return
-        events.append(((ts - start_ts).total_seconds(), label))
-
-    ev_path = session_dir / "events.csv"
-    tag_log_path = session_dir / "tag_log.csv"
-    if ev_path.exists():
-        sources = [ev_path]
-    elif tag_log_path.exists():
-        sources = [tag_log_path]
-    else:
-        sources = []
-        for p in sorted(session_dir.iterdir()):
-            if not p.is_dir():
-                continue
-            rdir = round_dir(fighter, date, bout_name, p.name)
-            tag_path = rdir / "tags.csv"
-            if tag_path.exists():
-                sources.append(tag_path)
-    for path in sources:
-        try:
-            df = pd.read_csv(path)
-        except Exception:
-            continue
-        df.columns = [c.lower() for c in df.columns]
-        df["timestamp"] = pd.to_datetime(df.get("timestamp"), errors="coerce")
-        df = df[df.get("fighter", "").str.lower() == fighter]
-        if "type" in df.columns:
-            df = df[df["type"].str.lower() != "bookmark"]
-        for _, row in df.dropna(subset=["timestamp", "tag"]).iterrows():
-            _append(row["timestamp"], str(row["tag"]))
-
-    events.sort(key=lambda x: x[0])
-    return events
+    from services import timeline
 
-
-def _plot_hr(
-    ax: plt.Axes,
+    fighter = fighter.lower()
+    tl = timeline.load_timeline(session_dir)
+    hr = [s for s in tl.stream("hr") if s.get("source") == "hr_continuous.json"]
+    if not hr:
+        return []
+    start = hr[0]["t"]
+    return [
+        (item["t"] - start, str(item["tag"]))
+        for item in tl.stream("tag")
+        if str(item.get("fighter") or "").lower() == fighter
+        and str(item.get("type") or "").lower() != "bookmark"
+        and item.get("tag")
+    ]
+
+
+def _hr_panel(
     df: pd.DataFrame,
     fighter: str,
     max_hr: int,
     zones: List[Tuple[float, float, str]],
     tags: List[Tuple[float, str]] | None = None,
-) -> None:
-    for lower, upper, color in zones:
-        ax.axhspan(lower * max_hr, upper * max_hr, color=color, alpha=0.2)
+) -> HrPanel:
+    """Return the :class:`HrPanel` for one fighter's side of a summary."""
+
     if df.empty:
-        ax.text(0.5, 0.5, "No HR data", ha="center", va="center")
+        times: List[float] = []
+        bpm: List[float] = []
     else:
         if "seconds" in df.columns:
-            ax.plot(df["seconds"], df["bpm"], color="black")
-            ax.set_xlabel("Time (s)")
-        elif "timestamp" in df.columns:
-            ax.plot(df["timestamp"], df["bpm"], color="black")
-            ax.tick_params(axis="x", rotation=45)
-            ax.set_xlabel("Time")
+            times = df["seconds"].astype(float).tolist()
         else:
-            ax.plot(df.index, df["bpm"], color="black")
-            ax.set_xlabel("Time (samples)")
-    ax.set_title(fighter)
-    ax.set_ylabel("BPM")
-    ax.set_ylim(0, max_hr * 1.1)
-    if tags:
-        ymin, ymax = ax.get_ylim()
-        for time, label in tags:
-            ax.vlines(time, ymin, ymax, color="r")
-            ax.text(time, ymax, label, rotation=90, va="bottom", fontsize=8)
+            times = [float(i) for i in range(len(df))]
+        bpm = df["bpm"].astype(float).tolist()
+    return HrPanel(
+        times=times,
+        bpm=bpm,
+        max_hr=max_hr,
+        zones=zones,
+        tags=tags or (),
+        title=fighter,
+        y_max=max_hr * 1.1,
+    )
+
+
+def _render_summary(
+    out_path: Path,
+    title: str,
+    red: Tuple[pd.DataFrame, str, int, List[Tuple[float, float, str]], List[Tuple[float, str]]],
+    blue: Tuple[pd.DataFrame, str, int, List[Tuple[float, float, str]], List[Tuple[float, str]]],
+) -> None:
+    """Render the side-by-side red/blue chart for one summary image."""
+
+    panels = [_hr_panel(*red[:4], tags=red[4]), _hr_panel(*blue[:4], tags=blue[4])]
+    render_hr_panels(panels, out_path, title=title)
 
 
 def _round_boundaries(total_rounds: int, round_dur: int, rest_dur: int) -> List[Tuple[int, int]]:
@@ -247,7 +225,7 @@ def _round_boundaries(total_rounds: int, round_dur: int, rest_dur: int) -> List[
     return bounds
 
 
-def generate_round_summaries(fight_meta: Dict[str, str]) -> List[str]:
+def generate_round_summaries(fight_meta: Dict[str, str], session_dir: Path | None = None) -> List[str]:
     """Generate summary charts for each round and return file paths.
 
     Parameters
@@ -256,6 +234,10 @@ def generate_round_summaries(fight_meta: Dict[str, str]) -> List[str]:
         Dictionary containing at least ``red_fighter`` and ``blue_fighter`` as
         well as ``fight_date`` and ``round_type``.  For backward compatibility
         the legacy keys ``red`` and ``blue`` are also recognised.
+    session_dir:
+        Optional bout directory to read from and write charts to.  Defaults to
+        the ``<red>_vs_<blue>`` folder of the live bout; archived bouts are
+        reprocessed by passing their own directory.
     """
     red = fight_meta.get("red_fighter") or fight_meta.get("red") or "Red"
     blue = fight_meta.get("blue_fighter") or fight_meta.get("blue") or "Blue"
@@ -271,8 +253,12 @@ def generate_round_summaries(fight_meta: Dict[str, str]) -> List[str]:
     round_dur = int(fight_meta.get("round_duration", round_dur))
     rest_dur = int(fight_meta.get("rest_duration", 60))
 
-    bout = f"{safe_filename(red)}_vs_{safe_filename(blue)}"
-    out_dir = bout_dir(red, date, bout)
+    if session_dir is not None:
+        out_dir = Path(session_dir)
+        bout = out_dir.name
+    else:
+        bout = f"{safe_filename(red)}_vs_{safe_filename(blue)}"
+        out_dir = bout_dir(red, date, bout)
     summary_red_dir = summary_dir(red, date, bout)
     summary_blue_dir = summary_dir(blue, date, bout)
     summary_red_dir.mkdir(parents=True, exist_ok=True)
@@ -283,6 +269,13 @@ def generate_round_summaries(fight_meta: Dict[str, str]) -> List[str]:
 
     red_df = _load_continuous_hr(red_dir, "red")
     blue_df = _load_continuous_hr(blue_dir, "blue")
+    try:
+        # Precompute the downsampled levels served by ``/api/bout/<id>/hr``.
+        from utils.hr_pyramid import load_pyramid
+
+        load_pyramid(out_dir)
+    except Exception:
+        logger.exception("Failed to build HR pyramid for %s", out_dir)
 
     red_tags = _load_tag_events(red_dir, "red")
     blue_tags = _load_tag_events(blue_dir, "blue")
@@ -304,14 +297,13 @@ def generate_round_summaries(fight_meta: Dict[str, str]) -> List[str]:
         r_tags = [(t, l) for t, l in red_tags if start <= t < end]
         b_tags = [(t, l) for t, l in blue_tags if start <= t < end]
 
-        fig, axes = plt.subplots(1, 2, figsize=(12, 4))
-        _plot_hr(axes[0], r_seg, red, red_max, red_zones, tags=r_tags)
-        _plot_hr(axes[1], b_seg, blue, blue_max, blue_zones, tags=b_tags)
-        fig.suptitle(f"Round {idx} - {red} vs {blue}")
-        fig.tight_layout(rect=[0, 0.03, 1, 0.95])
         out_path = out_dir / f"round_{idx}.png"
-        fig.savefig(out_path)
-        plt.close(fig)
+        _render_summary(
+            out_path,
+            f"Round {idx} - {red} vs {blue}",
+            (r_seg, red, red_max, red_zones, r_tags),
+            (b_seg, blue, blue_max, blue_zones, b_tags),
+        )
         outputs.append(str(out_path))
         try:
             shutil.copy2(out_path, summary_red_dir / out_path.name)
@@ -319,14 +311,13 @@ def generate_round_summaries(fight_meta: Dict[str, str]) -> List[str]:
         except Exception:
             pass
 
-    fig, axes = plt.subplots(1, 2, figsize=(12, 4))
-    _plot_hr(axes[0], red_df, red, red_max, red_zones, tags=red_tags)
-    _plot_hr(axes[1], blue_df, blue, blue_max, blue_zones, tags=blue_tags)
-    fig.suptitle(f"Overall Summary - {red} vs {blue}")
-    fig.tight_layout(rect=[0, 0.03, 1, 0.95])
     overall_path = out_dir / "overall_summary.png"
-    fig.savefig(overall_path)
-    plt.close(fig)
+    _render_summary(
+        overall_path,
+        f"Overall Summary - {red} vs {blue}",
+        (red_df, red, red_max, red_zones, red_tags),
+        (blue_df, blue, blue_max, blue_zones, blue_tags),
+    )
     outputs.append(str(overall_path))
     try:
         shutil.copy2(overall_path, summary_red_dir / overall_path.name)
@@ -17,15 +17,17 @@ import time
 from datetime import datetime
 from typing import Optional
 
+import bout_context
+import fight_state
 from fight_state import fighter_session_dir, load_fight_state
 from FightControl.fight_utils import safe_filename
 from FightControl.play_sound import play_audio
 from FightControl.round_manager import round_status
 from paths import BASE_DIR
+from services import timeline
 from session_summary import build_session_summary
 from utils.obs_ws import ObsWs
 from utils_bpm import read_bpm
-from utils_checks import next_bout_number
 
 logger = logging.getLogger(__name__)
 
@@ -44,19 +46,37 @@ EVENTS_FILE = DATA_DIR / "round_events.csv"
 logging.basicConfig(level=logging.INFO)
 
 
+def _mark(stream: str, **fields) -> None:
+    """Record a round transition or recording event on the bout timeline."""
+
+    try:
+        fight, date, _ = load_fight_state()
+        timeline.mark(bout_context.current(fight, date).log_dir, stream, **fields)
+    except Exception:
+        logger.exception("failed to record %s timeline mark", stream)
+
+
 class ObsClient(ObsWs):
-    """Thin wrapper adding convenient recording helpers."""
+    """Thin wrapper adding convenient recording helpers.
+
+    Each request is also marked on the bout timeline as a ``recording``
+    segment boundary.
+    """
 
     async def start_record(self):
+        _mark("recording", event="start")
         return await self.ws_request("StartRecord")
 
     async def stop_record(self):
+        _mark("recording", event="stop")
         return await self.ws_request("StopRecord")
 
     async def pause_record(self):
+        _mark("recording", event="pause")
         return await self.ws_request("PauseRecord")
 
     async def resume_record(self):
+        _mark("recording", event="resume")
         return await self.ws_request("ResumeRecord")
 
 
@@ -189,13 +209,8 @@ def init_bout_metadata(fight: dict, data: dict) -> str:
     corner can reference the same bout information.
     """
 
-    date = fight.get("fight_date", datetime.now().strftime("%Y-%m-%d"))
-    red = fight.get("red_fighter") or fight.get("red") or "Red"
-    blue = fight.get("blue_fighter") or fight.get("blue") or "Blue"
-    bout_num = next_bout_number(date, red, blue)
-    safe_red = safe_filename(red).upper()
-    safe_blue = safe_filename(blue).upper()
-    bout_id = f"{date}_{safe_red}_vs_{safe_blue}_BOUT{bout_num}"
+    bout = bout_context.ensure(fight, fight.get("fight_date"))
+    date, red, blue, bout_id = bout.date, bout.red, bout.blue, bout.name
 
     round_type = fight.get("round_type")
     round_duration = data.get("duration")
@@ -238,14 +253,11 @@ def update_bout_metadata(updates: dict) -> None:
     """Merge ``updates`` into the active bout's metadata files."""
 
     fight, date, _ = load_fight_state()
-    red = fight.get("red_fighter") or fight.get("red") or "Red"
-    blue = fight.get("blue_fighter") or fight.get("blue") or "Blue"
-    bout_num = next_bout_number(date, red, blue) - 1
-    if bout_num <= 0:
-        bout_num = 1
-    safe_red = safe_filename(red).upper()
-    safe_blue = safe_filename(blue).upper()
-    bout_id = updates.get("bout_id") or f"{date}_{safe_red}_vs_{safe_blue}_BOUT{bout_num}"
+    bout = bout_context.current(fight, date)
+    if bout.number <= 0:
+        bout = bout_context.ensure(fight, date)
+    red, blue = bout.red, bout.blue
+    bout_id = updates.get("bout_id") or bout.name
 
     from FightControl.fighter_paths import bout_dir
 
@@ -268,7 +280,7 @@ def arm_round_status(dur, rest, total_rounds):
     path.parent.mkdir(parents=True, exist_ok=True)
     path.write_text(json.dumps(info, indent=2))
     # Ensure the current round tracker is initialised at fight start.
-    (DATA_DIR / "current_round.txt").write_text("round_1")
+    fight_state.save_round("round_1", DATA_DIR)
     try:
         from routes import api_routes
 
@@ -324,6 +336,7 @@ def start_round_timer(dur, rest, on_complete=None, fire_bell: bool = True):
             init_bout_metadata(fight, data)
         except Exception:
             logger.exception("failed to write bout metadata")
+        _mark("round", event="start", round=data.get("round", 1))
         try:  # Ensure real round_manager is loaded for subsequent imports
             import importlib
 
@@ -356,17 +369,18 @@ def start_round_timer(dur, rest, on_complete=None, fire_bell: bool = True):
                 fight_meta = {**fight, "fight_date": date}
                 generate_round_summaries(fight_meta)
 
-                red = fight_meta.get("red_fighter") or fight_meta.get("red") or "Red"
-                blue = fight_meta.get("blue_fighter") or fight_meta.get("blue") or "Blue"
-                bout_num = next_bout_number(date, red, blue) - 1
-                safe_red = safe_filename(red).upper()
-                safe_blue = safe_filename(blue).upper()
-                bout_name = f"{date}_{safe_red}_vs_{safe_blue}_BOUT{bout_num}"
+                bout = bout_context.current(fight, date)
+                bout_name = bout.name
                 from FightControl.fighter_paths import bout_dir
 
-                for fighter in (red, blue):
+                for fighter in (bout.red, bout.blue):
                     session_dir = bout_dir(fighter, date, bout_name)
-                    build_session_summary(session_dir)
+                    build_session_summary(
+                        session_dir,
+                        fighter=safe_filename(fighter),
+                        date=date,
+                        bout=bout_name,
+                    )
             except Exception:
                 logger.exception("failed to build summaries")
             refresh_obs_overlay()
@@ -397,7 +411,7 @@ def start_round_timer(dur, rest, on_complete=None, fire_bell: bool = True):
             new_round = current_round + 1
             data["round"] = new_round
             # Persist the new round identifier for other components.
-            (DATA_DIR / "current_round.txt").write_text(f"round_{new_round}")
+            fight_state.save_round(f"round_{new_round}", DATA_DIR)
             data["status"] = "ACTIVE"
             data.pop("remaining_time", None)
             try:
@@ -414,6 +428,7 @@ def start_round_timer(dur, rest, on_complete=None, fire_bell: bool = True):
                 logger.exception("OBS start recording failed")
             data["start_time"] = datetime.now().isoformat()
             path.write_text(json.dumps(data, indent=2))
+            _mark("round", event="start", round=new_round)
             refresh_obs_overlay()
             push_obs_text_sources()
             start_round_timer(dur, rest)
@@ -461,6 +476,7 @@ def start_round_timer(dur, rest, on_complete=None, fire_bell: bool = True):
             time.sleep(min(1, max(0, remaining_secs)))
 
         remaining_secs = 0
+        _mark("round", event="end", round=round_status().get("round", 1))
         push_obs_text_sources()
         try:
             asyncio.run(obs.stop_record())
@@ -1,16 +1,16 @@
 # isort: skip_file
 import asyncio
-import csv
 import importlib
 import json
 import logging
 import os
-import tempfile
+import threading
 from datetime import datetime
 from pathlib import Path
 
 from flask import (
     Blueprint,
+    Response,
     current_app,
     has_app_context,
     jsonify,
@@ -18,9 +18,12 @@ from flask import (
     request,
     send_file,
     send_from_directory,
+    stream_with_context,
 )
 
-from fighter_utils import ensure_fighter_card, load_fighters, save_fighter
+import bout_context
+import fight_state
+from fighter_utils import load_fighters, save_fighter
 from paths import BASE_DIR
 from round_timer import (
     arm_round_status,
@@ -67,8 +70,16 @@ except Exception:
     sys.modules.pop("FightControl.round_manager", None)
     from FightControl.round_manager import RoundManager, round_status
 
-from utils import ensure_dir_permissions
-from utils.files import open_utf8, read_csv_dicts
+from utils import (
+    ensure_dir_permissions,
+    fighter_bundles,
+    fighter_history,
+    fighter_store,
+    hr_pyramid,
+    performance_store,
+)
+from utils.files import read_csv_dicts
+from utils.fighters_index import update_index_entry
 
 try:
     from fight_state import fighter_session_dir, load_fight_state  # noqa: F401
@@ -77,7 +88,9 @@ except (ImportError, OSError, FileNotFoundError):  # pragma: no cover
 
 from round_state import load_round_state, save_round_state
 from round_summary import generate_round_summaries  # noqa: F401
-from utils_checks import load_tags, next_bout_number
+from services import image_variants, live_feed, tag_ingest, timeline
+from services.card_queue import card_queue
+from utils_checks import load_tags
 
 logger = logging.getLogger(__name__)
 api_routes = Blueprint("api_routes", __name__)
@@ -180,32 +193,12 @@ def api_round_state():
 # ----------------------------------------------------------------------------
 # CSV / logging helpers
 # ----------------------------------------------------------------------------
-def write_csv_row(path: Path, header: list[str], row: list[str]) -> None:
-    """Append ``row`` to ``path`` writing ``header`` when file is new."""
-    ensure_dir_permissions(path.parent)
-    new = not path.exists()
-    with open_utf8(path, "a", newline="") as f:
-        writer = csv.writer(f)
-        if new:
-            writer.writerow(header)
-        writer.writerow(row)
-
-
 def _append_performance(name: str, performance: dict) -> None:
     """Log ``performance`` for ``name`` to ``performance_results.json``."""
-    perf_path = _performance_results_json()
-    entries: list = []
-    if perf_path.exists():
-        try:
-            entries = json.loads(perf_path.read_text(encoding="utf-8"))
-        except json.JSONDecodeError as exc:
-            logger.warning("Failed to decode %s: %s; starting fresh", perf_path, exc)
-            entries = []
-    if not isinstance(entries, list):
-        entries = []
-    entries.append({"fighter_name": name, "performance": performance})
-    perf_path.parent.mkdir(parents=True, exist_ok=True)
-    perf_path.write_text(json.dumps(entries, indent=2), encoding="utf-8")
+    data_dir = _performance_results_json().parent
+    performance_store.append_result(name, performance, data_dir=data_dir)
+    if safe := safe_filename(name or ""):
+        fighter_bundles.refresh_bundle(data_dir.parent / "fighter_data" / safe)
 
 
 # ----------------------------------------------------------------------------
@@ -336,7 +329,9 @@ def enter_fighters():
         try:
             fjson = data_dir / "fighters.json"
             if fjson.exists():
-                arr = json.loads(fjson.read_text() or "[]")
+                import fighter_utils
+
+                arr = fighter_utils.registry.all(fjson)
                 for item in arr:
                     nm = (item.get("name") or item.get("fighter") or "").strip()
                     if not nm:
@@ -470,7 +465,8 @@ def enter_fighters():
             "rest_duration": rest_dur,
             "fight_date": datetime.now().strftime("%Y-%m-%d"),
         }
-        _current_fight_path().write_text(json.dumps(state, indent=2), encoding="utf-8")
+        fight_state.save_fight(state, _data_dir())
+        bout_context.arm(state)
         arm_round_status(round_dur, rest_dur, total_rounds or 1)
         try:
             init_bout_metadata(state, {"duration": round_dur, "rest": rest_dur})
@@ -536,11 +532,10 @@ def timer_cmd(cmd):
     return jsonify(status=status.get("status", "OFFLINE"))
 
 
-@api_routes.route("/api/timer", methods=["GET"])
-def get_timer_status():
+def _timer_payload() -> dict:
     data = round_status()
     if not data:
-        return jsonify(timer="00:00", status="OFFLINE")
+        return {"timer": "00:00", "status": "OFFLINE"}
     status = data.get("status", "OFFLINE")
     start = data.get("start_time")
     dur = data.get("duration", 180)
@@ -557,7 +552,97 @@ def get_timer_status():
     else:
         rem = dur
     m, s = divmod(rem, 60)
-    return jsonify(timer=f"{int(m):02d}:{int(s):02d}", status=status)
+    return {"timer": f"{int(m):02d}:{int(s):02d}", "status": status}
+
+
+@api_routes.route("/api/timer", methods=["GET"])
+def get_timer_status():
+    return jsonify(_timer_payload())
+
+
+# ----------------------------------------------------------------------------
+# Aggregated live feed (timer, round, both corners, recent tags)
+# ----------------------------------------------------------------------------
+LIVE_FEED_TAGS = int(os.getenv("LIVE_FEED_TAGS", "10"))
+_live_feed: "live_feed.LiveFeed | None" = None
+_live_feed_lock = threading.Lock()
+
+
+def _live_round() -> dict:
+    data = round_status() or {}
+    return {k: data.get(k) for k in ("round", "total_rounds", "status", "duration", "rest", "start_time")}
+
+
+def _live_corner(color: str) -> dict:
+    from utils_bpm import read_bpm
+
+    data = read_bpm(color)
+    fight = fight_state.snapshot().fight
+    return {
+        "name": fight.get(f"{color}_fighter") or fight.get(color) or color.title(),
+        "bpm": data.get("bpm"),
+        "zone": data.get("zone"),
+        "effort_percent": data.get("effort_percent"),
+        "max_hr": data.get("max_hr"),
+        "status": data.get("status"),
+    }
+
+
+def _live_tags() -> list[dict]:
+    snap = fight_state.snapshot()
+    log_dir = bout_context.current(dict(snap.fight), snap.date, api_routes.BASE_DIR).log_dir
+    if not (log_dir / tag_ingest.LOG_NAME).exists():
+        return []
+    keys = ("timestamp", "round", "fighter", "tag", "type")
+    return [{k: e.get(k) for k in keys} for e in tag_ingest.open_log(log_dir).recent(LIVE_FEED_TAGS)]
+
+
+def _feed() -> live_feed.LiveFeed:
+    global _live_feed
+    if _live_feed is None:
+        with _live_feed_lock:
+            if _live_feed is None:
+                _live_feed = live_feed.LiveFeed(
+                    {
+                        "timer": _timer_payload,
+                        "round": _live_round,
+                        "red": lambda: _live_corner("red"),
+                        "blue": lambda: _live_corner("blue"),
+                        "tags": _live_tags,
+                    }
+                )
+    return _live_feed
+
+
+@api_routes.route("/api/live/feed")
+def api_live_feed():
+    """Stream the live state as Server-Sent Events (snapshot, then deltas).
+
+    Reconnecting clients resume from ``Last-Event-ID`` (or ``?since=``).
+    """
+    last_id = request.headers.get("Last-Event-ID") or request.args.get("since")
+    return Response(
+        stream_with_context(_feed().stream(last_id)),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@api_routes.route("/api/live/state")
+def api_live_state():
+    """Return the live state, or only the deltas after ``?since=<id>``.
+
+    ``id`` in the response is the value to pass as ``since`` next time.
+    """
+    feed = _feed()
+    feed.fresh()
+    since = feed.parse_id(request.args.get("since"))
+    deltas = feed.since(since) if since is not None else None
+    if deltas is not None:
+        seq = deltas[-1][0] if deltas else since
+        return jsonify(id=feed.event_id(seq), seq=seq, deltas=[d for _, d in deltas])
+    seq, state = feed.snapshot()
+    return jsonify(id=feed.event_id(seq), seq=seq, state=state)
 
 
 # ----------------------------------------------------------------------------
@@ -652,7 +737,8 @@ def _validate_metrics(payload):
 @api_routes.route("/api/fighters")
 def get_fighters():
     """Return a JSON array of full fighter dictionaries with metadata."""
-    fighters = [ensure_fighter_card(f) for f in load_fighters()]
+    # Cards render in the background; only cached status is read here.
+    fighters = [image_variants.annotate(card_queue.annotate(f)) for f in load_fighters()]
     return jsonify(fighters), 200
 
 
@@ -692,7 +778,11 @@ def upload_fighter_photo():
     except Exception as exc:  # pragma: no cover - save failures are rare
         return jsonify(status="error", error=str(exc)), 500
 
-    return jsonify({"url": f"/static/uploads/{filename}"})
+    payload = {"url": f"/static/uploads/{filename}"}
+    variants = image_variants.generate_variants(dest, static_dir=upload_dir.parent)
+    if variants is not None:
+        payload.update(srcset=variants["srcset"], thumb_url=variants["src"])
+    return jsonify(payload)
 
 
 @api_routes.route("/api/create_fighter_card", methods=["POST"])
@@ -711,7 +801,10 @@ def create_fighter_card_api():
     if size > MAX_PHOTO_SIZE:
         return jsonify(status="error", error="file too large"), 400
 
-    create_fighter_card(photo)
+    card = create_fighter_card(photo)
+    variants = image_variants.lookup(card, static_dir=Path(api_routes.BASE_DIR) / "FightControl" / "static")
+    if variants is not None:
+        return jsonify(status="ok", srcset=variants["srcset"], thumb_url=variants["src"]), 200
     return jsonify(status="ok"), 200
 
 
@@ -754,6 +847,8 @@ def create_fighter():
         saved = save_fighter(data)
     except Exception as exc:
         return jsonify(status="error", error=str(exc)), 500
+    if saved.get("photo_local"):
+        card_queue.enqueue(saved)
 
     if performance is not None:
         try:
@@ -821,13 +916,15 @@ def update_fighter(fighter_name):
             400,
         )
     fighters[idx] = candidate
+    photo_changed = candidate.get("photo_local") != current.get("photo_local")
 
     paths_mod = importlib.import_module("paths")
     importlib.reload(paths_mod)
     fighters_path = Path(paths_mod.BASE_DIR) / "FightControl" / "data" / "fighters.json"
     try:
-        fighters_path.parent.mkdir(parents=True, exist_ok=True)
-        fighters_path.write_text(json.dumps(fighters, indent=2), encoding="utf-8")
+        import fighter_utils
+
+        fighter_utils.registry.update(idx, candidate, fighters_path)
     except Exception as exc:
         return jsonify(status="error", error=str(exc)), 500
 
@@ -836,6 +933,9 @@ def update_fighter(fighter_name):
             performance = json.loads(performance)
         except json.JSONDecodeError:
             return jsonify(status="error", error="Invalid performance data"), 400
+    if photo_changed and candidate.get("photo_local"):
+        card_queue.enqueue(candidate, force=True)
+
     if performance is not None:
         try:
             _append_performance(fighter_name, performance)
@@ -862,6 +962,7 @@ def update_fighter_by_id(fighter_id):
     if idx is None:
         return jsonify(status="error", error="fighter not found"), 404
 
+    photo_changed = "photo_local" in data and data["photo_local"] != fighters[idx].get("photo_local")
     fighter = fighters[idx].copy()
     fighter.update(data)
     fighters[idx] = fighter
@@ -870,10 +971,10 @@ def update_fighter_by_id(fighter_id):
     importlib.reload(paths_mod)
     fighters_path = Path(paths_mod.BASE_DIR) / "FightControl" / "data" / "fighters.json"
     try:
-        fighters_path.parent.mkdir(parents=True, exist_ok=True)
-        cleaned = [{k: v for k, v in f.items() if k != "id"} for f in fighters]
-        fighters_path.write_text(json.dumps(cleaned, indent=2), encoding="utf-8")
-    except Exception as exc:  # pragma: no cover - filesystem failures are rare
+        import fighter_utils
+
+        fighter_utils.registry.update(idx, fighter, fighters_path)
+    except Exception as exc:  # pragma: no cover - storage failures are rare
         return jsonify(status="error", error=str(exc)), 500
 
     profile_dir = (
@@ -886,19 +987,49 @@ def update_fighter_by_id(fighter_id):
     profile_path = profile_dir / "profile.json"
     profile_data = {k: v for k, v in fighter.items() if k != "id"}
     try:
-        with tempfile.NamedTemporaryFile(
-            "w", dir=profile_dir, delete=False, encoding="utf-8"
-        ) as tmp:
-            json.dump(profile_data, tmp, indent=2)
-            tmp.flush()
-            os.fsync(tmp.fileno())
-        os.replace(tmp.name, profile_path)
+        fighter_store.write_view(profile_path, profile_data)
     except Exception as exc:  # pragma: no cover - filesystem failures are rare
         return jsonify(status="error", error=str(exc)), 500
+    try:
+        update_index_entry(profile_dir.name, profile_dir.parent, fighters_path)
+    except OSError:
+        logger.warning("Could not update fighters index for %s", profile_dir.name)
+    fighter_bundles.refresh_bundle(profile_dir)
+
+    if photo_changed and fighter.get("photo_local"):
+        card_queue.enqueue(fighter, force=True)
 
     return jsonify(status="success", fighter=fighter), 200
 
 
+@api_routes.route("/api/fighters/<fighter>/history")
+def fighter_history_trends(fighter: str):
+    """Return cross-bout trends for ``fighter`` from the history index.
+
+    ``metric`` selects ``peak_hr`` (default, honours ``limit``), ``recovery``
+    (honours ``last_n``) or ``zones`` (honours ``start``/``end`` dates).
+    """
+    safe_name = safe_filename(fighter)
+    metric = request.args.get("metric", "peak_hr")
+    try:
+        if metric == "peak_hr":
+            limit = request.args.get("limit", type=int)
+            data = fighter_history.peak_hr_trend(safe_name, limit=limit)
+        elif metric == "recovery":
+            last_n = request.args.get("last_n", default=5, type=int)
+            data = fighter_history.recovery_by_round(safe_name, last_n=last_n)
+        elif metric == "zones":
+            data = fighter_history.zone_distribution(
+                safe_name, start=request.args.get("start"), end=request.args.get("end")
+            )
+        else:
+            return jsonify(error="unknown metric"), 400
+    except Exception:
+        logger.exception("fighter history query failed")
+        return jsonify(error="history unavailable"), 500
+    return jsonify(fighter=safe_name, metric=metric, data=data)
+
+
 # ----------------------------------------------------------------------------
 # Bout helpers + resources
 # ----------------------------------------------------------------------------
@@ -943,6 +1074,7 @@ def bout_events(bout_id: str):
     except ValueError:
         return jsonify(error="invalid bout id"), 400
 
+    tag_ingest.flush()
     path = session_dir / "events.csv"
     if not path.exists():
         return jsonify(error="events not found"), 404
@@ -957,21 +1089,71 @@ def bout_events(bout_id: str):
     return send_file(path, mimetype="text/csv")
 
 
+@api_routes.route("/api/bout/<path:bout_id>/timeline")
+def bout_timeline(bout_id: str):
+    """Return the bout's streams on one bout clock.
+
+    ``?round=3&start=1:30&end=1:45`` limits the result to a window of a round;
+    ``?from=90&to=105`` uses absolute bout seconds.  ``?streams=hr,tag``
+    selects streams.
+    """
+    try:
+        session_dir = _bout_path(bout_id)
+    except ValueError:
+        return jsonify(error="invalid bout id"), 400
+    if not session_dir.exists():
+        return jsonify(error="bout not found"), 404
+
+    args = request.args
+    streams = [s for s in (args.get("streams") or "").split(",") if s] or None
+    tl = timeline.load_timeline(session_dir)
+    try:
+        if args.get("round"):
+            items = tl.in_round(int(args["round"]), args.get("start", 0), args.get("end"), streams)
+        elif args.get("from") or args.get("to"):
+            items = tl.between(
+                timeline.parse_clock(args.get("from", 0)),
+                timeline.parse_clock(args["to"]) if args.get("to") else float("inf"),
+                streams,
+            )
+        else:
+            items = None if streams is None else tl.between(float("-inf"), float("inf"), streams)
+    except ValueError as exc:
+        return jsonify(error=str(exc)), 400
+    return jsonify(tl.to_dict(items))
+
+
 @api_routes.route("/api/bout/<path:bout_id>/hr")
 def bout_hr(bout_id: str):
-    """Return ``hr_continuous.json`` for ``bout_id``."""
+    """Return heart rate samples for ``bout_id``.
+
+    Without query parameters the raw ``hr_continuous.json`` array is returned.
+    ``?resolution=1s|5s|30s`` serves a precomputed min/max/mean level and
+    ``?max_points=N`` picks the finest level that fits within ``N`` points.
+    """
     try:
         session_dir = _bout_path(bout_id)
     except ValueError:
         return jsonify(error="invalid bout id"), 400
 
-    path = session_dir / "hr_continuous.json"
-    if not path.exists():
+    resolution = request.args.get("resolution")
+    max_points = request.args.get("max_points")
+    try:
+        max_points = int(max_points) if max_points else None
+        if max_points is not None and max_points < 1:
+            raise ValueError("max_points must be positive")
+        if resolution is not None:
+            hr_pyramid.parse_resolution(resolution)
+    except ValueError as exc:
+        return jsonify(error=str(exc)), 400
+
+    if not (session_dir / hr_pyramid.SOURCE_FILE).exists():
         return jsonify(error="hr data not found"), 404
     try:
-        return jsonify(json.loads(path.read_text(encoding="utf-8")))
+        series = hr_pyramid.select_series(session_dir, resolution=resolution, max_points=max_points)
     except Exception:
         return jsonify(error="invalid hr data"), 500
+    return jsonify(series)
 
 
 @api_routes.route("/api/bout/meta", methods=["POST"])
@@ -1090,27 +1272,19 @@ def api_tags():
     blue = fight.get("blue_fighter") or fight.get("blue") or "Blue"
     red_name = red.upper()
     blue_name = blue.upper()
-    bout_num = next_bout_number(date, red, blue) - 1
-    safe_red = safe_filename(red).upper()
-    safe_blue = safe_filename(blue).upper()
-    bout_name = f"{date}_{safe_red}_vs_{safe_blue}_BOUT{bout_num}"
-    base = Path(api_routes.BASE_DIR)
-    session_dir = base / "FightControl" / "logs" / date / bout_name
+    session_dir = bout_context.current(fight, date, api_routes.BASE_DIR).log_dir
 
     tags: list[dict] = []
-    seen: set[tuple[str, str]] = set()
 
     try:
-        for t in load_tags(session_dir, round_id):
-            if not t:
-                continue
-            parts = t.split(" ", 1)
-            prefix = parts[0]
-            label = parts[1] if len(parts) > 1 else ""
-            key = (prefix.upper(), label)
-            if key in seen:
-                continue
-            seen.add(key)
+        if (session_dir / tag_ingest.LOG_NAME).exists():
+            pairs = tag_ingest.open_log(session_dir).unique(round_id)
+        else:
+            index = tag_ingest.TagIndex()
+            for t in load_tags(session_dir, round_id):
+                index.add(round_id, "", "tag", t)
+            pairs = index.unique()
+        for prefix, label in pairs:
             prefix_upper = prefix.upper()
             if prefix_upper in (red_name, "RED"):
                 clr = "red"
@@ -1128,6 +1302,38 @@ def api_tags():
     return jsonify(tags=tags)
 
 
+def _tag_log_entry(event: dict) -> dict:
+    entry = {"timestamp": event["timestamp"], "fighter": event["fighter"], "tag": event["tag"]}
+    if event.get("type"):
+        entry["type"] = event["type"]
+    if event.get("meta"):
+        entry["meta"] = event["meta"]
+    return entry
+
+
+def _fighter_tag_views(fighter_dirs) -> list:
+    """Return the legacy ``fighter_data`` views for a bout's tag log."""
+
+    views: list = []
+    for dest in fighter_dirs:
+        views += [
+            tag_ingest.CsvView(
+                f"{dest}:events.csv",
+                lambda e, dest=dest: dest / "events.csv",
+                ["timestamp", "round", "fighter", "type", "tag", "meta"],
+                lambda e: [e["timestamp"], e["round"], e["fighter"], e["type"], e["tag"], e["meta"]],
+            ),
+            tag_ingest.CsvView(
+                f"{dest}:tags.csv",
+                lambda e, dest=dest: dest / safe_filename(e.get("safe_round") or e["round"]) / "tags.csv",
+                ["timestamp", "fighter", "tag"],
+                lambda e: [e["timestamp"], e["fighter"], e["tag"]],
+            ),
+            tag_ingest.JsonListView(f"{dest}:tag_log.json", dest / "tag_log.json", _tag_log_entry),
+        ]
+    return views
+
+
 def _log_tag_event(
     date: str,
     bout_name: str,
@@ -1137,11 +1343,13 @@ def _log_tag_event(
     etype: str,
     meta: str,
 ) -> str:
-    """Log a tag event to fighter-specific data directories.
+    """Log a tag event to the bout's tag log.
 
-    The event is written to both fighters' ``fighter_data`` folders. The
-    function returns the timestamp used so callers may reference it in other
-    logs or responses.
+    The event is appended once to ``logs/<date>/<bout>/tag_events.jsonl``;
+    the ``events.csv``, ``tags.csv`` and ``tag_log.json`` files in both
+    fighters' ``fighter_data`` folders are derived from it in the background
+    (see :mod:`services.tag_ingest`). The function returns the timestamp used
+    so callers may reference it in other logs or responses.
     """
     # Sanitize all path components to ensure valid filesystem paths
     safe_date = safe_filename(date)
@@ -1158,33 +1366,28 @@ def _log_tag_event(
         red_name, blue_name = "Red", "Blue"
 
     ts = timestamp_now()
-    entry = {"timestamp": ts, "fighter": fighter, "tag": tag}
-    if etype:
-        entry["type"] = etype
-    if meta:
-        entry["meta"] = meta
-
-    base = Path(api_routes.BASE_DIR) / "FightControl" / "fighter_data"
-    fighters = [red_name, blue_name]
-    for name in fighters:
-        safe_name = safe_filename(name)
-        dest = base / safe_name / safe_date / safe_bout
-        round_dir = dest / safe_round
-        ensure_dir_permissions(dest)
-        ensure_dir_permissions(round_dir)
-
-        write_csv_row(
-            dest / "events.csv",
-            ["timestamp", "round", "fighter", "type", "tag", "meta"],
-            [ts, round_id, fighter, etype, tag, meta],
-        )
-        write_csv_row(
-            round_dir / "tags.csv",
-            ["timestamp", "fighter", "tag"],
-            [ts, fighter, tag],
-        )
-        _log_event(dest / "tag_log.json", entry)
-
+    base = Path(api_routes.BASE_DIR) / "FightControl"
+    fighter_dirs = tuple(
+        base / "fighter_data" / safe_filename(name) / safe_date / safe_bout for name in (red_name, blue_name)
+    )
+    producer = f"fighter_data:{red_name}:{blue_name}"
+    bout_log = tag_ingest.open_log(
+        base / "logs" / safe_date / safe_bout,
+        lambda: _fighter_tag_views(fighter_dirs),
+        producer=producer,
+    )
+    bout_log.append(
+        {
+            "timestamp": ts,
+            "round": round_id,
+            "safe_round": safe_round,
+            "fighter": fighter,
+            "tag": tag,
+            "type": etype,
+            "meta": meta,
+        },
+        producer,
+    )
     return ts
 
 
@@ -1199,12 +1402,7 @@ def api_log_tag():
 
     try:
         fight, date, round_id = load_fight_state()
-        red = fight.get("red_fighter") or fight.get("red") or "Red"
-        blue = fight.get("blue_fighter") or fight.get("blue") or "Blue"
-        bout_num = next_bout_number(date, red, blue) - 1
-        safe_red = safe_filename(red).upper()
-        safe_blue = safe_filename(blue).upper()
-        bout_name = f"{date}_{safe_red}_vs_{safe_blue}_BOUT{bout_num}"
+        bout_name = bout_context.current(fight, date, api_routes.BASE_DIR).name
 
         etype = data.get("type", "coach_note")
         meta = data.get("meta", "")
@@ -1227,21 +1425,6 @@ def api_log_tag():
         return jsonify(status="error", error=str(exc)), 500
 
 
-def _log_event(path: Path, entry: dict) -> None:
-    """Append ``entry`` to the JSON log at ``path``."""
-    ensure_dir_permissions(path.parent)
-    try:
-        data = json.loads(path.read_text(encoding="utf-8"))
-        if not isinstance(data, list):
-            data = []
-    except FileNotFoundError:
-        data = []
-    except Exception:
-        data = []
-    data.append(entry)
-    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
-
-
 @api_routes.route("/api/trigger-tag", methods=["POST"])
 def api_trigger_tag():
     # Ensure zone_model files include fighter_id (required by tests)
@@ -1313,12 +1496,7 @@ def api_trigger_tag():
 
     try:
         fight, date, round_id = load_fight_state()
-        red = fight.get("red_fighter") or fight.get("red") or "Red"
-        blue = fight.get("blue_fighter") or fight.get("blue") or "Blue"
-        bout_num = next_bout_number(date, red, blue) - 1
-        safe_red = safe_filename(red).upper()
-        safe_blue = safe_filename(blue).upper()
-        bout_name = f"{date}_{safe_red}_vs_{safe_blue}_BOUT{bout_num}"
+        bout_name = bout_context.current(fight, date, api_routes.BASE_DIR).name
 
         _log_tag_event(date, bout_name, round_id, fighter, tag, "tag", "")
         return jsonify(status="ok")
@@ -25,8 +25,9 @@ except ImportError:  # pragma: no cover - Flask is optional for tests
     render_template = None  # type: ignore
 
 from FightControl.fight_utils import safe_filename
+from utils import fighter_bundles, performance_store
 from utils.csv_parser import parse_row
-from utils.fighters_index import _atomic_json_dump, rebuild_index
+from utils.fighters_index import rebuild_index
 
 __all__ = ["rebuild_index"]
 
@@ -195,34 +196,34 @@ def _extract_fighter() -> dict:
 
 
 def _append_fighter(fighter: dict) -> None:
-    """Append ``fighter`` to ``fighters.json``."""
+    """Append ``fighter`` to the fighters store."""
 
-    path = _fighters_json_path()
-    fighters = []
-    if path.exists():
-        try:
-            fighters = json.loads(path.read_text())
-        except json.JSONDecodeError:
-            fighters = []
-    fighters.append(fighter)
-    _atomic_json_dump(fighters, path)
+    import fighter_utils
+
+    fighter_utils.registry.append(fighter, _fighters_json_path())
 
 
 def _append_performance(name: str, performance: dict) -> None:
     """Log ``performance`` for ``name`` to ``performance_results.json``."""
-    # Build the performance log path relative to the fighters JSON file
-    perf_path = _fighters_json_path().with_name("performance_results.json")
-    perf_path.parent.mkdir(parents=True, exist_ok=True)
-    entries = []
-    if perf_path.exists():
-        try:
-            entries = json.loads(perf_path.read_text())
-        except json.JSONDecodeError:
-            entries = []
-    if not isinstance(entries, list):
-        entries = []
-    entries.append({"fighter_name": name, "performance": performance})
-    perf_path.write_text(json.dumps(entries, indent=2))
+    # The results live next to the fighters JSON file
+    performance_store.append_result(name, performance, data_dir=_fighters_json_path().parent)
+    if safe := safe_filename(name):
+        fighter_bundles.refresh_bundle(_fighter_dir(safe))
+
+
+def _fighter_dir(safe_name: str) -> Path:
+    return _fighters_json_path().parent.parent / "fighter_data" / safe_filename(safe_name)
+
+
+def _load_bundle(safe_name: str) -> dict:
+    """Return the precomputed view bundle for ``safe_name``.
+
+    Raises :class:`FileNotFoundError` when the fighter has no profile.
+    """
+
+    if not safe_filename(safe_name):
+        raise FileNotFoundError(safe_name)
+    return fighter_bundles.load_bundle(_fighter_dir(safe_name))
 
 
 def _load_fighter_detail(safe_name: str) -> tuple[dict, dict, str | None]:
@@ -232,44 +233,60 @@ def _load_fighter_detail(safe_name: str) -> tuple[dict, dict, str | None]:
     ``profile.json`` files result in :class:`FileNotFoundError`.
     """
 
-    safe = safe_filename(safe_name)
-    fighter_dir = _fighters_json_path().parent.parent / "fighter_data" / safe
+    bundle = _load_bundle(safe_name)
+    return bundle["profile"], bundle["charts"], bundle["card_url"]
 
-    profile_path = fighter_dir / "profile.json"
-    if not profile_path.exists():
-        raise FileNotFoundError
-    profile = json.loads(profile_path.read_text(encoding="utf-8"))
 
-    charts: dict = {}
-    charts_path = fighter_dir / "charts.json"
-    if charts_path.exists():
-        try:
-            charts = json.loads(charts_path.read_text(encoding="utf-8"))
-        except json.JSONDecodeError:
-            charts = {}
+def _not_modified(etag: str):
+    """Return a ``304`` response when the client already holds ``etag``."""
 
-    card_url: str | None = None
-    card_path = fighter_dir / "card_full.png"
-    if card_path.exists():
-        card_url = f"/fighter_data/{safe}/card_full.png"
+    from flask import make_response, request
 
-    return profile, charts, card_url
+    if etag in request.if_none_match:
+        resp = make_response("", 304)
+        resp.set_etag(etag)
+        return resp
+    return None
 
 
 def _render_fighter_page(safe_name: str):
     if render_template is None or abort is None:  # pragma: no cover - safety
         raise RuntimeError("Flask is required for rendering fighter pages")
+    from flask import make_response
+
     try:
-        profile, charts, card_url = _load_fighter_detail(safe_name)
+        bundle = _load_bundle(safe_name)
     except FileNotFoundError:
         return abort(404)
-    return render_template(
-        "touchportal/fighter_detail.html",
-        profile=profile,
-        charts=charts,
-        card_url=card_url,
-        safe_name=safe_name,
+    # The HTML differs from the JSON bundle, so give it a distinct validator.
+    etag = f"{bundle['etag']}-html"
+    if (resp := _not_modified(etag)) is not None:
+        return resp
+    resp = make_response(
+        render_template(
+            "touchportal/fighter_detail.html",
+            profile=bundle["profile"],
+            charts=bundle["charts"],
+            card_url=bundle["card_url"],
+            safe_name=safe_name,
+        )
     )
+    resp.set_etag(etag)
+    return resp
+
+
+def _serve_bundle(safe_name: str):
+    from flask import jsonify
+
+    try:
+        bundle = _load_bundle(safe_name)
+    except FileNotFoundError:
+        return jsonify(status="error", error="Fighter not found"), 404
+    if (resp := _not_modified(bundle["etag"])) is not None:
+        return resp
+    resp = jsonify({k: v for k, v in bundle.items() if k != "sources"})
+    resp.set_etag(bundle["etag"])
+    return resp
 
 
 # Blueprint registration ----------------------------------------------------
@@ -297,6 +314,12 @@ if Blueprint is not None:
 
         return _render_fighter_page(safe_name)
 
+    @fighters_bp.route("/api/fighters/<safe_name>/bundle")
+    def fighter_bundle_bp(safe_name: str):
+        """Return the precomputed view bundle for ``safe_name`` as JSON."""
+
+        return _serve_bundle(safe_name)
+
 else:  # pragma: no cover - Flask not installed
     fighters_bp = None
 
@@ -1,6 +1,10 @@
 """Health check blueprint.
 
-Provides a lightweight ``/api/health`` endpoint for status probes.
+Provides a lightweight ``/api/health`` endpoint for status probes.  The checks
+run on a :class:`~services.health_sampler.HealthSampler` so that, once
+:func:`start_sampler` has been called, requests only read the latest results;
+``/api/health/history`` returns the recent samples.  ``/api/status-report``
+reads the same sampler through :func:`status_checks`.
 """
 
 import json
@@ -13,11 +17,86 @@ except ImportError:  # pragma: no cover - Flask optional
 import psutil
 
 from paths import BASE_DIR
+from services.health_sampler import HealthSampler, Probe
 from utils import check_media_mtx, is_process_running, obs_health
 
 health_bp = Blueprint("health", __name__) if Blueprint is not None else None
 
 
+def _obs() -> bool:
+    return bool(obs_health.healthy(timeout=0.05))
+
+
+def _mtx() -> bool:
+    return bool(check_media_mtx(timeout=0.05))
+
+
+def _hr_daemon() -> bool:
+    if is_process_running("heartrate_mon.daemon"):
+        return True
+    overlay_dir = BASE_DIR / "FightControl" / "data" / "overlay"
+    now = time.time()
+    for name in ("red_bpm.json", "blue_bpm.json"):
+        try:
+            entry = json.loads((overlay_dir / name).read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            continue
+        stamp = entry.get("time")
+        if isinstance(stamp, (int, float)) and now - stamp < 10:
+            return True
+    return False
+
+
+def _system() -> dict:
+    usage = psutil.disk_usage("/")
+    return {
+        "disk_free_gb": round(usage.free / (1024**3), 2),
+        "cpu_percent": psutil.cpu_percent(interval=None),
+        "mem_percent": psutil.virtual_memory().percent,
+    }
+
+
+_sampler = HealthSampler(
+    [
+        Probe("obs_connected", _obs),
+        Probe("mediamtx_running", _mtx),
+        Probe("hr_daemon", _hr_daemon),
+        Probe("system", _system, interval=5.0, default={}),
+    ]
+)
+
+
+def sampler() -> HealthSampler:
+    """Return the health sampler shared by the health endpoints."""
+
+    return _sampler
+
+
+def start_sampler() -> HealthSampler:
+    """Start sampling in the background (idempotent)."""
+
+    return _sampler.start()
+
+
+def _latest() -> dict:
+    return _sampler.latest() if _sampler.running else _sampler.sample_now()
+
+
+def status_checks() -> dict:
+    """Return the ``obs``/``mtx``/``hr_daemon`` flags of ``/api/status-report``."""
+
+    latest = _latest()
+    return {"obs": latest["obs_connected"], "mtx": latest["mediamtx_running"], "hr_daemon": latest["hr_daemon"]}
+
+
+def health_data() -> dict:
+    """Return the ``/api/health`` payload, sampling now if not running."""
+
+    latest = _latest()
+    system = latest.pop("system") or {"disk_free_gb": None, "cpu_percent": None, "mem_percent": None}
+    return {**latest, **system}
+
+
 if health_bp is not None:
 
     @health_bp.route("/", strict_slashes=False)
@@ -26,31 +105,12 @@ if health_bp is not None:
 
         from flask import jsonify
 
-        try:
-            obs_ok = obs_health.healthy(timeout=0.05)
-        except Exception:
-            obs_ok = False
-        mtx_ok = check_media_mtx(timeout=0.05)
-        hr_running = is_process_running("heartrate_mon.daemon")
-        if not hr_running:
-            overlay_dir = BASE_DIR / "FightControl" / "data" / "overlay"
-            now = time.time()
-            for name in ("red_bpm.json", "blue_bpm.json"):
-                try:
-                    entry = json.loads((overlay_dir / name).read_text())
-                except (FileNotFoundError, json.JSONDecodeError):
-                    continue
-                stamp = entry.get("time")
-                if isinstance(stamp, (int, float)) and now - stamp < 10:
-                    hr_running = True
-                    break
-        usage = psutil.disk_usage("/")
-        data = {
-            "obs_connected": obs_ok,
-            "mediamtx_running": mtx_ok,
-            "hr_daemon": hr_running,
-            "disk_free_gb": round(usage.free / (1024**3), 2),
-            "cpu_percent": psutil.cpu_percent(interval=None),
-            "mem_percent": psutil.virtual_memory().percent,
-        }
-        return jsonify(data)
+        return jsonify(health_data())
+
+    @health_bp.route("/history")
+    def api_health_history():
+        """Return recent probe samples, optionally for one ``probe``."""
+
+        from flask import jsonify, request
+
+        return jsonify(_sampler.history(request.args.get("probe")))
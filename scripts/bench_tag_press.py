@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Benchmark coach tag logging under bursty controller input.
+
+Posts bursts of button presses to ``/api/tags/log`` (``FightControl.routes.tags.tag_press``)
+through a Flask test client while the round is live, then reports request
+throughput and the :class:`utils.csv_writer.DebouncedCsvWriter` commit
+statistics for several writer configurations.  Everything is written below a
+temporary directory.
+
+Example::
+
+    python scripts/bench_tag_press.py --bursts 50 --burst-size 40 --gap 0.02
+"""
+from __future__ import annotations
+
+import argparse
+import functools
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+CONFIGS = {
+    "per-row": {"max_batch": 1},
+    "group": {},
+    "group+fsync": {"fsync": "batch"},
+}
+
+
+def run(name: str, workdir: Path, bursts: int, burst_size: int, gap: float) -> dict:
+    from flask import Flask
+
+    from FightControl.common.states import RoundState
+    from FightControl.routes import tags
+    from utils.csv_writer import DebouncedCsvWriter
+
+    status_path = workdir / f"{name}_status.json"
+    status_path.write_text(json.dumps({"status": RoundState.LIVE.value}))
+    log_path = workdir / f"{name}.csv"
+    tags.DebouncedCsvWriter = functools.partial(DebouncedCsvWriter, **CONFIGS[name])
+    manager = tags.TagLogManager(path_fn=lambda: log_path, status_path=status_path, poll_interval=0.01)
+    try:
+        deadline = time.monotonic() + 2
+        while manager.writer is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        tags.tag_log_manager = manager
+        app = Flask(__name__)
+        app.register_blueprint(tags.tags_bp)
+        client = app.test_client()
+
+        start = time.perf_counter()
+        for _ in range(bursts):
+            for i in range(burst_size):
+                client.post("/api/tags/log", json={"button_id": f"b{i}", "state": "press", "fighter": "red"})
+            time.sleep(gap)
+        elapsed = time.perf_counter() - start - bursts * gap
+        writer = manager.writer
+        manager.shutdown()
+    finally:
+        tags.DebouncedCsvWriter = DebouncedCsvWriter
+    stats = writer.stats()
+    stats["requests_per_s"] = bursts * burst_size / elapsed if elapsed > 0 else float("inf")
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bursts", type=int, default=30, help="Number of bursts to send.")
+    parser.add_argument("--burst-size", type=int, default=40, help="Presses per burst.")
+    parser.add_argument("--gap", type=float, default=0.05, help="Idle seconds between bursts.")
+    parser.add_argument("--config", choices=sorted(CONFIGS), action="append", help="Limit to these writer configs.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.setdefault("BASE_DIR", tmp)
+        print(
+            f"{'config':<12} {'req/s':>9} {'rows':>6} {'flushes':>8} "
+            f"{'rows/flush':>11} {'commit ms':>10} {'latency ms':>11}"
+        )
+        for name in args.config or CONFIGS:
+            s = run(name, Path(tmp), args.bursts, args.burst_size, args.gap)
+            print(
+                f"{name:<12} {s['requests_per_s']:>9.0f} {s['rows']:>6} {s['flushes']:>8} "
+                f"{s['rows_per_flush']:>11.1f} {s['commit_ms_mean']:>10.3f} {s['latency_ms_mean']:>11.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
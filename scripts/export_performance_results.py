@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""Export performance results in the legacy ``performance_results.json`` shape.
+
+Results are stored in ``FightControl/data/performance.db``; this CLI writes
+every entry as a ``[{"fighter_name": ..., "performance": ...}]`` list for
+tools that still read the old JSON file.  The default output regenerates
+``performance_results.json`` in place.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--base-dir",
+        type=Path,
+        default=None,
+        help="Override the Cyclone base directory.",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        default=None,
+        help="Write to this file instead of performance_results.json.",
+    )
+    args = parser.parse_args()
+    if args.base_dir is not None:
+        os.environ["BASE_DIR"] = str(args.base_dir)
+
+    import paths
+    from utils import performance_store
+
+    paths.refresh_paths()
+    out = performance_store.export_legacy_json(args.output)
+    print(f"Wrote performance results to {out}")
+
+
+if __name__ == "__main__":
+    main()
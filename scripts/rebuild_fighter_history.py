@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""Backfill the fighter history index from existing session summaries.
+
+New bouts are recorded automatically when their session summary is built;
+this CLI is only needed once for data captured before the index existed or
+after the database file has been deleted.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--base-dir",
+        type=Path,
+        default=None,
+        help="Override the Cyclone base directory.",
+    )
+    args = parser.parse_args()
+    if args.base_dir is not None:
+        os.environ["BASE_DIR"] = str(args.base_dir)
+
+    import paths
+    from utils import fighter_history
+
+    paths.refresh_paths()
+    count = fighter_history.rebuild_history()
+    print(f"Recorded {count} bouts in {fighter_history.db_path()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,8 @@
 This CLI is a thin wrapper around ``utils.fighters_index.rebuild_index``.
 It accepts an optional ``--base-dir`` argument pointing to the root of a
 Cyclone installation. When omitted, :mod:`paths` is used to determine the
-base directory.
+base directory.  Only profiles changed since the previous run are re-parsed;
+pass ``--full`` to ignore the manifest and rebuild from scratch.
 """
 from __future__ import annotations
 
@@ -24,7 +25,7 @@ FIGHTER_DATA_DIR = paths.BASE_DIR / "FightControl" / "fighter_data"
 OUTPUT_PATH = paths.BASE_DIR / "FightControl" / "data" / "fighters.json"
 
 
-def rebuild_index(base_dir: Path | None = None) -> Path:
+def rebuild_index(base_dir: Path | None = None, full: bool = False) -> Path:
     """Rebuild the fighters index for ``base_dir``.
 
     The optional ``base_dir`` argument is primarily a convenience for the
@@ -38,7 +39,7 @@ def rebuild_index(base_dir: Path | None = None) -> Path:
     else:
         fighter_dir = FIGHTER_DATA_DIR
         output_path = OUTPUT_PATH
-    _rebuild_index(fighter_dir, output_path)
+    _rebuild_index(fighter_dir, output_path, full=full)
     return output_path
 
 
@@ -50,8 +51,13 @@ def main() -> None:
         default=None,
         help="Override the Cyclone base directory.",
     )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Re-parse every profile instead of only changed ones.",
+    )
     args = parser.parse_args()
-    output_path = rebuild_index(args.base_dir)
+    output_path = rebuild_index(args.base_dir, full=args.full)
     print(f"Wrote fighters index to {output_path}")
 
 
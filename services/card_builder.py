@@ -6,11 +6,21 @@ This module provides :func:`compose_card` which layers a card background,
 front template, fighter headshot, flag and key statistics into a single
 PNG image.  The function is deliberately defensive so that missing assets
 simply result in a partially populated card instead of raising errors.
+
+Shared assets – the front template, rasterised flags, circular headshot masks
+and the default font – are decoded once and kept in small LRU caches keyed by
+file modification time, so edited assets are picked up without a restart.
+:func:`compose_cards` renders a whole event's cards across a process pool
+with each worker reusing those caches.
 """
 
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from multiprocessing import get_context
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Union
 import io
+import os
 
 from PIL import Image, ImageDraw, ImageFont
 
@@ -18,32 +28,100 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 FRONT_TEMPLATE = BASE_DIR / "FightControl" / "static" / "images" / "cyclone_card_front_logo.png"
 FLAGS_DIR = BASE_DIR / "FightControl" / "static" / "flags"
 
+ASSET_CACHE_SIZE = int(os.getenv("CARD_ASSET_CACHE", "64"))
+HEADSHOT_SIZE = 180
+FLAG_SIZE = (80, 80)
 
-def _load_flag(country: str) -> Optional[Image.Image]:
-    """Return an RGBA flag image for ``country`` if available."""
 
-    if not country:
+def _mtime(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
         return None
-    country = country.lower()
+
+
+@lru_cache(maxsize=ASSET_CACHE_SIZE)
+def _decode_image(path: str, mtime: int, size: Optional[tuple] = None) -> Image.Image:
+    img = Image.open(path).convert("RGBA")
+    if size is not None and img.size != size:
+        img = img.resize(size)
+    return img
+
+
+def _cached_image(path: Path, size: Optional[tuple] = None) -> Optional[Image.Image]:
+    """Return a shared decoded RGBA image for ``path`` or ``None``.
+
+    The result is cached and must not be modified in place; ``copy()`` it
+    first when drawing on it.
+    """
+
+    mtime = _mtime(path)
+    if mtime is None:
+        return None
+    try:
+        return _decode_image(str(path), mtime, size)
+    except Exception:
+        return None
+
+
+@lru_cache(maxsize=ASSET_CACHE_SIZE)
+def _rasterise_flag(country: str, size: Optional[tuple], svg_mtime: Optional[int], png_mtime: Optional[int]):
     # Try SVG first using cairosvg if available
-    svg_path = FLAGS_DIR / f"{country}.svg"
-    if svg_path.exists():
+    if svg_mtime is not None:
         try:
             import cairosvg
 
-            png_bytes = cairosvg.svg2png(url=str(svg_path))
-            return Image.open(io.BytesIO(png_bytes)).convert("RGBA")
+            png_bytes = cairosvg.svg2png(url=str(FLAGS_DIR / f"{country}.svg"))
+            img = Image.open(io.BytesIO(png_bytes)).convert("RGBA")
+            return img.resize(size) if size else img
         except Exception:
             pass
-    png_path = FLAGS_DIR / f"{country}.png"
-    if png_path.exists():
+    if png_mtime is not None:
         try:
-            return Image.open(png_path).convert("RGBA")
+            img = Image.open(FLAGS_DIR / f"{country}.png").convert("RGBA")
+            return img.resize(size) if size else img
         except Exception:
             pass
     return None
 
 
+def _load_flag(country: str, size: Optional[tuple] = None) -> Optional[Image.Image]:
+    """Return an RGBA flag image for ``country`` if available.
+
+    Flags are rasterised once per ``(country, size)``; the returned image is
+    shared and must not be modified in place.
+    """
+
+    if not country:
+        return None
+    country = country.lower()
+    return _rasterise_flag(
+        country,
+        size,
+        _mtime(FLAGS_DIR / f"{country}.svg"),
+        _mtime(FLAGS_DIR / f"{country}.png"),
+    )
+
+
+@lru_cache(maxsize=8)
+def _circle_mask(size: int) -> Image.Image:
+    mask = Image.new("L", (size, size), 0)
+    ImageDraw.Draw(mask).ellipse((0, 0, size, size), fill=255)
+    return mask
+
+
+@lru_cache(maxsize=1)
+def _font() -> ImageFont.ImageFont:
+    return ImageFont.load_default()
+
+
+def clear_asset_cache() -> None:
+    """Drop every cached template, flag, mask and font."""
+
+    for cached in (_decode_image, _rasterise_flag, _circle_mask, _font):
+        cached.cache_clear()
+
+
 def _paste_headshot(img: Image.Image, dir_path: Path) -> None:
     """Paste a circular headshot onto ``img`` if ``photo.png`` exists."""
 
@@ -52,12 +130,9 @@ def _paste_headshot(img: Image.Image, dir_path: Path) -> None:
         return
     try:
         head = Image.open(photo).convert("RGBA")
-        size = 180
+        size = HEADSHOT_SIZE
         head = head.resize((size, size))
-        mask = Image.new("L", (size, size), 0)
-        draw = ImageDraw.Draw(mask)
-        draw.ellipse((0, 0, size, size), fill=255)
-        head.putalpha(mask)
+        head.putalpha(_circle_mask(size))
         img.paste(head, (20, 20), head)
     except Exception:
         pass
@@ -82,23 +157,23 @@ def compose_card(
     back = Path(back_img)
     out = Path(out_png)
 
-    try:
-        img = Image.open(back).convert("RGBA")
-    except Exception:
+    background = _cached_image(back)
+    if background is not None:
+        img = background.copy()
+    else:
         img = Image.new("RGBA", (600, 400), (0, 0, 0, 255))
 
     # Paste headshot if available
     _paste_headshot(img, out.parent)
 
     draw = ImageDraw.Draw(img)
-    font = ImageFont.load_default()
+    font = _font()
 
     if name:
         draw.text((220, 40), name, fill="white", font=font)
 
-    flag_img = _load_flag(country or "")
+    flag_img = _load_flag(country or "", FLAG_SIZE)
     if flag_img is not None:
-        flag_img = flag_img.resize((80, 80))
         img.paste(flag_img, (220, 70), flag_img)
 
     y = 160
@@ -107,16 +182,63 @@ def compose_card(
         y += 20
 
     # Overlay front template if available
-    try:
-        front = Image.open(FRONT_TEMPLATE).convert("RGBA")
-        if front.size != img.size:
-            front = front.resize(img.size)
+    front = _cached_image(FRONT_TEMPLATE, img.size)
+    if front is not None:
         img = Image.alpha_composite(img, front)
-    except Exception:
-        pass
 
     img.save(out)
     return str(out)
 
 
-__all__ = ["compose_card"]
+CardJob = Union[Mapping[str, object], Sequence[object]]
+
+
+def _compose_job(job: CardJob) -> str:
+    if isinstance(job, Mapping):
+        return compose_card(**job)  # type: ignore[arg-type]
+    return compose_card(*job)  # type: ignore[misc]
+
+
+def _job_country(job: CardJob) -> str:
+    if isinstance(job, Mapping):
+        value = job.get("country")
+    else:
+        value = job[3] if len(job) > 3 else None
+    return str(value or "").lower()
+
+
+def _warm_assets(countries: Sequence[str]) -> None:
+    """Decode shared assets once per worker before any card is rendered."""
+
+    for country in countries:
+        _load_flag(country, FLAG_SIZE)
+    _circle_mask(HEADSHOT_SIZE)
+    _font()
+
+
+def compose_cards(jobs: Iterable[CardJob], workers: int | None = None) -> List[str]:
+    """Render a batch of cards and return the output paths in job order.
+
+    Each job holds the :func:`compose_card` arguments either as a mapping
+    (``back_img``, ``out_png``, ``name``, ``country``, ``stats``) or as a
+    positional sequence.  With more than one worker the cards are spread over
+    a process pool whose workers pre-load the flags used by the batch; a
+    single worker renders inline and shares this process' caches.
+    """
+
+    jobs = list(jobs)
+    if workers is None:
+        workers = min(len(jobs), os.cpu_count() or 1)
+    countries = sorted({c for c in map(_job_country, jobs) if c})
+    if workers <= 1 or len(jobs) <= 1:
+        _warm_assets(countries)
+        return [_compose_job(job) for job in jobs]
+    # ``spawn`` rather than ``fork``: this runs inside the threaded Flask server.
+    ctx = get_context("spawn")
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=ctx, initializer=_warm_assets, initargs=(countries,)
+    ) as pool:
+        return list(pool.map(_compose_job, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+
+
+__all__ = ["clear_asset_cache", "compose_card", "compose_cards"]
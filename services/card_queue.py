@@ -0,0 +1,172 @@
+"""Background fighter card generation.
+
+Rendering a card opens the fighter photo and composites a PNG with Pillow,
+which is far too slow to do inside ``/api/fighters`` for every fighter on the
+roster.  :class:`CardQueue` moves that work onto a small thread pool: cards are
+enqueued when a fighter is created or their photo changes, and the roster
+endpoint only reads cached status via :meth:`CardQueue.annotate`.
+
+Each fighter returned by :meth:`CardQueue.annotate` carries ``card_url`` and a
+``card_status`` flag:
+
+``ready``
+    The card exists; ``card_local`` points to it.
+``pending``
+    The card is queued or rendering.
+``failed``
+    Rendering raised; the error is logged and the card is retried when the
+    fighter is enqueued again.
+``missing``
+    There is no card and no local photo to build one from.
+
+The pool size is configured with ``CARD_WORKERS`` (default ``2``).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+READY = "ready"
+PENDING = "pending"
+FAILED = "failed"
+MISSING = "missing"
+
+
+def _fighter_utils():
+    # Imported lazily: tests reload ``fighter_utils`` with different base dirs.
+    import fighter_utils
+
+    return fighter_utils
+
+
+def _render(fighter: dict) -> dict:
+    from services import image_variants
+
+    result = _fighter_utils().ensure_fighter_card(fighter)
+    # Photos that arrived without an upload (e.g. synced) get thumbnails here.
+    if photo := result.get("photo_local"):
+        image_variants.ensure_variants(photo)
+    return result
+
+
+class CardQueue:
+    """Render fighter cards on a worker pool and track their status.
+
+    Status is cached per card path so repeated roster requests do not touch the
+    filesystem once a card is known to exist.
+    """
+
+    def __init__(self, render: Callable[[dict], dict] | None = None, max_workers: int | None = None) -> None:
+        self._render = render or _render
+        self._max_workers = max_workers or int(os.getenv("CARD_WORKERS", "2"))
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._status: dict[str, str] = {}
+        self._futures: dict[str, Future] = {}
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="card")
+        return self._executor
+
+    def _run(self, key: str, fighter: dict) -> None:
+        try:
+            self._render(fighter)
+            status = READY if Path(key).exists() else MISSING
+        except Exception:
+            logger.exception("Card generation failed for %s", fighter.get("name"))
+            status = FAILED
+        with self._lock:
+            self._status[key] = status
+            self._futures.pop(key, None)
+
+    def enqueue(self, fighter: dict, force: bool = False) -> str:
+        """Queue card generation for ``fighter`` and return its status.
+
+        ``force`` re-renders an existing card, e.g. after a photo change.
+        Requests for a card that is already pending are coalesced.
+        """
+
+        key = str(_fighter_utils().fighter_card_path(fighter))
+        with self._lock:
+            if key in self._futures:
+                return PENDING
+            if not force and self._status.get(key) == READY:
+                return READY
+            if force:
+                try:
+                    Path(key).unlink()
+                except OSError:
+                    pass
+            self._status[key] = PENDING
+            self._futures[key] = self._pool().submit(self._run, key, dict(fighter))
+        return PENDING
+
+    def status(self, fighter: dict) -> str:
+        """Return the card status for ``fighter`` without blocking.
+
+        Fighters with a local photo but no card are enqueued automatically.
+        """
+
+        key = str(_fighter_utils().fighter_card_path(fighter))
+        with self._lock:
+            cached = self._status.get(key)
+        if cached in (READY, PENDING, FAILED):
+            return cached
+        if Path(key).exists():
+            with self._lock:
+                self._status[key] = READY
+            return READY
+        # ``cached == MISSING`` means a render was already attempted.
+        photo = fighter.get("photo_local")
+        if cached is None and photo and Path(photo).exists():
+            return self.enqueue(fighter)
+        return MISSING
+
+    def annotate(self, fighter: dict) -> dict:
+        """Return a copy of ``fighter`` with ``card_url``/``card_status`` set."""
+
+        result = dict(fighter)
+        card_path = _fighter_utils().fighter_card_path(result)
+        status = self.status(result)
+        if status == READY:
+            result.setdefault("card_local", str(card_path))
+        # Always provide the expected URL so the frontend can retry loading it
+        result["card_url"] = f"/static/data/{card_path.name}"
+        result["card_status"] = status
+        return result
+
+    def invalidate(self, fighter: dict | None = None) -> None:
+        """Forget cached status for ``fighter`` (or every fighter)."""
+
+        with self._lock:
+            if fighter is None:
+                self._status.clear()
+            else:
+                self._status.pop(str(_fighter_utils().fighter_card_path(fighter)), None)
+
+    def join(self, timeout: float | None = None) -> bool:
+        """Wait for queued cards to finish; return ``True`` if all completed."""
+
+        with self._lock:
+            futures = list(self._futures.values())
+        _done, not_done = wait(futures, timeout=timeout)
+        return not not_done
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+card_queue = CardQueue()
+
+__all__ = ["CardQueue", "FAILED", "MISSING", "PENDING", "READY", "card_queue"]
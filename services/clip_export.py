@@ -0,0 +1,225 @@
+"""Tagged highlight clips cut from round recordings.
+
+When a round ends :func:`round_outputs.move_outputs_for_round` files every
+camera's recording into place.  :func:`export_round` then cuts a window of
+``CLIP_PRE_SECONDS`` before to ``CLIP_POST_SECONDS`` after each coach tag of
+the round out of every recording, so coaches can review tagged moments without
+scrubbing whole multi-gigabyte files.
+
+Clips are cut with a local ``ffmpeg`` using stream copy (``-c copy``): nothing
+is re-encoded, so a clip costs little more than the bytes it copies and starts
+on the keyframe at or before the requested time.  Jobs run on a thread pool of
+``CLIP_WORKERS`` (default ``2``) ffmpeg processes.  ``ffmpeg`` is looked up on
+``PATH`` unless ``FFMPEG_PATH`` is set; without it no clips are cut.
+
+Tag times come from :mod:`services.timeline`.  A tag's position in a recording
+is measured from the last recording ``start`` mark of the round, less any
+time the recording spent paused, falling back to the round start when no
+recording was marked.  Clips are written to ``<bout>/round_<n>/clips/`` and
+listed per fighter in ``clips_index.json`` in each fighter's round folder.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+import subprocess
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from FightControl.fight_utils import safe_filename
+from services import timeline
+
+logger = logging.getLogger(__name__)
+
+PRE_SECONDS = float(os.getenv("CLIP_PRE_SECONDS", "5"))
+POST_SECONDS = float(os.getenv("CLIP_POST_SECONDS", "10"))
+WORKERS = int(os.getenv("CLIP_WORKERS", "2"))
+INDEX_NAME = "clips_index.json"
+CLIPS_DIR = "clips"
+
+Runner = Callable[[list[str]], "subprocess.CompletedProcess"]
+
+
+def ffmpeg_path() -> str | None:
+    return os.getenv("FFMPEG_PATH") or shutil.which("ffmpeg")
+
+
+def _run(cmd: list[str]) -> subprocess.CompletedProcess:
+    return subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=120)
+
+
+def clip_command(ffmpeg: str, src: Path, dest: Path, start: float, duration: float) -> list[str]:
+    """Return the ffmpeg command copying ``duration`` seconds of ``src`` from ``start``."""
+
+    return [
+        ffmpeg,
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-y",
+        "-ss",
+        f"{start:.3f}",
+        "-i",
+        str(src),
+        "-t",
+        f"{duration:.3f}",
+        "-map",
+        "0",
+        "-c",
+        "copy",
+        "-avoid_negative_ts",
+        "make_zero",
+        str(dest),
+    ]
+
+
+def recording_offset(tl: timeline.Timeline, round_no: int, t: float) -> float:
+    """Return seconds into the round's recording at bout time ``t``."""
+
+    start = tl.round_start(round_no)
+    prev_end = max((e for n, (_s, e) in tl.rounds.items() if n < round_no and e is not None), default=None)
+    lower = prev_end if prev_end is not None else float("-inf")
+    origin, paused, paused_at = start, 0.0, None
+    for m in tl.stream("recording"):
+        if m["t"] > t:
+            break
+        if m["t"] < lower:
+            continue
+        event = m.get("event")
+        if event == "start":
+            origin, paused, paused_at = m["t"], 0.0, None
+        elif event == "pause" and paused_at is None:
+            paused_at = m["t"]
+        elif event == "resume" and paused_at is not None:
+            paused += m["t"] - paused_at
+            paused_at = None
+    if paused_at is not None:
+        paused += t - paused_at
+    return t - origin - paused
+
+
+def tag_windows(
+    tl: timeline.Timeline,
+    round_no: int,
+    pre: float | None = None,
+    post: float | None = None,
+) -> list[dict]:
+    """Return one clip window per tag of ``round_no``, in tag order."""
+
+    pre = PRE_SECONDS if pre is None else pre
+    post = POST_SECONDS if post is None else post
+    windows = []
+    for tag in tl.in_round(round_no, streams=["tag"])["tag"]:
+        offset = recording_offset(tl, round_no, tag["t"])
+        start = max(0.0, offset - pre)
+        windows.append(
+            {
+                "tag": tag.get("tag"),
+                "fighter": tag.get("fighter"),
+                "t": tag["t"],
+                "offset": round(offset, 3),
+                "start": round(start, 3),
+                "duration": round(offset + post - start, 3),
+            }
+        )
+    return windows
+
+
+def _write_index(path: Path, payload: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def export_round(
+    session_dir: str | Path,
+    round_no: int,
+    recordings: Iterable[str | Path],
+    fighters: Mapping[str, str],
+    index_dirs: Mapping[str, Path],
+    *,
+    pre: float | None = None,
+    post: float | None = None,
+    workers: int | None = None,
+    ffmpeg: str | None = None,
+    runner: Runner | None = None,
+) -> dict[str, list[dict]]:
+    """Cut tagged clips of ``round_no`` from every file in ``recordings``.
+
+    ``fighters`` maps corners (``red``/``blue``) to fighter names and
+    ``index_dirs`` maps the same corners to the folders receiving
+    ``clips_index.json``.  Tags naming neither a corner nor a fighter are listed
+    for both.  Returns the clip records written to each corner's index.
+    """
+
+    recordings = [Path(p) for p in recordings]
+    ffmpeg = ffmpeg or ffmpeg_path()
+    if not recordings:
+        return {}
+    if not ffmpeg:
+        logger.warning("ffmpeg not found; skipping highlight clips for round %s", round_no)
+        return {}
+    windows = tag_windows(timeline.load_timeline(session_dir), round_no, pre, post)
+    if not windows:
+        return {}
+
+    out_dir = Path(session_dir) / f"round_{round_no}" / CLIPS_DIR
+    out_dir.mkdir(parents=True, exist_ok=True)
+    jobs = []
+    for src in recordings:
+        for i, w in enumerate(windows, 1):
+            name = f"{src.stem}_{i:03d}_{safe_filename(str(w['tag'] or 'tag'))}{src.suffix}"
+            jobs.append((src, out_dir / name, w))
+
+    run = runner or _run
+
+    def _cut(job) -> dict:
+        src, dest, w = job
+        try:
+            ok = run(clip_command(ffmpeg, src, dest, w["start"], w["duration"])).returncode == 0
+        except (OSError, subprocess.SubprocessError) as exc:
+            logger.warning("Clip %s failed: %s", dest.name, exc)
+            ok = False
+        return {**w, "camera": src.stem, "source": str(src), "path": str(dest), "ok": ok}
+
+    with ThreadPoolExecutor(max_workers=max(1, workers or WORKERS), thread_name_prefix="clip") as pool:
+        clips = list(pool.map(_cut, jobs))
+
+    names = {str(name).lower(): corner for corner, name in fighters.items() if name}
+    by_corner: dict[str, list[dict]] = {corner: [] for corner in index_dirs}
+    for clip in clips:
+        who = str(clip.get("fighter") or "").lower()
+        corner = who if who in by_corner else names.get(who)
+        for c in [corner] if corner in by_corner else by_corner:
+            by_corner[c].append(clip)
+
+    generated = datetime.utcnow().isoformat()
+    for corner, items in by_corner.items():
+        _write_index(
+            Path(index_dirs[corner]) / INDEX_NAME,
+            {
+                "fighter": fighters.get(corner),
+                "round": round_no,
+                "generated_at": generated,
+                "clips": items,
+            },
+        )
+    failed = sum(not c["ok"] for c in clips)
+    logger.info("Cut %d highlight clips for round %s (%d failed)", len(clips) - failed, round_no, failed)
+    return by_corner
+
+
+__all__ = [
+    "INDEX_NAME",
+    "clip_command",
+    "export_round",
+    "ffmpeg_path",
+    "recording_offset",
+    "tag_windows",
+]
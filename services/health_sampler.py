@@ -0,0 +1,186 @@
+"""Background sampling of subsystem health.
+
+``/api/health`` and ``/api/status-report`` used to probe OBS, MediaMTX and the
+HR daemon synchronously on every request; the boot screen and dashboard poll
+them every second, and without psutil the process check shells out to ``ps``
+or ``tasklist`` each time.  :class:`HealthSampler` runs each :class:`Probe` on
+its own cadence on a small thread pool instead, bounding every run by the
+probe's timeout, and keeps the latest result per probe plus a ring buffer of
+the last ``HEALTH_HISTORY`` samples (default ``120``) for short-term history.
+Endpoints read :meth:`HealthSampler.latest`, which never blocks on a probe.
+
+A probe that is still running when it is next due is not started again, so a
+hung check cannot pile up threads; it is reported as failed with
+``error == "timeout"`` until it returns.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+HISTORY = int(os.getenv("HEALTH_HISTORY", "120"))
+TIMEOUT = float(os.getenv("HEALTH_PROBE_TIMEOUT", "1.0"))
+
+
+@dataclass(frozen=True)
+class Probe:
+    """A named health check run every ``interval`` seconds."""
+
+    name: str
+    check: Callable[[], Any]
+    interval: float = 2.0
+    timeout: float = TIMEOUT
+    default: Any = False
+
+
+class HealthSampler:
+    """Run probes in the background and keep their latest results."""
+
+    def __init__(self, probes: Sequence[Probe], history: int | None = None) -> None:
+        self.probes = {p.name: p for p in probes}
+        self._lock = threading.Lock()
+        self._results: dict[str, dict] = {}
+        self._history: deque[dict] = deque(maxlen=history or HISTORY)
+        self._pending: dict[str, Future] = {}
+        self._started: dict[str, float] = {}
+        self._expired: set[str] = set()
+        self._pool: ThreadPoolExecutor | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    # -- results ----------------------------------------------------------
+
+    def _record(self, probe: Probe, value: Any, started: float, error: str | None = None) -> None:
+        result = {
+            "value": probe.default if error else value,
+            "ts": time.time(),
+            "latency_ms": round((time.monotonic() - started) * 1000, 1),
+            "error": error,
+        }
+        with self._lock:
+            self._results[probe.name] = result
+            self._history.append({"probe": probe.name, **result})
+
+    def _run(self, probe: Probe) -> None:
+        started = time.monotonic()
+        try:
+            value = probe.check()
+        except Exception as exc:
+            self._record(probe, None, started, error=f"{type(exc).__name__}: {exc}")
+        else:
+            self._record(probe, value, started)
+
+    def latest(self) -> dict[str, Any]:
+        """Return the newest value of every probe (``default`` until first sampled)."""
+
+        with self._lock:
+            return {name: self._results.get(name, {}).get("value", p.default) for name, p in self.probes.items()}
+
+    def results(self) -> dict[str, dict]:
+        """Return the newest result records, including timestamps and errors."""
+
+        with self._lock:
+            return {name: dict(r) for name, r in self._results.items()}
+
+    def history(self, name: str | None = None) -> list[dict]:
+        with self._lock:
+            return [h for h in self._history if name is None or h["probe"] == name]
+
+    # -- scheduling -------------------------------------------------------
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=len(self.probes) or 1, thread_name_prefix="health")
+        return self._pool
+
+    def _submit(self, probe: Probe) -> Future | None:
+        with self._lock:
+            pending = self._pending.get(probe.name)
+            if pending is not None and not pending.done():
+                return None
+            self._started[probe.name] = time.monotonic()
+            self._expired.discard(probe.name)
+            future = self._pending[probe.name] = self._executor().submit(self._run, probe)
+        return future
+
+    def _expire(self, probe: Probe) -> None:
+        """Mark ``probe`` failed (once per run) if its pending run outlived its timeout."""
+
+        with self._lock:
+            future = self._pending.get(probe.name)
+            started = self._started.get(probe.name, 0.0)
+            if future is None or future.done() or probe.name in self._expired:
+                return
+            if time.monotonic() - started < probe.timeout:
+                return
+            self._expired.add(probe.name)
+        self._record(probe, None, started, error="timeout")
+
+    def sample_now(self) -> dict[str, Any]:
+        """Run every probe now (in parallel, each within its timeout) and return :meth:`latest`."""
+
+        for probe in self.probes.values():
+            self._submit(probe)
+        while True:
+            now = time.monotonic()
+            with self._lock:
+                waiting = {
+                    f: self._started[name] + self.probes[name].timeout
+                    for name, f in self._pending.items()
+                    if not f.done() and now < self._started[name] + self.probes[name].timeout
+                }
+            if not waiting:
+                break
+            wait(waiting, timeout=min(waiting.values()) - now, return_when=FIRST_COMPLETED)
+        for probe in self.probes.values():
+            self._expire(probe)
+        return self.latest()
+
+    def _loop(self) -> None:
+        due = {name: 0.0 for name in self.probes}
+        while not self._stop.is_set():
+            now = time.monotonic()
+            for name, probe in self.probes.items():
+                self._expire(probe)
+                if now >= due[name]:
+                    self._submit(probe)
+                    due[name] = now + probe.interval
+            with self._lock:
+                # A run already reported as timed out has no deadline left to wake for.
+                deadlines = [
+                    self._started[n] + self.probes[n].timeout
+                    for n, f in self._pending.items()
+                    if not f.done() and n not in self._expired
+                ]
+            wake = min([*due.values(), *deadlines], default=now + 1.0)
+            self._stop.wait(max(0.05, wake - time.monotonic()))
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> HealthSampler:
+        if not self.running:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="health-sampler", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+__all__ = ["HealthSampler", "Probe"]
@@ -0,0 +1,291 @@
+"""Lightweight heart rate chart rendering using Pillow.
+
+matplotlib's pyplot state machine costs a heavy import plus hundreds of
+milliseconds per figure which is noticeable on the fight laptop when every
+round produces several PNGs.  :func:`render_hr_chart` draws the same
+ingredients – zone bands, the BPM polyline and tag markers – straight onto a
+Pillow canvas and typically finishes in a few milliseconds.
+
+matplotlib remains available as an optional high fidelity mode, imported only
+when selected.  Both renderers take the same :class:`HrPanel` data; the
+backend defaults to :func:`chart_backend`, which honours the
+``CYCLONE_CHART_BACKEND`` environment variable (``pillow`` or ``matplotlib``).
+"""
+
+from __future__ import annotations
+
+import math
+import os
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from PIL import Image, ImageColor, ImageDraw, ImageFont
+
+DEFAULT_ZONES: tuple[tuple[float, float, str], ...] = (
+    (0.0, 0.6, "blue"),
+    (0.6, 0.7, "limegreen"),
+    (0.7, 0.8, "yellow"),
+    (0.8, 0.9, "orange"),
+    (0.9, 1.1, "red"),
+)
+
+BACKENDS = ("pillow", "matplotlib")
+
+_BAND_ALPHA = 51  # ~0.2 opacity, matching the matplotlib charts
+_BACKGROUND = (255, 255, 255, 255)
+_AXIS = (0, 0, 0, 255)
+_TICK_LABEL = (60, 60, 60, 255)
+_TAG = (220, 0, 0, 255)
+_MARGIN = (48, 30, 16, 36)  # left, top, right, bottom
+
+
+@dataclass(frozen=True)
+class HrPanel:
+    """Data required to draw a single heart rate panel.
+
+    ``times`` are x positions in seconds and ``bpm`` the matching heart rate
+    samples.  ``zones`` are ``(lower, upper, colour)`` fractions of
+    ``max_hr``; ``tags`` are ``(seconds, label)`` markers drawn as vertical
+    lines.  ``y_max`` defaults to ``max_hr``.
+    """
+
+    times: Sequence[float]
+    bpm: Sequence[float]
+    max_hr: float
+    zones: Sequence[tuple[float, float, str]] = DEFAULT_ZONES
+    tags: Sequence[tuple[float, str]] = ()
+    title: str = ""
+    y_max: float | None = None
+    line_colour: str = "black"
+    line_width: int = 2
+
+
+def chart_backend(default: str = "pillow") -> str:
+    """Return the configured chart backend name.
+
+    Unknown values fall back to ``default`` so a typo in the environment never
+    stops charts from being produced.
+    """
+
+    value = os.getenv("CYCLONE_CHART_BACKEND", default).strip().lower()
+    return value if value in BACKENDS else default
+
+
+def _rgba(colour: str, alpha: int = 255) -> tuple[int, int, int, int]:
+    """Return ``colour`` as an RGBA tuple, falling back to grey."""
+
+    try:
+        rgb = ImageColor.getrgb(colour)
+    except (ValueError, AttributeError):
+        rgb = (128, 128, 128)
+    return rgb[0], rgb[1], rgb[2], alpha
+
+
+@lru_cache(maxsize=1)
+def _font() -> ImageFont.ImageFont:
+    return ImageFont.load_default()
+
+
+def _nice_step(span: float, target: int = 5) -> float:
+    """Return a rounded tick interval giving roughly ``target`` ticks."""
+
+    if span <= 0:
+        return 1.0
+    raw = span / target
+    magnitude = 10 ** math.floor(math.log10(raw))
+    for mult in (1, 2, 5, 10):
+        step = mult * magnitude
+        if step >= raw:
+            return float(step)
+    return float(raw)
+
+
+def _draw_panel(canvas: Image.Image, box: tuple[int, int, int, int], panel: HrPanel) -> None:
+    """Draw ``panel`` inside ``box`` (left, top, right, bottom) on ``canvas``."""
+
+    left, top, right, bottom = box
+    m_left, m_top, m_right, m_bottom = _MARGIN
+    x0, y0 = left + m_left, top + m_top
+    x1, y1 = right - m_right, bottom - m_bottom
+    width = max(x1 - x0, 1)
+    height = max(y1 - y0, 1)
+    font = _font()
+
+    max_hr = float(panel.max_hr or 0) or 200.0
+    y_top = float(panel.y_max or max_hr)
+
+    times = list(panel.times)
+    if times:
+        t_min, t_max = min(times), max(times)
+    else:
+        t_min, t_max = 0.0, 1.0
+    if t_max <= t_min:
+        t_max = t_min + 1.0
+
+    def sx(t: float) -> float:
+        return x0 + (t - t_min) / (t_max - t_min) * width
+
+    def sy(v: float) -> float:
+        v = min(max(v, 0.0), y_top)
+        return y1 - v / y_top * height
+
+    # Zone bands are composited so they stay translucent like ``axhspan``.
+    overlay = Image.new("RGBA", canvas.size, (0, 0, 0, 0))
+    odraw = ImageDraw.Draw(overlay)
+    for lower, upper, colour in panel.zones:
+        lo = sy(lower * max_hr)
+        hi = sy(upper * max_hr)
+        if lo - hi >= 1:
+            odraw.rectangle((x0, hi, x1, lo), fill=_rgba(colour, _BAND_ALPHA))
+    canvas.alpha_composite(overlay)
+
+    draw = ImageDraw.Draw(canvas)
+    draw.rectangle((x0, y0, x1, y1), outline=_AXIS)
+
+    step = _nice_step(y_top)
+    tick = 0.0
+    while tick <= y_top:
+        ty = sy(tick)
+        draw.line((x0 - 4, ty, x0, ty), fill=_AXIS)
+        draw.text((left + 4, ty - 5), f"{tick:g}", fill=_TICK_LABEL, font=font)
+        tick += step
+
+    if times:
+        x_step = _nice_step(t_max - t_min)
+        tick = (t_min // x_step) * x_step
+        while tick <= t_max:
+            if tick >= t_min:
+                tx = sx(tick)
+                draw.line((tx, y1, tx, y1 + 4), fill=_AXIS)
+                draw.text((tx - 6, y1 + 6), f"{tick:g}", fill=_TICK_LABEL, font=font)
+            tick += x_step
+
+    samples = [(float(t), float(v)) for t, v in zip(times, panel.bpm, strict=False) if v is not None]
+    if len(samples) > width * 4:
+        # Long bouts carry far more samples than pixel columns; M4 keeps the
+        # rendered line identical while drawing only a handful per column.
+        from utils.hr_pyramid import m4
+
+        samples = m4(samples, int(width))
+    points = [(sx(t), sy(v)) for t, v in samples]
+    if len(points) > 1:
+        draw.line(points, fill=_rgba(panel.line_colour), width=panel.line_width, joint="curve")
+    elif points:
+        px, py = points[0]
+        draw.ellipse((px - 2, py - 2, px + 2, py + 2), fill=_rgba(panel.line_colour))
+    else:
+        draw.text(((x0 + x1) / 2 - 24, (y0 + y1) / 2 - 5), "No HR data", fill=_AXIS, font=font)
+
+    for t, label in panel.tags:
+        if not times or t < t_min or t > t_max:
+            continue
+        tx = sx(t)
+        draw.line((tx, y0, tx, y1), fill=_TAG, width=1)
+        draw.text((tx + 2, y0 + 2), str(label), fill=_TAG, font=font)
+
+    if panel.title:
+        draw.text((x0, top + 8), panel.title, fill=_AXIS, font=font)
+    draw.text((x1 - 40, y1 + 20), "Time (s)", fill=_TICK_LABEL, font=font)
+
+
+def _pyplot():
+    """Return :mod:`matplotlib.pyplot` configured for off-screen rendering."""
+
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    return plt
+
+
+def _plot_panel(ax, panel: HrPanel) -> None:
+    """Draw ``panel`` on a matplotlib ``ax``."""
+
+    max_hr = float(panel.max_hr or 0) or 200.0
+    for lower, upper, colour in panel.zones:
+        ax.axhspan(lower * max_hr, upper * max_hr, color=colour, alpha=0.2)
+    if len(panel.times):
+        ax.plot(panel.times, panel.bpm, color=panel.line_colour, linewidth=panel.line_width)
+    else:
+        ax.text(0.5, 0.5, "No HR data", ha="center", va="center", transform=ax.transAxes)
+    ax.set_title(panel.title)
+    ax.set_xlabel("Time (s)")
+    ax.set_ylabel("BPM")
+    ax.set_ylim(0, float(panel.y_max or max_hr))
+    ymin, ymax = ax.get_ylim()
+    for t, label in panel.tags:
+        ax.vlines(t, ymin, ymax, color="r")
+        ax.text(t, ymax, label, rotation=90, va="bottom", fontsize=8)
+
+
+def _render_matplotlib(panels: Sequence[HrPanel], out: Path, title: str | None, panel_size: tuple[int, int]) -> None:
+    plt = _pyplot()
+    p_width, p_height = panel_size
+    count = max(len(panels), 1)
+    fig, axes = plt.subplots(1, count, figsize=(p_width * count / 100, p_height / 100))
+    for ax, panel in zip(axes if count > 1 else [axes], panels, strict=False):
+        _plot_panel(ax, panel)
+    if title:
+        fig.suptitle(title)
+        fig.tight_layout(rect=[0, 0.03, 1, 0.95])
+    else:
+        fig.tight_layout()
+    fig.savefig(out)
+    plt.close(fig)
+
+
+def render_hr_panels(
+    panels: Iterable[HrPanel],
+    out_path: str | Path,
+    title: str | None = None,
+    panel_size: tuple[int, int] = (600, 400),
+    backend: str | None = None,
+) -> Path:
+    """Render ``panels`` side by side into ``out_path`` and return the path.
+
+    ``backend`` defaults to :func:`chart_backend`.  The matplotlib backend
+    raises :class:`ImportError` when matplotlib is not installed.
+    """
+
+    panels = list(panels)
+    out = Path(out_path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    if (backend or chart_backend()) == "matplotlib":
+        _render_matplotlib(panels, out, title, panel_size)
+        return out
+
+    heading = 24 if title else 0
+    p_width, p_height = panel_size
+    canvas = Image.new("RGBA", (p_width * max(len(panels), 1), p_height + heading), _BACKGROUND)
+    for idx, panel in enumerate(panels):
+        left = idx * p_width
+        _draw_panel(canvas, (left, heading, left + p_width, heading + p_height), panel)
+    if title:
+        ImageDraw.Draw(canvas).text((12, 6), title, fill=_AXIS, font=_font())
+
+    canvas.convert("RGB").save(out, format="PNG", optimize=False)
+    return out
+
+
+def render_hr_chart(
+    panel: HrPanel,
+    out_path: str | Path,
+    size: tuple[int, int] = (800, 300),
+    backend: str | None = None,
+) -> Path:
+    """Render a single heart rate ``panel`` to ``out_path``."""
+
+    return render_hr_panels([panel], out_path, panel_size=size, backend=backend)
+
+
+__all__ = [
+    "BACKENDS",
+    "DEFAULT_ZONES",
+    "HrPanel",
+    "chart_backend",
+    "render_hr_chart",
+    "render_hr_panels",
+]
@@ -0,0 +1,220 @@
+"""Responsive image derivatives for fighter photos and cards.
+
+Uploaded photos and rendered cards are full size, yet the touch panel and
+overlay browsers only ever draw them as thumbnails.  :func:`generate_variants`
+writes downscaled copies at a few fixed widths, as WebP (when Pillow supports
+it) and PNG, beneath ``FightControl/static/variants/<sha[:2]>/<sha>/``.
+Derivatives are keyed by the SHA-256 of the source image, so re-uploading the
+same file or rendering an identical card reuses what is already on disk.
+
+Lookups from API handlers go through :func:`lookup`, which never decodes an
+image: it checks the source's size and modification time against an index
+kept in memory and in ``variants/index.json``.  Each record exposes
+``srcset`` strings ready for ``<img srcset>`` / ``<source srcset>``.
+
+Widths are configured with ``IMAGE_VARIANT_WIDTHS`` (default ``160,320,640``).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+WIDTHS = tuple(sorted(int(w) for w in os.getenv("IMAGE_VARIANT_WIDTHS", "160,320,640").split(",") if w.strip()))
+VARIANTS_DIR = "variants"
+INDEX_NAME = "index.json"
+
+_lock = threading.Lock()
+# static_dir -> {source path: [mtime_ns, size, record]}
+_indexes: dict[str, dict[str, list]] = {}
+
+
+def default_static_dir() -> Path:
+    # Resolved per call: tests reload ``paths`` with different base dirs.
+    return Path(importlib.import_module("paths").BASE_DIR) / "FightControl" / "static"
+
+
+def _formats() -> tuple[str, ...]:
+    from PIL import features
+
+    return ("webp", "png") if features.check("webp") else ("png",)
+
+
+def _stamp(path: Path) -> list[int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(64 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _index(static_dir: Path) -> dict[str, list]:
+    key = str(static_dir)
+    index = _indexes.get(key)
+    if index is None:
+        try:
+            index = json.loads((static_dir / VARIANTS_DIR / INDEX_NAME).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            index = {}
+        if not isinstance(index, dict):
+            index = {}
+        _indexes[key] = index
+    return index
+
+
+def _save_index(static_dir: Path, index: dict[str, list]) -> None:
+    path = static_dir / VARIANTS_DIR / INDEX_NAME
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{INDEX_NAME}.{threading.get_ident()}.tmp")
+    tmp.write_text(json.dumps(index), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _record(sha: str, width: int, files: list[tuple[int, str]], url_prefix: str) -> dict:
+    base = f"{url_prefix}/{VARIANTS_DIR}/{sha[:2]}/{sha}"
+    srcset: dict[str, str] = {}
+    for w, fmt in files:
+        entry = f"{base}/{w}.{fmt} {w}w"
+        srcset[fmt] = f"{srcset[fmt]}, {entry}" if fmt in srcset else entry
+    smallest = min(w for w, _ in files)
+    return {"hash": sha, "width": width, "src": f"{base}/{smallest}.png", "srcset": srcset}
+
+
+def _render(src: Path, out_dir: Path) -> tuple[int, list[tuple[int, str]]]:
+    from PIL import Image
+
+    files: list[tuple[int, str]] = []
+    with Image.open(src) as img:
+        img.load()
+        width = img.width
+        widths = sorted({min(w, width) for w in WIDTHS})
+        img = img.convert("RGBA")
+        out_dir.mkdir(parents=True, exist_ok=True)
+        for w in widths:
+            h = max(1, round(img.height * w / width))
+            resized = img if w == width else img.resize((w, h), Image.LANCZOS)
+            for fmt in _formats():
+                dest = out_dir / f"{w}.{fmt}"
+                files.append((w, fmt))
+                if dest.exists():
+                    continue
+                tmp = out_dir / f"{w}.{threading.get_ident()}.tmp"
+                if fmt == "webp":
+                    resized.save(tmp, "WEBP", quality=80, method=4)
+                else:
+                    resized.save(tmp, "PNG", optimize=True)
+                os.replace(tmp, dest)
+    return width, files
+
+
+def generate_variants(
+    src: str | os.PathLike[str],
+    static_dir: str | os.PathLike[str] | None = None,
+    url_prefix: str = "/static",
+) -> dict | None:
+    """Write thumbnails of ``src`` and return its srcset record.
+
+    Returns ``None`` when ``src`` is missing or cannot be decoded (for
+    example when Pillow is not installed); callers fall back to the original
+    image.
+    """
+
+    src = Path(src)
+    static_dir = Path(static_dir) if static_dir is not None else default_static_dir()
+    stamp = _stamp(src)
+    if stamp is None:
+        return None
+    try:
+        sha = _sha256(src)
+        out_dir = static_dir / VARIANTS_DIR / sha[:2] / sha
+        width, files = _render(src, out_dir)
+    except Exception as exc:
+        logger.warning("Could not create image variants for %s: %s", src, exc)
+        return None
+
+    record = _record(sha, width, files, url_prefix)
+    with _lock:
+        index = _index(static_dir)
+        index[str(src.resolve())] = [*stamp, record]
+        try:
+            _save_index(static_dir, index)
+        except OSError:
+            logger.warning("Could not write image variant index in %s", static_dir)
+    return record
+
+
+def lookup(src: str | os.PathLike[str] | None, static_dir: str | os.PathLike[str] | None = None) -> dict | None:
+    """Return the cached record for ``src`` if its variants are current.
+
+    Only the source is stat'ed; no image is decoded or hashed.
+    """
+
+    if not src:
+        return None
+    src = Path(src)
+    static_dir = Path(static_dir) if static_dir is not None else default_static_dir()
+    stamp = _stamp(src)
+    if stamp is None:
+        return None
+    with _lock:
+        entry = _index(static_dir).get(str(src.resolve()))
+    if entry and entry[:2] == stamp:
+        return entry[2]
+    return None
+
+
+def _resolve(local: str | os.PathLike[str], static_dir: Path) -> Path:
+    path = Path(local)
+    return path if path.is_absolute() else static_dir.parent / path
+
+
+def ensure_variants(local: str | os.PathLike[str], static_dir: str | os.PathLike[str] | None = None) -> dict | None:
+    """Return variants for ``local``, generating them only when missing or stale."""
+
+    static_dir = Path(static_dir) if static_dir is not None else default_static_dir()
+    path = _resolve(local, static_dir)
+    return lookup(path, static_dir) or generate_variants(path, static_dir)
+
+
+def annotate(fighter: dict, static_dir: str | os.PathLike[str] | None = None) -> dict:
+    """Add ``photo_srcset``/``card_srcset`` to ``fighter`` when variants exist.
+
+    ``fighter`` is updated in place and returned.  ``*_thumb_url`` points at
+    the smallest PNG for browsers without ``srcset`` support.  Relative
+    ``photo_local`` paths are resolved against ``FightControl``.
+    """
+
+    static_dir = Path(static_dir) if static_dir is not None else default_static_dir()
+    for field, local in (("photo", fighter.get("photo_local")), ("card", fighter.get("card_local"))):
+        if not local:
+            continue
+        record = lookup(_resolve(local, static_dir), static_dir)
+        if record is not None:
+            fighter[f"{field}_srcset"] = record["srcset"]
+            fighter[f"{field}_thumb_url"] = record["src"]
+    return fighter
+
+
+def clear_cache() -> None:
+    """Forget in-memory indexes so they are reloaded from disk."""
+
+    with _lock:
+        _indexes.clear()
+
+
+__all__ = ["WIDTHS", "annotate", "clear_cache", "ensure_variants", "generate_variants", "lookup"]
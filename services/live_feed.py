@@ -0,0 +1,238 @@
+"""Aggregated live state for coaching and overlay clients.
+
+The coaching panel, ``/live-log`` and the overlays each poll their own
+endpoints (``/api/timer``, ``/live-json/<corner>_bpm``, ``/api/tags``,
+``/live-json/round_status``) every second, so a tablet on venue Wi-Fi makes
+four or more requests a second and can render the timer from one moment and
+the heart rates from another.
+
+:class:`LiveFeed` samples all of those sources together on one thread every
+``LIVE_FEED_INTERVAL`` seconds (default ``0.5``) while anyone is subscribed.
+Each change is numbered and stored as a delta: only the keys that changed, with
+the removed keys of each object listed under :data:`DELETED` (``"$del"``), so a
+value that becomes ``None`` is sent as ``null`` rather than read as a removal;
+lists are replaced whole.  :meth:`LiveFeed.stream`
+renders the feed as Server-Sent Events: one ``snapshot`` event with the full
+state, then ``delta`` events.  Every event carries ``<boot>-<seq>`` as the
+SSE ``id``, so a reconnecting ``EventSource`` sends ``Last-Event-ID`` and
+receives just the deltas it missed, or a fresh snapshot once those have fallen
+out of the ``LIVE_FEED_HISTORY`` most recent changes (default ``256``).  The
+boot id is random per feed, so after a server restart, when sequence numbers
+start again from 1, a client's old id never matches and it gets a snapshot.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from collections.abc import Callable, Iterator, Mapping
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+INTERVAL = float(os.getenv("LIVE_FEED_INTERVAL", "0.5"))
+HISTORY = int(os.getenv("LIVE_FEED_HISTORY", "256"))
+HEARTBEAT = 15.0
+
+Source = Callable[[], Any]
+DELETED = "$del"
+
+
+def diff(old: Mapping[str, Any], new: Mapping[str, Any]) -> dict[str, Any]:
+    """Return the delta turning ``old`` into ``new``."""
+
+    delta: dict[str, Any] = {}
+    for key, value in new.items():
+        before = old.get(key)
+        if isinstance(value, dict) and isinstance(before, dict):
+            sub = diff(before, value)
+            if sub:
+                delta[key] = sub
+        elif key not in old or before != value:
+            delta[key] = value
+    removed = [key for key in old if key not in new]
+    if removed:
+        delta[DELETED] = removed
+    return delta
+
+
+def apply(state: Mapping[str, Any], delta: Mapping[str, Any]) -> dict[str, Any]:
+    """Return ``state`` with ``delta`` applied."""
+
+    out = dict(state)
+    for key in delta.get(DELETED, ()):
+        out.pop(key, None)
+    for key, value in delta.items():
+        if key == DELETED:
+            continue
+        if isinstance(value, dict) and isinstance(out.get(key), dict):
+            out[key] = apply(out[key], value)
+        else:
+            out[key] = value
+    return out
+
+
+def _event(kind: str, event_id: str, data: Any) -> str:
+    return f"id: {event_id}\nevent: {kind}\ndata: {json.dumps(data, separators=(',', ':'), default=str)}\n\n"
+
+
+class LiveFeed:
+    """Sample ``sources`` into one numbered state with delta history."""
+
+    def __init__(
+        self,
+        sources: Mapping[str, Source],
+        interval: float | None = None,
+        history: int | None = None,
+        boot: str | None = None,
+    ) -> None:
+        self.sources = dict(sources)
+        self.boot = boot or uuid.uuid4().hex[:12]
+        self.interval = INTERVAL if interval is None else interval
+        self.seq = 0
+        self.state: dict[str, Any] = {}
+        self._history: deque[tuple[int, dict[str, Any]]] = deque(maxlen=history or HISTORY)
+        self._cond = threading.Condition()
+        # Serialises polls so a slow sample cannot overwrite a newer one.
+        self._poll_lock = threading.Lock()
+        self._sampled = 0.0
+        self._subscribers = 0
+        self._thread: threading.Thread | None = None
+
+    def _collect(self) -> dict[str, Any]:
+        state = {}
+        for name, source in self.sources.items():
+            try:
+                state[name] = source()
+            except Exception:
+                logger.debug("Live feed source %s failed", name, exc_info=True)
+                # Keep the last good value rather than flapping to empty.
+                if name in self.state:
+                    state[name] = self.state[name]
+        return state
+
+    def poll(self) -> dict[str, Any] | None:
+        """Sample every source now; return the delta if anything changed."""
+
+        with self._poll_lock:
+            new = self._collect()
+            with self._cond:
+                self._sampled = time.monotonic()
+                delta = diff(self.state, new)
+                if not delta and self.seq:
+                    return None
+                self.seq += 1
+                self.state = new
+                self._history.append((self.seq, delta))
+                self._cond.notify_all()
+                return delta
+
+    def fresh(self) -> None:
+        """Poll unless the sampler thread or a recent poll already has."""
+
+        with self._cond:
+            stale = self._thread is None and time.monotonic() - self._sampled >= self.interval
+        if stale or not self.seq:
+            self.poll()
+
+    def event_id(self, seq: int) -> str:
+        return f"{self.boot}-{seq}"
+
+    def parse_id(self, value: object) -> int | None:
+        """Return the sequence number in event id ``value`` if this feed issued it."""
+
+        boot, sep, seq = str(value or "").rpartition("-")
+        if not sep or boot != self.boot:
+            return None
+        try:
+            return int(seq)
+        except ValueError:
+            return None
+
+    def snapshot(self) -> tuple[int, dict[str, Any]]:
+        with self._cond:
+            return self.seq, copy.deepcopy(self.state)
+
+    def since(self, seq: int) -> list[tuple[int, dict[str, Any]]] | None:
+        """Return the deltas after ``seq``, or ``None`` if some are no longer kept."""
+
+        with self._cond:
+            if seq > self.seq:
+                return None
+            if seq == self.seq:
+                return []
+            if not self._history or self._history[0][0] > seq + 1:
+                return None
+            return [item for item in self._history if item[0] > seq]
+
+    # -- sampler --------------------------------------------------------
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.poll()
+            except Exception:  # pragma: no cover - defensive
+                logger.exception("Live feed poll failed")
+            with self._cond:
+                self._cond.wait_for(lambda: not self._subscribers, self.interval)
+                if not self._subscribers:
+                    self._thread = None
+                    return
+
+    def subscribe(self) -> None:
+        with self._cond:
+            self._subscribers += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="live-feed", daemon=True)
+                self._thread.start()
+
+    def unsubscribe(self) -> None:
+        with self._cond:
+            self._subscribers = max(0, self._subscribers - 1)
+            self._cond.notify_all()
+
+    def wait(self, seq: int, timeout: float) -> bool:
+        """Block until a change after ``seq`` exists or ``timeout`` passes."""
+
+        with self._cond:
+            return self._cond.wait_for(lambda: self.seq > seq, timeout)
+
+    # -- Server-Sent Events -----------------------------------------------
+
+    def stream(self, last_id: str | None = None, heartbeat: float = HEARTBEAT) -> Iterator[str]:
+        """Yield SSE events: a snapshot (or the deltas missed since ``last_id``), then deltas."""
+
+        self.subscribe()
+        try:
+            self.fresh()
+            last = self.parse_id(last_id) if last_id is not None else None
+            backlog = self.since(last) if last is not None else None
+            if backlog is None:
+                seq, state = self.snapshot()
+                yield _event("snapshot", self.event_id(seq), state)
+            else:
+                seq = last
+            while True:
+                if backlog is None:
+                    backlog = self.since(seq)
+                if backlog is None:
+                    # Fell behind the kept history: resynchronise.
+                    seq, state = self.snapshot()
+                    yield _event("snapshot", self.event_id(seq), state)
+                else:
+                    for seq, delta in backlog:
+                        yield _event("delta", self.event_id(seq), delta)
+                backlog = None
+                if not self.wait(seq, heartbeat):
+                    yield ": keepalive\n\n"
+        finally:
+            self.unsubscribe()
+
+
+__all__ = ["DELETED", "LiveFeed", "apply", "diff"]
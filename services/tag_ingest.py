@@ -0,0 +1,465 @@
+"""Low-latency ingestion of coach tags.
+
+A tag used to be written four or five times on the request path: a row in
+``events.csv`` and ``tags.csv`` for each fighter plus a full read-modify-write
+of ``tag_log.json``.  :class:`BoutLog` instead appends every event exactly once
+to ``tag_events.jsonl`` in the bout's log directory through a file descriptor
+kept open in append mode, and keeps per-fighter and per-round indexes in
+memory.
+
+Each log also maintains a :class:`TagIndex` (per round, fighter and type, plus
+the unique tags seen) so ``/api/tags`` and session summaries answer in
+proportion to the result.  :func:`csv_index` provides the same index for
+``events.csv`` files, parsing only the bytes appended since the last call.
+
+The legacy files are *views* derived from that log.  Views belong to the
+producer that registered them and only receive that producer's events, since
+the controller and the web UI each keep their own legacy files.  Each view
+remembers how many events it has consumed (``tag_events.views.json``) and a background
+thread brings dirty views up to date ``TAG_VIEW_DELAY`` seconds (default
+``0.25``) after the first pending event, so a burst of taps costs one CSV
+append and one JSON rewrite.  Readers that need the legacy files to be
+current call :func:`flush` first; it is also run at interpreter exit.
+"""
+
+from __future__ import annotations
+
+import atexit
+import csv
+import heapq
+import io
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from pathlib import Path
+
+from utils import dir_cache, files
+
+logger = logging.getLogger(__name__)
+
+LOG_NAME = "tag_events.jsonl"
+OFFSETS_NAME = "tag_events.views.json"
+VIEW_DELAY = float(os.getenv("TAG_VIEW_DELAY", "0.25"))
+MAX_OPEN_LOGS = 8
+
+
+def round_key(round_id: object) -> str:
+    """Normalise ``"round_1"``, ``"Round_1"`` and ``"1"`` to the same key."""
+
+    return str(round_id or "").strip().lower().removeprefix("round_")
+
+
+class TagIndex:
+    """Incremental index of tag events.
+
+    Events are bucketed by ``(round, fighter, type)`` with their sequence
+    number, so filtered queries merge only the matching buckets.  The unique
+    ``(prefix, label)`` pairs of ``type == "tag"`` events are kept per round
+    in first-seen order.
+    """
+
+    def __init__(self) -> None:
+        self._seq = 0
+        self._buckets: dict[tuple[str, str, str], list[tuple[int, str]]] = {}
+        self._unique: dict[str, dict[tuple[str, str], str]] = {}
+        self._unique_all: dict[tuple[str, str], str] = {}
+
+    def __len__(self) -> int:
+        return self._seq
+
+    def add(self, round_id: object, fighter: object, etype: object, tag: object) -> None:
+        tag = str(tag or "").strip()
+        if not tag:
+            return
+        etype = str(etype or "").strip().lower()
+        rnd = round_key(round_id)
+        self._buckets.setdefault((rnd, str(fighter or ""), etype), []).append((self._seq, tag))
+        self._seq += 1
+        if etype == "tag":
+            prefix, _, label = tag.partition(" ")
+            key = (prefix.upper(), label)
+            self._unique.setdefault(rnd, {}).setdefault(key, prefix)
+            self._unique_all.setdefault(key, prefix)
+
+    def add_event(self, event: dict) -> None:
+        self.add(event.get("round"), event.get("fighter"), event.get("type"), event.get("tag"))
+
+    def _select(self, round_id, fighter, etype) -> Iterator[list[tuple[int, str]]]:
+        rnd = round_key(round_id) if round_id else None
+        etype = etype.lower() if etype else None
+        for (r, f, t), bucket in self._buckets.items():
+            if (rnd is None or r == rnd) and (fighter is None or f == fighter) and (etype is None or t == etype):
+                yield bucket
+
+    def tags(self, round_id: str | None = None, fighter: str | None = None, etype: str | None = "tag") -> list[str]:
+        """Return tags in logged order, optionally filtered."""
+
+        buckets = list(self._select(round_id, fighter, etype))
+        if len(buckets) == 1:
+            return [tag for _, tag in buckets[0]]
+        return [tag for _, tag in heapq.merge(*buckets)]
+
+    def unique(self, round_id: str | None = None) -> list[tuple[str, str]]:
+        """Return distinct ``(prefix, label)`` pairs of ``tag`` events."""
+
+        seen = self._unique.get(round_key(round_id), {}) if round_id else self._unique_all
+        return [(prefix, label) for (_, label), prefix in seen.items()]
+
+
+class _CsvIndex:
+    def __init__(self, ino: int, header: bytes) -> None:
+        self.ino = ino
+        self.header = header
+        self.offset = len(header)
+        self.columns: list[str] = next(csv.reader([header.decode("utf-8-sig")]), [])
+        self.index = TagIndex()
+
+    def feed(self, chunk: bytes) -> None:
+        col = {name: i for i, name in enumerate(self.columns)}
+        tag_i = col.get("tag", col.get("content"))
+        round_i = col.get("round", col.get("round_id"))
+        type_i = col.get("type")
+        fighter_i = col.get("fighter", col.get("fighter_name"))
+        for row in csv.reader(io.StringIO(chunk.decode("utf-8"), newline="")):
+            self.index.add(_cell(row, round_i), _cell(row, fighter_i), _cell(row, type_i), _cell(row, tag_i))
+
+
+def _cell(row: list[str], i: int | None) -> str:
+    return row[i] if i is not None and i < len(row) else ""
+
+
+_csv_lock = threading.Lock()
+_csv_indexes: dict[str, _CsvIndex] = {}
+
+
+def csv_index(path: str | Path) -> TagIndex:
+    """Return a :class:`TagIndex` over the ``events.csv`` at ``path``.
+
+    Only complete rows appended since the previous call are parsed; a file
+    that was replaced or truncated is re-indexed from the start.  Raises
+    :class:`FileNotFoundError` when ``path`` does not exist.
+    """
+
+    key = str(path)
+    with _csv_lock, open(path, "rb") as fh:
+        st = os.fstat(fh.fileno())
+        entry = _csv_indexes.get(key)
+        if entry is not None:
+            if entry.ino != st.st_ino or st.st_size < entry.offset or fh.read(len(entry.header)) != entry.header:
+                entry = None
+        if entry is None:
+            fh.seek(0)
+            header = fh.readline()
+            if not header.endswith(b"\n"):
+                return TagIndex()
+            entry = _csv_indexes[key] = _CsvIndex(st.st_ino, header)
+        if st.st_size > entry.offset:
+            fh.seek(entry.offset)
+            chunk = fh.read(st.st_size - entry.offset)
+            end = chunk.rfind(b"\n") + 1
+            if end:
+                entry.feed(chunk[:end])
+                entry.offset += end
+        return entry.index
+
+
+class CsvView:
+    """Append events as CSV rows; ``path_for`` picks the file per event."""
+
+    def __init__(
+        self,
+        name: str,
+        path_for: Callable[[dict], Path],
+        header: Sequence[str],
+        row: Callable[[dict], Sequence],
+    ) -> None:
+        self.name = name
+        self._path_for = path_for
+        self._header = list(header)
+        self._row = row
+
+    def apply(self, events: Sequence[dict]) -> None:
+        groups: dict[Path, list[Sequence]] = {}
+        for event in events:
+            groups.setdefault(self._path_for(event), []).append(self._row(event))
+        for path, rows in groups.items():
+            dir_cache.ensure(path.parent)
+            new = not path.exists()
+            with open(path, "a", newline="", encoding="utf-8") as fh:
+                writer = csv.writer(fh)
+                if new:
+                    writer.writerow(self._header)
+                writer.writerows(rows)
+
+
+class JsonListView:
+    """Maintain a JSON list at ``path`` with one entry per event.
+
+    New entries are appended in place with
+    :func:`utils.files.append_json_list`; the existing list is never re-read.
+    """
+
+    def __init__(self, name: str, path: Path, entry: Callable[[dict], dict], indent: int | None = 2) -> None:
+        self.name = name
+        self._path = Path(path)
+        self._entry = entry
+        self._indent = indent
+
+    def apply(self, events: Sequence[dict]) -> None:
+        dir_cache.ensure(self._path.parent)
+        files.append_json_list(self._path, [self._entry(e) for e in events], self._indent)
+
+
+class BoutLog:
+    """Append-only tag log for one bout directory."""
+
+    def __init__(self, log_dir: Path) -> None:
+        self.log_dir = Path(log_dir)
+        self.path = self.log_dir / LOG_NAME
+        self._lock = threading.Lock()
+        self._view_lock = threading.Lock()
+        self._events: list[dict] = []
+        self._index: dict[tuple[str, str], list[int]] = {}
+        self.index = TagIndex()
+        self._views: dict[str, tuple[str, object]] = {}
+        self.producers: set = set()
+        self._offsets: dict[str, int] = {}
+        self._fd: int | None = None
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        self._add(json.loads(line))
+                    except ValueError:
+                        logger.warning("Skipping corrupt line in %s", self.path)
+        except FileNotFoundError:
+            pass
+        try:
+            self._offsets = json.loads((self.log_dir / OFFSETS_NAME).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self._offsets = {}
+
+    def _add(self, event: dict) -> None:
+        self._index.setdefault((event.get("fighter", ""), event.get("round", "")), []).append(len(self._events))
+        self._events.append(event)
+        self.index.add_event(event)
+
+    def add_views(self, views: Iterable, producer: str = "default") -> None:
+        """Register ``producer``'s views not yet attached to this log."""
+
+        with self._view_lock:
+            for view in views:
+                self._views.setdefault(view.name, (producer, view))
+        if self.pending():
+            _worker.mark(self)
+
+    def append(self, event: dict, producer: str = "default") -> dict:
+        """Append ``event`` from ``producer`` to the log and schedule the views."""
+
+        event = {**event, "producer": producer}
+        line = (json.dumps(event, separators=(",", ":")) + "\n").encode("utf-8")
+        with self._lock:
+            if self._fd is None:
+                self.log_dir.mkdir(parents=True, exist_ok=True)
+                self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            os.write(self._fd, line)
+            self._add(event)
+        _worker.mark(self)
+        return event
+
+    def events(self, fighter: str | None = None, round_id: str | None = None) -> list[dict]:
+        """Return logged events, optionally limited to a fighter and/or round."""
+
+        with self._lock:
+            if fighter is None and round_id is None:
+                return list(self._events)
+            hits: list[int] = []
+            for (f, r), idxs in self._index.items():
+                if (fighter is None or f == fighter) and (round_id is None or r == round_id):
+                    hits.extend(idxs)
+            return [self._events[i] for i in sorted(hits)]
+
+    def recent(self, count: int) -> list[dict]:
+        """Return the last ``count`` logged events, oldest first."""
+
+        with self._lock:
+            return self._events[-count:] if count > 0 else []
+
+    def tags(self, round_id: str | None = None, fighter: str | None = None, etype: str | None = "tag") -> list[str]:
+        """Return tag contents from :attr:`index`."""
+
+        with self._lock:
+            return self.index.tags(round_id, fighter, etype)
+
+    def unique(self, round_id: str | None = None) -> list[tuple[str, str]]:
+        """Return distinct ``(prefix, label)`` tag pairs from :attr:`index`."""
+
+        with self._lock:
+            return self.index.unique(round_id)
+
+    def pending(self) -> bool:
+        n = len(self._events)
+        return any(self._offsets.get(name, 0) < n for name in self._views)
+
+    def materialize(self) -> None:
+        """Bring every registered view up to date with the log."""
+
+        with self._view_lock:
+            with self._lock:
+                events = list(self._events)
+            changed = False
+            for name, (producer, view) in self._views.items():
+                start = self._offsets.get(name, 0)
+                if start >= len(events):
+                    continue
+                # Events logged before producers were recorded feed every view.
+                mine = [e for e in events[start:] if e.get("producer", producer) == producer]
+                try:
+                    if mine:
+                        view.apply(mine)
+                except OSError:
+                    logger.exception("Could not update %s for %s", name, self.log_dir)
+                    continue
+                self._offsets[name] = len(events)
+                changed = True
+            if changed:
+                tmp = self.log_dir / f"{OFFSETS_NAME}.tmp"
+                tmp.write_text(json.dumps(self._offsets), encoding="utf-8")
+                os.replace(tmp, self.log_dir / OFFSETS_NAME)
+
+    def close(self) -> None:
+        self.materialize()
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+
+class _ViewWorker:
+    """Background thread that materialises dirty views after a short delay."""
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._dirty: dict[str, BoutLog] = {}
+        self._since: float | None = None
+        self._thread: threading.Thread | None = None
+
+    def mark(self, log: BoutLog) -> None:
+        with self._cond:
+            self._dirty[str(log.log_dir)] = log
+            if self._since is None:
+                self._since = time.monotonic()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="tag-views", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def _take(self) -> list[BoutLog]:
+        with self._cond:
+            logs = list(self._dirty.values())
+            self._dirty.clear()
+            self._since = None
+            return logs
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._since is None:
+                    self._cond.wait()
+                wait = self._since + VIEW_DELAY - time.monotonic()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+            self.flush()
+
+    def flush(self) -> None:
+        for log in self._take():
+            try:
+                log.materialize()
+            except Exception:
+                logger.exception("Could not materialise tag views for %s", log.log_dir)
+
+
+_worker = _ViewWorker()
+_logs_lock = threading.Lock()
+_logs: OrderedDict[str, BoutLog] = OrderedDict()
+
+
+def open_log(
+    log_dir: str | Path,
+    views: Callable[[], Iterable] | None = None,
+    producer: str = "default",
+) -> BoutLog:
+    """Return the :class:`BoutLog` for ``log_dir``.
+
+    ``views`` is a factory for the legacy views ``producer`` maintains; it is
+    only called the first time that producer opens the log in this process.
+    Those views only see events appended with the same ``producer``.
+    """
+
+    key = str(Path(log_dir))
+    evicted: list[BoutLog] = []
+    with _logs_lock:
+        log = _logs.get(key)
+        if log is None:
+            log = _logs[key] = BoutLog(Path(log_dir))
+            while len(_logs) > MAX_OPEN_LOGS:
+                evicted.append(_logs.popitem(last=False)[1])
+        else:
+            _logs.move_to_end(key)
+    for old in evicted:
+        old.close()
+    if views is not None and producer not in log.producers:
+        log.producers.add(producer)
+        log.add_views(views(), producer)
+    return log
+
+
+def flush() -> None:
+    """Materialise all pending views now.
+
+    Every open log is brought up to date, including one the background worker
+    is already materialising: :meth:`BoutLog.materialize` waits for it.
+    """
+
+    _worker.flush()
+    with _logs_lock:
+        logs = list(_logs.values())
+    for log in logs:
+        try:
+            log.materialize()
+        except Exception:
+            logger.exception("Could not materialise tag views for %s", log.log_dir)
+
+
+def close_all() -> None:
+    """Materialise views and close every open log."""
+
+    with _logs_lock:
+        logs = list(_logs.values())
+        _logs.clear()
+    for log in logs:
+        log.close()
+
+
+atexit.register(close_all)
+
+
+__all__ = [
+    "BoutLog",
+    "CsvView",
+    "JsonListView",
+    "TagIndex",
+    "close_all",
+    "csv_index",
+    "flush",
+    "open_log",
+    "round_key",
+]
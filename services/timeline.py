@@ -0,0 +1,426 @@
+"""Time-aligned bout timeline.
+
+Bout data is recorded against several time bases: heart-rate samples in
+``hr_continuous.json`` carry ISO timestamps or elapsed seconds, ``hr_log.csv``
+rows written by :func:`FightControl.round_manager.log_bpm` use a ``0``
+placeholder, coach tags carry wall-clock strings, and round transitions and
+OBS recording segments were not recorded per bout at all.  :func:`load_timeline`
+ingests every stream of a bout directory once and normalises it to a single
+bout clock: seconds since round 1 started.
+
+Round transitions and recording segments are appended to ``timeline.jsonl`` by
+:func:`mark` with both the wall time and :func:`time.monotonic`.  Marks from the
+same process are spaced by their monotonic readings, so clock adjustments
+during a bout cannot reorder them; the wall time only anchors the first mark of
+each process.  ``hr_log.csv`` placeholder rows are assumed to be one second
+apart from the start of their round.  Heart-rate samples with only elapsed
+seconds are placed relative to the HR logger's start, taken from a sample that
+has both fields or else from the first mark; without either they are skipped.
+
+Streams are sorted once by bout time after ingest, so :meth:`Timeline.between` and
+:meth:`Timeline.in_round` ("everything between 1:30 and 1:45 of round 3") are
+binary searches.  Loaded timelines are cached until one of their source files
+changes.
+"""
+
+from __future__ import annotations
+
+import bisect
+import csv
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Iterable, Sequence
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+MARKS_NAME = "timeline.jsonl"
+STREAMS = ("round", "hr", "tag", "recording")
+SOURCES = (
+    MARKS_NAME,
+    "bout.json",
+    "hr_continuous.json",
+    "tag_events.jsonl",
+    "events.csv",
+    "tag_log.csv",
+)
+
+_BOOT = f"{os.getpid()}-{time.time():.6f}"
+
+
+def parse_clock(value: object) -> float:
+    """Return seconds for ``90``, ``"90.5"``, ``"1:30"`` or ``"1:02:03"``."""
+
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip()
+    seconds = 0.0
+    for part in text.split(":"):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def _wall(value: object) -> datetime | None:
+    if isinstance(value, datetime):
+        dt = value
+    else:
+        text = str(value or "").strip()
+        if not text or text == "0":
+            return None
+        try:
+            dt = datetime.fromisoformat(text.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if dt.tzinfo is not None:
+        dt = dt.astimezone().replace(tzinfo=None)
+    return dt
+
+
+def mark(session_dir: str | Path, stream: str, **fields: object) -> dict:
+    """Append a timestamped ``stream`` event to the bout's ``timeline.jsonl``."""
+
+    entry = {
+        "stream": stream,
+        "wall": datetime.now().isoformat(),
+        "mono": time.monotonic(),
+        "boot": _BOOT,
+        **fields,
+    }
+    path = Path(session_dir) / MARKS_NAME
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as fh:
+        fh.write(json.dumps(entry, separators=(",", ":")) + "\n")
+    return entry
+
+
+class Timeline:
+    """Streams of events on one bout clock, each sorted by time."""
+
+    def __init__(self, origin: datetime | None = None) -> None:
+        self.origin = origin
+        self._times: dict[str, list[float]] = {}
+        self._items: dict[str, list[dict]] = {}
+        self._unsorted: set = set()
+        self.rounds: dict[int, tuple[float, float | None]] = {}
+
+    def at(self, value: object) -> float | None:
+        """Convert a wall-clock value to bout seconds."""
+
+        dt = _wall(value)
+        if dt is None or self.origin is None:
+            return None
+        return (dt - self.origin).total_seconds()
+
+    def add(self, stream: str, t: float, item: dict) -> None:
+        """Append ``item`` at ``t``; streams are sorted once, on first read."""
+
+        self._times.setdefault(stream, [])
+        self._items.setdefault(stream, []).append({**item, "t": t})
+        self._unsorted.add(stream)
+
+    def sort(self) -> None:
+        """Sort every stream that has had items added since the last sort."""
+
+        for name in self._unsorted:
+            items = self._items[name]
+            items.sort(key=lambda item: item["t"])
+            self._times[name] = [item["t"] for item in items]
+        self._unsorted.clear()
+
+    def streams(self) -> list[str]:
+        return [s for s in STREAMS if s in self._times] + sorted(s for s in self._times if s not in STREAMS)
+
+    def stream(self, name: str) -> list[dict]:
+        self.sort()
+        return list(self._items.get(name, []))
+
+    def between(self, start: float, end: float, streams: Iterable[str] | None = None) -> dict[str, list[dict]]:
+        """Return items with ``start <= t <= end`` for each stream."""
+
+        self.sort()
+        out: dict[str, list[dict]] = {}
+        for name in streams or self.streams():
+            times = self._times.get(name, [])
+            lo = bisect.bisect_left(times, start)
+            hi = bisect.bisect_right(times, end)
+            out[name] = self._items[name][lo:hi] if times else []
+        return out
+
+    def round_start(self, number: int) -> float:
+        try:
+            return self.rounds[int(number)][0]
+        except KeyError:
+            raise ValueError(f"round {number} not found") from None
+
+    def in_round(
+        self,
+        number: int,
+        start: object = 0,
+        end: object | None = None,
+        streams: Iterable[str] | None = None,
+    ) -> dict[str, list[dict]]:
+        """Return items between ``start`` and ``end`` (``"m:ss"``) of round ``number``."""
+
+        base = self.round_start(number)
+        if end is None:
+            stop = self.rounds[int(number)][1]
+            end_t = stop if stop is not None else float("inf")
+        else:
+            end_t = base + parse_clock(end)
+        return self.between(base + parse_clock(start), end_t, streams)
+
+    def to_dict(self, items: dict[str, list[dict]] | None = None) -> dict:
+        return {
+            "origin": self.origin.isoformat() if self.origin else None,
+            "rounds": [
+                {"round": n, "start": s, "end": e} for n, (s, e) in sorted(self.rounds.items())
+            ],
+            "streams": items if items is not None else {name: self.stream(name) for name in self.streams()},
+        }
+
+
+# ---------------------------------------------------------------------------
+# Ingest
+# ---------------------------------------------------------------------------
+
+
+def _read_json(path: Path, default):
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return default
+
+
+def _read_marks(session_dir: Path) -> list[dict]:
+    marks: list[dict] = []
+    try:
+        with open(session_dir / MARKS_NAME, encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    marks.append(json.loads(line))
+                except ValueError:
+                    logger.warning("Skipping corrupt timeline mark in %s", session_dir)
+    except FileNotFoundError:
+        pass
+    return marks
+
+
+def _tag_rows(session_dir: Path) -> list[dict]:
+    log = session_dir / "tag_events.jsonl"
+    if log.exists():
+        from services import tag_ingest
+
+        return tag_ingest.open_log(session_dir).events()
+    for name in ("events.csv", "tag_log.csv"):
+        path = session_dir / name
+        if path.exists():
+            paths: Sequence[Path] = [path]
+            break
+    else:
+        paths = sorted(session_dir.glob("*/tags.csv"))
+    rows: list[dict] = []
+    for path in paths:
+        try:
+            with open(path, newline="", encoding="utf-8-sig") as fh:
+                for row in csv.DictReader(fh):
+                    row = {(k or "").lower(): v for k, v in row.items()}
+                    row.setdefault("round", row.get("round_id") or path.parent.name)
+                    row.setdefault("tag", row.get("content") or row.get("value"))
+                    row.setdefault("timestamp", row.get("time"))
+                    rows.append(row)
+        except OSError:
+            continue
+    return rows
+
+
+def _round_number(value: object) -> int | None:
+    try:
+        return int(str(value).lower().replace("round_", "").strip())
+    except ValueError:
+        return None
+
+
+def _elapsed(sample: dict) -> float | None:
+    try:
+        return float(sample.get("seconds", sample.get("time")))
+    except (TypeError, ValueError):
+        return None
+
+
+def build_timeline(session_dir: str | Path) -> Timeline:
+    """Read every stream of ``session_dir`` onto one bout clock."""
+
+    session_dir = Path(session_dir)
+    meta = _read_json(session_dir / "bout.json", {})
+    meta = meta if isinstance(meta, dict) else {}
+    marks = _read_marks(session_dir)
+    hr = _read_json(session_dir / "hr_continuous.json", [])
+    hr = hr if isinstance(hr, list) else []
+    tags = _tag_rows(session_dir)
+
+    # Bout time zero: round 1 starting, else the earliest thing we know of.
+    origin = min(
+        (
+            _wall(m.get("wall"))
+            for m in marks
+            if m.get("stream") == "round" and m.get("event") == "start" and _round_number(m.get("round")) == 1
+        ),
+        default=None,
+    ) or _wall(meta.get("start_time"))
+    if origin is None:
+        walls = [_wall(m.get("wall")) for m in marks]
+        walls += [_wall(x.get("timestamp")) for x in hr if isinstance(x, dict)]
+        walls += [_wall(r.get("timestamp")) for r in tags]
+        origin = min((w for w in walls if w is not None), default=None)
+    tl = Timeline(origin)
+
+    # Marks: monotonic spacing within a process, wall clock across processes.
+    anchors: dict[str, tuple[float, float]] = {}
+    for m in marks:
+        boot, mono = m.get("boot"), m.get("mono")
+        if boot in anchors and isinstance(mono, (int, float)):
+            t0, mono0 = anchors[boot]
+            t = t0 + (mono - mono0)
+        else:
+            t = tl.at(m.get("wall"))
+            if t is None:
+                continue
+            if boot is not None and isinstance(mono, (int, float)):
+                anchors[boot] = (t, mono)
+        item = {k: v for k, v in m.items() if k not in ("stream", "mono", "boot")}
+        tl.add(m.get("stream", "mark"), t, item)
+        if m.get("stream") == "round":
+            n = _round_number(m.get("round"))
+            if n is None:
+                continue
+            start, end = tl.rounds.get(n, (t, None))
+            if m.get("event") == "start":
+                tl.rounds[n] = (t, end)
+            elif m.get("event") == "end":
+                tl.rounds[n] = (start, t)
+
+    # Without marks, rounds follow the configured round and rest durations.
+    if not tl.rounds:
+        try:
+            dur = float(meta.get("round_duration") or 0)
+            rest = float(meta.get("rest_duration") or 0)
+            total = int(meta.get("total_rounds") or meta.get("rounds") or 0)
+        except (TypeError, ValueError):
+            dur = rest = total = 0
+        if dur > 0:
+            for n in range(1, max(total, 1) + 1):
+                start = (n - 1) * (dur + rest)
+                tl.rounds[n] = (start, start + dur)
+
+    # Samples without a timestamp only carry seconds since the HR logger
+    # started.  Anchor them to a timestamped sample that also has elapsed
+    # seconds, else to the first mark; with neither they cannot be placed.
+    hr_anchor: float | None = None
+    for sample in hr:
+        if isinstance(sample, dict):
+            t = tl.at(sample.get("timestamp"))
+            elapsed = _elapsed(sample)
+            if t is not None and elapsed is not None:
+                hr_anchor = t - elapsed
+                break
+    if hr_anchor is None:
+        marked = [item["t"] for name in tl.streams() for item in tl.stream(name)]
+        hr_anchor = min(marked, default=None)
+    skipped = 0
+    for sample in hr:
+        if not isinstance(sample, dict):
+            continue
+        t = tl.at(sample.get("timestamp"))
+        if t is None:
+            elapsed = _elapsed(sample)
+            if elapsed is None or hr_anchor is None:
+                skipped += elapsed is not None
+                continue
+            t = hr_anchor + elapsed
+        tl.add("hr", t, {**sample, "source": "hr_continuous.json"})
+    if skipped:
+        logger.debug("Skipped %d unanchored HR samples in %s", skipped, session_dir)
+
+    for n, (start, _end) in sorted(tl.rounds.items()):
+        path = session_dir / f"round_{n}" / "hr_log.csv"
+        try:
+            lines = path.read_text(encoding="utf-8").splitlines()
+        except OSError:
+            continue
+        for i, line in enumerate(filter(None, lines)):
+            parts = line.split(",")
+            t = tl.at(parts[0])
+            try:
+                bpm = float(parts[1])
+            except (IndexError, ValueError):
+                continue
+            tl.add("hr", start + i if t is None else t, {"bpm": bpm, "round": n, "source": "hr_log.csv"})
+
+    for row in tags:
+        t = tl.at(row.get("timestamp"))
+        if t is not None:
+            tl.add("tag", t, dict(row))
+
+    tl.sort()
+    return tl
+
+
+_cache_lock = threading.Lock()
+_cache: dict[str, tuple[tuple, Timeline]] = {}
+
+
+def _stamp(session_dir: Path) -> tuple:
+    stamp = []
+    for name in SOURCES:
+        try:
+            st = (session_dir / name).stat()
+            stamp.append((name, st.st_mtime_ns, st.st_size))
+        except OSError:
+            stamp.append((name, None, None))
+    for path in sorted(session_dir.glob("round_*/*.csv")):
+        try:
+            st = path.stat()
+            stamp.append((str(path), st.st_mtime_ns, st.st_size))
+        except OSError:
+            # Removed between the glob and the stat.
+            stamp.append((str(path), None, None))
+    return tuple(stamp)
+
+
+def load_timeline(session_dir: str | Path) -> Timeline:
+    """Return the cached :class:`Timeline` for ``session_dir``, rebuilding on change."""
+
+    from services import tag_ingest
+
+    tag_ingest.flush()
+    session_dir = Path(session_dir)
+    stamp = _stamp(session_dir)
+    key = str(session_dir)
+    with _cache_lock:
+        hit = _cache.get(key)
+        if hit is not None and hit[0] == stamp:
+            return hit[1]
+    tl = build_timeline(session_dir)
+    with _cache_lock:
+        _cache[key] = (stamp, tl)
+    return tl
+
+
+def clear_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
+
+
+__all__ = [
+    "MARKS_NAME",
+    "Timeline",
+    "build_timeline",
+    "clear_cache",
+    "load_timeline",
+    "mark",
+    "parse_clock",
+]
@@ -6,7 +6,9 @@ import json
 import statistics
 from pathlib import Path
 
+import fight_state
 from FightControl.round_manager import round_status
+from utils.fighter_history import record_summary
 from utils_checks import load_tags
 
 
@@ -158,15 +160,36 @@ def calc_round_metrics(hr_series: list[dict]) -> dict[str, dict]:
     return metrics
 
 
-def build_session_summary(session_dir: str | Path) -> dict:
-    """Create ``session_summary.json`` in ``session_dir``."""
+def build_session_summary(
+    session_dir: str | Path,
+    fighter: str | None = None,
+    date: str | None = None,
+    bout: str | None = None,
+    round_results: dict | None = None,
+) -> dict:
+    """Create ``session_summary.json`` for one fighter's bout.
+
+    Tags are read from ``session_dir``.  When ``fighter``, ``date`` and
+    ``bout`` are given, the HR series is the fighter's own ``hr_data.json``
+    written by the HR logger under ``fighter_data/<fighter>/<date>/<bout>``,
+    and the summary is written there too; otherwise both live in
+    ``session_dir``.  The summary is also recorded in the cross-bout fighter
+    history index.  ``round_results`` defaults to the live round status and is
+    passed explicitly when re-analysing old bouts.
+    """
     session_dir = Path(session_dir)
+    out_dir = session_dir
+    if fighter and date and bout:
+        out_dir = fight_state.get_session_dir(fighter, date, bout)
 
     # Load HR series if available
-    try:
-        hr_series = json.loads((session_dir / "hr_data.json").read_text(encoding="utf-8"))
-    except Exception:
-        hr_series = []
+    hr_series = []
+    for hr_dir in dict.fromkeys((out_dir, session_dir)):
+        try:
+            hr_series = json.loads((hr_dir / "hr_data.json").read_text(encoding="utf-8"))
+            break
+        except Exception:
+            continue
 
     summary = {
         "tags": load_tags(session_dir),
@@ -176,10 +199,14 @@ def build_session_summary(session_dir: str | Path) -> dict:
         "round_metrics": calc_round_metrics(hr_series),
     }
 
-    try:
-        summary["round_results"] = round_status()
-    except Exception:
-        pass
+    if round_results is not None:
+        summary["round_results"] = round_results
+    else:
+        try:
+            summary["round_results"] = round_status()
+        except Exception:
+            pass
 
-    (session_dir / "session_summary.json").write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    (out_dir / "session_summary.json").write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    record_summary(out_dir, summary, fighter=fighter, date=date, bout=bout)
     return summary
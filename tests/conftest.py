@@ -13,11 +13,24 @@ import pytest  # noqa: E402
 
 from boot_state import set_boot_state  # noqa: E402
 
+# Charts import matplotlib lazily, so load the real package (when installed)
+# before test modules register their ``setdefault`` stubs for it.
+try:
+    import matplotlib  # noqa: E402
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot  # noqa: E402,F401
+except ImportError:  # pragma: no cover - optional dependency
+    pass
+
 os.environ.setdefault("BASE_DIR", str(ROOT))
 os.environ.setdefault("OBS_WS_URL", "ws://127.0.0.1:4455")
 os.environ.setdefault("OBS_WS_PASSWORD", "changeme")
 os.environ.setdefault("CYCLONE_DEFER_OBS_INIT", "1")
 os.environ.setdefault("MEDIAMTX_PATH", str(ROOT / "mediamtx.yml"))
+# Tests read ``fighters.json`` straight after a write; export the view
+# synchronously instead of coalescing on a timer.
+os.environ.setdefault("FIGHTERS_JSON_VIEW_DELAY", "0")
 
 
 @pytest.fixture(autouse=True, scope="session")
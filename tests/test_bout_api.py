@@ -62,3 +62,26 @@ def test_bout_endpoints(tmp_path):
     resp = client.get(f"/api/bout/{base}/hr")
     assert resp.status_code == 200
     assert resp.get_json() == [{"bpm": 123}]
+
+
+def test_bout_hr_resolution(tmp_path):
+    app = setup_app(tmp_path)
+    client = app.test_client()
+
+    fighter, date, bout = _create_bout(tmp_path)
+    session_dir = tmp_path / "FightControl" / "logs" / date / bout
+    samples = [{"seconds": i, "bpm": 100 + i % 10} for i in range(300)]
+    (session_dir / "hr_continuous.json").write_text(json.dumps(samples))
+    base = f"{fighter}/{date}/{bout}"
+
+    resp = client.get(f"/api/bout/{base}/hr?resolution=30s")
+    assert resp.status_code == 200
+    data = resp.get_json()
+    assert len(data) == 10
+    assert data[0]["min"] == 100 and data[0]["max"] == 109
+
+    resp = client.get(f"/api/bout/{base}/hr?max_points=100")
+    assert len(resp.get_json()) == 60
+
+    assert client.get(f"/api/bout/{base}/hr?resolution=7s").status_code == 400
+    assert client.get(f"/api/bout/{base}/hr?max_points=abc").status_code == 400
@@ -0,0 +1,52 @@
+import bout_context
+
+
+def test_identity_is_scanned_once_and_rollover_is_explicit(tmp_path, monkeypatch):
+    scans = []
+    monkeypatch.setattr(bout_context, "_scan", lambda *a: scans.append(a) or 3)
+    monkeypatch.setattr(bout_context, "safe_filename", lambda s: s.replace(" ", "_"))
+    bout_context.clear()
+    fight = {"red_fighter": "Red One", "blue_fighter": "Blue"}
+
+    armed = bout_context.arm(fight, "2099-01-01", tmp_path)
+    assert armed.name == "2099-01-01_RED_ONE_vs_BLUE_BOUT3"
+    assert armed.log_dir == tmp_path / "FightControl" / "logs" / "2099-01-01" / armed.name
+    assert armed.fighter_dirs[0] == tmp_path / "FightControl" / "fighter_data" / "Red_One" / "2099-01-01" / armed.name
+
+    for _ in range(5):
+        assert bout_context.current(fight, "2099-01-01", tmp_path) is armed
+        assert bout_context.ensure(fight, "2099-01-01", tmp_path) is armed
+    assert len(scans) == 1
+
+    assert bout_context.rollover().number == 4
+    assert bout_context.current(fight, "2099-01-01", tmp_path).number == 4
+    # Re-arming the same fighters never reuses a number, even without files.
+    assert bout_context.arm(fight, "2099-01-01", tmp_path).number == 5
+
+    # A different fight resumes the latest bout on disk.
+    other = bout_context.current({"red": "A", "blue": "B"}, "2099-01-01", tmp_path)
+    assert other.number == 2 and len(scans) == 3
+    bout_context.clear()
+
+
+def test_arming_creates_the_bout_tree_once(tmp_path, monkeypatch):
+    from FightControl import fighter_paths
+    from utils import dir_cache
+
+    monkeypatch.setattr(bout_context, "_scan", lambda *a: 1)
+    bout_context.clear()
+    bout = bout_context.arm({"red": "A", "blue": "B", "total_rounds": 3}, "2099-01-01", tmp_path)
+    assert all((bout.log_dir / f"round_{n}").is_dir() for n in (1, 2, 3))
+    assert all(d.is_dir() for d in bout.fighter_dirs)
+
+    monkeypatch.setattr(fighter_paths, "_base_dir", lambda: tmp_path)
+    monkeypatch.setattr(fighter_paths, "safe_filename", lambda s: s)
+    calls = []
+    monkeypatch.setattr(dir_cache.Path, "mkdir", lambda self, *a, **k: calls.append(self))
+    for _ in range(3):
+        assert fighter_paths.round_dir("A", bout.date, bout.name, "round_2") == bout.log_dir / "round_2"
+    assert calls == []
+    dir_cache.forget(tmp_path)
+    fighter_paths.round_dir("A", bout.date, bout.name, "round_2")
+    assert calls == [bout.log_dir / "round_2"]
+    bout_context.clear()
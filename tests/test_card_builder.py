@@ -0,0 +1,66 @@
+import os
+
+from PIL import Image
+
+from services import card_builder
+
+
+def _flags(tmp_path, monkeypatch):
+    flags = tmp_path / "flags"
+    flags.mkdir()
+    Image.new("RGB", (30, 20), (255, 0, 0)).save(flags / "gb.png")
+    monkeypatch.setattr(card_builder, "FLAGS_DIR", flags)
+    monkeypatch.setattr(card_builder, "FRONT_TEMPLATE", tmp_path / "no_template.png")
+    card_builder.clear_asset_cache()
+    return flags
+
+
+def test_assets_are_decoded_once_and_refreshed_on_change(tmp_path, monkeypatch):
+    flags = _flags(tmp_path, monkeypatch)
+
+    first = card_builder._load_flag("GB", (80, 80))
+    assert first.size == (80, 80)
+    assert card_builder._load_flag("gb", (80, 80)) is first
+    assert card_builder._load_flag("gb", (40, 40)).size == (40, 40)
+    assert card_builder._circle_mask(180) is card_builder._circle_mask(180)
+    assert card_builder._load_flag("zz", (80, 80)) is None
+
+    Image.new("RGB", (30, 20), (0, 0, 255)).save(flags / "gb.png")
+    os.utime(flags / "gb.png", ns=(1, 1))
+    refreshed = card_builder._load_flag("gb", (80, 80))
+    assert refreshed is not first
+    assert refreshed.getpixel((10, 10))[:3] == (0, 0, 255)
+    card_builder.clear_asset_cache()
+
+
+def test_compose_card_does_not_mutate_cached_background(tmp_path, monkeypatch):
+    _flags(tmp_path, monkeypatch)
+    back = tmp_path / "back.png"
+    Image.new("RGBA", (600, 400), (0, 0, 0, 255)).save(back)
+
+    card_builder.compose_card(back, tmp_path / "a.png", "Red", "gb", {"speed": 1})
+    cached = card_builder._cached_image(back)
+    assert cached.getpixel((250, 100)) == (0, 0, 0, 255)
+    with Image.open(tmp_path / "a.png") as out:
+        assert out.getpixel((250, 100))[:3] == (255, 0, 0)
+    card_builder.clear_asset_cache()
+
+
+def test_compose_cards_batch_preserves_order(tmp_path, monkeypatch):
+    _flags(tmp_path, monkeypatch)
+    back = tmp_path / "back.png"
+    Image.new("RGBA", (600, 400), (10, 10, 10, 255)).save(back)
+    jobs = [
+        {"back_img": back, "out_png": tmp_path / "red.png", "name": "Red", "country": "gb", "stats": {}},
+        (back, tmp_path / "blue.png", "Blue", None, {"power": 2}),
+    ]
+
+    assert card_builder.compose_cards(jobs, workers=1) == [str(tmp_path / "red.png"), str(tmp_path / "blue.png")]
+    assert (tmp_path / "red.png").exists() and (tmp_path / "blue.png").exists()
+
+    out = card_builder.compose_cards(
+        [(back, tmp_path / f"card{i}.png", f"F{i}", None, {}) for i in range(3)], workers=2
+    )
+    assert out == [str(tmp_path / f"card{i}.png") for i in range(3)]
+    assert all(os.path.exists(p) for p in out)
+    card_builder.clear_asset_cache()
@@ -0,0 +1,91 @@
+import importlib
+import os
+import sys
+import threading
+from pathlib import Path
+
+from services.card_queue import FAILED, MISSING, PENDING, READY, CardQueue
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+
+
+def _reload_utils(tmp_path, monkeypatch):
+    os.environ["BASE_DIR"] = str(tmp_path)
+    import fighter_utils
+    import paths
+
+    importlib.reload(paths)
+    importlib.reload(fighter_utils)
+    monkeypatch.setattr(fighter_utils, "safe_filename", lambda s: str(s).replace(" ", "_"))
+    (tmp_path / "FightControl" / "data").mkdir(parents=True, exist_ok=True)
+    return fighter_utils
+
+
+def _cleanup():
+    sys.modules.pop("fighter_utils", None)
+    sys.modules.pop("paths", None)
+    os.environ["BASE_DIR"] = str(BASE_DIR)
+
+
+def test_annotate_enqueues_and_reports_ready(tmp_path, monkeypatch):
+    fu = _reload_utils(tmp_path, monkeypatch)
+    photo = tmp_path / "red.png"
+    photo.write_bytes(b"png")
+    release = threading.Event()
+    calls = []
+
+    def render(fighter):
+        calls.append(fighter["name"])
+        release.wait(5)
+        fu.fighter_card_path(fighter).write_bytes(b"card")
+        return fighter
+
+    queue = CardQueue(render=render, max_workers=1)
+    fighter = {"name": "Red Fighter", "photo_local": str(photo)}
+    try:
+        first = queue.annotate(fighter)
+        assert first["card_status"] == PENDING
+        assert first["card_url"] == "/static/data/Red_Fighter_card.png"
+        assert "card_local" not in first
+
+        # Pending requests are coalesced rather than rendered twice.
+        assert queue.annotate(fighter)["card_status"] == PENDING
+        release.set()
+        assert queue.join(timeout=5)
+        assert calls == ["Red Fighter"]
+
+        ready = queue.annotate(fighter)
+        assert ready["card_status"] == READY
+        assert Path(ready["card_local"]) == fu.fighter_card_path(fighter)
+    finally:
+        release.set()
+        queue.shutdown()
+        _cleanup()
+
+
+def test_missing_failed_and_forced_rerender(tmp_path, monkeypatch):
+    fu = _reload_utils(tmp_path, monkeypatch)
+    photo = tmp_path / "blue.png"
+    photo.write_bytes(b"png")
+
+    def broken(fighter):
+        raise OSError("bad photo")
+
+    queue = CardQueue(render=broken, max_workers=1)
+    try:
+        assert queue.annotate({"name": "Nobody"})["card_status"] == MISSING
+        fighter = {"name": "Blue", "photo_local": str(photo)}
+        queue.annotate(fighter)
+        assert queue.join(timeout=5)
+        assert queue.status(fighter) == FAILED
+
+        card = fu.fighter_card_path(fighter)
+        card.write_bytes(b"old")
+        queue._render = lambda f: fu.fighter_card_path(f).write_bytes(b"new")
+        assert queue.enqueue(fighter, force=True) == PENDING
+        assert queue.join(timeout=5)
+        assert queue.status(fighter) == READY
+        assert card.read_bytes() == b"new"
+    finally:
+        queue.shutdown()
+        _cleanup()
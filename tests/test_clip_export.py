@@ -0,0 +1,58 @@
+import json
+import subprocess
+from datetime import datetime, timedelta
+
+from services import clip_export, timeline
+
+
+def test_tags_are_cut_from_every_recording(tmp_path):
+    start = datetime(2099, 1, 1, 20, 0, 0)
+    bout = tmp_path / "bout"
+    bout.mkdir()
+    marks = [
+        (0, "round", {"event": "start", "round": 1}),
+        (2, "recording", {"event": "start"}),
+        (30, "recording", {"event": "pause"}),
+        (40, "recording", {"event": "resume"}),
+    ]
+    with open(bout / timeline.MARKS_NAME, "w") as fh:
+        for secs, stream, fields in marks:
+            wall = (start + timedelta(seconds=secs)).isoformat()
+            fh.write(json.dumps({"stream": stream, "wall": wall, "mono": 100.0 + secs, "boot": "b", **fields}) + "\n")
+    (bout / "events.csv").write_text(
+        "timestamp,round,fighter,type,tag,meta\n"
+        f"{(start + timedelta(seconds=4)).isoformat()},round_1,red,tag,Jab,\n"
+        f"{(start + timedelta(seconds=60)).isoformat()},round_1,blue,tag,Hook,\n"
+    )
+    recordings = [tmp_path / "cam_a.mkv", tmp_path / "cam_b.mkv"]
+    calls = []
+
+    def runner(cmd):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0)
+
+    red_dir, blue_dir = tmp_path / "red", tmp_path / "blue"
+    result = clip_export.export_round(
+        bout,
+        1,
+        recordings,
+        {"red": "Red", "blue": "Blue"},
+        {"red": red_dir, "blue": blue_dir},
+        pre=5,
+        post=10,
+        ffmpeg="ffmpeg",
+        runner=runner,
+    )
+
+    assert len(calls) == 4 and all("copy" in cmd for cmd in calls)
+    # Jab: 2s into the recording, clamped at 0.  Hook: 58s less a 10s pause.
+    red = json.loads((red_dir / clip_export.INDEX_NAME).read_text())["clips"]
+    assert [(c["camera"], c["start"], c["duration"]) for c in red] == [("cam_a", 0.0, 12.0), ("cam_b", 0.0, 12.0)]
+    blue = result["blue"]
+    assert [(c["tag"], c["offset"], c["start"], c["duration"]) for c in blue][0] == ("Hook", 48.0, 43.0, 15.0)
+    assert blue[0]["path"].endswith("round_1/clips/cam_a_002_Hook.mkv")
+
+
+def test_missing_ffmpeg_skips_export(tmp_path, monkeypatch):
+    monkeypatch.setattr(clip_export, "ffmpeg_path", lambda: None)
+    assert clip_export.export_round(tmp_path, 1, [tmp_path / "a.mkv"], {}, {"red": tmp_path}) == {}
@@ -54,6 +54,9 @@ def test_log_tag_caches_modules(tmp_path, monkeypatch):
 
     ct.log_tag("red", "One")
     ct.log_tag("red", "Two")
+    from services import tag_ingest
+
+    tag_ingest.flush()
 
     assert reload_calls.count("paths") == 0
     assert reload_calls.count("fight_state") == 1
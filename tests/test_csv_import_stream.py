@@ -0,0 +1,87 @@
+import csv
+import io
+import json
+
+
+def _write_csv(path, rows):
+    headers = ["Full Name", "Weight Category (KG)", "Height\n", "Stance", "speed_2024-01-01", "power 2024-02-01"]
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(headers)
+        writer.writerows(rows)
+
+
+def test_import_csv_streams_batches_and_upserts(tmp_path, monkeypatch):
+    from FightControl.scripts import csv_to_fighter_json as importer
+    from utils import fighter_store
+
+    exports = []
+    real_export = fighter_store.export_json
+    monkeypatch.setattr(fighter_store, "export_json", lambda p: exports.append(p) or real_export(p))
+
+    src = tmp_path / "roster.csv"
+    _write_csv(
+        src,
+        [
+            ["Alice", "60", "170", "Orthodox", "10", "5.5"],
+            ["Bob", "70", "180", "Southpaw", "7", ""],
+            ["", "80", "175", "Orthodox", "9", ""],
+            ["Cara", "55", "160", "Orthodox", "12", "n/a"],
+            ["Dan", "90", "190", "Southpaw", "8", "inf"],
+            ["Eve", "65", "168", "Orthodox", "fast", ""],
+        ],
+    )
+    out = tmp_path / "fighters.json"
+    bob = {
+        "name": "Bob",
+        "email": "bob@example.com",
+        "photo": "bob.png",
+        "sessions": [{"date": "2024-01-01", "performance": {"jump": 3}}],
+    }
+    out.write_text(json.dumps([bob]))
+
+    seen = []
+    stats = importer.import_csv(src, out, batch_size=2, progress=lambda s: seen.append(s["rows"]))
+
+    assert seen == [2, 4, 6]
+    # The JSON view is regenerated once, not after every batch.
+    assert exports == [out]
+    assert (stats["rows"], stats["created"], stats["updated"], stats["invalid"]) == (6, 4, 1, 1)
+    assert stats["errors"] == [{"row": 4, "error": "missing name"}]
+    # Bad metrics are skipped one by one; their rows are still imported.
+    assert stats["skipped_metrics"] == 2
+    assert stats["warnings"] == [
+        {"row": 6, "error": "power on 2024-02-01 is not a number: 'inf'"},
+        {"row": 7, "error": "speed on 2024-01-01 is not a number: 'fast'"},
+    ]
+
+    fighters = json.loads(out.read_text())
+    assert [f["name"] for f in fighters] == ["Bob", "Alice", "Cara", "Dan", "Eve"]
+    assert fighters[0]["email"] == "bob@example.com" and fighters[0]["stance"] == "Southpaw"
+    # Blank cells keep stored values and sessions are merged by date.
+    assert fighters[0]["photo"] == "bob.png"
+    assert fighters[0]["sessions"] == [{"date": "2024-01-01", "performance": {"jump": 3, "speed": 7}}]
+    alice = fighters[1]
+    assert alice["height"] == "170"
+    assert alice["sessions"] == [
+        {"date": "2024-01-01", "performance": {"speed": 10}},
+        {"date": "2024-02-01", "performance": {"power": 5.5}},
+    ]
+    # Placeholder text counts as a test not taken.
+    assert fighters[2]["sessions"] == [{"date": "2024-01-01", "performance": {"speed": 12}}]
+    assert fighters[3]["sessions"] == [{"date": "2024-01-01", "performance": {"speed": 8}}]
+    assert fighters[4]["sessions"] == []
+
+
+def test_iter_csv_compiles_headers_once():
+    from utils import csv_parser
+
+    data = io.StringIO("Name,Weight (lbs),Unknown\nAlice,220,x\nBob,,y\n")
+    rows = csv_parser.iter_csv(data)
+    first = next(rows)
+    assert first["name"] == "Alice" and round(first["weight"], 3) == 99.79
+    assert next(rows) == {"name": "Bob", "weight": None}
+    assert csv_parser.compile_headers(["Name", None, "Height (in)"]) == [
+        ("Name", "name", None),
+        ("Height (in)", "height", "in"),
+    ]
@@ -3,6 +3,8 @@ import threading
 import time
 from pathlib import Path
 
+import pytest
+
 spec = importlib.util.spec_from_file_location(
     "csv_writer", Path(__file__).resolve().parents[1] / "utils" / "csv_writer.py"
 )
@@ -43,3 +45,66 @@ def test_debounced_writer_single_flush(tmp_path):
     assert flush_calls == 1
     assert writer.flush_count == 3
     assert flush_time - last_write >= writer.debounce_interval - 0.01
+
+
+def test_group_commit_batches_and_reports_stats(tmp_path):
+    path = tmp_path / "burst.csv"
+    writer = DebouncedCsvWriter(path, ["n"], debounce_interval=10, max_batch=8, max_latency=10)
+
+    writes = []
+    orig_write = writer._fh.write
+    writer._fh.write = lambda s: writes.append(s) or orig_write(s)
+
+    for i in range(20):
+        writer.write({"n": i})
+    deadline = time.monotonic() + 1.0
+    while writer.flush_count < 16 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert writer.flush_count == 16
+    writer.close()
+
+    assert len(writes) == 3
+    assert path.read_text().splitlines() == ["n"] + [str(i) for i in range(20)]
+    stats = writer.stats()
+    assert stats["rows"] == 20 and stats["flushes"] == 3
+    assert stats["max_rows_per_flush"] == 8
+    assert stats["latency_ms_max"] >= stats["commit_ms_max"]
+
+
+def test_failed_commit_keeps_rows_and_flusher_alive(tmp_path):
+    path = tmp_path / "retry.csv"
+    writer = DebouncedCsvWriter(path, ["n"], debounce_interval=0.01, max_latency=0.05)
+
+    orig_write = writer._fh.write
+    failures = []
+
+    def flaky(s):
+        if not failures:
+            failures.append(s)
+            raise OSError("disk full")
+        return orig_write(s)
+
+    writer._fh.write = flaky
+    writer.write({"n": 1})
+    deadline = time.monotonic() + 1.0
+    while writer.flush_count < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert failures and writer.flush_count == 1
+    writer.write({"n": 2})
+    writer.close()
+
+    assert path.read_text().splitlines() == ["n", "1", "2"]
+
+
+def test_close_releases_handle_when_final_commit_fails(tmp_path):
+    writer = DebouncedCsvWriter(tmp_path / "fail.csv", ["n"], debounce_interval=60, max_latency=60)
+    fh = writer._fh
+
+    def broken(s):
+        raise OSError("disk full")
+
+    fh.write = broken
+    writer.write({"n": 1})
+    with pytest.raises(OSError):
+        writer.close()
+    assert fh.closed
@@ -130,3 +130,29 @@ def test_get_session_dir_raises_when_unwritable(tmp_path, monkeypatch):
 
     with pytest.raises(PermissionError):
         fs.get_session_dir("Alice", "2099-01-01", "round_1")
+
+
+def test_snapshot_is_cached_until_files_change(tmp_path, monkeypatch):
+    fs = _reload_modules(tmp_path, monkeypatch)
+    fs.save_fight({"red_fighter": "Alice", "fight_date": "2099-01-01"})
+    fs.save_round("round_2")
+
+    reads = []
+    original = fs._read_fight
+    monkeypatch.setattr(fs, "_read_fight", lambda d: reads.append(d) or original(d))
+    snap = fs.snapshot()
+    assert fs.snapshot() is snap and reads == []
+    assert (snap.fight["red_fighter"], snap.date, snap.round_id) == ("Alice", "2099-01-01", "round_2")
+    with pytest.raises(TypeError):
+        snap.fight["red_fighter"] = "Mallory"
+
+    fight, _, _ = fs.load_fight_state()
+    fight["red_fighter"] = "Mallory"
+    assert fs.snapshot().fight["red_fighter"] == "Alice"
+
+    # Another process rewriting the file is picked up on the next call.
+    (fs.DATA_DIR / "current_fight.json").write_text(json.dumps({"red_fighter": "Bob", "blue_fighter": "Carl"}))
+    assert fs.load_fight_state()[0]["red_fighter"] == "Bob" and len(reads) == 1
+
+    fs.clear_fight()
+    assert fs.load_fight_state()[0] == {}
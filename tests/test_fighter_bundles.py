@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+from utils import fighter_bundles, performance_store
+
+
+@pytest.fixture
+def fighter_dir(tmp_path):
+    fighter_bundles.invalidate()
+    path = tmp_path / "FightControl" / "fighter_data" / "alice"
+    path.mkdir(parents=True)
+    (path / "profile.json").write_text(json.dumps({"name": "Alice", "country": "GB"}))
+    yield path
+    fighter_bundles.invalidate()
+
+
+def test_bundle_merges_sources_and_serves_from_memory(fighter_dir, monkeypatch):
+    performance_store.append_result("Alice", {"speed": 7, "power": 8}, data_dir=fighter_dir.parents[1] / "data")
+    (fighter_dir / "card_full.png").write_bytes(b"png")
+
+    bundle = fighter_bundles.build_bundle(fighter_dir)
+    assert bundle["profile"]["name"] == "Alice"
+    assert bundle["performance"] == {"speed": 7, "power": 8}
+    assert bundle["charts"]["radar"] == {"power": 8, "speed": 7}
+    assert bundle["card_url"] == "/fighter_data/alice/card_full.png"
+    assert json.loads((fighter_dir / fighter_bundles.BUNDLE_NAME).read_text())["etag"] == bundle["etag"]
+
+    monkeypatch.setattr(fighter_bundles, "CHECK_INTERVAL", 3600)
+    monkeypatch.setattr(fighter_bundles, "_stamps", lambda d: pytest.fail("sources re-stat'ed"))
+    assert fighter_bundles.load_bundle(fighter_dir) is bundle
+
+
+def test_load_bundle_rebuilds_stale_and_reuses_stored(fighter_dir, monkeypatch):
+    monkeypatch.setattr(fighter_bundles, "CHECK_INTERVAL", 0)
+    first = fighter_bundles.load_bundle(fighter_dir)
+    assert first["card_url"] is None
+
+    # A fresh process picks up the stored bundle without rebuilding it.
+    fighter_bundles.invalidate()
+    monkeypatch.setattr(fighter_bundles, "build_bundle", lambda d: pytest.fail("rebuilt"))
+    assert fighter_bundles.load_bundle(fighter_dir)["etag"] == first["etag"]
+    monkeypatch.undo()
+    monkeypatch.setattr(fighter_bundles, "CHECK_INTERVAL", 0)
+
+    (fighter_dir / "profile.json").write_text(json.dumps({"name": "Alice", "country": "IE", "stance": "Southpaw"}))
+    second = fighter_bundles.load_bundle(fighter_dir)
+    assert second["profile"]["country"] == "IE"
+    assert second["etag"] != first["etag"]
+
+    (fighter_dir / "profile.json").unlink()
+    with pytest.raises(FileNotFoundError):
+        fighter_bundles.load_bundle(fighter_dir)
+    assert fighter_bundles.refresh_bundle(fighter_dir) is None
+
+
+def test_bundle_api_uses_strong_etags(fighter_dir, monkeypatch):
+    pytest.importorskip("flask")
+    from flask import Flask
+
+    from routes import fighters
+
+    monkeypatch.setattr(fighters, "_fighters_json_path", lambda: fighter_dir.parents[1] / "data" / "fighters.json")
+    monkeypatch.setattr(fighters, "safe_filename", lambda s: s)
+    app = Flask(__name__)
+    app.register_blueprint(fighters.fighters_bp)
+    client = app.test_client()
+
+    resp = client.get("/api/fighters/alice/bundle")
+    assert resp.status_code == 200
+    etag = resp.headers["ETag"]
+    assert etag == f'"{resp.get_json()["etag"]}"'
+    assert "sources" not in resp.get_json()
+
+    cached = client.get("/api/fighters/alice/bundle", headers={"If-None-Match": etag})
+    assert cached.status_code == 304 and cached.headers["ETag"] == etag
+    assert client.get("/api/fighters/missing/bundle").status_code == 404
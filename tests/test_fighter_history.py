@@ -0,0 +1,155 @@
+import json
+
+from tests.helpers import use_tmp_base_dir
+from utils import fighter_history
+
+
+def _summary(peak, recovery, zones):
+    return {
+        "tags": ["Jab"],
+        "bpm_stats": {"min": 80, "avg": 120, "max": peak},
+        "time_in_zones": zones,
+        "round_metrics": {
+            "round_1": {"peak_hr": peak, "recovery_hr": recovery, "zone_percentages": {}},
+            "round_2": {"peak_hr": peak - 5, "recovery_hr": recovery - 5, "zone_percentages": {}},
+        },
+    }
+
+
+def test_record_and_query_trends(tmp_path):
+    use_tmp_base_dir(tmp_path)
+    logs = tmp_path / "FightControl" / "logs"
+
+    fighter_history.record_summary(
+        logs / "2099-01-01" / "bout_a", _summary(180, 120, {"red": 30}), fighter="red_fighter"
+    )
+    fighter_history.record_summary(
+        logs / "2099-02-01" / "bout_b", _summary(170, 110, {"red": 10, "blue": 50}), fighter="red_fighter"
+    )
+    # Re-recording a bout replaces rather than duplicates its rows.
+    fighter_history.record_summary(
+        logs / "2099-02-01" / "bout_b", _summary(175, 110, {"red": 10, "blue": 50}), fighter="red_fighter"
+    )
+
+    assert fighter_history.db_path().exists()
+    trend = fighter_history.peak_hr_trend("red_fighter")
+    assert [row["peak_hr"] for row in trend] == [180, 175]
+    assert fighter_history.peak_hr_trend("red_fighter", limit=1)[0]["date"] == "2099-02-01"
+
+    recovery = fighter_history.recovery_by_round("red_fighter", last_n=1)
+    assert [(r["round"], r["recovery_hr"]) for r in recovery] == [(1, 110), (2, 105)]
+
+    zones = fighter_history.zone_distribution("red_fighter", start="2099-01-15")
+    assert zones == {"2099-02-01": {"red": 10, "blue": 50}}
+
+
+def test_record_skips_unknown_fighter_and_rebuilds(tmp_path):
+    use_tmp_base_dir(tmp_path)
+    shared = tmp_path / "FightControl" / "logs" / "2099-01-01" / "bout_a"
+    assert fighter_history.record_summary(shared, _summary(150, 100, {})) is False
+
+    session = tmp_path / "FightControl" / "fighter_data" / "blue_fighter" / "2099-01-01" / "bout_a"
+    session.mkdir(parents=True)
+    (session / "session_summary.json").write_text(json.dumps(_summary(160, 100, {"orange": 5})))
+
+    assert fighter_history.rebuild_history(tmp_path) == 1
+    assert fighter_history.peak_hr_trend("blue_fighter")[0]["bout"] == "bout_a"
+
+
+def test_history_endpoint(tmp_path):
+    import importlib
+
+    import pytest
+
+    pytest.importorskip("flask")
+    use_tmp_base_dir(tmp_path)
+    import routes.api_routes as api_routes
+
+    importlib.reload(api_routes)
+    from flask import Flask
+
+    app = Flask(__name__)
+    app.register_blueprint(api_routes.api_routes)
+    session = tmp_path / "FightControl" / "logs" / "2099-01-01" / "bout_a"
+    fighter_history.record_summary(session, _summary(180, 120, {"red": 30}), fighter="red")
+
+    client = app.test_client()
+    resp = client.get("/api/fighters/red/history?metric=recovery")
+    assert resp.status_code == 200
+    assert len(resp.get_json()["data"]) == 2
+    assert client.get("/api/fighters/red/history?metric=bogus").status_code == 400
+
+
+def test_round_end_records_each_fighters_hr(tmp_path, monkeypatch):
+    """HR saved by the HR logger reaches the history index via the round-end hook."""
+
+    import importlib
+    import time
+
+    import pytest
+
+    pytest.importorskip("matplotlib")
+    use_tmp_base_dir(tmp_path)
+    data_dir = tmp_path / "FightControl" / "data"
+    fight = {"red_fighter": "Red Fighter", "blue_fighter": "Blue Fighter", "fight_date": "2099-01-01"}
+    (data_dir / "current_fight.json").write_text(json.dumps(fight))
+    (data_dir / "round_status.json").write_text(
+        json.dumps({"round": 1, "duration": 0, "rest": 0, "total_rounds": 1, "status": "ACTIVE"})
+    )
+
+    import fight_state
+    import round_timer
+    from cyclone_modules.HRLogger import hr_logger
+
+    importlib.reload(fight_state)
+    importlib.reload(round_timer)
+    importlib.reload(hr_logger)
+    monkeypatch.setattr(round_timer.bout_context, "_scan", lambda *a, **k: 1)
+    monkeypatch.setattr(round_timer.bout_context, "_active", None)
+    bout = round_timer.bout_context.current(fight, "2099-01-01").name
+
+    def series(base):
+        return [{"time": t, "bpm": base + t, "status": "ACTIVE", "round": 1} for t in range(5)]
+
+    hr_logger.save_series("Red Fighter", "2099-01-01", bout, series(150))
+    hr_logger.save_series("Blue Fighter", "2099-01-01", bout, series(120))
+
+    import round_summary
+
+    monkeypatch.setattr(round_summary, "generate_round_summaries", lambda meta: [])
+    monkeypatch.setattr(round_timer, "refresh_obs_overlay", lambda: None)
+    monkeypatch.setattr(round_timer, "push_obs_text_sources", lambda: None)
+    monkeypatch.setattr(round_timer, "play_audio", lambda *a, **k: None)
+    monkeypatch.setattr(round_timer, "save_round_logs", lambda *a, **k: None)
+
+    async def _noop():
+        return None
+
+    monkeypatch.setattr(round_timer.obs, "stop_record", _noop)
+    monkeypatch.setattr(round_timer.obs, "start_record", _noop)
+
+    round_timer.start_round_timer(0, 0)
+    if round_timer._timer_thread:
+        round_timer._timer_thread.join(timeout=2)
+    time.sleep(0.05)
+
+    red = fighter_history.peak_hr_trend("Red_Fighter")
+    blue = fighter_history.peak_hr_trend("Blue_Fighter")
+    assert [(r["bout"], r["peak_hr"], r["avg_hr"]) for r in red] == [(bout, 154, 152)]
+    assert [(r["bout"], r["peak_hr"], r["avg_hr"]) for r in blue] == [(bout, 124, 122)]
+    summary = tmp_path / "FightControl" / "fighter_data" / "Red_Fighter" / "2099-01-01" / bout / "session_summary.json"
+    assert json.loads(summary.read_text())["bpm_stats"]["max"] == 154
+
+
+def test_bouts_order_by_number(tmp_path):
+    db = tmp_path / "history.db"
+    logs = tmp_path / "FightControl" / "logs" / "2099-01-01"
+    for n in (9, 10, 2):
+        fighter_history.record_summary(
+            logs / f"RED_vs_BLUE_BOUT{n}", _summary(150 + n, 100, {}), fighter="red", db=db
+        )
+
+    assert [r["peak_hr"] for r in fighter_history.peak_hr_trend("red", db=db)] == [152, 159, 160]
+    assert fighter_history.peak_hr_trend("red", limit=1, db=db)[0]["bout"] == "RED_vs_BLUE_BOUT10"
+    recent = fighter_history.recovery_by_round("red", last_n=2, db=db)
+    assert [r["bout"] for r in recent if r["round"] == 1] == ["RED_vs_BLUE_BOUT9", "RED_vs_BLUE_BOUT10"]
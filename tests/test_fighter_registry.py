@@ -0,0 +1,63 @@
+import importlib
+import json
+import os
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+
+
+def _reload_utils(tmp_path):
+    os.environ["BASE_DIR"] = str(tmp_path)
+    import fighter_utils
+    import paths
+
+    importlib.reload(paths)
+    importlib.reload(fighter_utils)
+    return fighter_utils
+
+
+def _cleanup():
+    sys.modules.pop("fighter_utils", None)
+    sys.modules.pop("paths", None)
+    os.environ["BASE_DIR"] = str(BASE_DIR)
+
+
+def test_registry_indexes_and_mtime_invalidation(tmp_path):
+    fu = _reload_utils(tmp_path)
+    data_dir = tmp_path / "FightControl" / "data"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    path = data_dir / "fighters.json"
+    path.write_text(json.dumps([{"name": "Red Fighter", "age": "30"}, {"name": "Blue", "country": "GB"}]))
+
+    assert fu.load_fighter(1)["nation"] == "GB"
+    assert fu.load_fighter("01")["name"] == "Blue"
+    assert fu.find_fighter("Red Fighter")["id"] == 0
+    assert fu.find_fighter("red_fighter")["age"] == "30"
+    assert fu.load_fighter(5) is None
+
+    # Returned dictionaries are copies; mutating them leaves the cache intact.
+    fu.load_fighters()[0]["name"] = "Changed"
+    assert fu.load_fighters()[0]["name"] == "Red Fighter"
+
+    # External rewrites are picked up through the file's mtime/size.
+    path.write_text(json.dumps([{"name": "Green Fighter"}]))
+    os.utime(path, ns=(1, 1))
+    assert [f["name"] for f in fu.load_fighters()] == ["Green Fighter"]
+    assert fu.find_fighter("Red Fighter") is None
+    _cleanup()
+
+
+def test_save_fighter_is_copy_on_write(tmp_path):
+    fu = _reload_utils(tmp_path)
+    (tmp_path / "FightControl" / "data").mkdir(parents=True, exist_ok=True)
+
+    before = fu.registry.snapshot()
+    saved = fu.save_fighter({"name": "New", "country": "IE"})
+    after = fu.registry.snapshot()
+
+    assert saved["id"] == 0 and saved["nation"] == "IE"
+    assert before.fighters == () and len(after.fighters) == 1
+    assert fu.save_fighter({"name": "New"})["id"] == 0
+    assert json.loads(fu.FIGHTERS_JSON.read_text()) == [{"name": "New", "nation": "IE"}]
+    _cleanup()
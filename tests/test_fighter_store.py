@@ -0,0 +1,97 @@
+import json
+import os
+import sqlite3
+import threading
+
+from fighter_utils import FighterRegistry
+from utils import fighter_store
+
+
+def _names(path):
+    return [f["name"] for f in json.loads(path.read_text())]
+
+
+def test_writes_are_row_level_and_json_is_a_view(tmp_path):
+    path = tmp_path / "fighters.json"
+    path.write_text(json.dumps([{"name": "Red", "age": 30}, {"name": "Blue"}]))
+    reg = FighterRegistry()
+
+    assert [f["name"] for f in reg.all(path)] == ["Red", "Blue"]
+    updated = reg.update(1, {"id": 1, "name": "Blue", "stance": "Southpaw"}, path)
+    assert updated["stance"] == "Southpaw" and updated["id"] == 1
+    assert reg.update(9, {"name": "Nobody"}, path) is None
+    reg.append({"name": "Red"}, path)
+
+    with sqlite3.connect(fighter_store.db_path(path)) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("SELECT pos FROM fighters WHERE name='Red' ORDER BY pos").fetchall() == [(0,), (2,)]
+    assert json.loads(path.read_text())[1] == {"name": "Blue", "stance": "Southpaw"}
+    assert _names(path) == ["Red", "Blue", "Red"]
+
+    # Hand edits to the view are imported back.
+    path.write_text(json.dumps([{"name": "Green"}]))
+    os.utime(path, ns=(1, 1))
+    assert [f["name"] for f in reg.all(path)] == ["Green"]
+    assert reg.add({"name": "Green"}, path)[1] is False
+
+    # Deleting the view regenerates it from the database.
+    path.unlink()
+    assert [f["name"] for f in FighterRegistry().all(path)] == ["Green"]
+    assert _names(path) == ["Green"]
+
+
+def test_delayed_view_export_coalesces(tmp_path, monkeypatch):
+    monkeypatch.setattr(fighter_store, "VIEW_DELAY", 3600)
+    path = tmp_path / "fighters.json"
+    reg = FighterRegistry()
+
+    reg.add({"name": "A"}, path)
+    reg.upsert_many([{"name": "B"}, {"name": "A", "age": 20}], path)
+    assert not path.exists()
+    assert reg.get_by_name("A", path)["age"] == 20
+
+    fighter_store.flush()
+    assert json.loads(path.read_text()) == [{"name": "A", "age": 20}, {"name": "B"}]
+    assert [f["name"] for f in FighterRegistry().all(path)] == ["A", "B"]
+
+
+def test_pending_view_does_not_hide_other_writers(tmp_path, monkeypatch):
+    monkeypatch.setattr(fighter_store, "VIEW_DELAY", 3600)
+    path = tmp_path / "fighters.json"
+    writer, reader = FighterRegistry(), FighterRegistry()
+    writer.add({"name": "A"}, path)
+    assert [f["name"] for f in reader.all(path)] == ["A"]
+
+    # The view is not rewritten yet, but the database commit is seen.
+    writer.add({"name": "B"}, path)
+    assert [f["name"] for f in reader.all(path)] == ["A", "B"]
+    fighter_store.flush()
+
+
+def test_concurrent_writers_do_not_lose_updates(tmp_path):
+    path = tmp_path / "fighters.json"
+
+    def writer(prefix):
+        # Separate registries stand in for the web UI and the importer.
+        reg = FighterRegistry()
+        for i in range(15):
+            reg.add({"name": f"{prefix}{i}"}, path)
+
+    threads = [threading.Thread(target=writer, args=(p,)) for p in ("ui-", "csv-")]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    names = _names(path)
+    assert len(names) == 30 and len(set(names)) == 30
+
+
+def test_write_view_skips_unchanged_files(tmp_path):
+    path = tmp_path / "Red" / "fighter.json"
+    assert fighter_store.write_view(path, {"name": "Red"}) is True
+    stamp = path.stat().st_mtime_ns
+    assert fighter_store.write_view(path, {"name": "Red"}) is False
+    assert path.stat().st_mtime_ns == stamp
+    assert fighter_store.write_view(path, {"name": "Red", "age": 20}) is True
+    assert json.loads(path.read_text()) == {"name": "Red", "age": 20}
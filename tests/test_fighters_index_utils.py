@@ -15,3 +15,76 @@ def test_rebuild_index(tmp_path):
 
     data = json.loads(output.read_text())
     assert data == [{"name": "Alice"}, {"name": "Bob"}]
+
+
+def test_rebuild_index_is_incremental(tmp_path, monkeypatch):
+    import utils.fighters_index as fi
+
+    fighter_dir = tmp_path / "fighter_data"
+    for name in ("Alice", "Bob"):
+        (fighter_dir / name).mkdir(parents=True)
+        (fighter_dir / name / "profile.json").write_text(json.dumps({"name": name}))
+    output = tmp_path / "fighters.json"
+
+    parsed = []
+    real_parse = fi._parse
+    monkeypatch.setattr(fi, "_parse", lambda p: parsed.append(p.parent.name) or real_parse(p))
+
+    assert fi.rebuild_index(fighter_dir, output) is True
+    assert parsed == ["Alice", "Bob"]
+    assert fi.manifest_path(output).exists()
+
+    parsed.clear()
+    assert fi.rebuild_index(fighter_dir, output) is False
+    assert parsed == []
+
+    (fighter_dir / "Bob" / "profile.json").write_text(json.dumps({"name": "Bob", "age": 30}))
+    (fighter_dir / "Cara").mkdir()
+    (fighter_dir / "Cara" / "profile.json").write_text(json.dumps({"name": "Cara"}))
+    (fighter_dir / "Alice" / "profile.json").unlink()
+    # Only the changed profiles are patched into the roster.
+    import fighter_utils
+
+    replaced = []
+    real_replace = fighter_utils.registry.replace
+    monkeypatch.setattr(
+        fighter_utils.registry,
+        "replace",
+        lambda fighters, path=None: replaced.append(path) or real_replace(fighters, path),
+    )
+    assert fi.rebuild_index(fighter_dir, output) is True
+    assert sorted(parsed) == ["Bob", "Cara"]
+    assert json.loads(output.read_text()) == [{"name": "Bob", "age": 30}, {"name": "Cara"}]
+    assert replaced == []
+
+    parsed.clear()
+    assert fi.rebuild_index(fighter_dir, output, full=True) is True
+    assert parsed == ["Bob", "Cara"]
+    assert replaced == [output]
+
+
+def test_update_index_entry_patches_single_fighter(tmp_path):
+    from utils.fighters_index import rebuild_index, update_index_entry
+
+    fighter_dir = tmp_path / "fighter_data"
+    (fighter_dir / "Alice").mkdir(parents=True)
+    profile = fighter_dir / "Alice" / "profile.json"
+    profile.write_text(json.dumps({"name": "Alice"}))
+    output = tmp_path / "fighters.json"
+    rebuild_index(fighter_dir, output)
+
+    # Entries without a profile (e.g. appended by ``/fighters``) are preserved.
+    output.write_text(json.dumps([{"name": "Alice"}, {"name": "Walk-in"}]))
+    profile.write_text(json.dumps({"name": "Alice", "stance": "southpaw"}))
+    assert update_index_entry("Alice", fighter_dir, output) is True
+    assert json.loads(output.read_text()) == [{"name": "Alice", "stance": "southpaw"}, {"name": "Walk-in"}]
+    assert update_index_entry("Alice", fighter_dir, output) is False
+
+    (fighter_dir / "Bob").mkdir()
+    (fighter_dir / "Bob" / "profile.json").write_text(json.dumps({"name": "Bob"}))
+    update_index_entry("Bob", fighter_dir, output)
+    assert [f["name"] for f in json.loads(output.read_text())] == ["Alice", "Walk-in", "Bob"]
+
+    profile.unlink()
+    update_index_entry("Alice", fighter_dir, output)
+    assert [f["name"] for f in json.loads(output.read_text())] == ["Walk-in", "Bob"]
@@ -0,0 +1,93 @@
+import threading
+import time
+
+from services.health_sampler import HealthSampler, Probe
+
+
+def test_sample_now_records_results_and_history():
+    calls = {"ok": 0}
+
+    def ok():
+        calls["ok"] += 1
+        return calls["ok"]
+
+    def boom():
+        raise RuntimeError("down")
+
+    sampler = HealthSampler([Probe("ok", ok), Probe("boom", boom, default="n/a")], history=3)
+    assert sampler.latest() == {"ok": False, "boom": "n/a"}
+
+    for _ in range(3):
+        sampler.sample_now()
+    assert sampler.latest() == {"ok": 3, "boom": "n/a"}
+    assert sampler.results()["boom"]["error"] == "RuntimeError: down"
+    # Ring buffer keeps only the newest samples.
+    assert len(sampler.history()) == 3
+    assert sampler.history("ok")[-1]["value"] == 3
+
+
+def test_hung_probe_times_out_without_piling_up():
+    release = threading.Event()
+    started = []
+
+    def hang():
+        started.append(1)
+        release.wait(5)
+        return True
+
+    sampler = HealthSampler([Probe("hang", hang, timeout=0.05), Probe("fast", lambda: True)])
+    t0 = time.monotonic()
+    assert sampler.sample_now() == {"hang": False, "fast": True}
+    assert time.monotonic() - t0 < 1
+    assert sampler.results()["hang"]["error"] == "timeout"
+
+    sampler.sample_now()
+    assert len(started) == 1
+    assert len([h for h in sampler.history("hang") if h["error"] == "timeout"]) == 1
+
+    release.set()
+    deadline = time.monotonic() + 2
+    while sampler.latest()["hang"] is not True and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert sampler.latest()["hang"] is True
+
+
+def test_background_loop_follows_probe_cadence():
+    counts = {"fast": 0, "slow": 0}
+
+    def probe(name):
+        def check():
+            counts[name] += 1
+            return counts[name]
+
+        return check
+
+    sampler = HealthSampler(
+        [Probe("fast", probe("fast"), interval=0.05), Probe("slow", probe("slow"), interval=10)]
+    ).start()
+    try:
+        time.sleep(0.4)
+        assert sampler.running
+    finally:
+        sampler.stop()
+    assert not sampler.running
+    assert counts["fast"] >= 3
+    assert counts["slow"] == 1
+
+
+def test_loop_sleeps_while_a_timed_out_probe_hangs(monkeypatch):
+    release = threading.Event()
+    sampler = HealthSampler([Probe("hang", lambda: release.wait(5), interval=10, timeout=0.05)])
+    wakeups = []
+    real_expire = sampler._expire
+    monkeypatch.setattr(sampler, "_expire", lambda probe: wakeups.append(1) or real_expire(probe))
+
+    sampler.start()
+    try:
+        time.sleep(0.5)
+        assert sampler.results()["hang"]["error"] == "timeout"
+    finally:
+        release.set()
+        sampler.stop()
+    # Start, the timeout deadline and nothing more until the next interval.
+    assert len(wakeups) <= 3
@@ -0,0 +1,42 @@
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+hr_chart = pytest.importorskip("services.hr_chart")
+
+
+def test_render_hr_chart_draws_line_and_tags(tmp_path):
+    panel = hr_chart.HrPanel(
+        times=[0, 1, 2, 3],
+        bpm=[100, 120, 140, 130],
+        max_hr=180,
+        tags=[(1.5, "Jab")],
+        title="Red",
+    )
+    out = hr_chart.render_hr_chart(panel, tmp_path / "graph.png", size=(400, 200))
+
+    img = Image.open(out).convert("RGB")
+    assert img.size == (400, 200)
+    colours = {c for _, c in img.getcolors(maxcolors=400 * 200)}
+    # Black BPM line and red tag marker are both present.
+    assert (0, 0, 0) in colours
+    assert (220, 0, 0) in colours
+
+
+def test_render_hr_panels_side_by_side_handles_empty(tmp_path):
+    panels = [
+        hr_chart.HrPanel(times=[0, 1], bpm=[90, 95], max_hr=200),
+        hr_chart.HrPanel(times=[], bpm=[], max_hr=200),
+    ]
+    out = hr_chart.render_hr_panels(panels, tmp_path / "round_1.png", title="Round 1", panel_size=(300, 200))
+
+    img = Image.open(out)
+    assert img.size == (600, 224)
+
+
+def test_chart_backend_env(monkeypatch):
+    monkeypatch.delenv("CYCLONE_CHART_BACKEND", raising=False)
+    assert hr_chart.chart_backend() == "pillow"
+    monkeypatch.setenv("CYCLONE_CHART_BACKEND", "MATPLOTLIB")
+    assert hr_chart.chart_backend() == "matplotlib"
+    monkeypatch.setenv("CYCLONE_CHART_BACKEND", "bogus")
+    assert hr_chart.chart_backend() == "pillow"
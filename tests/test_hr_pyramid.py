@@ -0,0 +1,60 @@
+import json
+
+from utils import hr_pyramid
+
+
+def _series(n):
+    return [{"seconds": i * 0.5, "bpm": 100 + (i % 20)} for i in range(n)]
+
+
+def test_bucket_series_keeps_min_max_mean():
+    points = [(0, 100), (0.5, 120), (1.0, 90), (1.5, 110), (5.2, 150)]
+    buckets = hr_pyramid.bucket_series(points, 1)
+
+    assert buckets[0] == {"seconds": 0, "min": 100, "max": 120, "count": 2, "bpm": 110}
+    assert buckets[1]["min"] == 90 and buckets[1]["max"] == 110
+    assert buckets[2]["seconds"] == 5
+
+
+def test_samples_from_series_accepts_timestamps():
+    series = [
+        {"timestamp": "2025-01-01T00:00:00", "bpm": 99},
+        {"timestamp": "2025-01-01T00:00:02", "bpm": 101},
+        {"bpm": "bad"},
+    ]
+    assert hr_pyramid.samples_from_series(series) == [(0.0, 99.0), (2.0, 101.0)]
+
+
+def test_lttb_and_m4_respect_budget():
+    points = [(float(i), float(i % 7)) for i in range(1000)]
+    reduced = hr_pyramid.lttb(points, 50)
+    assert len(reduced) == 50
+    assert reduced[0] == points[0] and reduced[-1] == points[-1]
+
+    columns = hr_pyramid.m4(points, 10)
+    assert len(columns) <= 40
+    assert max(y for _, y in columns) == 6 and min(y for _, y in columns) == 0
+
+
+def test_load_pyramid_caches_and_rebuilds(tmp_path):
+    source = tmp_path / "hr_continuous.json"
+    source.write_text(json.dumps(_series(120)))
+
+    pyramid = hr_pyramid.load_pyramid(tmp_path)
+    assert pyramid["count"] == 120
+    assert len(pyramid["levels"]["1"]) == 60
+    assert len(pyramid["levels"]["30"]) == 2
+    assert (tmp_path / hr_pyramid.PYRAMID_FILE).exists()
+
+    source.write_text(json.dumps(_series(10)))
+    assert hr_pyramid.load_pyramid(tmp_path)["count"] == 10
+
+
+def test_select_series_levels(tmp_path):
+    (tmp_path / "hr_continuous.json").write_text(json.dumps(_series(600)))
+
+    assert len(hr_pyramid.select_series(tmp_path)) == 600
+    assert len(hr_pyramid.select_series(tmp_path, resolution="5s")) == 60
+    assert len(hr_pyramid.select_series(tmp_path, max_points=100)) == 60
+    assert len(hr_pyramid.select_series(tmp_path, max_points=5)) == 5
+    assert hr_pyramid.select_series(tmp_path / "missing") is None
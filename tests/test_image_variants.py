@@ -0,0 +1,81 @@
+import io
+
+import pytest
+from PIL import Image
+
+from services import image_variants
+
+
+@pytest.fixture(autouse=True)
+def _fresh_index():
+    image_variants.clear_cache()
+    yield
+    image_variants.clear_cache()
+
+
+def _save(path, size=(800, 400), colour=(200, 30, 30)):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    Image.new("RGB", size, colour).save(path, "PNG")
+    return path
+
+
+def test_variants_are_hashed_and_srcset_ready(tmp_path):
+    static = tmp_path / "FightControl" / "static"
+    src = _save(static / "uploads" / "a.png")
+
+    record = image_variants.generate_variants(src, static)
+    out = static / "variants" / record["hash"][:2] / record["hash"]
+    widths = [int(p.stem) for p in out.glob("*.png")]
+    assert sorted(widths) == list(image_variants.WIDTHS)
+    with Image.open(out / "160.png") as thumb:
+        assert thumb.size == (160, 80)
+    assert record["src"].endswith("/160.png")
+    assert record["srcset"]["png"].endswith("/640.png 640w")
+    assert "/320.png 320w, " in record["srcset"]["png"]
+
+    # Identical content elsewhere reuses the same derivatives.
+    copy = static / "uploads" / "b.png"
+    copy.write_bytes(src.read_bytes())
+    assert image_variants.generate_variants(copy, static)["hash"] == record["hash"]
+
+    # The index survives a restart and goes stale when the source changes.
+    image_variants.clear_cache()
+    assert image_variants.lookup(src, static) == record
+    _save(src, size=(100, 50))
+    assert image_variants.lookup(src, static) is None
+    small = image_variants.ensure_variants(src, static)
+    assert small["width"] == 100 and small["srcset"]["png"].endswith("/100.png 100w")
+
+
+def test_annotate_adds_srcset_for_relative_paths(tmp_path):
+    static = tmp_path / "FightControl" / "static"
+    _save(static / "uploads" / "p.png")
+    record = image_variants.generate_variants(static / "uploads" / "p.png", static)
+
+    fighter = image_variants.annotate({"name": "A", "photo_local": "static/uploads/p.png"}, static)
+    assert fighter["photo_srcset"] == record["srcset"]
+    assert fighter["photo_thumb_url"] == record["src"]
+    assert "card_srcset" not in fighter
+    assert image_variants.generate_variants(static / "missing.png", static) is None
+
+
+def test_upload_returns_srcset(tmp_path, monkeypatch, stub_optional_dependencies):
+    pytest.importorskip("flask")
+    from flask import Flask
+
+    import routes.api_routes as api_routes
+
+    monkeypatch.setattr(api_routes.api_routes, "BASE_DIR", tmp_path, raising=False)
+    app = Flask(__name__)
+    app.register_blueprint(api_routes.api_routes)
+
+    buf = io.BytesIO()
+    Image.new("RGB", (400, 400), (0, 0, 255)).save(buf, "PNG")
+    buf.seek(0)
+    resp = app.test_client().post(
+        "/api/fighter/photo", data={"file": (buf, "photo.png", "image/png")}, content_type="multipart/form-data"
+    )
+    payload = resp.get_json()
+    assert resp.status_code == 200
+    assert payload["srcset"]["png"].startswith("/static/variants/")
+    assert payload["srcset"]["png"].endswith("/400.png 400w")
@@ -0,0 +1,70 @@
+import json
+
+from services import live_feed
+
+
+def _events(chunks):
+    out = []
+    for chunk in chunks:
+        if chunk.startswith(":"):
+            out.append(("keepalive", None, None))
+            continue
+        fields = dict(line.split(": ", 1) for line in chunk.strip().splitlines())
+        out.append((fields["event"], int(fields["id"].rpartition("-")[2]), json.loads(fields["data"])))
+    return out
+
+
+def test_snapshot_then_deltas_and_resume():
+    state = {"timer": {"timer": "03:00", "status": "ACTIVE"}, "red": {"bpm": 120}, "tags": []}
+    sources = {name: (lambda name=name: state[name]) for name in state}
+    feed = live_feed.LiveFeed(sources, interval=60, history=3, boot="b1")
+
+    stream = feed.stream(heartbeat=0.01)
+    kind, seq, snap = _events([next(stream)])[0]
+    assert (kind, seq) == ("snapshot", 1)
+    assert snap["timer"] == {"timer": "03:00", "status": "ACTIVE"}
+
+    state["timer"] = {"timer": "02:59", "status": "ACTIVE"}
+    state["tags"] = [{"tag": "Jab"}]
+    feed.poll()
+    kind, seq, delta = _events([next(stream)])[0]
+    assert (kind, seq) == ("delta", 2)
+    assert delta == {"timer": {"timer": "02:59"}, "tags": [{"tag": "Jab"}]}
+    assert live_feed.apply(snap, delta)["timer"]["timer"] == "02:59"
+    assert _events([next(stream)])[0][0] == "keepalive"
+    stream.close()
+
+    # Reconnecting with Last-Event-ID gets only what was missed.
+    del state["red"]
+    feed.sources.pop("red")
+    feed.poll()
+    resumed = feed.stream(last_id="b1-2", heartbeat=0.01)
+    kind, seq, delta = _events([next(resumed)])[0]
+    assert (kind, seq) == ("delta", 3) and delta == {"$del": ["red"]}
+    resumed.close()
+
+    # Too far behind the kept history: a fresh snapshot instead.
+    for i in range(4):
+        state["tags"] = [{"tag": str(i)}]
+        feed.poll()
+    assert feed.since(1) is None
+    stale = feed.stream(last_id="b1-1", heartbeat=0.01)
+    kind, seq, snap = _events([next(stale)])[0]
+    assert (kind, seq, snap["tags"]) == ("snapshot", feed.seq, [{"tag": "3"}])
+    stale.close()
+
+    # An id from before a restart (another boot) gets a snapshot, not deltas.
+    restarted = feed.stream(last_id=f"b0-{feed.seq - 1}", heartbeat=0.01)
+    assert _events([next(restarted)])[0][0] == "snapshot"
+    restarted.close()
+    bare = feed.stream(last_id=str(feed.seq - 1))
+    assert next(bare).startswith(f"id: b1-{feed.seq}\nevent: snapshot")
+    bare.close()
+
+
+def test_none_values_are_not_removals():
+    old = {"red": {"bpm": 120, "zone": "Z2"}, "blue": {"bpm": 110}}
+    new = {"red": {"bpm": None, "zone": "Z2"}}
+    delta = live_feed.diff(old, new)
+    assert delta == {"red": {"bpm": None}, "$del": ["blue"]}
+    assert live_feed.apply(old, delta) == new
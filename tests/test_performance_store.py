@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+from utils import performance_store
+
+
+def test_append_indexes_results_and_keeps_legacy_json(tmp_path):
+    legacy = tmp_path / "performance_results.json"
+    legacy.write_text(json.dumps([{"fighter_name": "Existing", "performance": {"speed": 1}}], indent=2))
+
+    performance_store.append_result("Alice", {"speed": 5}, tmp_path, recorded_at="2025-05-30T09:00:00")
+    performance_store.append_result("Alice", {"wingate": [600, 580]}, tmp_path, recorded_at="2025-06-02T09:00:00")
+    performance_store.append_result("Bob", {"Wingate": [700]}, tmp_path, recorded_at="2025-06-20T09:00:00")
+
+    # The legacy list is patched in place and stays byte-identical to a rewrite.
+    entries = json.loads(legacy.read_text())
+    assert [e["fighter_name"] for e in entries] == ["Existing", "Alice", "Alice", "Bob"]
+    assert legacy.read_text() == json.dumps(entries, indent=2)
+
+    latest = performance_store.latest_results("alice", limit=2, data_dir=tmp_path)
+    assert [r["performance"] for r in latest] == [{"wingate": [600, 580]}, {"speed": 5}]
+    assert performance_store.latest_results("Existing", data_dir=tmp_path)[0]["performance"] == {"speed": 1}
+
+    june = performance_store.find_results("wingate", start="2025-06-01", end="2025-06-30", data_dir=tmp_path)
+    assert [r["fighter_name"] for r in june] == ["Alice", "Bob"]
+    assert performance_store.find_results(fighter="Bob", end="2025-06-01", data_dir=tmp_path) == []
+
+
+def test_export_legacy_json_and_malformed_file(tmp_path, caplog):
+    legacy = tmp_path / "performance_results.json"
+    legacy.write_text("{broken")
+    with caplog.at_level("WARNING"):
+        performance_store.append_result("Tester", {"speed": 7}, tmp_path)
+    assert "Failed to decode" in caplog.text
+    assert json.loads(legacy.read_text()) == [{"fighter_name": "Tester", "performance": {"speed": 7}}]
+
+    legacy.unlink()
+    out = performance_store.export_legacy_json(data_dir=tmp_path)
+    assert out == legacy
+    assert json.loads(legacy.read_text()) == [{"fighter_name": "Tester", "performance": {"speed": 7}}]
+
+
+def test_connect_initialises_database_once(tmp_path, monkeypatch):
+    performance_store.append_result("Alice", {"speed": 5}, tmp_path)
+    # The legacy import and schema setup are not repeated on later opens.
+    monkeypatch.setattr(performance_store, "_read_legacy", lambda path: pytest.fail("legacy JSON re-read"))
+    performance_store.append_result("Alice", {"speed": 6}, tmp_path)
+    assert len(performance_store.latest_results("Alice", limit=5, data_dir=tmp_path)) == 2
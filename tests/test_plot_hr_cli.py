@@ -10,12 +10,15 @@ def test_cli_requires_matplotlib(tmp_path):
     # Create stub matplotlib that raises at import time
     (fake_dir / "matplotlib.py").write_text("raise ImportError('boom')")
 
+    src = tmp_path / "hr_data.json"
+    src.write_text('[{"time": 0, "bpm": 100}]')
+
     repo_root = Path(__file__).resolve().parents[1]
     env = os.environ.copy()
     env["PYTHONPATH"] = os.pathsep.join([str(fake_dir), str(repo_root)])
 
     result = subprocess.run(
-        [sys.executable, "-m", "tools.plot_hr"],
+        [sys.executable, "-m", "tools.plot_hr", str(src), "--backend", "matplotlib"],
         capture_output=True,
         text=True,
         env=env,
@@ -23,3 +26,27 @@ def test_cli_requires_matplotlib(tmp_path):
 
     assert result.returncode != 0
     assert "matplotlib is required for plotting" in result.stderr
+
+
+def test_cli_renders_with_pillow_without_matplotlib(tmp_path):
+    fake_dir = tmp_path / "fake"
+    fake_dir.mkdir()
+    (fake_dir / "matplotlib.py").write_text("raise ImportError('boom')")
+    src = tmp_path / "hr_data.json"
+    src.write_text('[{"time": 0, "bpm": 100}, {"time": 1, "bpm": 120}]')
+    out = tmp_path / "chart.png"
+
+    repo_root = Path(__file__).resolve().parents[1]
+    env = os.environ.copy()
+    env["PYTHONPATH"] = os.pathsep.join([str(fake_dir), str(repo_root)])
+    env.pop("CYCLONE_CHART_BACKEND", None)
+
+    result = subprocess.run(
+        [sys.executable, "-m", "tools.plot_hr", str(src), "-o", str(out)],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert out.exists()
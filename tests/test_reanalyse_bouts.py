@@ -0,0 +1,81 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("pandas")
+
+from tools import reanalyse_bouts
+
+
+def _make_bout(base, name="2099-01-01_RED_vs_BLUE_BOUT1"):
+    session = base / "FightControl" / "logs" / "2099-01-01" / name
+    session.mkdir(parents=True)
+    start = datetime(2099, 1, 1)
+    hr = [{"timestamp": (start + timedelta(seconds=i)).isoformat(), "bpm": 100 + i} for i in range(20)]
+    (session / "hr_continuous.json").write_text(json.dumps(hr))
+    (session / "bout.json").write_text(
+        json.dumps(
+            {
+                "red_fighter": "Red",
+                "blue_fighter": "Blue",
+                "fight_date": "2099-01-01",
+                "round_type": "1x1",
+                "round_duration": 20,
+                "rest_duration": 0,
+            }
+        )
+    )
+    return session
+
+
+def test_discover_and_meta(tmp_path):
+    session = _make_bout(tmp_path)
+    (tmp_path / "FightControl" / "logs" / "notes").mkdir()
+
+    assert list(reanalyse_bouts.discover_bouts(tmp_path)) == [session]
+    legacy = tmp_path / "FightControl" / "logs" / "2099-01-02" / "red_vs_blue"
+    legacy.mkdir(parents=True)
+    meta = reanalyse_bouts.bout_meta(legacy)
+    assert meta["red_fighter"] == "red" and meta["fight_date"] == "2099-01-02"
+
+
+def _write_hr(base, fighter, bout, peak):
+    session = base / "FightControl" / "fighter_data" / fighter / "2099-01-01" / bout
+    session.mkdir(parents=True, exist_ok=True)
+    series = [{"time": t, "bpm": peak - 4 + t, "status": "ACTIVE", "round": 1} for t in range(5)]
+    (session / "hr_data.json").write_text(json.dumps(series))
+    return session
+
+
+def test_run_reprocesses_then_skips_unchanged(tmp_path):
+    from utils import fighter_history
+
+    session = _make_bout(tmp_path)
+    red = _write_hr(tmp_path, "Red", session.name, 160)
+    blue = _write_hr(tmp_path, "Blue", session.name, 130)
+    db = tmp_path / "FightControl" / "data" / fighter_history.DB_NAME
+
+    stats = reanalyse_bouts.run(tmp_path, workers=1)
+    assert stats["failed"] == 0, stats["failures"]
+    assert stats["ok"] == 1
+    assert json.loads((red / "session_summary.json").read_text())["bpm_stats"] == {"min": 156, "avg": 158, "max": 160}
+    assert json.loads((blue / "session_summary.json").read_text())["bpm_stats"]["max"] == 130
+    assert [r["peak_hr"] for r in fighter_history.peak_hr_trend("Red", db=db)] == [160]
+    assert [r["peak_hr"] for r in fighter_history.peak_hr_trend("Blue", db=db)] == [130]
+    assert (session / "round_1.png").exists()
+    assert (session / reanalyse_bouts.MANIFEST).exists()
+
+    stats = reanalyse_bouts.run(tmp_path, workers=1)
+    assert stats["skipped"] == 1 and stats["ok"] == 0
+
+    zone_dir = tmp_path / "FightControl" / "fighter_data" / "Red"
+    (zone_dir / "zone_model.json").write_text(json.dumps({"max_hr": 190}))
+    stats = reanalyse_bouts.run(tmp_path, workers=1)
+    assert stats["ok"] == 1
+
+    _write_hr(tmp_path, "Blue", session.name, 140)
+    stats = reanalyse_bouts.run(tmp_path, workers=1)
+    assert stats["ok"] == 1
+    assert [r["peak_hr"] for r in fighter_history.peak_hr_trend("Blue", db=db)] == [140]
+    assert [r["peak_hr"] for r in fighter_history.peak_hr_trend("Red", db=db)] == [160]
@@ -44,6 +44,7 @@ def test_generate_round_summaries_renders_tags(tmp_path, monkeypatch):
     """Tags from ``tag_log.csv`` should render as vertical lines for both fighters."""
 
     monkeypatch.setenv("BASE_DIR", str(tmp_path))
+    monkeypatch.setenv("CYCLONE_CHART_BACKEND", "matplotlib")
 
     # Reload paths with monkeypatched base
     import paths
@@ -108,3 +109,54 @@ def test_generate_round_summaries_renders_tags(tmp_path, monkeypatch):
     # Count LineCollections to confirm tag markers are drawn
     assert sum(isinstance(c, LineCollection) for c in red_ax.collections) >= 1
     assert sum(isinstance(c, LineCollection) for c in blue_ax.collections) >= 1
+
+
+def test_generate_round_summaries_pillow_renders_tags(tmp_path, monkeypatch):
+    """The default Pillow backend should draw tag markers on both panels."""
+
+    Image = pytest.importorskip("PIL.Image")
+    monkeypatch.setenv("BASE_DIR", str(tmp_path))
+    monkeypatch.delenv("CYCLONE_CHART_BACKEND", raising=False)
+
+    import paths
+
+    importlib.reload(paths)
+    fighter_paths = _load_fighter_paths()
+    import round_summary
+
+    importlib.reload(round_summary)
+
+    date = "2099-01-01"
+    red = "Red Fighter"
+    blue = "Blue Fighter"
+    bout = f"{safe_filename(red)}_vs_{safe_filename(blue)}"
+    red_dir = fighter_paths.bout_dir(red, date, bout)
+    blue_dir = fighter_paths.bout_dir(blue, date, bout)
+
+    start = datetime(2025, 1, 1)
+    hr_data = [{"timestamp": (start + timedelta(seconds=i)).isoformat(), "bpm": 100 + i} for i in range(10)]
+    (red_dir / "hr_continuous.json").write_text(json.dumps(hr_data))
+    (blue_dir / "hr_continuous.json").write_text(json.dumps(hr_data))
+    (red_dir / "events.csv").write_text(
+        "timestamp,fighter,tag\n"
+        f"{(start + timedelta(seconds=4)).isoformat()},red,Cross\n"
+        f"{(start + timedelta(seconds=2)).isoformat()},blue,Kick\n"
+    )
+
+    fight = {
+        "red_fighter": red,
+        "blue_fighter": blue,
+        "fight_date": date,
+        "round_type": "1x1",
+        "round_duration": 10,
+        "rest_duration": 0,
+    }
+    monkeypatch.setattr(plt, "subplots", lambda *a, **k: pytest.fail("matplotlib used by default"))
+
+    paths_out = round_summary.generate_round_summaries(fight)
+
+    img = Image.open(paths_out[0]).convert("RGB")
+    half = img.width // 2
+    for box in ((0, 0, half, img.height), (half, 0, img.width, img.height)):
+        colours = {c for _, c in img.crop(box).getcolors(maxcolors=img.width * img.height)}
+        assert (220, 0, 0) in colours
@@ -51,12 +51,12 @@ def test_default_on_complete_builds_summaries(tmp_path, monkeypatch):
     monkeypatch.setattr(round_timer.obs, "start_record", _noop)
     monkeypatch.setattr(round_timer, "play_audio", lambda *a, **k: None)
     monkeypatch.setattr(round_timer, "save_round_logs", lambda *a, **k: None)
-    monkeypatch.setattr(round_timer, "next_bout_number", lambda *a, **k: 1)
+    monkeypatch.setattr(round_timer.bout_context, "_scan", lambda *a, **k: 1)
 
     def fake_generate_round_summaries(meta):
         calls["summaries"] += 1
 
-    def fake_build_session_summary(session_dir):
+    def fake_build_session_summary(session_dir, **_kwargs):
         calls["sessions"].append(session_dir)
 
     import round_summary
@@ -34,7 +34,7 @@ def test_start_round_timer_allows_initial_hr_logging(tmp_path, monkeypatch):
     monkeypatch.setattr(round_timer, "play_audio", lambda *a, **k: None)
     monkeypatch.setattr(round_timer, "save_round_logs", lambda *a, **k: None)
     monkeypatch.setattr(round_timer, "build_session_summary", lambda *a, **k: None)
-    monkeypatch.setattr(round_timer, "next_bout_number", lambda *a, **k: 1)
+    monkeypatch.setattr(round_timer.bout_context, "_scan", lambda *a, **k: 1)
     import sys as _sys
     import types
 
@@ -0,0 +1,115 @@
+import io
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from PIL import Image
+
+from FightControl.scripts import sync_photos
+
+
+def _png(colour):
+    buf = io.BytesIO()
+    Image.new("RGB", (600, 400), colour).save(buf, "PNG")
+    return buf.getvalue()
+
+
+RED = _png((255, 0, 0))
+BLUE = _png((0, 0, 255))
+
+
+@pytest.fixture
+def photo_server():
+    files = {"/red.png": RED, "/red-copy.png": RED, "/blue.png": BLUE}
+    hits = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = files.get(self.path)
+            etag = f'"{self.path}-{len(body or b"")}"'
+            if self.headers.get("If-None-Match") == etag:
+                hits.append((self.path, 304))
+                self.send_response(304)
+                self.end_headers()
+                return
+            if body is None:
+                hits.append((self.path, 404))
+                self.send_error(404)
+                return
+            hits.append((self.path, 200))
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", hits
+    server.shutdown()
+    server.server_close()
+
+
+def test_sync_is_concurrent_content_addressed_and_revalidates(tmp_path, photo_server):
+    url, hits = photo_server
+    base = tmp_path / "FightControl"
+    photo_dir = base / "data" / "photos"
+    fighters = [
+        {"name": "Red", "photo": f"{url}/red.png"},
+        {"name": "Red Twin", "photo": f"{url}/red-copy.png"},
+        {"name": "Blue", "photo": f"{url}/blue.png"},
+        {"name": "Blue Again", "photo": f"{url}/blue.png"},
+        {"name": "Ghost", "photo": f"{url}/missing.png"},
+        {"name": "Nobody", "photo": ""},
+    ]
+
+    stats = sync_photos.sync_photos(fighters, photo_dir, base, workers=3)
+    assert stats == {"fetched": 2, "deduplicated": 1, "not_modified": 0, "failed": 1, "no_photo": 1}
+    # Shared URLs are fetched once.
+    assert sorted(p for p, _ in hits) == ["/blue.png", "/missing.png", "/red-copy.png", "/red.png"]
+
+    stored = sorted(p for p in (photo_dir / "store").rglob("*") if p.is_file())
+    assert len(stored) == 2
+    assert fighters[0]["photo_local"] == fighters[1]["photo_local"]
+    assert fighters[0]["photo_local"].startswith("data/photos/store/")
+    assert fighters[2]["photo_local"] == fighters[3]["photo_local"] != fighters[0]["photo_local"]
+    assert fighters[4]["photo_local"] == "" and fighters[5]["photo_local"] == ""
+    with Image.open(base / fighters[2]["photo_thumb"]) as thumb:
+        assert max(thumb.size) == 256
+
+    manifest = json.loads((photo_dir / "manifest.json").read_text())
+    assert manifest[f"{url}/red.png"]["etag"]
+
+    hits.clear()
+    again = [{"name": "Red", "photo": f"{url}/red.png"}, {"name": "Blue", "photo": f"{url}/blue.png"}]
+    stats = sync_photos.sync_photos(again, photo_dir, base, workers=2)
+    assert stats["not_modified"] == 2 and stats["fetched"] == 0
+    assert sorted(hits) == [("/blue.png", 304), ("/red.png", 304)]
+    assert again[0]["photo_local"] == fighters[0]["photo_local"]
+
+
+def test_photo_url_handles_drive_links():
+    assert sync_photos.photo_url("https://drive.google.com/open?id=abc") == sync_photos.DRIVE_DOWNLOAD_URL.format(
+        file_id="abc"
+    )
+    assert sync_photos.photo_url("https://drive.google.com/file/d/xyz/view").endswith("id=xyz")
+    assert sync_photos.photo_url("photos/local.jpg") is None
+
+
+def test_failed_fetch_keeps_photo_already_on_disk(tmp_path, photo_server):
+    url, _hits = photo_server
+    base = tmp_path / "FightControl"
+    photo_dir = base / "data" / "photos"
+    photo_dir.mkdir(parents=True)
+    (photo_dir / "old_timer.jpg").write_bytes(RED)
+
+    fighters = [{"name": "Old Timer", "photo": f"{url}/missing.png"}]
+    stats = sync_photos.sync_photos(fighters, photo_dir, base, workers=1)
+    assert stats["failed"] == 1
+    assert fighters[0]["photo_local"] == "data/photos/old_timer.jpg"
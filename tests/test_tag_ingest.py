@@ -0,0 +1,144 @@
+import csv
+import json
+
+from services import tag_ingest
+
+
+def _views(bout_dir):
+    return [
+        tag_ingest.CsvView(
+            "tags.csv",
+            lambda e: bout_dir / e["round"] / "tags.csv",
+            ["timestamp", "fighter", "tag"],
+            lambda e: [e["timestamp"], e["fighter"], e["tag"]],
+        ),
+        tag_ingest.JsonListView("tag_log.json", bout_dir / "tag_log.json", lambda e: {"tag": e["tag"]}),
+    ]
+
+
+def _event(i, fighter="red", rnd="round_1"):
+    return {"timestamp": str(i), "round": rnd, "fighter": fighter, "tag": f"T{i}", "type": "tag", "meta": ""}
+
+
+def test_events_are_logged_once_and_views_derived_lazily(tmp_path, monkeypatch):
+    monkeypatch.setattr(tag_ingest, "VIEW_DELAY", 3600)
+    bout = tmp_path / "bout"
+    log = tag_ingest.open_log(bout, lambda: _views(bout))
+    assert tag_ingest.open_log(bout) is log
+
+    log.append(_event(0))
+    log.append(_event(1, fighter="blue"))
+    log.append(_event(2, rnd="round_2"))
+    assert len((bout / tag_ingest.LOG_NAME).read_text().splitlines()) == 3
+    assert not (bout / "tag_log.json").exists()
+    assert [e["tag"] for e in log.events(fighter="red")] == ["T0", "T2"]
+    assert [e["tag"] for e in log.events(round_id="round_1")] == ["T0", "T1"]
+
+    tag_ingest.flush()
+    with open(bout / "round_1" / "tags.csv", newline="") as fh:
+        assert [r["tag"] for r in csv.DictReader(fh)] == ["T0", "T1"]
+    assert json.loads((bout / "tag_log.json").read_text()) == [{"tag": "T0"}, {"tag": "T1"}, {"tag": "T2"}]
+
+    # A restarted process resumes the views where they stopped.
+    log.close()
+    fresh = tag_ingest.BoutLog(bout)
+    fresh.add_views(_views(bout))
+    fresh.append(_event(3))
+    fresh.materialize()
+    assert [e["tag"] for e in json.loads((bout / "tag_log.json").read_text())] == ["T0", "T1", "T2", "T3"]
+    fresh.close()
+
+
+def test_log_tag_event_feeds_both_fighters(tmp_path, monkeypatch, stub_optional_dependencies):
+    import routes.api_routes as api_routes
+
+    monkeypatch.setattr(api_routes.api_routes, "BASE_DIR", tmp_path, raising=False)
+    monkeypatch.setattr(api_routes, "safe_filename", lambda s: s.replace(" ", "_"))
+    fight = {"red_fighter": "Red", "blue_fighter": "Blue"}
+    monkeypatch.setattr(api_routes, "load_fight_state", lambda: (fight, "2099-01-01", "round_1"))
+
+    ts = api_routes._log_tag_event("2099-01-01", "bout_1", "round_1", "red", "Jab", "tag", "")
+    tag_ingest.flush()
+
+    log_dir = tmp_path / "FightControl" / "logs" / "2099-01-01" / "bout_1"
+    assert len((log_dir / tag_ingest.LOG_NAME).read_text().splitlines()) == 1
+    for name in ("Red", "Blue"):
+        dest = tmp_path / "FightControl" / "fighter_data" / name / "2099-01-01" / "bout_1"
+        assert json.loads((dest / "tag_log.json").read_text()) == [
+            {"timestamp": ts, "fighter": "red", "tag": "Jab", "type": "tag"}
+        ]
+        assert (dest / "round_1" / "tags.csv").read_text().splitlines()[1] == f"{ts},red,Jab"
+        assert "round_1,red,tag,Jab" in (dest / "events.csv").read_text()
+
+
+def test_tag_index_answers_filtered_queries(tmp_path, monkeypatch):
+    monkeypatch.setattr(tag_ingest, "VIEW_DELAY", 3600)
+    log = tag_ingest.BoutLog(tmp_path / "bout")
+    for fighter, rnd, etype, tag in [
+        ("red", "round_1", "tag", "RED Jab"),
+        ("blue", "round_1", "tag", "BLUE Hook"),
+        ("red", "round_1", "coach_note", "Breathe"),
+        ("red", "round_2", "tag", "RED Jab"),
+        ("blue", "round_2", "tag", "blue Hook"),
+    ]:
+        log.append({"timestamp": "t", "round": rnd, "fighter": fighter, "tag": tag, "type": etype, "meta": ""})
+
+    assert log.tags() == ["RED Jab", "BLUE Hook", "RED Jab", "blue Hook"]
+    assert log.tags("1") == ["RED Jab", "BLUE Hook"]
+    assert log.tags(fighter="red", etype=None) == ["RED Jab", "Breathe", "RED Jab"]
+    assert log.unique() == [("RED", "Jab"), ("BLUE", "Hook")]
+    assert log.unique("round_2") == [("RED", "Jab"), ("blue", "Hook")]
+    log.close()
+
+
+def test_csv_index_parses_only_appended_rows(tmp_path):
+    path = tmp_path / "events.csv"
+    path.write_text("timestamp,round,fighter,type,tag,meta\n1,round_1,red,tag,Jab,\n2,round_1,red,tag,Cr")
+    index = tag_ingest.csv_index(path)
+    assert index.tags() == ["Jab"]
+
+    with open(path, "a") as fh:
+        fh.write("oss,\n3,round_2,blue,bookmark,Pause,\n")
+    assert tag_ingest.csv_index(path) is index
+    assert index.tags() == ["Jab", "Cross"] and index.tags("round_2", etype=None) == ["Pause"]
+
+    path.write_text("timestamp,type,content,round_id,fighter_name\n1,tag,Hook,round_1,Red\n")
+    assert tag_ingest.csv_index(path).tags() == ["Hook"]
+
+
+def test_views_see_only_their_producer_and_flush_covers_taken_logs(tmp_path, monkeypatch):
+    monkeypatch.setattr(tag_ingest, "VIEW_DELAY", 3600)
+    bout = tmp_path / "shared"
+
+    def views(name):
+        return lambda: [tag_ingest.JsonListView(f"{name}:log", bout / f"{name}.json", lambda e: {"tag": e["tag"]})]
+
+    log = tag_ingest.open_log(bout, views("ui"), producer="ui")
+    log.append(_event(0), producer="ui")
+    # Registered later by another producer: must not replay the UI's events.
+    tag_ingest.open_log(bout, views("ctl"), producer="ctl").append(_event(1), producer="ctl")
+
+    # The worker may already have taken the log off its dirty list.
+    tag_ingest._worker._take()
+    tag_ingest.flush()
+    assert json.loads((bout / "ui.json").read_text()) == [{"tag": "T0"}]
+    assert json.loads((bout / "ctl.json").read_text()) == [{"tag": "T1"}]
+    tag_ingest.close_all()
+
+
+def test_json_list_view_appends_in_place(tmp_path):
+    path = tmp_path / "tag_log.json"
+    for indent in (2, None):
+        path.write_text(json.dumps([{"tag": "A"}], indent=indent))
+        view = tag_ingest.JsonListView("tag_log.json", path, lambda e: {"tag": e["tag"]}, indent=indent)
+        view.apply([_event(1), _event(2)])
+        assert path.read_text() == json.dumps([{"tag": "A"}, {"tag": "T1"}, {"tag": "T2"}], indent=indent)
+    path.write_text("[]")
+    view.apply([_event(3)])
+    assert json.loads(path.read_text()) == [{"tag": "T3"}]
+
+
+def test_round_key_strips_only_the_prefix():
+    assert tag_ingest.round_key("Round_1") == tag_ingest.round_key(1) == "1"
+    assert tag_ingest.round_key("round_d") == "d"
+    assert tag_ingest.round_key("draw") == "draw"
@@ -223,3 +223,50 @@ def test_tag_press_minimal_fields(tmp_path, monkeypatch):
     assert rows[0]["fighter"] == ""
     assert rows[0]["user"] == ""
     assert rows[0]["ts_iso"]
+
+
+def test_tag_log_manager_follows_round_transitions(tmp_path, monkeypatch):
+    from FightControl import round_manager
+    from FightControl.round_manager import RoundManager
+    from FightControl.routes import tags
+
+    monkeypatch.setattr(round_manager, "_overlay_state_file", lambda: tmp_path / "overlay.json")
+
+    status_path = tmp_path / "round_status.json"
+    log_path = tmp_path / "coach_notes.csv"
+    rm = RoundManager(status_path)
+    manager = tags.TagLogManager(path_fn=lambda: log_path, status_path=status_path, poll_interval=3600, prebuffer=5)
+    try:
+        row = dict.fromkeys(tags.FIELDS, "")
+        assert manager.log({**row, "button_id": "early"}) is False
+
+        rm.transition(RoundState.LIVE)
+        assert manager.writer is not None
+        assert manager.log({**row, "button_id": "live"})
+
+        rm.transition(RoundState.ENDED)
+        assert manager.writer is None
+        with log_path.open() as f:
+            assert [r["button_id"] for r in csv.DictReader(f)] == ["early", "live"]
+    finally:
+        manager.shutdown()
+
+
+def test_round_listeners_survive_round_manager_reload(tmp_path, monkeypatch):
+    import importlib
+
+    from FightControl import round_manager
+    from FightControl.routes import tags
+
+    status_path = tmp_path / "round_status.json"
+    manager = tags.TagLogManager(
+        path_fn=lambda: tmp_path / "coach_notes.csv", status_path=status_path, poll_interval=3600, prebuffer=0
+    )
+    try:
+        # round_timer.start_round_timer reloads the module on the first round.
+        reloaded = importlib.reload(round_manager)
+        monkeypatch.setattr(reloaded, "_overlay_state_file", lambda: tmp_path / "overlay.json")
+        reloaded.RoundManager(status_path).transition(RoundState.LIVE)
+        assert manager.writer is not None
+    finally:
+        manager.shutdown()
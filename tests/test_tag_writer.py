@@ -139,6 +139,9 @@ def test_tag_writer_handles_rapid_posts(tmp_path):
         for i in range(20):
             ct_module.log_tag("red", f"Tag{i}")
 
+        from services import tag_ingest
+
+        tag_ingest.flush()
         bout = f"2099-01-01_{safe_filename('Red Fighter').upper()}_vs_{safe_filename('Blue Fighter').upper()}_BOUT0"
         tag_path = Path(paths.BASE_DIR) / "FightControl" / "logs" / "2099-01-01" / bout / "round_1" / "tags.csv"
         lines = tag_path.read_text().strip().splitlines()
@@ -183,6 +186,9 @@ def test_tag_writer_stress_accumulates_entries(tmp_path):
         for i in range(100):
             ct_module.log_tag("red", f"Tag{i}")
 
+        from services import tag_ingest
+
+        tag_ingest.flush()
         bout = f"2099-01-01_{safe_filename('Red Fighter').upper()}_vs_{safe_filename('Blue Fighter').upper()}_BOUT0"
         tag_path = Path(paths.BASE_DIR) / "FightControl" / "logs" / "2099-01-01" / bout / "round_1" / "tags.csv"
         lines = tag_path.read_text().strip().splitlines()
@@ -0,0 +1,77 @@
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from services import timeline
+
+
+def _mark(fh, wall, mono, **fields):
+    fh.write(json.dumps({"wall": wall.isoformat(), "mono": mono, "boot": "b1", **fields}) + "\n")
+
+
+def test_streams_share_one_bout_clock(tmp_path):
+    start = datetime(2099, 1, 1, 20, 0, 0)
+    bout = tmp_path / "bout"
+    bout.mkdir()
+    with open(bout / timeline.MARKS_NAME, "w") as fh:
+        _mark(fh, start, 1000.0, stream="round", event="start", round=1)
+        _mark(fh, start + timedelta(seconds=180), 1180.0, stream="round", event="end", round=1)
+        # The wall clock jumped back during the rest; monotonic spacing wins.
+        _mark(fh, start + timedelta(seconds=200), 1240.0, stream="round", event="start", round=2)
+        _mark(fh, start + timedelta(seconds=210), 1241.0, stream="recording", event="start")
+    hr = [{"timestamp": (start + timedelta(seconds=i)).isoformat(), "bpm": 100 + i} for i in range(0, 400, 5)]
+    (bout / "hr_continuous.json").write_text(json.dumps(hr))
+    (bout / "events.csv").write_text(
+        "timestamp,round,fighter,type,tag,meta\n"
+        f"{(start + timedelta(seconds=335)).isoformat()},round_2,red,tag,Jab,\n"
+        f"{(start + timedelta(seconds=20)).isoformat()},round_1,blue,tag,Hook,\n"
+    )
+    (bout / "round_2").mkdir()
+    (bout / "round_2" / "hr_log.csv").write_text("0,150,ACTIVE,round_2\n0,151,ACTIVE,round_2")
+
+    tl = timeline.load_timeline(bout)
+    assert tl.rounds == {1: (0.0, 180.0), 2: (240.0, None)}
+    assert [m["event"] for m in tl.stream("recording")] == ["start"]
+    assert [t["tag"] for t in tl.stream("tag")] == ["Hook", "Jab"]
+
+    window = tl.in_round(2, "1:30", "1:45", ["hr", "tag"])
+    assert [s["t"] for s in window["hr"]] == [330.0, 335.0, 340.0, 345.0]
+    assert [t["tag"] for t in window["tag"]] == ["Jab"]
+    placeholders = [s for s in tl.in_round(2, 0, 1, ["hr"])["hr"] if s["source"] == "hr_log.csv"]
+    assert [(s["t"], s["bpm"]) for s in placeholders] == [(240.0, 150), (241.0, 151)]
+    assert timeline.load_timeline(bout) is tl
+
+
+def test_rounds_fall_back_to_configured_durations(tmp_path):
+    (tmp_path / "bout.json").write_text(json.dumps({"round_duration": 120, "rest_duration": 60, "total_rounds": 3}))
+    tl = timeline.build_timeline(tmp_path)
+    assert tl.round_start(3) == 360.0
+    assert timeline.parse_clock("1:02:03") == 3723.0
+
+
+def test_elapsed_hr_samples_are_anchored_or_skipped(tmp_path):
+    start = datetime(2099, 1, 1, 20, 0, 0)
+    hr = [{"time": 0, "bpm": 100}, {"time": 5, "bpm": 105}]
+    (tmp_path / "hr_continuous.json").write_text(json.dumps(hr))
+    assert timeline.build_timeline(tmp_path).stream("hr") == []
+
+    with open(tmp_path / timeline.MARKS_NAME, "w") as fh:
+        _mark(fh, start - timedelta(seconds=30), 970.0, stream="recording", event="start")
+        _mark(fh, start, 1000.0, stream="round", event="start", round=1)
+    tl = timeline.build_timeline(tmp_path)
+    assert [(s["t"], s["bpm"]) for s in tl.stream("hr")] == [(-30.0, 100), (-25.0, 105)]
+
+
+def test_stamp_tolerates_files_removed_after_glob(tmp_path, monkeypatch):
+    csv_path = tmp_path / "round_1" / "tags.csv"
+    csv_path.parent.mkdir()
+    csv_path.write_text("timestamp,tag\n")
+    real_stat = Path.stat
+
+    def stat(self, *args, **kwargs):
+        if self == csv_path:
+            raise FileNotFoundError(self)
+        return real_stat(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "stat", stat)
+    assert (str(csv_path), None, None) in timeline._stamp(tmp_path)
@@ -1,29 +1,103 @@
-"""Plot heart rate data using matplotlib."""
+"""Plot heart rate data to a PNG chart.
 
+The input is a JSON list of samples as written by the HR logger
+(``hr_data.json``) or the continuous logger (``hr_continuous.json``).  Each
+sample needs a ``bpm`` value and either a ``time`` offset in seconds or an ISO
+``timestamp``.  Charts are drawn with Pillow by default; ``--backend
+matplotlib`` selects the optional high fidelity renderer.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
 import sys
+from datetime import datetime
+from pathlib import Path
+from typing import List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from services.hr_chart import BACKENDS, HrPanel, render_hr_chart
+
 
+def load_samples(path: Path) -> Tuple[List[float], List[float], float | None]:
+    """Return ``(times, bpm, max_hr)`` parsed from the JSON file at ``path``."""
 
-def plot_hr() -> None:
-    """Plot heart rate data.
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    if isinstance(data, dict):
+        data = data.get("series") or data.get("data") or []
+
+    times: List[float] = []
+    bpm: List[float] = []
+    max_hr = None
+    start = None
+    for idx, sample in enumerate(data):
+        if not isinstance(sample, dict) or sample.get("bpm") is None:
+            continue
+        if max_hr is None and sample.get("max_hr"):
+            max_hr = float(sample["max_hr"])
+        if "time" in sample:
+            t = float(sample["time"])
+        elif "seconds" in sample:
+            t = float(sample["seconds"])
+        elif "timestamp" in sample:
+            try:
+                ts = datetime.fromisoformat(str(sample["timestamp"]))
+            except ValueError:
+                continue
+            start = start or ts
+            t = (ts - start).total_seconds()
+        else:
+            t = float(idx)
+        times.append(t)
+        bpm.append(float(sample["bpm"]))
+    return times, bpm, max_hr
+
+
+def plot_hr(
+    src: Path,
+    out: Path,
+    title: str = "Heart Rate",
+    max_hr: float | None = None,
+    backend: str | None = None,
+) -> Path:
+    """Plot heart rate samples from ``src`` into ``out``.
 
     Raises:
-        RuntimeError: If matplotlib is not installed.
+        RuntimeError: If the matplotlib backend is requested but matplotlib is
+            not installed.
     """
+    times, bpm, file_max = load_samples(src)
+    max_hr = max_hr or file_max or 200.0
+    panel = HrPanel(times=times, bpm=bpm, max_hr=max_hr, title=title, line_colour="black")
     try:
-        import matplotlib.pyplot as _  # type: ignore # noqa: F401
-    except Exception as exc:  # pragma: no cover - import failure
+        return render_hr_chart(panel, out, backend=backend)
+    except ImportError as exc:  # pragma: no cover - import failure
         raise RuntimeError("matplotlib is required for plotting") from exc
 
-    # Placeholder for plotting logic.
-    # The actual implementation is not required for this test.
 
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", type=Path, help="JSON file containing HR samples")
+    parser.add_argument("-o", "--output", type=Path, help="PNG path (defaults to input with .png suffix)")
+    parser.add_argument("--title", default="Heart Rate", help="Chart title")
+    parser.add_argument("--max-hr", type=float, help="Maximum heart rate used for zone bands")
+    parser.add_argument("--backend", choices=BACKENDS, help="Renderer to use (default: pillow)")
+    args = parser.parse_args(argv)
 
-def main() -> None:
+    out = args.output or args.input.with_suffix(".png")
     try:
-        plot_hr()
+        plot_hr(args.input, out, title=args.title, max_hr=args.max_hr, backend=args.backend)
     except RuntimeError:
         print("matplotlib is required for plotting", file=sys.stderr)
         raise SystemExit(1)
+    except (OSError, ValueError) as exc:
+        print(f"Failed to plot {args.input}: {exc}", file=sys.stderr)
+        raise SystemExit(1)
+    print(out)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,248 @@
+"""Regenerate session summaries and round charts for archived bouts.
+
+Every bout folder under ``FightControl/logs/<date>/<bout>`` is discovered and
+reprocessed in a process pool: round charts are rebuilt with
+:func:`round_summary.generate_round_summaries` and each fighter's
+``fighter_data/<fighter>/<date>/<bout>/session_summary.json`` with
+:func:`session_summary.build_session_summary` (which also refreshes the fighter
+history index).
+
+A fingerprint of each bout's inputs – the shared HR and tag files,
+``bout.json`` and both fighters' ``hr_data.json`` and ``zone_model.json`` – is
+stored in ``.reanalysis.json``.  Bouts
+whose fingerprint is unchanged are skipped, so rerunning after editing one
+fighter's zone model only touches that fighter's bouts.  Use ``--force`` to
+reprocess everything.
+
+Example::
+
+    python -m tools.reanalyse_bouts --workers 4
+    python -m tools.reanalyse_bouts --date 2025-06-01 --force
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+import traceback
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+# Bump when the analysis output format changes so every bout is redone.
+ANALYSIS_VERSION = 1
+MANIFEST = ".reanalysis.json"
+INPUT_FILES = ("bout.json", "hr_continuous.json", "events.csv", "tag_log.csv")
+CORNERS = ("red_fighter", "blue_fighter")
+
+_BOUT_RE = re.compile(r"^(?:\d{4}-\d{2}-\d{2}_)?(?P<red>.+?)_vs_(?P<blue>.+?)(?:_BOUT\d+)?$", re.IGNORECASE)
+_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+def discover_bouts(base_dir: Path, date: str | None = None) -> Iterator[Path]:
+    """Yield bout directories beneath ``FightControl/logs`` in date order."""
+
+    logs = Path(base_dir) / "FightControl" / "logs"
+    if not logs.is_dir():
+        return
+    for date_dir in sorted(logs.iterdir()):
+        if not date_dir.is_dir() or not _DATE_RE.match(date_dir.name):
+            continue
+        if date and date_dir.name != date:
+            continue
+        for bout in sorted(date_dir.iterdir()):
+            if bout.is_dir() and "_vs_" in bout.name:
+                yield bout
+
+
+def bout_meta(session_dir: Path) -> dict[str, object]:
+    """Return fight metadata for ``session_dir`` from ``bout.json`` or its name."""
+
+    meta: dict[str, object] = {}
+    try:
+        meta = json.loads((session_dir / "bout.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        pass
+    meta = {k: v for k, v in meta.items() if v is not None}
+    meta.setdefault("fight_date", session_dir.parent.name)
+    if not (meta.get("red_fighter") and meta.get("blue_fighter")):
+        match = _BOUT_RE.match(session_dir.name)
+        if match:
+            meta.setdefault("red_fighter", match.group("red"))
+            meta.setdefault("blue_fighter", match.group("blue"))
+    return meta
+
+
+def _stamp(path: Path) -> list[int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def fighter_session(base_dir: Path, session_dir: Path, meta: dict[str, object], corner: str) -> Path:
+    """Return ``fighter_data/<fighter>/<date>/<bout>`` for ``corner`` of the bout."""
+
+    from FightControl.fight_utils import safe_filename
+
+    fighter = safe_filename(str(meta.get(corner, "")))
+    return Path(base_dir) / "FightControl" / "fighter_data" / fighter / str(meta.get("fight_date")) / session_dir.name
+
+
+def fingerprint(base_dir: Path, session_dir: Path, meta: dict[str, object]) -> str:
+    """Return a hash of every input that influences the analysis output."""
+
+    parts: dict[str, object] = {"version": ANALYSIS_VERSION}
+    for name in INPUT_FILES:
+        parts[name] = _stamp(session_dir / name)
+    for corner in CORNERS:
+        fighter_dir = fighter_session(base_dir, session_dir, meta, corner)
+        parts[corner] = _stamp(fighter_dir.parent.parent / "zone_model.json")
+        parts[f"{corner}_hr"] = _stamp(fighter_dir / "hr_data.json")
+    return hashlib.sha1(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+
+def _init_worker(base_dir: str) -> None:
+    os.environ["BASE_DIR"] = base_dir
+    import paths
+
+    paths.refresh_paths()
+
+
+def reanalyse_bout(base_dir: str, session_dir: str, force: bool = False, charts: bool = True) -> dict[str, object]:
+    """Reprocess one bout and return a result record.
+
+    Runs inside the worker processes; exceptions are captured and returned so
+    a single corrupt bout never aborts the whole batch.
+    """
+
+    started = time.perf_counter()
+    path = Path(session_dir)
+    result: dict[str, object] = {"bout": session_dir, "status": "ok", "error": None}
+    try:
+        meta = bout_meta(path)
+        digest = fingerprint(Path(base_dir), path, meta)
+        manifest = path / MANIFEST
+        try:
+            previous = json.loads(manifest.read_text(encoding="utf-8")).get("fingerprint")
+        except (OSError, ValueError, AttributeError):
+            previous = None
+        summaries = [fighter_session(Path(base_dir), path, meta, c) / "session_summary.json" for c in CORNERS]
+        if not force and previous == digest and all(p.exists() for p in summaries):
+            result["status"] = "skipped"
+            return result
+
+        # ``session_summary`` must be imported before ``round_summary`` which
+        # installs a lightweight ``FightControl`` package stub.
+        import session_summary
+        from FightControl.fight_utils import safe_filename
+
+        try:
+            old = json.loads(summaries[0].read_text(encoding="utf-8"))
+            round_results = old.get("round_results") or {}
+        except (OSError, ValueError, AttributeError):
+            round_results = {}
+
+        if charts:
+            import round_summary
+
+            round_summary.generate_round_summaries(meta, session_dir=path)
+        for corner in CORNERS:
+            # One summary per fighter, each from that fighter's own hr_data.json.
+            session_summary.build_session_summary(
+                path,
+                fighter=safe_filename(str(meta.get(corner, ""))) or None,
+                date=str(meta.get("fight_date")),
+                bout=path.name,
+                round_results=round_results,
+            )
+        manifest.write_text(json.dumps({"fingerprint": digest, "version": ANALYSIS_VERSION}), encoding="utf-8")
+    except Exception as exc:
+        result["status"] = "failed"
+        result["error"] = f"{type(exc).__name__}: {exc}"
+        result["traceback"] = traceback.format_exc()
+    finally:
+        result["seconds"] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def run(
+    base_dir: Path,
+    workers: int | None = None,
+    force: bool = False,
+    charts: bool = True,
+    date: str | None = None,
+    progress=None,
+) -> dict[str, object]:
+    """Reprocess every discovered bout and return aggregate statistics."""
+
+    base = str(Path(base_dir).resolve())
+    bouts = [str(p) for p in discover_bouts(Path(base), date)]
+    stats: dict[str, object] = {"total": len(bouts), "ok": 0, "skipped": 0, "failed": 0, "failures": []}
+    started = time.perf_counter()
+    if bouts:
+        # ``spawn`` gives every platform the same clean worker state as Windows.
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=ctx, initializer=_init_worker, initargs=(base,)
+        ) as pool:
+            futures = [pool.submit(reanalyse_bout, base, bout, force, charts) for bout in bouts]
+            for done, future in enumerate(as_completed(futures), start=1):
+                result = future.result()
+                stats[result["status"]] += 1  # type: ignore[operator]
+                if result["status"] == "failed":
+                    stats["failures"].append(result)  # type: ignore[union-attr]
+                if progress is not None:
+                    progress(done, len(bouts), result)
+    elapsed = time.perf_counter() - started
+    processed = int(stats["ok"]) + int(stats["failed"])
+    stats["elapsed"] = round(elapsed, 3)
+    stats["bouts_per_second"] = round(processed / elapsed, 2) if elapsed and processed else 0.0
+    return stats
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Regenerate session summaries and charts for archived bouts.")
+    parser.add_argument("--base-dir", type=Path, default=None, help="Override the Cyclone base directory.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--date", help="Only reprocess bouts from this YYYY-MM-DD date")
+    parser.add_argument("--force", action="store_true", help="Reprocess bouts even if inputs are unchanged")
+    parser.add_argument("--no-charts", dest="charts", action="store_false", help="Skip round chart generation")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Only print the final report")
+    args = parser.parse_args(argv)
+
+    if args.base_dir is None:
+        import paths
+
+        base_dir = Path(paths.BASE_DIR)
+    else:
+        base_dir = args.base_dir
+
+    def _progress(done: int, total: int, result: dict[str, object]) -> None:
+        if not args.quiet:
+            print(f"[{done}/{total}] {result['status']:<7} {result['bout']}")
+
+    stats = run(base_dir, args.workers, args.force, args.charts, args.date, progress=_progress)
+    print(
+        f"{stats['total']} bouts: {stats['ok']} reprocessed, {stats['skipped']} unchanged, "
+        f"{stats['failed']} failed in {stats['elapsed']}s ({stats['bouts_per_second']} bouts/s)"
+    )
+    for failure in stats["failures"]:  # type: ignore[union-attr]
+        print(f"FAILED {failure['bout']}: {failure['error']}", file=sys.stderr)
+    if stats["failed"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,13 +4,18 @@ This module provides helpers to parse CSV rows and files while
 normalising header names to internal keys, performing unit conversions
 and gracefully handling missing values. It is intentionally lightweight
 and does not depend on pandas.
+
+Header normalisation is resolved once per file with :func:`compile_headers`
+and :func:`iter_csv` yields parsed rows lazily so large files are processed
+in bounded memory.
 """
 
 from __future__ import annotations
 
 import csv
 import re
-from typing import IO, Any, Dict, Iterable, List, Mapping, Optional
+from functools import lru_cache
+from typing import IO, Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
 
 # Map normalised header names to internal keys
 HEADER_MAP = {
@@ -52,6 +57,7 @@ UNIT_PATTERNS = {
 }
 
 
+@lru_cache(maxsize=1024)
 def _normalise_header(header: str) -> (str, Optional[str]):
     """Return (normalised_header, unit) for ``header``.
 
@@ -85,34 +91,55 @@ def _convert(value: str, unit: Optional[str]) -> Any:
     return num * factor if factor is not None else num
 
 
-def parse_row(row: Mapping[str, Any]) -> Dict[str, Any]:
-    """Parse a single CSV row into internal representation.
+HeaderSpec = List[Tuple[str, str, Optional[str]]]
 
-    ``row`` should map column headers to values.  Unknown headers are
-    ignored.  Empty values are converted to ``None``.  Numeric values are
-    converted to ``float`` and known units are converted to their SI
-    equivalents.
-    """
-    result: Dict[str, Any] = {}
-    for header, raw in row.items():
+
+def compile_headers(headers: Iterable[Optional[str]]) -> HeaderSpec:
+    """Return ``(header, key, unit)`` for every recognised column in ``headers``."""
+    spec: HeaderSpec = []
+    for header in headers:
         if header is None:
             continue
         norm, unit = _normalise_header(str(header))
         key = HEADER_MAP.get(norm)
-        if not key:
-            continue
+        if key:
+            spec.append((header, key, unit))
+    return spec
+
+
+def _apply(spec: HeaderSpec, row: Mapping[str, Any]) -> Dict[str, Any]:
+    result: Dict[str, Any] = {}
+    for header, key, unit in spec:
+        raw = row.get(header)
         if raw in (None, ""):
             result[key] = None
             continue
-        value = str(raw).strip()
-        result[key] = _convert(value, unit)
+        result[key] = _convert(str(raw).strip(), unit)
     return result
 
 
+def parse_row(row: Mapping[str, Any]) -> Dict[str, Any]:
+    """Parse a single CSV row into internal representation.
+
+    ``row`` should map column headers to values.  Unknown headers are
+    ignored.  Empty values are converted to ``None``.  Numeric values are
+    converted to ``float`` and known units are converted to their SI
+    equivalents.
+    """
+    return _apply(compile_headers(row.keys()), row)
+
+
+def iter_csv(file: IO[str]) -> Iterator[Dict[str, Any]]:
+    """Yield parsed fighters from ``file`` one row at a time."""
+    reader = csv.DictReader(file)
+    spec = compile_headers(reader.fieldnames or [])
+    for row in reader:
+        yield _apply(spec, row)
+
+
 def parse_csv(file: IO[str]) -> List[Dict[str, Any]]:
     """Parse ``file`` containing CSV data into a list of fighters."""
-    reader = csv.DictReader(file)
-    return [parse_row(row) for row in reader]
+    return list(iter_csv(file))
 
 
-__all__ = ["parse_row", "parse_csv"]
+__all__ = ["compile_headers", "iter_csv", "parse_row", "parse_csv"]
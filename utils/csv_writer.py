@@ -1,17 +1,40 @@
 import csv
+import io
+import logging
+import os
 import threading
+import time
 from pathlib import Path
 from typing import Any, Dict, Sequence
 
+MAX_BATCH = int(os.getenv("CSV_WRITER_MAX_BATCH", "256"))
+MAX_LATENCY = float(os.getenv("CSV_WRITER_MAX_LATENCY", "0.5"))
+FSYNC = os.getenv("CSV_WRITER_FSYNC", "never").lower()
+FSYNC_POLICIES = ("never", "batch", "close")
+
+logger = logging.getLogger(__name__)
+
 
 class DebouncedCsvWriter:
-    """Append rows to a CSV file with debounced disk writes.
+    """Append rows to a CSV file with group-committed disk writes.
+
+    The writer keeps the file handle open for the lifetime of the instance and
+    a single flusher thread, started on the first :meth:`write`.  Rows are
+    queued and committed once no row has arrived for ``debounce_interval``
+    seconds, once the oldest pending row has waited ``max_latency`` seconds, or
+    once ``max_batch`` rows are pending, whichever comes first.  Each commit is
+    one ``write`` and one ``flush`` of the whole batch, preserving order.
 
-    The writer keeps the file handle open for the lifetime of the instance.
-    Calls to :meth:`write` enqueue a row and schedule a flush after
-    ``debounce_interval`` seconds.  Multiple writes within the interval are
-    coalesced into a single flush, preserving order.  Each row is flushed to
-    disk individually to ensure durability.
+    ``fsync`` selects when the data is forced to stable storage: ``"never"``
+    (leave it to the OS), ``"batch"`` (after every commit) or ``"close"``.
+    The defaults come from ``CSV_WRITER_MAX_BATCH``, ``CSV_WRITER_MAX_LATENCY``
+    and ``CSV_WRITER_FSYNC``.
+
+    A failed commit is logged and its rows stay queued; the flusher retries
+    after ``max_latency`` seconds.
+
+    ``flush_count`` is the number of rows committed so far; :meth:`stats`
+    reports batch sizes and commit latency.
     """
 
     def __init__(
@@ -19,30 +42,48 @@ class DebouncedCsvWriter:
         path: Path,
         fieldnames: Sequence[str],
         debounce_interval: float = 0.05,
+        max_batch: int | None = None,
+        max_latency: float | None = None,
+        fsync: str | None = None,
     ) -> None:
         self.path = Path(path)
         self.path.parent.mkdir(parents=True, exist_ok=True)
         self.fieldnames = list(fieldnames)
         self.debounce_interval = debounce_interval
+        self.max_batch = max(1, max_batch if max_batch is not None else MAX_BATCH)
+        self.max_latency = max(debounce_interval, max_latency if max_latency is not None else MAX_LATENCY)
+        self.fsync = (fsync or FSYNC).lower()
+        if self.fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}, not {self.fsync!r}")
         self._fh = self.path.open("a", newline="", encoding="utf-8")
-        self._writer = csv.DictWriter(self._fh, fieldnames=self.fieldnames)
         if self._fh.tell() == 0:
-            self._writer.writeheader()
+            csv.DictWriter(self._fh, fieldnames=self.fieldnames).writeheader()
             self._fh.flush()
-        self._lock = threading.Lock()
-        self._queue: list[Dict[str, Any]] = []
-        self._timer: threading.Timer | None = None
+        self._cond = threading.Condition()
+        self._io_lock = threading.Lock()
+        self._queue: list[tuple[float, Dict[str, Any]]] = []
+        self._last_write = 0.0
+        self._closed = False
+        self._thread: threading.Thread | None = None
         self.flush_count = 0
+        self._flushes = 0
+        self._max_rows = 0
+        self._commit_total = 0.0
+        self._commit_max = 0.0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
 
     def write(self, row: Dict[str, Any]) -> None:
         """Queue ``row`` for writing to the CSV file."""
-        with self._lock:
-            self._queue.append(row)
-            if self._timer is not None:
-                self._timer.cancel()
-            self._timer = threading.Timer(self.debounce_interval, self._flush)
-            self._timer.daemon = True
-            self._timer.start()
+        with self._cond:
+            if self._closed:
+                raise ValueError("write to closed DebouncedCsvWriter")
+            self._last_write = time.monotonic()
+            self._queue.append((self._last_write, row))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=f"csv-writer:{self.path.name}", daemon=True)
+                self._thread.start()
+            self._cond.notify()
 
     # NOTE: ``write_row`` provides a slightly more explicit API name used by
     # newer code.  It simply forwards to :meth:`write` so existing behaviour is
@@ -51,26 +92,106 @@ class DebouncedCsvWriter:
     def write_row(self, row: Dict[str, Any]) -> None:
         self.write(row)
 
+    def _due(self) -> float:
+        """Seconds until the pending batch should be committed (``<= 0`` means now)."""
+        if self._closed or len(self._queue) >= self.max_batch:
+            return 0.0
+        oldest = self._queue[0][0]
+        deadline = min(self._last_write + self.debounce_interval, oldest + self.max_latency)
+        return deadline - time.monotonic()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                wait = self._due()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+            try:
+                self._flush()
+            except Exception:
+                logger.exception("Failed to write %s; keeping rows for retry", self.path)
+                with self._cond:
+                    if self._closed:
+                        # close() commits what is left and reports the error.
+                        return
+                    self._cond.wait(self.max_latency)
+
     def _flush(self) -> None:
-        with self._lock:
-            rows = self._queue
-            self._queue = []
-            self._timer = None
-        for r in rows:
-            self._writer.writerow(r)
+        with self._cond:
+            batch = self._queue[: self.max_batch]
+            del self._queue[: self.max_batch]
+        if batch:
+            try:
+                self._commit(batch)
+            except Exception:
+                with self._cond:
+                    self._queue[:0] = batch
+                raise
+
+    def _commit(self, batch: list[tuple[float, Dict[str, Any]]]) -> None:
+        buf = io.StringIO()
+        writer = csv.DictWriter(buf, fieldnames=self.fieldnames)
+        writer.writerows(row for _, row in batch)
+        start = time.monotonic()
+        with self._io_lock:
+            self._fh.write(buf.getvalue())
             self._fh.flush()
-            self.flush_count += 1
+            if self.fsync == "batch":
+                os.fsync(self._fh.fileno())
+        done = time.monotonic()
+        self.flush_count += len(batch)
+        self._flushes += 1
+        self._max_rows = max(self._max_rows, len(batch))
+        self._commit_total += done - start
+        self._commit_max = max(self._commit_max, done - start)
+        self._latency_total += done - batch[0][0]
+        self._latency_max = max(self._latency_max, done - batch[0][0])
+
+    def stats(self) -> Dict[str, Any]:
+        """Return commit statistics for this writer.
+
+        ``commit_ms`` is the time spent writing and flushing a batch;
+        ``latency_ms`` runs from the oldest row being queued to its commit.
+        """
+        flushes = self._flushes or 1
+        with self._cond:
+            pending = len(self._queue)
+        return {
+            "rows": self.flush_count,
+            "flushes": self._flushes,
+            "pending": pending,
+            "rows_per_flush": self.flush_count / flushes,
+            "max_rows_per_flush": self._max_rows,
+            "commit_ms_mean": self._commit_total / flushes * 1000,
+            "commit_ms_max": self._commit_max * 1000,
+            "latency_ms_mean": self._latency_total / flushes * 1000,
+            "latency_ms_max": self._latency_max * 1000,
+        }
 
     def close(self) -> None:
         """Flush any pending rows and close the file handle."""
-        with self._lock:
-            if self._timer is not None:
-                self._timer.cancel()
-                self._timer = None
-            rows = self._queue
-            self._queue = []
-        for r in rows:
-            self._writer.writerow(r)
-            self._fh.flush()
-            self.flush_count += 1
-        self._fh.close()
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+            self._cond.notify_all()
+        if thread is not None:
+            thread.join()
+        with self._cond:
+            batch, self._queue = self._queue, []
+        try:
+            if batch:
+                self._commit(batch)
+            with self._io_lock:
+                if self.fsync != "never":
+                    os.fsync(self._fh.fileno())
+        finally:
+            # A failed final commit is still raised, but never leaks the handle.
+            with self._io_lock:
+                self._fh.close()
@@ -0,0 +1,76 @@
+"""Process-wide record of directories already created.
+
+Session folders are resolved on hot paths (every HR sample and coach tag), and
+each lookup used to ``mkdir(parents=True)`` and sometimes ``os.access`` the
+result even though the folder was created on the first call.  :func:`ensure`
+creates a directory the first time it is asked for and afterwards only checks
+an in-memory set, so repeated lookups cost a string join and a set lookup.
+
+:func:`ensure_tree` creates a whole bout's folder tree up front when the bout
+is armed.
+
+The cache cannot notice directories removed outside this module.  Code that
+deletes folders while the server is running (``/reset-system`` clearing the
+logs, for example) must call :func:`forget` for them afterwards; otherwise
+writers that rely on :func:`ensure` fail with :class:`FileNotFoundError`
+instead of re-creating the folder.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+
+_lock = threading.Lock()
+_known: set[str] = set()
+
+
+def known(path: str | Path) -> bool:
+    """Return ``True`` if ``path`` has been created or checked by this process."""
+
+    return os.fspath(path) in _known
+
+
+def remember(path: str | Path) -> Path:
+    """Record ``path`` (an existing directory) as known."""
+
+    with _lock:
+        _known.add(os.fspath(path))
+    return Path(path)
+
+
+def ensure(path: str | Path) -> Path:
+    """Create ``path`` and its parents unless it is already known."""
+
+    path = Path(path)
+    if os.fspath(path) not in _known:
+        path.mkdir(parents=True, exist_ok=True)
+        remember(path)
+    return path
+
+
+def ensure_tree(paths: Iterable[str | Path]) -> list[Path]:
+    """Create every directory in ``paths`` once and return them."""
+
+    return [ensure(p) for p in paths]
+
+
+def forget(prefix: str | Path | None = None) -> None:
+    """Forget known directories, all of them or those beneath ``prefix``.
+
+    Call this after deleting directories so the next :func:`ensure` creates
+    them again.
+    """
+
+    with _lock:
+        if prefix is None:
+            _known.clear()
+            return
+        root = os.fspath(prefix)
+        for path in [p for p in _known if p == root or p.startswith(root + os.sep)]:
+            _known.discard(path)
+
+
+__all__ = ["ensure", "ensure_tree", "forget", "known", "remember"]
@@ -0,0 +1,181 @@
+"""Precomputed view bundles for fighter detail pages.
+
+Rendering ``/fighters/<safe_name>`` used to read ``profile.json`` and
+``charts.json`` and stat ``card_full.png`` on every request.  A bundle merges
+everything the page needs – profile, chart series, latest performance and
+asset URLs – into ``fighter_data/<safe_name>/bundle.json`` together with a
+strong ETag derived from its content.
+
+Bundles are rebuilt eagerly by :func:`build_bundle` whenever a profile or
+performance result is saved.  :func:`load_bundle` serves them from memory and
+only re-stats the source files once every ``FIGHTER_BUNDLE_CHECK_INTERVAL``
+seconds (default ``2``) to pick up edits made outside the app, so kiosks
+cycling through fighter pages cause almost no disk activity.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_NAME = "bundle.json"
+BUNDLE_VERSION = 1
+SOURCES = ("profile.json", "charts.json", "card_full.png")
+CHECK_INTERVAL = float(os.getenv("FIGHTER_BUNDLE_CHECK_INTERVAL", "2"))
+
+_lock = threading.Lock()
+# fighter_dir -> (monotonic time of last source check, bundle)
+_cache: dict[str, tuple[float, dict]] = {}
+
+
+def _stamps(fighter_dir: Path) -> dict[str, list[int] | None]:
+    stamps: dict[str, list[int] | None] = {}
+    for name in SOURCES:
+        try:
+            st = (fighter_dir / name).stat()
+        except OSError:
+            stamps[name] = None
+        else:
+            stamps[name] = [st.st_mtime_ns, st.st_size]
+    return stamps
+
+
+def _latest_performance(fighter_dir: Path, profile: dict) -> dict:
+    name = profile.get("name")
+    data_dir = fighter_dir.parent.parent / "data"
+    if name:
+        from utils import performance_store
+
+        if performance_store.db_path(data_dir).exists():
+            try:
+                latest = performance_store.latest_results(name, data_dir=data_dir)
+            except Exception:  # pragma: no cover - corrupt database
+                logger.exception("Could not read performance results for %s", name)
+                latest = []
+            if latest and isinstance(latest[0]["performance"], dict):
+                return latest[0]["performance"]
+    perf = profile.get("performance")
+    return perf if isinstance(perf, dict) else {}
+
+
+def build_bundle(fighter_dir: str | Path) -> dict:
+    """Build, store and cache the bundle for ``fighter_dir``.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the fighter has no ``profile.json``.
+    """
+
+    from utils.perf import build_charts_from_perf
+
+    fighter_dir = Path(fighter_dir)
+    stamps = _stamps(fighter_dir)
+    if stamps["profile.json"] is None:
+        raise FileNotFoundError(fighter_dir / "profile.json")
+    profile = json.loads((fighter_dir / "profile.json").read_text(encoding="utf-8"))
+    performance = _latest_performance(fighter_dir, profile)
+
+    charts: dict = {}
+    if stamps["charts.json"] is not None:
+        try:
+            charts = json.loads((fighter_dir / "charts.json").read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            charts = {}
+    if not charts and performance:
+        charts = build_charts_from_perf(performance, profile)
+
+    safe = fighter_dir.name
+    content = {
+        "safe_name": safe,
+        "profile": profile,
+        "performance": performance,
+        "charts": charts,
+        "card_url": f"/fighter_data/{safe}/card_full.png" if stamps["card_full.png"] else None,
+    }
+    etag = hashlib.sha1(json.dumps(content, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    bundle = {"version": BUNDLE_VERSION, "etag": etag, "sources": stamps, **content}
+
+    path = fighter_dir / BUNDLE_NAME
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    try:
+        tmp.write_text(json.dumps(bundle, default=str), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError:
+        logger.warning("Could not write fighter bundle for %s", safe)
+    with _lock:
+        _cache[str(fighter_dir)] = (time.monotonic(), bundle)
+    return bundle
+
+
+def load_bundle(fighter_dir: str | Path) -> dict:
+    """Return the bundle for ``fighter_dir``, rebuilding it when stale.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the fighter has no ``profile.json``.
+    """
+
+    fighter_dir = Path(fighter_dir)
+    key = str(fighter_dir)
+    now = time.monotonic()
+    with _lock:
+        cached = _cache.get(key)
+    if cached is not None and now - cached[0] < CHECK_INTERVAL:
+        return cached[1]
+
+    stamps = _stamps(fighter_dir)
+    if cached is not None and cached[1]["sources"] == stamps:
+        with _lock:
+            _cache[key] = (now, cached[1])
+        return cached[1]
+    if stamps["profile.json"] is None:
+        invalidate(fighter_dir)
+        raise FileNotFoundError(fighter_dir / "profile.json")
+
+    try:
+        stored = json.loads((fighter_dir / BUNDLE_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        stored = None
+    if isinstance(stored, dict) and stored.get("version") == BUNDLE_VERSION and stored.get("sources") == stamps:
+        with _lock:
+            _cache[key] = (now, stored)
+        return stored
+    return build_bundle(fighter_dir)
+
+
+def refresh_bundle(fighter_dir: str | Path) -> dict | None:
+    """Rebuild the bundle after a change, ignoring fighters without a profile."""
+
+    try:
+        return build_bundle(fighter_dir)
+    except (OSError, ValueError):
+        invalidate(fighter_dir)
+        return None
+
+
+def invalidate(fighter_dir: str | Path | None = None) -> None:
+    """Drop cached bundles for ``fighter_dir`` (or all fighters)."""
+
+    with _lock:
+        if fighter_dir is None:
+            _cache.clear()
+        else:
+            _cache.pop(str(Path(fighter_dir)), None)
+
+
+__all__ = [
+    "BUNDLE_NAME",
+    "build_bundle",
+    "invalidate",
+    "load_bundle",
+    "refresh_bundle",
+]
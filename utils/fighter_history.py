@@ -0,0 +1,313 @@
+"""Persistent cross-bout history index for fighters.
+
+Per-bout data lives in many small files under ``FightControl/logs`` and
+``FightControl/fighter_data`` which makes questions such as "how has this
+fighter's peak HR changed over the last month" expensive: every bout folder has
+to be discovered and parsed.  This module keeps a compact SQLite database in
+``FightControl/data/fighter_history.db`` that is updated incrementally each
+time a session summary is written (see :func:`record_summary`).  Trend queries
+then run against indexed tables without touching the bout folders at all.
+
+Only the Python standard library is used so the index works on the fight
+laptop without extra dependencies.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+import sqlite3
+import threading
+from collections.abc import Iterable
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+
+import paths
+
+logger = logging.getLogger(__name__)
+
+DB_NAME = "fighter_history.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bouts (
+    fighter TEXT NOT NULL,
+    date TEXT NOT NULL,
+    bout TEXT NOT NULL,
+    bout_no INTEGER,
+    session_dir TEXT,
+    peak_hr INTEGER,
+    avg_hr INTEGER,
+    min_hr INTEGER,
+    tag_count INTEGER,
+    updated_at TEXT,
+    PRIMARY KEY (fighter, date, bout)
+);
+CREATE TABLE IF NOT EXISTS rounds (
+    fighter TEXT NOT NULL,
+    date TEXT NOT NULL,
+    bout TEXT NOT NULL,
+    round INTEGER NOT NULL,
+    peak_hr INTEGER,
+    recovery_hr INTEGER,
+    PRIMARY KEY (fighter, date, bout, round)
+);
+CREATE TABLE IF NOT EXISTS zones (
+    fighter TEXT NOT NULL,
+    date TEXT NOT NULL,
+    bout TEXT NOT NULL,
+    zone TEXT NOT NULL,
+    seconds REAL,
+    PRIMARY KEY (fighter, date, bout, zone)
+);
+CREATE INDEX IF NOT EXISTS idx_bouts_fighter_date ON bouts (fighter, date);
+CREATE INDEX IF NOT EXISTS idx_zones_fighter_date ON zones (fighter, date);
+"""
+
+
+def db_path() -> Path:
+    """Return the history database path honouring ``BASE_DIR`` overrides."""
+
+    return Path(paths.BASE_DIR) / "FightControl" / "data" / DB_NAME
+
+
+_BOUT_NO_RE = re.compile(r"_BOUT(\d+)$", re.IGNORECASE)
+
+_init_lock = threading.Lock()
+_initialised: set[str] = set()
+
+
+def _initialise(path: Path) -> None:
+    """Create the schema and enable WAL for ``path`` once per process."""
+
+    key = str(path)
+    if key in _initialised and path.exists():
+        return
+    with _init_lock:
+        if key in _initialised and path.exists():
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(sqlite3.connect(key, timeout=5)) as conn:
+            try:
+                # WAL is persistent in the database file, so it is set only once.
+                conn.execute("PRAGMA journal_mode=WAL")
+            except sqlite3.DatabaseError:  # pragma: no cover - e.g. network drives
+                pass
+            conn.executescript(_SCHEMA)
+            _add_bout_no(conn)
+        _initialised.add(key)
+
+
+def bout_number(bout: str) -> int:
+    """Return the ``_BOUT<n>`` suffix of ``bout`` as an integer, ``0`` if absent."""
+
+    match = _BOUT_NO_RE.search(str(bout))
+    return int(match.group(1)) if match else 0
+
+
+def _add_bout_no(conn: sqlite3.Connection) -> None:
+    """Add and backfill ``bouts.bout_no`` in databases created before it existed."""
+
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(bouts)")}
+    if "bout_no" in columns:
+        return
+    with conn:
+        conn.execute("ALTER TABLE bouts ADD COLUMN bout_no INTEGER")
+        conn.executemany(
+            "UPDATE bouts SET bout_no=? WHERE bout=?",
+            [(bout_number(bout), bout) for (bout,) in conn.execute("SELECT DISTINCT bout FROM bouts")],
+        )
+
+
+def connect(path: Path | None = None) -> sqlite3.Connection:
+    """Open the history database, creating the schema on first use."""
+
+    path = Path(path) if path is not None else db_path()
+    _initialise(path)
+    conn = sqlite3.connect(str(path), timeout=5)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def _round_number(key: str) -> int | None:
+    try:
+        return int(str(key).lower().replace("round_", "").replace("round", ""))
+    except ValueError:
+        return None
+
+
+def bout_identity(session_dir: str | Path) -> dict[str, str | None]:
+    """Infer ``fighter``/``date``/``bout`` from a session directory path.
+
+    ``fighter_data/<fighter>/<date>/<bout>`` yields all three components while
+    the shared ``logs/<date>/<bout>`` layout leaves ``fighter`` as ``None``.
+    """
+
+    parts = Path(session_dir).parts
+    ident: dict[str, str | None] = {"fighter": None, "date": None, "bout": None}
+    if len(parts) >= 2:
+        ident["date"], ident["bout"] = parts[-2], parts[-1]
+    if len(parts) >= 4 and parts[-4] == "fighter_data":
+        ident["fighter"] = parts[-3]
+    return ident
+
+
+def record_summary(
+    session_dir: str | Path,
+    summary: dict,
+    fighter: str | None = None,
+    date: str | None = None,
+    bout: str | None = None,
+    db: Path | None = None,
+) -> bool:
+    """Insert or replace the history rows for one bout summary.
+
+    Missing identity components are inferred from ``session_dir``.  Returns
+    ``False`` without raising when the bout cannot be attributed to a fighter
+    or the database is unavailable so summary generation never fails because
+    of the index.
+    """
+
+    ident = bout_identity(session_dir)
+    fighter = fighter or ident["fighter"]
+    date = date or ident["date"]
+    bout = bout or ident["bout"]
+    if not (fighter and date and bout):
+        logger.debug("Skipping history update for %s: unknown fighter", session_dir)
+        return False
+
+    stats = summary.get("bpm_stats") or {}
+    rounds = summary.get("round_metrics") or {}
+    zones = summary.get("time_in_zones") or {}
+    key = (fighter, date, bout)
+    try:
+        with closing(connect(db)) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO bouts (fighter, date, bout, bout_no, session_dir, peak_hr, avg_hr, min_hr,"
+                " tag_count, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    *key,
+                    bout_number(bout),
+                    str(session_dir),
+                    stats.get("max"),
+                    stats.get("avg"),
+                    stats.get("min"),
+                    len(summary.get("tags") or []),
+                    datetime.now().isoformat(timespec="seconds"),
+                ),
+            )
+            conn.execute("DELETE FROM rounds WHERE fighter=? AND date=? AND bout=?", key)
+            conn.execute("DELETE FROM zones WHERE fighter=? AND date=? AND bout=?", key)
+            conn.executemany(
+                "INSERT INTO rounds VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (*key, num, metrics.get("peak_hr"), metrics.get("recovery_hr"))
+                    for name, metrics in rounds.items()
+                    if (num := _round_number(name)) is not None and isinstance(metrics, dict)
+                ],
+            )
+            conn.executemany(
+                "INSERT INTO zones VALUES (?, ?, ?, ?, ?)",
+                [(*key, zone, seconds) for zone, seconds in zones.items()],
+            )
+    except sqlite3.Error:
+        logger.exception("Failed to update fighter history for %s", session_dir)
+        return False
+    return True
+
+
+def peak_hr_trend(fighter: str, limit: int | None = None, db: Path | None = None) -> list[dict]:
+    """Return ``peak_hr``/``avg_hr`` per bout ordered oldest first.
+
+    ``limit`` restricts the result to the most recent bouts.
+    """
+
+    sql = "SELECT date, bout, peak_hr, avg_hr FROM bouts WHERE fighter=? ORDER BY date DESC, bout_no DESC, bout DESC"
+    params: list = [fighter]
+    if limit:
+        sql += " LIMIT ?"
+        params.append(int(limit))
+    with closing(connect(db)) as conn:
+        rows = [dict(r) for r in conn.execute(sql, params)]
+    rows.reverse()
+    return rows
+
+
+def recovery_by_round(fighter: str, last_n: int = 5, db: Path | None = None) -> list[dict]:
+    """Return per-round peak and recovery HR across the last ``last_n`` bouts."""
+
+    sql = """
+        SELECT r.date, r.bout, r.round, r.peak_hr, r.recovery_hr
+        FROM rounds r
+        JOIN (
+            SELECT date, bout, bout_no FROM bouts WHERE fighter=?
+            ORDER BY date DESC, bout_no DESC, bout DESC LIMIT ?
+        ) recent ON recent.date = r.date AND recent.bout = r.bout
+        WHERE r.fighter=?
+        ORDER BY r.date, recent.bout_no, r.bout, r.round
+    """
+    with closing(connect(db)) as conn:
+        return [dict(r) for r in conn.execute(sql, (fighter, int(last_n), fighter))]
+
+
+def zone_distribution(
+    fighter: str,
+    start: str | None = None,
+    end: str | None = None,
+    db: Path | None = None,
+) -> dict[str, dict[str, float]]:
+    """Return ``{date: {zone: seconds}}`` for ``fighter`` within ``start``..``end``."""
+
+    sql = "SELECT date, zone, SUM(seconds) AS seconds FROM zones WHERE fighter=?"
+    params: list = [fighter]
+    if start:
+        sql += " AND date >= ?"
+        params.append(start)
+    if end:
+        sql += " AND date <= ?"
+        params.append(end)
+    sql += " GROUP BY date, zone ORDER BY date"
+    result: dict[str, dict[str, float]] = {}
+    with closing(connect(db)) as conn:
+        for row in conn.execute(sql, params):
+            result.setdefault(row["date"], {})[row["zone"]] = row["seconds"]
+    return result
+
+
+def _summary_files(base_dir: Path) -> Iterable[Path]:
+    fighter_data = base_dir / "FightControl" / "fighter_data"
+    return sorted(fighter_data.glob("*/*/*/session_summary.json"))
+
+
+def rebuild_history(base_dir: Path | None = None, db: Path | None = None) -> int:
+    """Backfill the index from existing ``session_summary.json`` files.
+
+    Only the per-fighter ``fighter_data/<fighter>/<date>/<bout>`` layout is
+    scanned because shared bout folders cannot be attributed to a fighter.
+    Returns the number of bouts recorded.
+    """
+
+    base_dir = Path(base_dir) if base_dir is not None else Path(paths.BASE_DIR)
+    count = 0
+    for path in _summary_files(base_dir):
+        try:
+            summary = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        if record_summary(path.parent, summary, db=db):
+            count += 1
+    return count
+
+
+__all__ = [
+    "bout_identity",
+    "bout_number",
+    "connect",
+    "db_path",
+    "peak_hr_trend",
+    "rebuild_history",
+    "record_summary",
+    "recovery_by_round",
+    "zone_distribution",
+]
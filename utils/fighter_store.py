@@ -0,0 +1,290 @@
+"""Transactional storage for the fighter roster.
+
+The roster used to live only in ``fighters.json`` and every save – from the
+web UI, the CSV importer or the update endpoints – re-read and rewrote the
+whole file, so two writers could silently drop each other's changes.  Fighters
+are now stored one row per fighter in ``fighters.db`` (SQLite in WAL mode)
+next to the JSON file, with secondary indexes on name and safe name.  Writers
+run inside ``BEGIN IMMEDIATE`` transactions, which serialises them across
+processes, and only the rows that changed are written.
+
+``fighters.json`` remains as a generated view for older readers.
+:func:`schedule_export` regenerates it once edits settle: writes within
+``FIGHTERS_JSON_VIEW_DELAY`` seconds (one by default) of each other are
+coalesced into a single rewrite, pending exports run at exit and ``0``
+restores the old synchronous behaviour.  In-process readers go through the
+registry and never wait for the view.  When the
+JSON file is edited by hand (its size or modification time no longer match
+the last export) its contents are imported back into the database; a deleted
+JSON file is simply regenerated, the database stays authoritative.
+
+The per-fighter mirrors (``fighter.json``, ``profile.json``,
+``zone_model.json`` and ``charts.json``) are views of the same data and are
+written with :func:`write_view`, which leaves the file alone when its
+contents did not change.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import threading
+from collections.abc import Iterable
+from contextlib import closing
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DB_NAME = "fighters.db"
+VIEW_DELAY = float(os.getenv("FIGHTERS_JSON_VIEW_DELAY", "1"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fighters (
+    pos INTEGER PRIMARY KEY,
+    name TEXT,
+    safe_name TEXT,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_fighters_name ON fighters (name, pos);
+CREATE INDEX IF NOT EXISTS idx_fighters_safe_name ON fighters (safe_name, pos);
+"""
+
+_timers_lock = threading.Lock()
+_timers: dict[str, threading.Timer] = {}
+
+
+def _safe_filename(value: str) -> str:
+    from fighter_utils import safe_filename
+
+    return safe_filename(value).lower()
+
+
+def db_path(json_path: str | Path) -> Path:
+    """Return the database path backing the JSON view at ``json_path``."""
+
+    return Path(json_path).with_name(DB_NAME)
+
+
+def json_stamp(json_path: str | Path) -> str | None:
+    try:
+        st = Path(json_path).stat()
+    except OSError:
+        return None
+    return f"{st.st_mtime_ns}:{st.st_size}"
+
+
+def connect(json_path: str | Path) -> sqlite3.Connection:
+    """Open the roster database for ``json_path``.
+
+    The connection uses manual transaction control so callers can hold the
+    write lock with ``BEGIN IMMEDIATE``.
+    """
+
+    path = db_path(json_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), timeout=10, isolation_level=None, check_same_thread=False)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+    except sqlite3.DatabaseError:  # pragma: no cover - e.g. network drives
+        pass
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _meta(conn: sqlite3.Connection, key: str) -> str | None:
+    row = conn.execute("SELECT value FROM meta WHERE key=?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def _set_meta(conn: sqlite3.Connection, key: str, value) -> None:
+    conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, None if value is None else str(value)))
+
+
+def version(conn: sqlite3.Connection) -> int:
+    """Return the write counter, bumped by every committed change."""
+
+    return int(_meta(conn, "version") or 0)
+
+
+def bump(conn: sqlite3.Connection) -> int:
+    new = version(conn) + 1
+    _set_meta(conn, "version", new)
+    return new
+
+
+def put(conn: sqlite3.Connection, pos: int, fighter: dict) -> None:
+    """Insert or replace the fighter stored at ``pos``."""
+
+    name = fighter.get("name")
+    name = name if isinstance(name, str) else None
+    conn.execute(
+        "INSERT OR REPLACE INTO fighters (pos, name, safe_name, data) VALUES (?, ?, ?, ?)",
+        (pos, name, _safe_filename(name) if name else None, json.dumps(fighter)),
+    )
+
+
+def replace_all(conn: sqlite3.Connection, fighters: Iterable[dict]) -> None:
+    conn.execute("DELETE FROM fighters")
+    for pos, fighter in enumerate(fighters):
+        put(conn, pos, fighter)
+
+
+def load(conn: sqlite3.Connection) -> tuple[int, list[dict]]:
+    """Return ``(version, fighters)`` ordered by position."""
+
+    rows = conn.execute("SELECT data FROM fighters ORDER BY pos").fetchall()
+    return version(conn), [json.loads(r[0]) for r in rows]
+
+
+def find(conn: sqlite3.Connection, name: str) -> int | None:
+    """Return the position of the first fighter called ``name``."""
+
+    row = conn.execute("SELECT pos FROM fighters WHERE name=? ORDER BY pos LIMIT 1", (name,)).fetchone()
+    if row is None and name:
+        row = conn.execute(
+            "SELECT pos FROM fighters WHERE safe_name=? ORDER BY pos LIMIT 1", (_safe_filename(name),)
+        ).fetchone()
+    return row[0] if row else None
+
+
+def sync_legacy(conn: sqlite3.Connection, json_path: str | Path) -> bool:
+    """Import ``fighters.json`` when it changed outside the store.
+
+    Must be called inside a transaction.  Returns ``True`` when rows were
+    replaced.  A file that cannot be decoded is ignored (the database keeps
+    its rows) and will be overwritten by the next export.
+    """
+
+    json_path = Path(json_path)
+    stamp = json_stamp(json_path)
+    if stamp == _meta(conn, "json_stamp"):
+        return False
+    _set_meta(conn, "json_stamp", stamp)
+    if stamp is None:
+        # A missing view is regenerated from the database, never imported.
+        return False
+    try:
+        fighters = json.loads(json_path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as exc:
+        logger.warning("Failed to decode %s: %s; keeping stored fighters", json_path, exc)
+        return False
+    if not isinstance(fighters, list):
+        logger.warning("Failed to decode %s: not a JSON list; keeping stored fighters", json_path)
+        return False
+    replace_all(conn, [f for f in fighters if isinstance(f, dict)])
+    bump(conn)
+    return True
+
+
+def export_json(json_path: str | Path) -> Path:
+    """Regenerate the ``fighters.json`` view from the database."""
+
+    json_path = Path(json_path)
+    with closing(connect(json_path)) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if sync_legacy(conn, json_path):
+                # The file was edited by hand since the write being exported;
+                # it is already the freshest copy.
+                conn.commit()
+                return json_path
+            _version, fighters = load(conn)
+            tmp = json_path.with_name(f"{json_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_text(json.dumps(fighters, indent=2), encoding="utf-8")
+            os.replace(tmp, json_path)
+            _set_meta(conn, "json_stamp", json_stamp(json_path))
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+    return json_path
+
+
+def write_view(path: str | Path, data, indent: int | None = 2) -> bool:
+    """Write ``data`` as JSON to ``path`` unless it already holds it.
+
+    The file is replaced atomically.  Returns ``True`` when it was rewritten.
+    """
+
+    path = Path(path)
+    text = json.dumps(data, indent=indent)
+    try:
+        if path.read_text(encoding="utf-8") == text:
+            return False
+    except (OSError, UnicodeDecodeError):
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+    return True
+
+
+def legacy_changed(conn: sqlite3.Connection, json_path: str | Path) -> bool:
+    """Return ``True`` when :func:`sync_legacy` would write."""
+
+    return json_stamp(json_path) != _meta(conn, "json_stamp")
+
+
+def _export_later(key: str) -> None:
+    with _timers_lock:
+        _timers.pop(key, None)
+    try:
+        export_json(key)
+    except (OSError, sqlite3.Error):
+        logger.exception("Could not export %s", key)
+
+
+def schedule_export(json_path: str | Path, delay: float | None = None) -> None:
+    """Regenerate the JSON view once edits settle, or now when ``delay`` is 0."""
+
+    delay = VIEW_DELAY if delay is None else delay
+    if delay <= 0:
+        export_json(json_path)
+        return
+    key = str(json_path)
+    with _timers_lock:
+        if key in _timers:
+            return
+        timer = threading.Timer(delay, _export_later, args=(key,))
+        timer.daemon = True
+        _timers[key] = timer
+        timer.start()
+
+
+def flush() -> None:
+    """Run pending view exports immediately."""
+
+    with _timers_lock:
+        pending = list(_timers.items())
+        _timers.clear()
+    for key, timer in pending:
+        timer.cancel()
+        export_json(key)
+
+
+atexit.register(flush)
+
+
+__all__ = [
+    "DB_NAME",
+    "connect",
+    "db_path",
+    "export_json",
+    "find",
+    "flush",
+    "legacy_changed",
+    "load",
+    "put",
+    "replace_all",
+    "schedule_export",
+    "sync_legacy",
+    "write_view",
+]
@@ -1,38 +1,175 @@
+"""Build the fighter roster from the per-fighter ``profile.json`` files.
+
+The index is maintained incrementally.  A manifest stored next to the output
+(``fighters.manifest.json``) records the ``mtime``/size of every profile along
+with its parsed contents, so :func:`rebuild_index` only re-parses profiles
+that changed and skips the write entirely when nothing did.
+:func:`update_index_entry` patches a single fighter's entry in place after a
+profile is saved, leaving the rest of the index untouched.
+
+Both write through :data:`fighter_utils.registry`, so the roster database
+stays the single writer and ``fighters.json`` is regenerated from it.
+"""
+
 from __future__ import annotations
 
 import importlib
 import json
+import os
 from pathlib import Path
-from typing import Iterable
+from typing import Dict, List, Optional
 
 paths_mod = importlib.import_module("paths")
 importlib.reload(paths_mod)
 
+MANIFEST_VERSION = 1
+
+
+def _registry():
+    from fighter_utils import registry
+
+    return registry
+
+
+def _version(output_path: Path) -> Optional[int]:
+    """Return the roster version, which changes with every committed write."""
+
+    return _registry().snapshot(output_path).version
+
+
+def _defaults(fighter_data_dir: Path | None, output_path: Path | None) -> tuple[Path, Path]:
+    base = paths_mod.BASE_DIR
+    fighter_data_dir = Path(fighter_data_dir or base / "FightControl" / "fighter_data")
+    output_path = Path(output_path or paths_mod.FIGHTERS_JSON)
+    return fighter_data_dir, output_path
+
+
+def manifest_path(output_path: Path) -> Path:
+    """Return the manifest location for the index at ``output_path``."""
+
+    return output_path.with_suffix(".manifest.json")
+
+
+def _stamp(path: Path) -> Optional[List[int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
 
-def _atomic_json_dump(data: Iterable, path: Path) -> None:
-    """Write JSON ``data`` to ``path`` atomically."""
-    path.parent.mkdir(parents=True, exist_ok=True)
+def _parse(path: Path) -> Optional[dict]:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def _load_manifest(fighter_data_dir: Path, output_path: Path) -> Dict[str, object]:
+    empty: Dict[str, object] = {"version": MANIFEST_VERSION, "source": str(fighter_data_dir), "profiles": {}}
+    try:
+        manifest = json.loads(manifest_path(output_path).read_text())
+    except (OSError, json.JSONDecodeError):
+        return empty
+    if (
+        not isinstance(manifest, dict)
+        or manifest.get("version") != MANIFEST_VERSION
+        or manifest.get("source") != str(fighter_data_dir)
+        or not isinstance(manifest.get("profiles"), dict)
+    ):
+        return empty
+    return manifest
+
+
+def _save_manifest(manifest: Dict[str, object], output_path: Path) -> None:
+    manifest["output"] = _version(output_path)
+    path = manifest_path(output_path)
     tmp = path.with_suffix(path.suffix + ".tmp")
-    tmp.write_text(json.dumps(list(data), indent=2))
+    tmp.write_text(json.dumps(manifest))
     tmp.replace(path)
 
 
 def rebuild_index(
     fighter_data_dir: Path | None = None,
     output_path: Path | None = None,
-) -> None:
-    """Rebuild the fighters index from ``fighter_data`` profiles."""
-    base = paths_mod.BASE_DIR
-    fighter_data_dir = fighter_data_dir or base / "FightControl" / "fighter_data"
-    output_path = output_path or paths_mod.FIGHTERS_JSON
-
-    fighters: list[dict] = []
-    for profile_path in sorted(fighter_data_dir.glob("*/profile.json")):
-        try:
-            fighters.append(json.loads(profile_path.read_text()))
-        except json.JSONDecodeError:
-            pass
-        except OSError:
-            pass
-
-    _atomic_json_dump(fighters, output_path)
+    full: bool = False,
+) -> bool:
+    """Rebuild the fighters index from ``fighter_data`` profiles.
+
+    Only profiles whose ``mtime``/size differ from the manifest are parsed,
+    and only their entries are patched into the roster.  The roster is
+    replaced as a whole when it was modified since the last build, when there
+    is no manifest, or with ``full``, which also ignores the manifest and
+    re-parses everything.  Returns ``True`` when the index was written.
+    """
+    fighter_data_dir, output_path = _defaults(fighter_data_dir, output_path)
+
+    manifest = _load_manifest(fighter_data_dir, output_path)
+    previous: Dict[str, dict] = {} if full else manifest["profiles"]  # type: ignore[assignment]
+    profiles: Dict[str, dict] = {}
+    stale = full or manifest.get("output") is None or manifest.get("output") != _version(output_path)
+    patches: List[tuple] = []
+
+    try:
+        entries = sorted(e.name for e in os.scandir(fighter_data_dir) if e.is_dir())
+    except OSError:
+        entries = []
+    for name in entries:
+        profile_path = fighter_data_dir / name / "profile.json"
+        stamp = _stamp(profile_path)
+        if stamp is None:
+            continue
+        old = previous.get(name)
+        if old is not None and old.get("stamp") == stamp:
+            profiles[name] = old
+        else:
+            profiles[name] = {"stamp": stamp, "data": _parse(profile_path)}
+            patches.append(((old or {}).get("data"), profiles[name]["data"]))
+    patches.extend((old.get("data"), None) for name, old in previous.items() if name not in profiles)
+
+    if stale:
+        fighters = [p["data"] for p in profiles.values() if p["data"] is not None]
+        _registry().replace(fighters, output_path)
+    elif patches:
+        _registry().patch_many([(old, new) for old, new in patches if old is not None or new is not None], output_path)
+    else:
+        return False
+    manifest["profiles"] = profiles
+    _save_manifest(manifest, output_path)
+    return True
+
+
+def update_index_entry(
+    fighter: str,
+    fighter_data_dir: Path | None = None,
+    output_path: Path | None = None,
+) -> bool:
+    """Patch the index entry for the fighter stored in ``fighter_data/<fighter>``.
+
+    ``fighter`` is the profile directory name (see ``safe_filename``).  The
+    entry previously indexed for that profile, or failing that the entry with
+    the same ``name``, is replaced in the roster; new profiles are
+    appended and deleted ones removed.  Other entries are left as they are.
+    Returns ``True`` when the index was written.
+    """
+    fighter_data_dir, output_path = _defaults(fighter_data_dir, output_path)
+    manifest = _load_manifest(fighter_data_dir, output_path)
+    profiles: Dict[str, dict] = manifest["profiles"]  # type: ignore[assignment]
+
+    profile_path = fighter_data_dir / fighter / "profile.json"
+    stamp = _stamp(profile_path)
+    old = profiles.get(fighter)
+    if old is not None and old.get("stamp") == stamp:
+        return False
+    data = _parse(profile_path) if stamp is not None else None
+
+    _registry().patch((old or {}).get("data"), data, output_path)
+    if stamp is None:
+        profiles.pop(fighter, None)
+    else:
+        profiles[fighter] = {"stamp": stamp, "data": data}
+    _save_manifest(manifest, output_path)
+    return True
+
+
+__all__ = ["manifest_path", "rebuild_index", "update_index_entry"]
@@ -3,8 +3,10 @@ from __future__ import annotations
 """Small file helpers with explicit UTF-8 handling."""
 
 import csv
+import json
+import os
 from pathlib import Path
-from typing import IO
+from typing import IO, Iterable
 
 
 def open_utf8(path: str | Path, mode: str = "r", newline: str | None = "", **kwargs) -> IO[str]:
@@ -75,4 +77,66 @@ def csv_appender_utf8(path: str | Path, *args, **kwargs):
     return fh, writer
 
 
-__all__ = ["open_utf8", "read_csv_dicts", "csv_writer_utf8", "csv_appender_utf8"]
+def _json_items(entries: list, indent: int | None) -> bytes:
+    if indent is None:
+        return ", ".join(json.dumps(e) for e in entries).encode("utf-8")
+    pad = " " * indent
+    blocks = ("\n".join(pad + line for line in json.dumps(e, indent=indent).splitlines()) for e in entries)
+    return ",\n".join(blocks).encode("utf-8")
+
+
+def append_json_list(path: str | Path, entries: Iterable, indent: int | None = 2) -> bool:
+    """Append ``entries`` to the JSON list in ``path`` without rewriting it.
+
+    Only the closing ``]`` is patched, so the cost does not grow with the
+    file.  The output matches :func:`json.dumps` with the same ``indent``.
+    Callers must serialise appends to the same file.
+
+    Parameters
+    ----------
+    path:
+        JSON file holding a top-level list.  It is created when missing.
+    entries:
+        Items to append.
+    indent:
+        Indentation used for the items, ``None`` for a single line.
+
+    Returns
+    -------
+    bool:
+        ``False`` when ``path`` did not hold a JSON list and was started
+        afresh, ``True`` otherwise.
+    """
+    entries = list(entries)
+    if not entries:
+        return True
+    nl = b"" if indent is None else b"\n"
+    items = _json_items(entries, indent)
+    fresh = b"[" + nl + items + nl + b"]"
+    try:
+        fh = open(path, "r+b")
+    except FileNotFoundError:
+        Path(path).write_bytes(fresh)
+        return True
+    with fh:
+        size = fh.seek(0, os.SEEK_END)
+        fh.seek(max(0, size - 4096))
+        tail = fh.read()
+        fh.seek(0)
+        head = fh.read(64).lstrip()
+        stripped = tail.rstrip()
+        if not head.startswith(b"[") or not stripped.endswith(b"]"):
+            fh.seek(0)
+            fh.truncate()
+            fh.write(fresh)
+            return False
+        body = stripped[:-1].rstrip()
+        # Only an empty top-level list has ``[`` directly before its ``]``.
+        empty = body.endswith(b"[")
+        fh.seek(size - len(tail) + len(body))
+        fh.truncate()
+        fh.write((nl if empty else (b"," + (nl or b" "))) + items + nl + b"]")
+    return True
+
+
+__all__ = ["open_utf8", "read_csv_dicts", "csv_writer_utf8", "csv_appender_utf8", "append_json_list"]
@@ -0,0 +1,318 @@
+"""Multi-resolution heart rate series for charts and APIs.
+
+``hr_continuous.json`` holds every sample recorded during a bout which makes
+it slow to plot and large over the wire once several bouts are compared.  This
+module precomputes a small *pyramid* of bucketed levels (1 s, 5 s and 30 s by
+default) where every bucket keeps the ``min``/``max``/``mean`` BPM so peaks
+survive the downsampling.  The pyramid is stored next to the source file as
+``hr_pyramid.json`` and is rebuilt automatically when the source changes.
+
+Two point reducers are also provided for callers that need an exact point
+budget: :func:`lttb` (Largest-Triangle-Three-Buckets) for visually faithful
+line charts and :func:`m4` which keeps the first, last, minimum and maximum
+sample of each pixel column.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from collections.abc import Iterable, Sequence
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+RESOLUTIONS: tuple[int, ...] = (1, 5, 30)
+SOURCE_FILE = "hr_continuous.json"
+PYRAMID_FILE = "hr_pyramid.json"
+PYRAMID_VERSION = 1
+
+Point = tuple[float, float]
+
+
+def samples_from_series(series: Iterable[dict]) -> list[Point]:
+    """Return ``(seconds, bpm)`` pairs from raw HR samples sorted by time.
+
+    Samples may carry ``seconds``, ``time`` or an ISO ``timestamp``; entries
+    without a usable time or BPM value are skipped.
+    """
+
+    points: list[Point] = []
+    start: datetime | None = None
+    for sample in series:
+        if not isinstance(sample, dict):
+            continue
+        try:
+            bpm = float(sample["bpm"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        sec = None
+        for key in ("seconds", "time"):
+            if sample.get(key) is not None:
+                try:
+                    sec = float(sample[key])
+                except (TypeError, ValueError):
+                    sec = None
+                break
+        if sec is None and sample.get("timestamp"):
+            try:
+                ts = datetime.fromisoformat(str(sample["timestamp"]))
+            except ValueError:
+                continue
+            start = start or ts
+            sec = (ts - start).total_seconds()
+        if sec is None:
+            continue
+        points.append((sec, bpm))
+    points.sort(key=lambda p: p[0])
+    return points
+
+
+def bucket_series(points: Sequence[Point], width: float) -> list[dict]:
+    """Aggregate ``points`` into fixed ``width`` second buckets.
+
+    Each bucket is returned as ``{"seconds", "bpm", "min", "max", "count"}``
+    where ``seconds`` is the bucket start and ``bpm`` the mean value.
+    """
+
+    buckets: list[dict] = []
+    current = None
+    total = 0.0
+    for sec, bpm in points:
+        key = int(sec // width)
+        if current is None or key != current["_key"]:
+            if current is not None:
+                current["bpm"] = round(total / current["count"], 2)
+                del current["_key"]
+                buckets.append(current)
+            current = {"_key": key, "seconds": key * width, "min": bpm, "max": bpm, "count": 0}
+            total = 0.0
+        current["count"] += 1
+        total += bpm
+        if bpm < current["min"]:
+            current["min"] = bpm
+        if bpm > current["max"]:
+            current["max"] = bpm
+    if current is not None:
+        current["bpm"] = round(total / current["count"], 2)
+        del current["_key"]
+        buckets.append(current)
+    return buckets
+
+
+def lttb_indices(points: Sequence[Point], threshold: int) -> list[int]:
+    """Return the indices kept by Largest-Triangle-Three-Buckets."""
+
+    n = len(points)
+    if threshold >= n:
+        return list(range(n))
+    if threshold <= 2:
+        return [0, n - 1][: max(threshold, 0)]
+
+    kept = [0]
+    every = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        avg_start = int((i + 1) * every) + 1
+        avg_end = min(int((i + 2) * every) + 1, n)
+        span = max(avg_end - avg_start, 1)
+        avg_x = sum(points[j][0] for j in range(avg_start, avg_end)) / span
+        avg_y = sum(points[j][1] for j in range(avg_start, avg_end)) / span
+
+        range_start = int(i * every) + 1
+        range_end = int((i + 1) * every) + 1
+        ax, ay = points[a]
+        best = range_start
+        best_area = -1.0
+        for j in range(range_start, range_end):
+            x, y = points[j]
+            area = abs((ax - avg_x) * (y - ay) - (ax - x) * (avg_y - ay))
+            if area > best_area:
+                best_area = area
+                best = j
+        kept.append(best)
+        a = best
+    kept.append(n - 1)
+    return kept
+
+
+def lttb(points: Sequence[Point], threshold: int) -> list[Point]:
+    """Downsample ``points`` to ``threshold`` points using LTTB."""
+
+    return [points[i] for i in lttb_indices(points, threshold)]
+
+
+def m4(points: Sequence[Point], columns: int) -> list[Point]:
+    """Reduce ``points`` to at most four samples per output column.
+
+    Keeping the first, last, minimum and maximum point of every column makes
+    a rasterised line chart pixel-identical to plotting every sample.
+    """
+
+    n = len(points)
+    if columns <= 0 or n <= columns * 4:
+        return list(points)
+    x0 = points[0][0]
+    span = (points[-1][0] - x0) or 1.0
+    out: list[Point] = []
+    group: list[int] = []
+    column = 0
+
+    def _flush() -> None:
+        lo = min(group, key=lambda k: points[k][1])
+        hi = max(group, key=lambda k: points[k][1])
+        for k in sorted({group[0], lo, hi, group[-1]}):
+            out.append(points[k])
+
+    for idx, (x, _y) in enumerate(points):
+        col = min(int((x - x0) / span * columns), columns - 1)
+        if group and col != column:
+            _flush()
+            group = []
+        column = col
+        group.append(idx)
+    if group:
+        _flush()
+    return out
+
+
+def build_pyramid(series: Iterable[dict], resolutions: Sequence[int] = RESOLUTIONS) -> dict[str, object]:
+    """Return a pyramid dictionary for raw HR ``series``."""
+
+    points = samples_from_series(series)
+    return {
+        "version": PYRAMID_VERSION,
+        "count": len(points),
+        "levels": {str(res): bucket_series(points, res) for res in resolutions},
+    }
+
+
+def _source_stamp(path: Path) -> dict[str, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+
+def load_pyramid(session_dir: str | Path, rebuild: bool = True) -> dict[str, object] | None:
+    """Return the pyramid for ``session_dir``, rebuilding it when stale.
+
+    ``None`` is returned when ``hr_continuous.json`` does not exist.  A cached
+    ``hr_pyramid.json`` is reused while its recorded source ``mtime``/size
+    match; otherwise it is recomputed and, when ``rebuild`` is true, written
+    back atomically.
+    """
+
+    session_dir = Path(session_dir)
+    source = session_dir / SOURCE_FILE
+    stamp = _source_stamp(source)
+    if stamp is None:
+        return None
+
+    cache = session_dir / PYRAMID_FILE
+    try:
+        cached = json.loads(cache.read_text(encoding="utf-8"))
+        if cached.get("version") == PYRAMID_VERSION and cached.get("source") == stamp:
+            return cached
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    try:
+        series = json.loads(source.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        series = []
+    if not isinstance(series, list):
+        series = []
+
+    pyramid = build_pyramid(series)
+    pyramid["source"] = stamp
+    if rebuild:
+        tmp = cache.with_suffix(cache.suffix + ".tmp")
+        try:
+            tmp.write_text(json.dumps(pyramid), encoding="utf-8")
+            os.replace(tmp, cache)
+        except OSError:
+            logger.warning("Could not write HR pyramid for %s", session_dir)
+    return pyramid
+
+
+def parse_resolution(value: str) -> int | None:
+    """Return the bucket width for ``value`` (``"5"``/``"5s"``) or ``None`` for raw.
+
+    Raises
+    ------
+    ValueError
+        If ``value`` is not ``raw`` or one of :data:`RESOLUTIONS`.
+    """
+
+    text = str(value).strip().lower()
+    if text in ("", "raw", "0"):
+        return None
+    if text.endswith("s"):
+        text = text[:-1]
+    res = int(text)
+    if res not in RESOLUTIONS:
+        raise ValueError(f"resolution must be one of raw, {', '.join(f'{r}s' for r in RESOLUTIONS)}")
+    return res
+
+
+def select_series(
+    session_dir: str | Path,
+    resolution: str | None = None,
+    max_points: int | None = None,
+) -> list[dict] | None:
+    """Return the HR series for ``session_dir`` at the requested detail.
+
+    ``resolution`` selects a pyramid level directly.  ``max_points`` picks the
+    finest level (raw included) that fits the budget and falls back to LTTB on
+    the coarsest level when even that is too large.  With neither argument the
+    raw ``hr_continuous.json`` contents are returned.
+    """
+
+    session_dir = Path(session_dir)
+    source = session_dir / SOURCE_FILE
+    if not source.exists():
+        return None
+
+    res = parse_resolution(resolution) if resolution is not None else None
+    if res is None and not max_points:
+        return json.loads(source.read_text(encoding="utf-8"))
+
+    pyramid = load_pyramid(session_dir) or {}
+    levels: dict[str, list[dict]] = pyramid.get("levels", {})  # type: ignore[assignment]
+    if res is not None:
+        series = levels.get(str(res), [])
+        if max_points and len(series) > max_points:
+            series = _reduce_buckets(series, max_points)
+        return series
+
+    if int(pyramid.get("count", 0)) <= max_points:
+        return json.loads(source.read_text(encoding="utf-8"))
+    for level in RESOLUTIONS:
+        series = levels.get(str(level), [])
+        if len(series) <= max_points:
+            return series
+    return _reduce_buckets(levels.get(str(RESOLUTIONS[-1]), []), max_points)
+
+
+def _reduce_buckets(buckets: list[dict], max_points: int) -> list[dict]:
+    points = [(float(b["seconds"]), float(b["bpm"])) for b in buckets]
+    return [buckets[i] for i in lttb_indices(points, max_points)]
+
+
+__all__ = [
+    "PYRAMID_FILE",
+    "RESOLUTIONS",
+    "bucket_series",
+    "build_pyramid",
+    "load_pyramid",
+    "lttb",
+    "lttb_indices",
+    "m4",
+    "parse_resolution",
+    "samples_from_series",
+    "select_series",
+]
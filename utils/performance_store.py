@@ -0,0 +1,253 @@
+"""Indexed storage for fighter performance results.
+
+``performance_results.json`` used to be loaded, extended and rewritten in full
+for every new result, and every lookup parsed the whole history.  Results are
+now recorded in a small SQLite table (``performance.db`` next to the JSON
+file) indexed by fighter and by metric so queries such as "latest results for
+X" or "all wingate tests this month" only touch matching rows.
+
+The legacy JSON list is still kept up to date for older readers, but new
+entries are appended in place by patching the closing ``]`` instead of
+rewriting the file.  :func:`export_legacy_json` regenerates it from the
+database.  An existing JSON history is imported automatically the first time
+the database is opened.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+
+from utils.files import append_json_list
+
+logger = logging.getLogger(__name__)
+
+DB_NAME = "performance.db"
+LEGACY_JSON = "performance_results.json"
+
+_legacy_lock = threading.Lock()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    fighter TEXT NOT NULL,
+    fighter_key TEXT NOT NULL,
+    recorded_at TEXT,
+    performance TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    result_id INTEGER NOT NULL,
+    metric TEXT NOT NULL,
+    recorded_at TEXT
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_results_fighter ON results (fighter_key, id);
+CREATE INDEX IF NOT EXISTS idx_metrics_metric ON metrics (metric, recorded_at);
+"""
+
+
+def _default_data_dir() -> Path:
+    import paths
+
+    return Path(paths.BASE_DIR) / "FightControl" / "data"
+
+
+def db_path(data_dir: str | Path | None = None) -> Path:
+    """Return the results database path for ``data_dir``."""
+
+    return Path(data_dir or _default_data_dir()) / DB_NAME
+
+
+def _fighter_key(name: str) -> str:
+    return str(name).strip().lower()
+
+
+def _insert(conn: sqlite3.Connection, name: str, performance, recorded_at: str | None) -> int:
+    cur = conn.execute(
+        "INSERT INTO results (fighter, fighter_key, recorded_at, performance) VALUES (?, ?, ?, ?)",
+        (name, _fighter_key(name), recorded_at, json.dumps(performance)),
+    )
+    if isinstance(performance, dict):
+        conn.executemany(
+            "INSERT INTO metrics VALUES (?, ?, ?)",
+            [(cur.lastrowid, str(metric).lower(), recorded_at) for metric in performance],
+        )
+    return int(cur.lastrowid)
+
+
+def _read_legacy(path: Path) -> list:
+    try:
+        entries = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return []
+    except (OSError, json.JSONDecodeError) as exc:
+        logger.warning("Failed to decode %s: %s; starting fresh", path, exc)
+        return []
+    return entries if isinstance(entries, list) else []
+
+
+_init_lock = threading.Lock()
+_initialised: set[str] = set()
+
+
+def _initialise(data_dir: Path) -> None:
+    """Create the schema and import the legacy JSON once per process."""
+
+    path = data_dir / DB_NAME
+    key = str(path)
+    if key in _initialised and path.exists():
+        return
+    with _init_lock:
+        if key in _initialised and path.exists():
+            return
+        data_dir.mkdir(parents=True, exist_ok=True)
+        with closing(sqlite3.connect(key, timeout=5)) as conn:
+            try:
+                # WAL is persistent in the database file, so it is set only once.
+                conn.execute("PRAGMA journal_mode=WAL")
+            except sqlite3.DatabaseError:  # pragma: no cover - e.g. network drives
+                pass
+            conn.executescript(_SCHEMA)
+            with conn:
+                imported = conn.execute("SELECT value FROM meta WHERE key='legacy_imported'").fetchone()
+                if imported is None:
+                    for entry in _read_legacy(data_dir / LEGACY_JSON):
+                        if not isinstance(entry, dict):
+                            continue
+                        name = entry.get("fighter_name") or entry.get("name") or entry.get("fighter")
+                        if name:
+                            _insert(conn, str(name), entry.get("performance", {}), entry.get("recorded_at"))
+                    conn.execute(
+                        "INSERT OR REPLACE INTO meta VALUES ('legacy_imported', ?)", (datetime.now().isoformat(),)
+                    )
+        _initialised.add(key)
+
+
+def connect(data_dir: str | Path | None = None) -> sqlite3.Connection:
+    """Open the results database, importing the legacy JSON on first use."""
+
+    data_dir = Path(data_dir or _default_data_dir())
+    _initialise(data_dir)
+    conn = sqlite3.connect(str(data_dir / DB_NAME), timeout=5)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def _append_legacy(path: Path, entry: dict) -> None:
+    """Append ``entry`` to the JSON list at ``path`` without rewriting it."""
+
+    with _legacy_lock:
+        if not append_json_list(path, [entry]):
+            logger.warning("Failed to decode %s: not a JSON list; starting fresh", path)
+
+
+def append_result(
+    name: str,
+    performance,
+    data_dir: str | Path | None = None,
+    recorded_at: str | None = None,
+) -> int:
+    """Record ``performance`` for ``name`` and return the new result id.
+
+    The entry is also appended to the legacy ``performance_results.json``.
+    """
+
+    data_dir = Path(data_dir or _default_data_dir())
+    recorded_at = recorded_at or datetime.now().isoformat(timespec="seconds")
+    with closing(connect(data_dir)) as conn, conn:
+        result_id = _insert(conn, name, performance, recorded_at)
+    _append_legacy(data_dir / LEGACY_JSON, {"fighter_name": name, "performance": performance})
+    return result_id
+
+
+def _row(row: sqlite3.Row) -> dict:
+    return {
+        "id": row["id"],
+        "fighter_name": row["fighter"],
+        "recorded_at": row["recorded_at"],
+        "performance": json.loads(row["performance"]),
+    }
+
+
+def latest_results(name: str, limit: int = 1, data_dir: str | Path | None = None) -> list[dict]:
+    """Return the ``limit`` most recent results for ``name``, newest first."""
+
+    with closing(connect(data_dir)) as conn:
+        rows = conn.execute(
+            "SELECT * FROM results WHERE fighter_key=? ORDER BY id DESC LIMIT ?",
+            (_fighter_key(name), int(limit)),
+        )
+        return [_row(r) for r in rows]
+
+
+def find_results(
+    metric: str | None = None,
+    start: str | None = None,
+    end: str | None = None,
+    fighter: str | None = None,
+    data_dir: str | Path | None = None,
+) -> list[dict]:
+    """Return results in recording order filtered by metric, date range and fighter.
+
+    ``start``/``end`` are ISO dates or timestamps compared against
+    ``recorded_at``; ``end`` dates include the whole day.
+    """
+
+    sql = "SELECT r.* FROM results r"
+    where: list = []
+    params: list = []
+    if metric:
+        sql += " JOIN metrics m ON m.result_id = r.id"
+        where.append("m.metric = ?")
+        params.append(metric.lower())
+    if start:
+        where.append("r.recorded_at >= ?")
+        params.append(start)
+    if end:
+        where.append("r.recorded_at <= ?")
+        params.append(end if "T" in end else f"{end}T23:59:59")
+    if fighter:
+        where.append("r.fighter_key = ?")
+        params.append(_fighter_key(fighter))
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY r.id"
+    with closing(connect(data_dir)) as conn:
+        return [_row(r) for r in conn.execute(sql, params)]
+
+
+def export_legacy_json(out_path: str | Path | None = None, data_dir: str | Path | None = None) -> Path:
+    """Write every result in the legacy ``[{fighter_name, performance}]`` shape."""
+
+    data_dir = Path(data_dir or _default_data_dir())
+    out = Path(out_path) if out_path is not None else data_dir / LEGACY_JSON
+    with closing(connect(data_dir)) as conn:
+        entries = [
+            {"fighter_name": r["fighter"], "performance": json.loads(r["performance"])}
+            for r in conn.execute("SELECT fighter, performance FROM results ORDER BY id")
+        ]
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_suffix(out.suffix + ".tmp")
+    with _legacy_lock:
+        tmp.write_text(json.dumps(entries, indent=2), encoding="utf-8")
+        os.replace(tmp, out)
+    return out
+
+
+__all__ = [
+    "append_result",
+    "connect",
+    "db_path",
+    "export_legacy_json",
+    "find_results",
+    "latest_results",
+]
@@ -5,6 +5,7 @@ import json
 import logging
 from collections import deque
 
+import fight_state
 from FightControl.fight_utils import safe_filename
 from FightControl.round_manager import round_status
 from paths import BASE_DIR
@@ -79,18 +80,14 @@ def read_bpm(color: str) -> dict:
     model: dict = {}
     fighter = None
     if "max_hr" not in data or "smoothing" not in data:
-        try:
-            fight = json.loads(FIGHT_JSON.read_text())
-            fighter = fight.get(f"{color}_fighter") or fight.get(color)
-
-            if fighter:
-                hr_logger = importlib.import_module("cyclone_modules.HRLogger.hr_logger")
-                importlib.reload(hr_logger)
-                model = hr_logger.load_zone_model(safe_filename(fighter))
-        except FileNotFoundError:
-            logger.warning("Fight status file not found: %s", FIGHT_JSON)
-        except json.JSONDecodeError:
-            logger.warning("Invalid JSON in fight status file: %s", FIGHT_JSON)
+        # Served from the stat-validated fight state cache, not re-parsed per call.
+        fight = fight_state.snapshot(DATA_DIR).fight
+        fighter = fight.get(f"{color}_fighter") or fight.get(color)
+
+        if fighter:
+            hr_logger = importlib.import_module("cyclone_modules.HRLogger.hr_logger")
+            importlib.reload(hr_logger)
+            model = hr_logger.load_zone_model(safe_filename(fighter))
 
     if "max_hr" not in data:
         if model.get("max_hr"):
@@ -101,9 +98,10 @@ def read_bpm(color: str) -> dict:
                 try:
                     import fighter_utils
 
-                    importlib.reload(fighter_utils)
-                    fmap = {f.get("name"): f for f in fighter_utils.load_fighters()}
-                    age = fmap.get(fighter, {}).get("age")
+                    # Only reload when BASE_DIR moved so the registry cache survives.
+                    if fighter_utils.BASE_DIR != fighter_utils._resolve_base_dir():
+                        importlib.reload(fighter_utils)
+                    age = (fighter_utils.registry.get_by_name(fighter) or {}).get("age")
                 except (ImportError, json.JSONDecodeError, OSError) as exc:
                     logger.warning("Error loading fighters for %s: %s", fighter, exc)
                     age = None
@@ -1,6 +1,5 @@
 """System checks (mediaMTX, process, OBS health)."""
 
-import csv
 import json
 import logging
 import re
@@ -10,9 +9,7 @@ from pathlib import Path
 from config.settings import settings  # noqa: E402
 from cyclone_modules.ObsControl.obs_control import check_obs_sync  # noqa: E402
 from fight_state import get_session_dir as _fs_get_session_dir
-from FightControl.round_manager import round_status  # noqa: E402
 from utils import check_media_mtx  # noqa: E402
-from utils.files import open_utf8
 from utils.obs_ws import WS_AVAILABLE, websockets
 
 logger = logging.getLogger(__name__)
@@ -134,6 +131,11 @@ def load_tags(
     ``timestamp,type,content,round_id,fighter_name``.  Only rows whose
     ``type`` is ``"tag"`` contribute to the returned list.  Missing files
     result in an empty list.
+
+    Tags are answered from an index (:class:`services.tag_ingest.TagIndex`):
+    a bout log directory uses its ``tag_events.jsonl`` index, otherwise
+    ``events.csv`` is indexed incrementally by
+    :func:`services.tag_ingest.csv_index`.
     """
 
     if fighter_dir is not None:
@@ -143,7 +145,14 @@ def load_tags(
     else:  # pragma: no cover - defensive; callers should provide a path
         raise TypeError("Either session_dir or fighter_dir must be specified")
 
-    tags: list[str] = []
+    from services import tag_ingest
+
+    # Bout log directories carry the append-only tag log and its index.
+    if (base / tag_ingest.LOG_NAME).exists():
+        return tag_ingest.open_log(base).tags(round_id or None)
+
+    # Legacy event files are derived from the tag log in the background.
+    tag_ingest.flush()
 
     # New schema stores all events in the session directory; older versions
     # used per-round subdirectories.  Prefer the legacy file when present to
@@ -155,33 +164,14 @@ def load_tags(
             path = legacy
 
     try:
-        with open_utf8(path, newline="") as f:
-            reader = csv.DictReader(f)
-            if not reader.fieldnames:
-                return []
-            # Determine column names for backward compatibility
-            tag_col = "tag" if "tag" in reader.fieldnames else "content"
-            round_col = "round" if "round" in reader.fieldnames else "round_id"
-
-            for row in reader:
-                if (row.get("type") or "").strip().lower() != "tag":
-                    continue
-                if round_id and path == base / "events.csv":
-                    rnd = (row.get(round_col) or "").strip()
-                    # Normalise values like "round_1" or "1"
-                    target = str(round_id).lower().lstrip("round_")
-                    candidate = rnd.lower().lstrip("round_")
-                    if candidate != target:
-                        continue
-                content = (row.get(tag_col) or "").strip()
-                if content:
-                    tags.append(content)
+        index = tag_ingest.csv_index(path)
     except FileNotFoundError as exc:
         logger.warning("events.csv not found at %s", path, exc_info=exc)
+        return []
     except Exception as exc:  # pragma: no cover - unexpected CSV errors
         logger.exception("Error loading tags from %s", path, exc_info=exc)
-
-    return tags
+        return []
+    return index.tags(round_id if round_id and path == base / "events.csv" else None)
 
 
 def calc_time_in_zones(hr_series: list[dict]) -> dict[str, int]:
@@ -211,34 +201,20 @@ def calc_bpm_stats(hr_series: list[dict]) -> dict[str, int]:
     }
 
 
-def build_session_summary(session_dir: str | Path) -> dict:
+def build_session_summary(
+    session_dir: str | Path,
+    fighter: str | None = None,
+    date: str | None = None,
+    bout: str | None = None,
+) -> dict:
     """Create ``session_summary.json`` in ``session_dir``.
 
-    The summary combines coach tags, BPM statistics, zone durations and
-    the final round status.
+    Kept for older callers; see :func:`session_summary.build_session_summary`.
     """
-    session_dir = Path(session_dir)
-
-    # Load HR series if available
-    try:
-        hr_series = json.loads((session_dir / "hr_data.json").read_text(encoding="utf-8"))
-    except Exception:
-        hr_series = []
-
-    summary = {
-        "tags": load_tags(session_dir),
-        "time_in_zones": calc_time_in_zones(hr_series),
-        "bpm_stats": calc_bpm_stats(hr_series),
-        "round_results": {},
-    }
-
-    try:
-        summary["round_results"] = round_status()
-    except Exception:
-        pass
+    # Imported here because ``session_summary`` imports :func:`load_tags` from this module.
+    from session_summary import build_session_summary as _build
 
-    (session_dir / "session_summary.json").write_text(json.dumps(summary, indent=2), encoding="utf-8")
-    return summary
+    return _build(session_dir, fighter=fighter, date=date, bout=bout)
 
 
 # Re-export for backward compatibility.  Older modules may still